@@ -23,6 +23,8 @@ from tenacity import (
 
 from ..core.config import AIModelConfig, RetryStrategy
 from ..utils.process_monitor import get_process_monitor
+from ..utils.logging_config import get_metrics_collector
+from ..utils.tracing import get_tracer, traced
 
 
 class AgentRole(str, Enum):
@@ -123,9 +125,10 @@ class RateLimiter:
         self.minute_requests = []
         self.hour_requests = []
     
-    async def acquire(self):
-        """Acquire rate limit permission."""
+    async def acquire(self) -> float:
+        """Acquire rate limit permission. Returns the seconds spent waiting."""
         now = time.time()
+        waited = 0.0
         
         # Clean old requests
         self.minute_requests = [req_time for req_time in self.minute_requests if now - req_time < 60]
@@ -136,15 +139,18 @@ class RateLimiter:
             sleep_time = 60 - (now - self.minute_requests[0])
             if sleep_time > 0:
                 await asyncio.sleep(sleep_time)
+                waited += sleep_time
         
         if len(self.hour_requests) >= self.requests_per_hour:
             sleep_time = 3600 - (now - self.hour_requests[0])
             if sleep_time > 0:
                 await asyncio.sleep(sleep_time)
+                waited += sleep_time
         
         # Record request
         self.minute_requests.append(now)
         self.hour_requests.append(now)
+        return waited
 
 
 class BaseAgent(ABC):
@@ -166,6 +172,7 @@ class BaseAgent(ABC):
         )
         
         # Configure retry decorator based on strategy
+        self._log_retry_sleep = before_sleep_log(self.logger, logging.WARNING)
         self.retry_decorator = self._configure_retry()
     
     def _get_headers(self) -> Dict[str, str]:
@@ -196,10 +203,15 @@ class BaseAgent(ABC):
                 ConnectionError,
                 asyncio.TimeoutError
             )),
-            before_sleep=before_sleep_log(self.logger, logging.WARNING),
+            before_sleep=self._before_retry_sleep,
             after=after_log(self.logger, logging.INFO)
         )
     
+    def _before_retry_sleep(self, retry_state):
+        """Log the upcoming retry and count its backoff as session wait time."""
+        self._log_retry_sleep(retry_state)
+        get_process_monitor().record_timing(None, "retry_backoff", retry_state.next_action.sleep)
+    
     @abstractmethod
     async def _make_api_request(self, prompt: str, **kwargs) -> str:
         """Make API request to the specific AI service. Must be implemented by subclasses."""
@@ -210,6 +222,11 @@ class BaseAgent(ABC):
         """Format the prompt for the specific AI service. Must be implemented by subclasses."""
         pass
     
+    @traced(
+        "agent",
+        name=lambda self, task: f"{self.role.value}:{task.task_type.value}",
+        attributes=lambda self, task: {"model": self.config.model_name}
+    )
     async def execute_task(self, task: AgentTask) -> AgentResponse:
         """
         Execute a task with resilient API calling and structured response.
@@ -223,7 +240,9 @@ class BaseAgent(ABC):
         
         try:
             # Rate limiting
-            await self.rate_limiter.acquire()
+            waited = await self.rate_limiter.acquire()
+            if waited:
+                process_monitor.record_timing(task.session_id, "rate_limit_wait", waited)
             
             # Format prompt based on task
             formatted_prompt = self._format_prompt(task)
@@ -256,6 +275,8 @@ class BaseAgent(ABC):
                 }
             )
             
+            self._record_call_metrics(task, time.time() - start_time, success=True)
+            
             # Create successful response
             response = AgentResponse(
                 content=response_content,
@@ -292,6 +313,8 @@ class BaseAgent(ABC):
                 }
             )
             
+            self._record_call_metrics(task, time.time() - start_time, success=False)
+            
             # Create error response
             self.logger.error(f"Task failed: {task.task_type.value} - {str(e)}")
             
@@ -313,15 +336,44 @@ class BaseAgent(ABC):
         """
         Make a resilient API call with retry logic.
         """
+        attempts = 0
+        
         @self.retry_decorator
         async def _call():
+            nonlocal attempts
+            attempts += 1
             # Pass task_type to the API request
             kwargs = task.requirements.copy()
             kwargs['task_type'] = task.task_type
-            return await self._make_api_request(prompt, **kwargs)
+            with get_tracer().span("http.request", "http", model=self.config.model_name, attempt=attempts):
+                return await self._make_api_request(prompt, **kwargs)
         
         return await _call()
     
+    def _metric_labels(self, task_type: Optional[TaskType]) -> Dict[str, str]:
+        """Labels shared by all agent metrics."""
+        return {
+            "role": self.role.value,
+            "model": self.config.model_name,
+            "task_type": task_type.value if isinstance(task_type, TaskType) else str(task_type or "unknown")
+        }
+    
+    def _record_call_metrics(self, task: AgentTask, duration: float, success: bool):
+        """Record latency and outcome of an agent call."""
+        labels = self._metric_labels(task.task_type)
+        metrics = get_metrics_collector()
+        metrics.observe("agent_call_duration", duration, labels, "seconds")
+        metrics.increment("agent_calls", labels=dict(labels, success=str(success).lower()))
+    
+    def _record_token_usage(self, usage: Optional[Dict[str, Any]], task_type: Optional[TaskType] = None):
+        """Record token counts from an Anthropic or OpenAI ``usage`` block."""
+        if not usage:
+            return
+        labels = self._metric_labels(task_type)
+        metrics = get_metrics_collector()
+        metrics.increment("agent_tokens_in", usage.get("input_tokens", usage.get("prompt_tokens", 0)), labels)
+        metrics.increment("agent_tokens_out", usage.get("output_tokens", usage.get("completion_tokens", 0)), labels)
+    
     def get_capabilities(self) -> List[TaskType]:
         """Return list of task types this agent can handle."""
         return [
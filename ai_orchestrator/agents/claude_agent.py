@@ -7,6 +7,8 @@ from typing import Dict, Any, List, Optional
 
 from .base_agent import BaseAgent, AgentRole, AgentTask, TaskType, MicroPhase
 from ..core.config import AnthropicConfig
+from ..utils.process_monitor import get_process_monitor
+from ..utils.tracing import traced
 
 
 class ClaudeAgent(BaseAgent):
@@ -62,6 +64,7 @@ class ClaudeAgent(BaseAgent):
         response.raise_for_status()
         
         data = response.json()
+        self._record_token_usage(data.get("usage"), kwargs.get("task_type"))
         return data["content"][0]["text"]
     
     def _get_task_temperature(self, task_type: Optional[TaskType] = None) -> float:
@@ -142,6 +145,11 @@ class ClaudeAgent(BaseAgent):
         
         return base_prompt
     
+    @traced(
+        "agent",
+        name=lambda self, task: f"{self.role.value}:{task.task_type.value}",
+        attributes=lambda self, task: {"model": self.config.model_name}
+    )
     async def execute_task(self, task: AgentTask) -> 'AgentResponse':
         """Execute task with enhanced prompts from plan files."""
         import time
@@ -149,16 +157,43 @@ class ClaudeAgent(BaseAgent):
         
         start_time = time.time()
         self.logger.info(f"Executing task: {task.task_type.value} (Session: {task.session_id})")
+        process_monitor = get_process_monitor()
         
         try:
             # Rate limiting
-            await self.rate_limiter.acquire()
+            waited = await self.rate_limiter.acquire()
+            if waited:
+                process_monitor.record_timing(task.session_id, "rate_limit_wait", waited)
             
             # Format prompt with plan file enhancement
             formatted_prompt = await self._format_prompt(task)
             
+            process_monitor.log_agent_request(
+                session_id=task.session_id,
+                agent_name=self.role.value,
+                prompt=formatted_prompt[:500],
+                metadata={
+                    "task_type": task.task_type.value,
+                    "model": self.config.model_name,
+                    "prompt_length": len(formatted_prompt)
+                }
+            )
+            
             # Make resilient API call with enhanced prompt
             response_content = await self._resilient_api_call(formatted_prompt, task)
+            self._record_call_metrics(task, time.time() - start_time, success=True)
+            
+            process_monitor.log_agent_response(
+                session_id=task.session_id,
+                agent_name=self.role.value,
+                response=response_content[:500],
+                metadata={
+                    "task_type": task.task_type.value,
+                    "model": self.config.model_name,
+                    "response_length": len(response_content),
+                    "execution_time": time.time() - start_time
+                }
+            )
             
             # Create successful response
             response = AgentResponse(
@@ -180,6 +215,19 @@ class ClaudeAgent(BaseAgent):
             return response
             
         except Exception as e:
+            self._record_call_metrics(task, time.time() - start_time, success=False)
+            process_monitor.log_error(
+                session_id=task.session_id,
+                source=self.role.value,
+                error=str(e),
+                metadata={
+                    "task_type": task.task_type.value,
+                    "model": self.config.model_name,
+                    "execution_time": time.time() - start_time,
+                    "error_type": type(e).__name__
+                }
+            )
+            
             # Create error response
             error_response = AgentResponse(
                 content=f"Task execution failed: {str(e)}",
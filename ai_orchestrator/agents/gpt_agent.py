@@ -57,6 +57,7 @@ class GPTAgent(BaseAgent):
         response.raise_for_status()
         
         data = response.json()
+        self._record_token_usage(data.get("usage"), kwargs.get("task_type"))
         return data["choices"][0]["message"]["content"]
     
     def _get_task_temperature(self, task_type: TaskType = None) -> float:
@@ -56,6 +56,7 @@ class GPTIntegrationAgent(BaseAgent):
         response.raise_for_status()
         
         data = response.json()
+        self._record_token_usage(data.get("usage"), kwargs.get("task_type"))
         return data["choices"][0]["message"]["content"]
     
     def _get_system_prompt(self, task_type: TaskType = None) -> str:
@@ -17,6 +17,9 @@ from enum import Enum
 import aiofiles
 
 from ..agents.base_agent import MicroPhase
+from ..utils.logging_config import get_metrics_collector
+from ..utils.tracing import traced
+from ..utils.process_monitor import get_process_monitor
 
 
 class CacheStatus(str, Enum):
@@ -102,6 +105,7 @@ class CacheManager:
         self.dependency_graph: Dict[str, Set[str]] = {}
         
         # Performance tracking
+        self.metrics = get_metrics_collector()
         self.stats = {
             "hits": 0,
             "misses": 0,
@@ -143,6 +147,7 @@ class CacheManager:
         except Exception as e:
             self.logger.error(f"Failed to initialize cache: {str(e)}")
     
+    @traced("cache", name="cache.get", attributes=lambda self, cache_key, *args, **kwargs: {"key": cache_key})
     async def get(self, cache_key: str, validate_dependencies: bool = True) -> Optional[Any]:
         """
         Get cached data with dependency validation.
@@ -159,7 +164,7 @@ class CacheManager:
         try:
             # Check if entry exists
             if cache_key not in self.cache_index:
-                self.stats["misses"] += 1
+                self._record_miss(cache_key)
                 self.logger.debug(f"Cache miss: {cache_key}")
                 return None
             
@@ -171,20 +176,21 @@ class CacheManager:
             if cache_status != CacheStatus.VALID:
                 self.logger.warning(f"Invalid cache entry {cache_key}: {cache_status}")
                 await self._invalidate_entry(cache_key)
-                self.stats["misses"] += 1
+                self._record_miss(cache_key)
                 return None
             
             # Load cached data
             data = await self._load_cache_data(metadata)
             
             if data is None:
-                self.stats["misses"] += 1
+                self._record_miss(cache_key)
                 return None
             
             # Update access statistics
             await self._update_access_stats(metadata)
             
             self.stats["hits"] += 1
+            self.metrics.increment("cache_hits", labels={"tier": self._cache_tier(cache_key)})
             access_time = (datetime.utcnow() - start_time).total_seconds() * 1000
             
             self.logger.info(f"Cache hit: {cache_key} ({access_time:.2f}ms)")
@@ -192,9 +198,10 @@ class CacheManager:
             
         except Exception as e:
             self.logger.error(f"Cache get error for {cache_key}: {str(e)}")
-            self.stats["misses"] += 1
+            self._record_miss(cache_key)
             return None
     
+    @traced("cache", name="cache.set", attributes=lambda self, cache_key, *args, **kwargs: {"key": cache_key})
     async def set(self, cache_key: str, data: Any, metadata_override: Dict[str, Any] = None,
                   dependencies: List[str] = None, expiry_hours: Optional[int] = None) -> bool:
         """
@@ -518,9 +525,10 @@ class CacheManager:
         cache_file = self._get_cache_file_path(metadata.cache_key)
         
         try:
-            async with aiofiles.open(cache_file, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                return json.loads(content)
+            with get_process_monitor().track_time("cache_io"):
+                async with aiofiles.open(cache_file, 'r', encoding='utf-8') as f:
+                    content = await f.read()
+            return json.loads(content)
         except Exception as e:
             self.logger.error(f"Failed to load cache data for {metadata.cache_key}: {str(e)}")
             return None
@@ -537,8 +545,9 @@ class CacheManager:
             else:
                 json_data = json.dumps(data, indent=2)
             
-            async with aiofiles.open(cache_file, 'w', encoding='utf-8') as f:
-                await f.write(json_data)
+            with get_process_monitor().track_time("cache_io"):
+                async with aiofiles.open(cache_file, 'w', encoding='utf-8') as f:
+                    await f.write(json_data)
             
             return True
         except Exception as e:
@@ -567,6 +576,15 @@ class CacheManager:
             safe_key = cache_key.replace("/", "_").replace(":", "_")
             return self.cache_dirs["files"] / f"{safe_key}.json"
     
+    def _cache_tier(self, cache_key: str) -> str:
+        """Cache directory a key lives in, used as the metrics tier label."""
+        return self._get_cache_file_path(cache_key).relative_to(self.cache_root).parts[0]
+    
+    def _record_miss(self, cache_key: str):
+        """Count a cache miss."""
+        self.stats["misses"] += 1
+        self.metrics.increment("cache_misses", labels={"tier": self._cache_tier(cache_key)})
+    
     async def _update_access_stats(self, metadata: CacheMetadata):
         """Update access statistics for cache entry."""
         metadata.access_count += 1
@@ -591,6 +609,7 @@ class CacheManager:
             
             # Remove from index
             del self.cache_index[cache_key]
+            self.metrics.increment("cache_evictions", labels={"tier": self._cache_tier(cache_key)})
             
             # Remove from dependency graph
             if cache_key in self.dependency_graph:
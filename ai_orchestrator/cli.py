@@ -13,6 +13,7 @@ from typing import Optional
 from .core.orchestrator import AIOrchestrator
 from .core.config import get_config, reload_config
 from .utils.logging_config import setup_logging, get_logger, get_metrics_collector
+from .utils.executors import get_executor_manager
 from .utils.file_manager import FileOutputManager
 from .utils.git_integration import ProjectPublisher
 
@@ -95,10 +96,16 @@ def generate(ctx, request, output, workflow, workflow_type, no_git, no_github, w
 
 @cli.command()
 @click.argument('session_id', required=True)
+@click.option('--profile', is_flag=True, help='Show the critical-path and waterfall report of the session')
+@click.option('--log-dir', help='Event log directory for --profile (defaults to EVENT_LOG_DIR)')
 @click.pass_context
-def status(ctx, session_id):
+def status(ctx, session_id, profile, log_dir):
     """Check the status of a workflow session."""
     
+    if profile:
+        show_profile(session_id, log_dir)
+        return
+    
     async def check_status():
         try:
             orchestrator = AIOrchestrator()
@@ -130,6 +137,21 @@ def status(ctx, session_id):
     asyncio.run(check_status())
 
 
+def show_profile(session_id, log_dir=None):
+    """Print the profile of a session recorded in the event log."""
+    from .utils.event_log import EventLogReader
+    from .utils.session_profile import build_session_profile, format_profile_report
+    
+    events = EventLogReader(log_dir or get_config().event_log_dir).read_session(session_id)
+    if not events:
+        click.echo(f"❌ No recorded events for session {session_id}")
+        return
+    
+    click.echo(f"⏱️  Profile for {session_id}")
+    for line in format_profile_report(build_session_profile(session_id, events)):
+        click.echo(line)
+
+
 @cli.command()
 @click.pass_context
 def metrics(ctx):
@@ -146,8 +168,53 @@ def metrics(ctx):
     if summary['aggregated_metrics']:
         click.echo("Key Metrics:")
         for name, data in summary['aggregated_metrics'].items():
-            if data['count'] > 0:
-                click.echo(f"  {name}: {data['average']:.3f} avg ({data['count']} samples)")
+            if data['type'] == 'gauge':
+                click.echo(f"  {name}: {data['value']:g}")
+            elif data['type'] == 'counter':
+                click.echo(f"  {name}: {data['total']:g} ({data['count']} updates)")
+            elif data['count'] > 0:
+                click.echo(f"  {name}: {data['average']:.3f} avg, {data['p95']:.3f} p95 ({data['count']} samples)")
+
+
+@cli.command()
+@click.argument('session_id', required=True)
+@click.option('--log-dir', help='Event log directory (defaults to EVENT_LOG_DIR)')
+@click.option('--since', 'since_ts', type=float, help='Only events at or after this Unix timestamp')
+@click.option('--until', 'until_ts', type=float, help='Only events at or before this Unix timestamp')
+@click.option('--json', 'as_json', is_flag=True, help='Print raw events as JSON Lines')
+@click.pass_context
+def replay(ctx, session_id, log_dir, since_ts, until_ts, as_json):
+    """Replay the recorded process monitor timeline of a session."""
+    from .utils.event_log import EventLogReader, format_timeline
+    
+    reader = EventLogReader(log_dir or get_config().event_log_dir)
+    events = [
+        event for event in reader.read_session(session_id)
+        if (since_ts is None or event.get('timestamp', 0) >= since_ts)
+        and (until_ts is None or event.get('timestamp', 0) <= until_ts)
+    ]
+    
+    if not events:
+        click.echo(f"❌ No recorded events for session {session_id}")
+        sessions = reader.list_sessions()
+        if sessions:
+            click.echo("Recorded sessions:")
+            for known_id, info in sorted(sessions.items(), key=lambda item: item[1]['last_ts'], reverse=True)[:10]:
+                click.echo(f"  {known_id}  ({info['count']} events)")
+        return
+    
+    if as_json:
+        for event in events:
+            click.echo(json.dumps(event, ensure_ascii=False, default=str))
+        return
+    
+    duration = events[-1].get('timestamp', 0) - events[0].get('timestamp', 0)
+    errors = sum(1 for event in events if event.get('level') == 'error')
+    click.echo(f"🎞️  Timeline for {session_id}")
+    click.echo(f"Events: {len(events)} | Duration: {duration:.1f}s | Errors: {errors}")
+    click.echo()
+    for line in format_timeline(events):
+        click.echo(line)
 
 
 @cli.command()
@@ -241,18 +308,24 @@ def doctor(ctx, check_apis, check_git, check_github):
 @cli.command()
 @click.option('--port', '-p', default=8000, help='Port to run on')
 @click.option('--host', '-h', default='localhost', help='Host to bind to')
+@click.option('--workers', type=int, help='Number of web worker processes (defaults to WEB_WORKERS)')
 @click.pass_context
-def serve(ctx, port, host):
+def serve(ctx, port, host, workers):
     """Start the AI orchestrator as a web service."""
     
-    click.echo(f"🚀 Starting AI Orchestrator web service on {host}:{port}")
+    config = get_config()
+    workers = workers or config.web_workers
+    if workers > 1 and config.job_queue_backend == "inline":
+        click.echo("❌ Several web workers need a shared job queue", err=True)
+        click.echo("Set JOB_QUEUE_BACKEND=sqlite (or redis) and start 'ai-orchestrator worker'", err=True)
+        sys.exit(1)
+    
+    click.echo(f"🚀 Starting AI Orchestrator web service on {host}:{port} ({workers} worker(s))")
     
     try:
-        from .web.app import create_app
-        app = create_app()
-        
         import uvicorn
-        uvicorn.run(app, host=host, port=port)
+        # Each worker process builds its own app from the factory
+        uvicorn.run("ai_orchestrator.web.app:create_app", factory=True, host=host, port=port, workers=workers)
         
     except ImportError:
         click.echo("❌ Web service dependencies not installed", err=True)
@@ -260,6 +333,25 @@ def serve(ctx, port, host):
         sys.exit(1)
 
 
+@cli.command()
+@click.option('--concurrency', type=int, help='Workflows to run at once (defaults to WORKER_CONCURRENCY)')
+@click.pass_context
+def worker(ctx, concurrency):
+    """Run queued workflows (requires JOB_QUEUE_BACKEND=sqlite or redis)."""
+    
+    from .core.worker import run_worker
+    
+    config = get_config()
+    click.echo(f"⚙️  Starting orchestration worker ({config.job_queue_backend} queue)")
+    try:
+        asyncio.run(run_worker(concurrency))
+    except RuntimeError as e:
+        click.echo(f"❌ {str(e)}", err=True)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        click.echo("\n👋 Worker stopped")
+
+
 async def monitor_workflow(orchestrator, session_id):
     """Monitor workflow progress with real-time updates."""
     
@@ -319,20 +411,23 @@ async def generate_output(workflow_state, output_dir, no_git, no_github):
     try:
         # Create project structure
         file_manager = FileOutputManager()
-        project = file_manager.create_project_structure(workflow_state.__dict__)
+        project = await file_manager.create_project_structure_async(workflow_state.__dict__)
         
         # Write to disk
         if not output_dir:
             output_dir = f"./output/{project.name}"
         
-        project_path = file_manager.write_project_to_disk(project, output_dir)
+        write_result = await file_manager.materialize_project_async(project, output_dir)
+        project_path = write_result.path
         click.echo(f"📂 Project saved to: {project_path}")
+        click.echo(f"   {write_result.written} written, {write_result.skipped} unchanged, {write_result.deleted} deleted")
         
         # Git and GitHub integration
         if not no_git:
             try:
-                publisher = ProjectPublisher()
-                publish_result = publisher.publish_project(
+                # Constructing the publisher authenticates with GitHub, so keep it off the loop
+                publisher = await get_executor_manager().run_io(ProjectPublisher, task_name="create_project_publisher")
+                publish_result = await publisher.publish_project_async(
                     project, 
                     project_path, 
                     push_to_github=not no_github
@@ -106,6 +106,7 @@ class OrchestratorConfig(BaseSettings):
     output_dir: str = Field(default="./output", env="OUTPUT_DIR")
     project_template_dir: str = Field(default="./templates", env="TEMPLATE_DIR")
     workflow_config_path: str = Field(default="./workflows/default.yaml", env="WORKFLOW_CONFIG")
+    archive_cache_mb: int = Field(default=64, env="ARCHIVE_CACHE_MB")
     
     @validator('workflow_config_path')
     def check_active_workflow(cls, v):
@@ -126,8 +127,78 @@ class OrchestratorConfig(BaseSettings):
     
     # Session management
     session_timeout: int = Field(default=3600, env="SESSION_TIMEOUT")  # 1 hour
+    session_store_backend: str = Field(default="sqlite", env="SESSION_STORE_BACKEND")  # sqlite, redis or memory
+    session_store_path: str = Field(default="./data/sessions.db", env="SESSION_STORE_PATH")
+    session_store_redis_url: str = Field(default="redis://localhost:6379/0", env="SESSION_STORE_REDIS_URL")
+    session_snapshot_every: int = Field(default=20, env="SESSION_SNAPSHOT_EVERY")
+    session_save_delay: float = Field(default=0.5, env="SESSION_SAVE_DELAY")  # seconds saves are coalesced for
+    session_evict_interval: float = Field(default=60, env="SESSION_EVICT_INTERVAL")
     max_concurrent_agents: int = Field(default=3, env="MAX_CONCURRENT_AGENTS")
     
+    # Multi-process deployment
+    job_queue_backend: str = Field(default="inline", env="JOB_QUEUE_BACKEND")  # inline, sqlite or redis
+    job_queue_path: str = Field(default="./data/jobs.db", env="JOB_QUEUE_PATH")
+    job_queue_redis_url: str = Field(default="redis://localhost:6379/0", env="JOB_QUEUE_REDIS_URL")
+    job_lease_seconds: int = Field(default=60, env="JOB_LEASE_SECONDS")
+    job_max_attempts: int = Field(default=3, env="JOB_MAX_ATTEMPTS")
+    worker_concurrency: int = Field(default=2, env="WORKER_CONCURRENCY")
+    web_workers: int = Field(default=1, env="WEB_WORKERS")
+    event_bus_poll_interval: float = Field(default=0.1, env="EVENT_BUS_POLL_INTERVAL")
+    
+    # Executors for blocking I/O and CPU-heavy post-processing
+    executor_io_workers: int = Field(default=8, env="EXECUTOR_IO_WORKERS")
+    executor_cpu_workers: int = Field(default=0, env="EXECUTOR_CPU_WORKERS")  # 0 = min(4, CPU count)
+    executor_cpu_pool: bool = Field(default=True, env="EXECUTOR_CPU_POOL")  # False runs CPU tasks on threads
+    executor_max_pending: int = Field(default=64, env="EXECUTOR_MAX_PENDING")
+    executor_cpu_min_bytes: int = Field(default=32768, env="EXECUTOR_CPU_MIN_BYTES")
+    
+    # Process monitor event log
+    event_log_enabled: bool = Field(default=True, env="EVENT_LOG_ENABLED")
+    event_log_dir: str = Field(default="./logs/events", env="EVENT_LOG_DIR")
+    event_log_compress: bool = Field(default=True, env="EVENT_LOG_COMPRESS")
+    event_log_segment_mb: int = Field(default=16, env="EVENT_LOG_SEGMENT_MB")
+    monitor_max_sessions: int = Field(default=100, env="MONITOR_MAX_SESSIONS")
+    
+    # Metrics collection
+    metrics_window_seconds: int = Field(default=300, env="METRICS_WINDOW_SECONDS")
+    metrics_max_series: int = Field(default=1000, env="METRICS_MAX_SERIES")
+    
+    # Tracing
+    tracing_enabled: bool = Field(default=True, env="TRACING_ENABLED")
+    trace_dir: str = Field(default="./logs/traces", env="TRACE_DIR")
+    
+    # GitHub API scheduling
+    github_write_interval: float = Field(default=1.0, env="GITHUB_WRITE_INTERVAL")  # seconds between mutating calls per token
+    github_quota_reserve: int = Field(default=100, env="GITHUB_QUOTA_RESERVE")  # requests kept for interactive calls
+    github_max_retries: int = Field(default=3, env="GITHUB_MAX_RETRIES")
+    github_max_wait: float = Field(default=300.0, env="GITHUB_MAX_WAIT")  # longest rate-limit wait before failing
+    github_cache_max_entries: int = Field(default=1000, env="GITHUB_CACHE_MAX_ENTRIES")  # cached GET responses, 0 disables
+    
+    # Micro-phase publishing
+    publish_backend: str = Field(default="api", env="PUBLISH_BACKEND")  # "api" (Git Data API) or "git" (local mirror + git push)
+    git_mirror_dir: str = Field(default="./output/.mirrors", env="GIT_MIRROR_DIR")
+    stack_micro_phases: bool = Field(default=False, env="STACK_MICRO_PHASES")  # dependent micro-phases share one PR
+    
+    # CI webhooks
+    ci_webhook_secret: Optional[str] = Field(default=None, env="CI_WEBHOOK_SECRET")  # GitHub webhook secret; unset rejects deliveries
+    ci_poll_min_interval: float = Field(default=5.0, env="CI_POLL_MIN_INTERVAL")  # seconds, polling without webhooks
+    ci_poll_max_interval: float = Field(default=60.0, env="CI_POLL_MAX_INTERVAL")
+    
+    # Merge queue
+    merge_queue_max_batch: int = Field(default=8, env="MERGE_QUEUE_MAX_BATCH")  # branches landed per fast-forward, 1 merges one by one
+    merge_queue_concurrency: int = Field(default=8, env="MERGE_QUEUE_CONCURRENCY")  # concurrent branch lookups
+    
+    # Branch cleanup and analytics
+    branch_metadata_concurrency: int = Field(default=8, env="BRANCH_METADATA_CONCURRENCY")  # concurrent metadata fetches and REST deletions
+    branch_stale_days: int = Field(default=30, env="BRANCH_STALE_DAYS")  # for branches without a max age rule
+    branch_cleanup_without_rule: bool = Field(default=False, env="BRANCH_CLEANUP_WITHOUT_RULE")  # clean up branches no rule gives a max age
+    
+    # Event loop lag monitor
+    loop_monitor_enabled: bool = Field(default=True, env="LOOP_MONITOR_ENABLED")
+    loop_monitor_interval: float = Field(default=0.5, env="LOOP_MONITOR_INTERVAL")
+    loop_block_threshold: float = Field(default=0.1, env="LOOP_BLOCK_THRESHOLD")  # seconds
+    loop_block_debug: bool = Field(default=False, env="LOOP_BLOCK_DEBUG")  # capture stacks of blocking callbacks
+    
     # AI model configurations (Google/Gemini removed - no longer used)
     openai: OpenAIConfig = OpenAIConfig()
     anthropic: AnthropicConfig = AnthropicConfig()
@@ -5,6 +5,7 @@ Handles agent coordination and communication for micro-phase development.
 
 import asyncio
 import logging
+import time
 import uuid
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
@@ -15,13 +16,16 @@ from ..agents import (
     GPTManagerAgent, GPTValidatorAgent, GPTGitAgent, GPTIntegrationAgent,
     ClaudeAgent, AgentTask, TaskType, AgentResponse, MicroPhase, ValidationResult
 )
-from ..core.config import AIModelConfig, OpenAIConfig, AnthropicConfig
+from ..core.config import AIModelConfig, OpenAIConfig, AnthropicConfig, get_config
 from ..utils.repository_manager import RepositoryManager, ProjectSetupConfig
 from ..utils.ci_cd_automation import CICDAutomation, PipelineConfig, PipelineStage
 from ..cache import CacheManager, CacheStatus
 from ..cache.cost_optimizer import CostOptimizer
 from ..documentation import PhaseDocumenter, PhaseDocumentation, ArchitecturePlan
 from ..utils.process_monitor import get_process_monitor
+from ..utils.status_hub import get_status_hub
+from ..utils.tracing import get_tracer, traced
+from ..utils.session_store import create_session_map
 
 
 class WorkflowPhase(str, Enum):
@@ -88,6 +92,26 @@ class WorkflowState:
             self.phase_results = {}
         if self.integration_results is None:
             self.integration_results = {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dictionary with enum keys and values as strings."""
+        data = asdict(self)
+        data['current_phase'] = self.current_phase.value
+        data['phase_status'] = {phase.value: status.value for phase, status in self.phase_status.items()}
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'WorkflowState':
+        """Rebuild a workflow state from ``to_dict`` output."""
+        current_micro_phase = data.get('current_micro_phase')
+        return cls(**{
+            **data,
+            'current_phase': WorkflowPhase(data['current_phase']),
+            'phase_status': {WorkflowPhase(phase): PhaseStatus(status) for phase, status in data['phase_status'].items()},
+            'proposed_micro_phases': [MicroPhase(**phase) for phase in data.get('proposed_micro_phases') or []],
+            'approved_micro_phases': [MicroPhase(**phase) for phase in data.get('approved_micro_phases') or []],
+            'current_micro_phase': MicroPhase(**current_micro_phase) if current_micro_phase else None
+        })
 
 
 class MicroPhaseCoordinator:
@@ -125,21 +149,26 @@ class MicroPhaseCoordinator:
         # Initialize caching system
         self.cache_manager = CacheManager(cache_root)
         self.cost_optimizer = CostOptimizer(self.cache_manager)
+        self.gpt_git_agent.branch_manager.cache_manager = self.cache_manager
+        self.repository_manager.branch_manager = self.gpt_git_agent.branch_manager
         
         # (Documentation system already initialized above)
         
         # State management
-        self.active_workflows: Dict[str, WorkflowState] = {}
+        self.active_workflows = create_session_map("micro_phase", WorkflowState.to_dict, WorkflowState.from_dict)
         
         # Process monitoring
         self.process_monitor = get_process_monitor()
+        self.status_hub = get_status_hub()
         
         # Track phase timing for documentation
         self.phase_start_times: Dict[str, datetime] = {}
+        # "<session_id>:<phase>" -> wall-clock start, for phase start/end events
+        self._phase_started_at: Dict[str, float] = {}
     
-    async def start_micro_phase_workflow(self, project_requirements: str) -> str:
+    async def start_micro_phase_workflow(self, project_requirements: str, session_id: Optional[str] = None) -> str:
         """Start a new micro-phase workflow."""
-        session_id = str(uuid.uuid4())
+        session_id = session_id or str(uuid.uuid4())
         
         workflow_state = WorkflowState(
             session_id=session_id,
@@ -148,7 +177,8 @@ class MicroPhaseCoordinator:
             project_requirements=project_requirements
         )
         
-        self.active_workflows[session_id] = workflow_state
+        await self.active_workflows.set_async(session_id, workflow_state)
+        self._publish_status(workflow_state)
         
         self.logger.info(f"Started micro-phase workflow: {session_id}")
         
@@ -164,7 +194,13 @@ class MicroPhaseCoordinator:
         )
         
         # Begin the workflow
-        await self._execute_workflow(session_id)
+        try:
+            with get_tracer().trace(session_id, "micro_phase_workflow", workflow_type="micro_phase"):
+                await self._execute_workflow(session_id)
+        finally:
+            self.process_monitor.log_session_timings(session_id)
+            self.active_workflows.mark_finished(session_id)
+            self.repository_manager.finish_session(session_id)
         
         return session_id
     
@@ -204,9 +240,10 @@ class MicroPhaseCoordinator:
             
         except Exception as e:
             self.logger.error(f"Workflow failed: {session_id} - {str(e)}")
-            workflow_state.phase_status[workflow_state.current_phase] = PhaseStatus.FAILED
+            self._set_phase_status(workflow_state, workflow_state.current_phase, PhaseStatus.FAILED)
             raise
     
+    @traced("phase", name="repository_setup")
     async def _phase_repository_setup(self, workflow_state: WorkflowState):
         """Phase 0: Set up GitHub repository and CI/CD infrastructure."""
         self.logger.info("Starting repository setup phase")
@@ -220,7 +257,8 @@ class MicroPhaseCoordinator:
             tech_stack=["python", "javascript"],  # Will be determined in architecture phase
             enable_ci_cd=False,  # Disabled to avoid Git conflicts
             enable_branch_protection=False,  # Disabled for free GitHub accounts
-            private_repository=True
+            private_repository=True,
+            stack_micro_phases=get_config().stack_micro_phases
         )
         
         # Set up repository
@@ -251,21 +289,19 @@ class MicroPhaseCoordinator:
             "repository_url": repo_state.repository_url,
             "repository_name": repo_state.repository_name,
             "ci_cd_setup": cicd_result,
-            "branches": repo_state.created_branches
+            "branches": repo_state.created_branches,
+            "stack_micro_phases": repo_state.stack_micro_phases
         }
         
         self.logger.info(f"Repository setup completed: {repo_state.repository_url}")
     
+    @traced("phase", name="joint_brainstorming")
     async def _phase_joint_brainstorming(self, workflow_state: WorkflowState):
         """Phase 1: Joint brainstorming between GPT Manager and Claude."""
         self.logger.info("Starting joint brainstorming phase")
         workflow_state.current_phase = WorkflowPhase.JOINT_BRAINSTORMING
-        workflow_state.phase_status[WorkflowPhase.JOINT_BRAINSTORMING] = PhaseStatus.IN_PROGRESS
-        
-        # Log phase start
-        self.process_monitor.log_phase_start(
-            session_id=workflow_state.session_id,
-            phase_name=WorkflowPhase.JOINT_BRAINSTORMING.value,
+        self._set_phase_status(
+            workflow_state, WorkflowPhase.JOINT_BRAINSTORMING, PhaseStatus.IN_PROGRESS,
             metadata={
                 "description": "Joint brainstorming between GPT Manager and Claude",
                 "agents": ["gpt_manager", "claude_agent"]
@@ -277,7 +313,7 @@ class MicroPhaseCoordinator:
         if cached_features:
             self.logger.info("Using cached brainstorming results")
             workflow_state.unified_features = cached_features.get("content") if isinstance(cached_features, dict) else cached_features
-            workflow_state.phase_status[WorkflowPhase.JOINT_BRAINSTORMING] = PhaseStatus.COMPLETED
+            self._set_phase_status(workflow_state, WorkflowPhase.JOINT_BRAINSTORMING, PhaseStatus.COMPLETED)
             return
         
         # GPT Manager strategic brainstorming
@@ -335,21 +371,22 @@ class MicroPhaseCoordinator:
             phase_duration
         )
         
-        workflow_state.phase_status[WorkflowPhase.JOINT_BRAINSTORMING] = PhaseStatus.COMPLETED
+        self._set_phase_status(workflow_state, WorkflowPhase.JOINT_BRAINSTORMING, PhaseStatus.COMPLETED)
         self.logger.info("Joint brainstorming phase completed, cached, and documented")
     
+    @traced("phase", name="architecture_design")
     async def _phase_architecture_design(self, workflow_state: WorkflowState):
         """Phase 2: Claude designs the architecture."""
         self.logger.info("Starting architecture design phase")
         workflow_state.current_phase = WorkflowPhase.ARCHITECTURE_DESIGN
-        workflow_state.phase_status[WorkflowPhase.ARCHITECTURE_DESIGN] = PhaseStatus.IN_PROGRESS
+        self._set_phase_status(workflow_state, WorkflowPhase.ARCHITECTURE_DESIGN, PhaseStatus.IN_PROGRESS)
         
         # Check cache for existing architecture
         cached_architecture = await self.cache_manager.get("system_architecture_plan")
         if cached_architecture:
             self.logger.info("Using cached architecture plan")
             workflow_state.claude_architecture = cached_architecture.get("content") if isinstance(cached_architecture, dict) else cached_architecture
-            workflow_state.phase_status[WorkflowPhase.ARCHITECTURE_DESIGN] = PhaseStatus.COMPLETED
+            self._set_phase_status(workflow_state, WorkflowPhase.ARCHITECTURE_DESIGN, PhaseStatus.COMPLETED)
             return
         
         architecture_task = AgentTask(
@@ -382,14 +419,15 @@ class MicroPhaseCoordinator:
         # Store architecture plan reference in workflow state
         workflow_state.integration_results["architecture_plan_file"] = arch_plan
         
-        workflow_state.phase_status[WorkflowPhase.ARCHITECTURE_DESIGN] = PhaseStatus.COMPLETED
+        self._set_phase_status(workflow_state, WorkflowPhase.ARCHITECTURE_DESIGN, PhaseStatus.COMPLETED)
         self.logger.info("Architecture design phase completed, cached, documented with plan file created")
     
+    @traced("phase", name="architecture_review")
     async def _phase_architecture_review(self, workflow_state: WorkflowState):
         """Phase 3: GPT Manager reviews and approves architecture."""
         self.logger.info("Starting architecture review phase")
         workflow_state.current_phase = WorkflowPhase.ARCHITECTURE_REVIEW
-        workflow_state.phase_status[WorkflowPhase.ARCHITECTURE_REVIEW] = PhaseStatus.IN_PROGRESS
+        self._set_phase_status(workflow_state, WorkflowPhase.ARCHITECTURE_REVIEW, PhaseStatus.IN_PROGRESS)
         
         review_task = AgentTask(
             task_type=TaskType.PLAN_COMPARISON,
@@ -408,14 +446,15 @@ class MicroPhaseCoordinator:
         # For now, assume approval. In real implementation, parse response for approval status
         workflow_state.approved_architecture = workflow_state.claude_architecture
         
-        workflow_state.phase_status[WorkflowPhase.ARCHITECTURE_REVIEW] = PhaseStatus.COMPLETED
+        self._set_phase_status(workflow_state, WorkflowPhase.ARCHITECTURE_REVIEW, PhaseStatus.COMPLETED)
         self.logger.info("Architecture review phase completed")
     
+    @traced("phase", name="micro_phase_planning")
     async def _phase_micro_phase_planning(self, workflow_state: WorkflowState):
         """Phase 4: Claude breaks down project into micro-phases."""
         self.logger.info("Starting micro-phase planning")
         workflow_state.current_phase = WorkflowPhase.MICRO_PHASE_PLANNING
-        workflow_state.phase_status[WorkflowPhase.MICRO_PHASE_PLANNING] = PhaseStatus.IN_PROGRESS
+        self._set_phase_status(workflow_state, WorkflowPhase.MICRO_PHASE_PLANNING, PhaseStatus.IN_PROGRESS)
         
         # Check cache for existing micro-phase breakdown
         cached_phases = await self.cache_manager.get("project_micro_phases")
@@ -425,7 +464,7 @@ class MicroPhaseCoordinator:
             workflow_state.proposed_micro_phases = [
                 MicroPhase(**phase_data) for phase_data in cached_phases
             ] if isinstance(cached_phases, list) else []
-            workflow_state.phase_status[WorkflowPhase.MICRO_PHASE_PLANNING] = PhaseStatus.COMPLETED
+            self._set_phase_status(workflow_state, WorkflowPhase.MICRO_PHASE_PLANNING, PhaseStatus.COMPLETED)
             return
         
         planning_task = AgentTask(
@@ -463,14 +502,15 @@ class MicroPhaseCoordinator:
             phase_duration
         )
         
-        workflow_state.phase_status[WorkflowPhase.MICRO_PHASE_PLANNING] = PhaseStatus.COMPLETED
+        self._set_phase_status(workflow_state, WorkflowPhase.MICRO_PHASE_PLANNING, PhaseStatus.COMPLETED)
         self.logger.info("Micro-phase planning completed, cached, and documented with updated plan file")
     
+    @traced("phase", name="micro_phase_validation")
     async def _phase_micro_phase_validation(self, workflow_state: WorkflowState):
         """Phase 5: GPT Manager validates micro-phase breakdown."""
         self.logger.info("Starting micro-phase validation")
         workflow_state.current_phase = WorkflowPhase.MICRO_PHASE_VALIDATION
-        workflow_state.phase_status[WorkflowPhase.MICRO_PHASE_VALIDATION] = PhaseStatus.IN_PROGRESS
+        self._set_phase_status(workflow_state, WorkflowPhase.MICRO_PHASE_VALIDATION, PhaseStatus.IN_PROGRESS)
         
         validation_task = AgentTask(
             task_type=TaskType.MICRO_PHASE_VALIDATION,
@@ -488,25 +528,89 @@ class MicroPhaseCoordinator:
         # For now, assume approval
         workflow_state.approved_micro_phases = workflow_state.proposed_micro_phases
         
-        workflow_state.phase_status[WorkflowPhase.MICRO_PHASE_VALIDATION] = PhaseStatus.COMPLETED
+        self._set_phase_status(workflow_state, WorkflowPhase.MICRO_PHASE_VALIDATION, PhaseStatus.COMPLETED)
         self.logger.info("Micro-phase validation completed")
     
+    @traced("phase", name="iterative_development")
     async def _phase_iterative_development(self, workflow_state: WorkflowState):
         """Phase 6: Iterative development of each micro-phase."""
         self.logger.info("Starting iterative development")
         workflow_state.current_phase = WorkflowPhase.ITERATIVE_DEVELOPMENT
-        workflow_state.phase_status[WorkflowPhase.ITERATIVE_DEVELOPMENT] = PhaseStatus.IN_PROGRESS
-        
-        for micro_phase in workflow_state.approved_micro_phases:
-            await self._execute_micro_phase(workflow_state, micro_phase)
-        
-        workflow_state.phase_status[WorkflowPhase.ITERATIVE_DEVELOPMENT] = PhaseStatus.COMPLETED
+        self._set_phase_status(workflow_state, WorkflowPhase.ITERATIVE_DEVELOPMENT, PhaseStatus.IN_PROGRESS)
+        
+        phase_names = {micro_phase.id: micro_phase.name for micro_phase in workflow_state.approved_micro_phases}
+        for stack in self._plan_micro_phase_stacks(workflow_state):
+            prepared: List[Dict[str, Any]] = []
+            for micro_phase in stack:
+                phase_name = f"micro_phase:{micro_phase.name}"
+                self.process_monitor.log_phase_start(
+                    session_id=workflow_state.session_id,
+                    phase_name=phase_name,
+                    metadata={
+                        "parent": WorkflowPhase.ITERATIVE_DEVELOPMENT.value,
+                        "micro_phase_id": micro_phase.id,
+                        "depends_on": [f"micro_phase:{phase_names.get(dep, dep)}" for dep in micro_phase.dependencies]
+                    }
+                )
+                started_at = time.time()
+                try:
+                    prepared.append(await self._execute_micro_phase(
+                        workflow_state, micro_phase, [item["micro_phase"].id for item in prepared]
+                    ))
+                    # The last phase of a stack publishes the whole stack, one commit per phase
+                    if len(prepared) == len(stack):
+                        await self._publish_micro_phases(workflow_state, prepared)
+                except Exception as e:
+                    self.process_monitor.log_phase_end(
+                        workflow_state.session_id, phase_name, False,
+                        metadata={"duration": time.time() - started_at, "error": str(e)}
+                    )
+                    raise
+                self.process_monitor.log_phase_end(
+                    workflow_state.session_id, phase_name, True,
+                    metadata={"duration": time.time() - started_at}
+                )
+        
+        # Checkpoint: branches committed to a local git mirror go out in one push
+        await self.repository_manager.push_pending(workflow_state.session_id)
+        
+        self._set_phase_status(workflow_state, WorkflowPhase.ITERATIVE_DEVELOPMENT, PhaseStatus.COMPLETED)
         self.logger.info("Iterative development completed")
     
-    async def _execute_micro_phase(self, workflow_state: WorkflowState, micro_phase: MicroPhase):
-        """Execute a single micro-phase."""
+    def _plan_micro_phase_stacks(self, workflow_state: WorkflowState) -> List[List[MicroPhase]]:
+        """
+        Group the approved micro-phases into stacks published as one branch and
+        pull request. With stacking enabled a phase joins the open stack when it
+        builds on a phase of that stack and everything it depends on is
+        developed before it; otherwise every phase is a stack of its own.
+        """
+        micro_phases = workflow_state.approved_micro_phases
+        if not workflow_state.integration_results.get("stack_micro_phases"):
+            return [[micro_phase] for micro_phase in micro_phases]
+        
+        known = {micro_phase.id for micro_phase in micro_phases}
+        planned: set = set()
+        stacks: List[List[MicroPhase]] = []
+        for micro_phase in micro_phases:
+            dependencies = {dep for dep in micro_phase.dependencies if dep in known}
+            open_stack = {phase.id for phase in stacks[-1]} if stacks else set()
+            if dependencies & open_stack and dependencies <= planned:
+                stacks[-1].append(micro_phase)
+            else:
+                stacks.append([micro_phase])
+            planned.add(micro_phase.id)
+        return stacks
+    
+    @traced("phase", name=lambda self, workflow_state, micro_phase, *args: f"micro_phase:{micro_phase.name}")
+    async def _execute_micro_phase(self, workflow_state: WorkflowState, micro_phase: MicroPhase,
+                                   stacked_on: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Develop a single micro-phase; ``stacked_on`` lists the phases of its
+        stack developed before it. Returns what ``_publish_micro_phases`` needs.
+        """
         self.logger.info(f"Executing micro-phase: {micro_phase.name}")
         workflow_state.current_micro_phase = micro_phase
+        self._publish_status(workflow_state)
         
         # Track phase start time for documentation
         phase_start_time = datetime.utcnow()
@@ -522,27 +626,12 @@ class MicroPhaseCoordinator:
         
         if cached_files and cached_validation:
             self.logger.info(f"Using cached implementation for micro-phase: {micro_phase.name}")
-            
-            # Use cached GitHub operations if available
-            github_result = await self.repository_manager.execute_micro_phase_workflow(
-                session_id=workflow_state.session_id,
-                micro_phase=micro_phase,
-                generated_files=cached_files
-            )
-            
-            # Store results using cached data
-            workflow_state.phase_results[micro_phase.id] = {
-                "implementation": "Loaded from cache",
+            return {
+                "micro_phase": micro_phase,
+                "generated_files": cached_files,
                 "validation": cached_validation,
-                "github_operations": github_result,
-                "repository_url": github_result.get("repository_url"),
-                "pull_request_url": github_result.get("pull_request", {}).get("url"),
                 "cached": True
             }
-            
-            workflow_state.completed_phases.append(micro_phase.id)
-            self.logger.info(f"Micro-phase completed from cache: {micro_phase.name}")
-            return
         
         # Claude implements the micro-phase with plan file guidance
         implementation_task = AgentTask(
@@ -550,7 +639,7 @@ class MicroPhaseCoordinator:
             prompt=workflow_state.project_requirements,
             context={
                 "micro_phase": asdict(micro_phase),
-                "previous_phases": workflow_state.completed_phases,
+                "previous_phases": workflow_state.completed_phases + list(stacked_on or []),
                 "project_architecture": workflow_state.approved_architecture,
                 "implementation_guide": implementation_guide,
                 "architecture_plan_file": workflow_state.integration_results.get("architecture_plan_file"),
@@ -579,8 +668,6 @@ class MicroPhaseCoordinator:
         
         validation_response = await self.gpt_validator.execute_task(validation_task)
         
-        # Execute real GitHub operations
-        repo_name = workflow_state.integration_results.get("repository_name", "")
         generated_files = {f"src/{micro_phase.name.lower()}.py": implementation_response.content}
         
         # Cache the generated files and validation results
@@ -603,47 +690,81 @@ class MicroPhaseCoordinator:
             workflow_state.session_id
         )
         
-        # Use repository manager for actual GitHub operations
-        github_result = await self.repository_manager.execute_micro_phase_workflow(
-            session_id=workflow_state.session_id,
-            micro_phase=micro_phase,
-            generated_files=generated_files
-        )
-        
-        # Skip CI/CD validation completely to avoid GitHub API conflicts
-        validation_result = {"status": "skipped", "message": "CI/CD validation disabled"}
-        
-        # Document micro-phase implementation
-        phase_duration = (datetime.utcnow() - phase_start_time).total_seconds()
-        phase_doc = await self.phase_documenter.document_micro_phase_implementation(
-            workflow_state.session_id,
-            micro_phase,
-            implementation_response.content,
-            validation_report,
-            github_result,
-            phase_duration
-        )
-        
-        # Store results
-        workflow_state.phase_results[micro_phase.id] = {
+        return {
+            "micro_phase": micro_phase,
+            "generated_files": generated_files,
             "implementation": implementation_response.content,
             "validation": validation_response.content,
-            "github_operations": github_result,
-            "ci_cd_validation": validation_result if 'validation_result' in locals() else None,
-            "repository_url": github_result.get("repository_url"),
-            "pull_request_url": github_result.get("pull_request", {}).get("url"),
-            "cached": False,
-            "documentation": asdict(phase_doc)
+            "validation_report": validation_report,
+            "started_at": phase_start_time,
+            "cached": False
         }
+    
+    async def _publish_micro_phases(self, workflow_state: WorkflowState, prepared: List[Dict[str, Any]]):
+        """Publish a stack of developed micro-phases and record their results."""
+        results = await self.repository_manager.execute_stacked_micro_phases(
+            workflow_state.session_id,
+            [(item["micro_phase"], item["generated_files"]) for item in prepared]
+        )
+        # A stacked publish has one branch and pull request for all of its phases
+        if len(results) < len(prepared):
+            results = results * len(prepared)
         
-        workflow_state.completed_phases.append(micro_phase.id)
-        self.logger.info(f"Micro-phase completed, cached, and documented: {micro_phase.name}")
+        for item, github_result in zip(prepared, results):
+            micro_phase = item["micro_phase"]
+            pull_request = github_result.get("pull_request") or {}
+            
+            if item["cached"]:
+                # Store results using cached data
+                workflow_state.phase_results[micro_phase.id] = {
+                    "implementation": "Loaded from cache",
+                    "validation": item["validation"],
+                    "github_operations": github_result,
+                    "repository_url": github_result.get("repository_url"),
+                    "pull_request_url": pull_request.get("url"),
+                    "cached": True
+                }
+                workflow_state.completed_phases.append(micro_phase.id)
+                self._publish_status(workflow_state)
+                self.logger.info(f"Micro-phase completed from cache: {micro_phase.name}")
+                continue
+            
+            # Skip CI/CD validation completely to avoid GitHub API conflicts
+            validation_result = {"status": "skipped", "message": "CI/CD validation disabled"}
+            
+            # Document micro-phase implementation
+            phase_duration = (datetime.utcnow() - item["started_at"]).total_seconds()
+            phase_doc = await self.phase_documenter.document_micro_phase_implementation(
+                workflow_state.session_id,
+                micro_phase,
+                item["implementation"],
+                item["validation_report"],
+                github_result,
+                phase_duration
+            )
+            
+            # Store results
+            workflow_state.phase_results[micro_phase.id] = {
+                "implementation": item["implementation"],
+                "validation": item["validation"],
+                "github_operations": github_result,
+                "ci_cd_validation": validation_result,
+                "repository_url": github_result.get("repository_url"),
+                "pull_request_url": pull_request.get("url"),
+                "cached": False,
+                "documentation": asdict(phase_doc)
+            }
+            
+            workflow_state.completed_phases.append(micro_phase.id)
+            self._publish_status(workflow_state)
+            self.logger.info(f"Micro-phase completed, cached, and documented: {micro_phase.name}")
     
+    @traced("phase", name="final_integration")
     async def _phase_final_integration(self, workflow_state: WorkflowState):
         """Phase 7: Final integration and deployment."""
         self.logger.info("Starting final integration")
         workflow_state.current_phase = WorkflowPhase.FINAL_INTEGRATION
-        workflow_state.phase_status[WorkflowPhase.FINAL_INTEGRATION] = PhaseStatus.IN_PROGRESS
+        self._set_phase_status(workflow_state, WorkflowPhase.FINAL_INTEGRATION, PhaseStatus.IN_PROGRESS)
         
         integration_task = AgentTask(
             task_type=TaskType.FINAL_ASSEMBLY,
@@ -690,18 +811,53 @@ class MicroPhaseCoordinator:
         
         workflow_state.integration_results.update(integration_summary)
         workflow_state.final_repository_url = repo_finalization.get("repository_url")
+        self._publish_status(workflow_state)
         workflow_state.integration_results["documentation"] = asdict(integration_doc)
         
-        workflow_state.phase_status[WorkflowPhase.FINAL_INTEGRATION] = PhaseStatus.COMPLETED
+        self._set_phase_status(workflow_state, WorkflowPhase.FINAL_INTEGRATION, PhaseStatus.COMPLETED)
         self.logger.info("Final integration completed, cached, and fully documented")
     
+    def _set_phase_status(self, workflow_state: WorkflowState, phase: WorkflowPhase, status: PhaseStatus,
+                          metadata: Optional[Dict[str, Any]] = None):
+        """Record a phase status transition, log phase start/end events and push it to status subscribers."""
+        previous = workflow_state.phase_status.get(phase)
+        workflow_state.phase_status[phase] = status
+        
+        key = f"{workflow_state.session_id}:{phase.value}"
+        if status == PhaseStatus.IN_PROGRESS and previous != PhaseStatus.IN_PROGRESS:
+            self._phase_started_at[key] = time.time()
+            self.process_monitor.log_phase_start(workflow_state.session_id, phase.value, metadata=metadata)
+        elif previous == PhaseStatus.IN_PROGRESS and status in (PhaseStatus.COMPLETED, PhaseStatus.FAILED):
+            started_at = self._phase_started_at.pop(key, None)
+            self.process_monitor.log_phase_end(
+                workflow_state.session_id, phase.value, status == PhaseStatus.COMPLETED,
+                metadata={"duration": time.time() - started_at if started_at else 0.0, **(metadata or {})}
+            )
+        
+        self._publish_status(workflow_state)
+    
+    def _publish_status(self, workflow_state: WorkflowState):
+        """Persist the workflow and push its progress fields to the status hub."""
+        self.active_workflows.save(workflow_state.session_id)
+        current_micro_phase = workflow_state.current_micro_phase
+        self.status_hub.publish(
+            workflow_state.session_id,
+            session_id=workflow_state.session_id,
+            workflow_type="micro_phase",
+            current_phase=workflow_state.current_phase.value,
+            phase_status={phase.value: status.value for phase, status in workflow_state.phase_status.items()},
+            completed_phases_count=len(workflow_state.completed_phases),
+            total_phases_count=len(workflow_state.approved_micro_phases) if workflow_state.approved_micro_phases else 0,
+            current_micro_phase=current_micro_phase.name if current_micro_phase else None,
+            repository_url=workflow_state.final_repository_url
+        )
+    
     async def get_workflow_status(self, session_id: str) -> Dict[str, Any]:
         """Get current status of a workflow."""
-        if session_id not in self.active_workflows:
+        workflow_state = await self.active_workflows.get_async(session_id)
+        if workflow_state is None:
             return {"error": "Workflow not found"}
         
-        workflow_state = self.active_workflows[session_id]
-        
         # Get cache analytics for the session
         cache_stats = await self.cache_manager.get_cache_analytics()
         
@@ -729,7 +885,7 @@ class MicroPhaseCoordinator:
     
     async def get_cost_analysis(self, session_id: str) -> Dict[str, Any]:
         """Get detailed cost analysis for a workflow session."""
-        if session_id not in self.active_workflows:
+        if not await self.active_workflows.contains_async(session_id):
             return {"error": "Workflow not found"}
         
         # Generate comprehensive cost report
@@ -760,6 +916,9 @@ class MicroPhaseCoordinator:
         await self.gpt_integration_agent.cleanup()
         await self.claude.cleanup()
         
+        # Write pending session saves
+        await self.active_workflows.close()
+        
         # Cleanup GitHub integration components
         await self.repository_manager.cleanup()
         
@@ -7,7 +7,7 @@ import uuid
 import time
 import logging
 from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
 
 from ..agents import (
@@ -17,6 +17,12 @@ from ..agents import (
 )
 from ..core.config import get_config
 from ..utils.logging_config import get_logger, get_workflow_logger
+from ..utils.process_monitor import get_process_monitor
+from ..utils.status_hub import get_status_hub
+from ..utils.session_store import create_session_map
+from ..utils.job_queue import Job, get_job_queue
+from ..utils.executors import get_executor_manager
+from ..utils.tracing import get_tracer
 from .workflow_engine import WorkflowEngine
 from .micro_phase_coordinator import MicroPhaseCoordinator
 from .adaptive_workflow import AdaptiveWorkflowGenerator
@@ -70,6 +76,23 @@ class WorkflowState:
     execution_log: List[Dict[str, Any]] = field(default_factory=list)
     error_count: int = 0
     total_execution_time: float = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dictionary, including attributes added by adaptive workflows."""
+        data = dict(vars(self))
+        data['current_phase'] = self.current_phase.value
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'WorkflowState':
+        """Rebuild a workflow state from ``to_dict`` output."""
+        known = {f.name for f in fields(cls)}
+        state = cls(**{key: value for key, value in data.items() if key in known and key != 'current_phase'},
+                    current_phase=WorkflowPhase(data['current_phase']))
+        for key, value in data.items():
+            if key not in known:
+                setattr(state, key, value)
+        return state
 
 
 class AIOrchestrator:
@@ -102,7 +125,13 @@ class AIOrchestrator:
         self.adaptive_workflow_generator = AdaptiveWorkflowGenerator(self.gpt_manager)
         
         # Workflow state management
-        self.active_sessions: Dict[str, WorkflowState] = {}
+        self.active_sessions = create_session_map(
+            "orchestrator", WorkflowState.to_dict, WorkflowState.from_dict, summarize=self._session_summary
+        )
+        # Workflows running in this process; referenced so the tasks are not garbage collected
+        self._workflow_tasks: Dict[str, asyncio.Task] = {}
+        # Set when workflows are handed to worker processes instead of run here
+        self.job_queue = get_job_queue()
         
         # Agent mapping for workflow engine
         self.agent_map = {
@@ -118,17 +147,18 @@ class AIOrchestrator:
         
         self.logger.info("AI Orchestrator initialized with both legacy and micro-phase workflows")
     
-    async def start_workflow(self, user_request: str) -> str:
+    async def start_workflow(self, user_request: str, session_id: Optional[str] = None) -> str:
         """
         Start a new GPT-Claude collaborative workflow.
         
         Args:
             user_request: The initial project request from the user
+            session_id: Id to run the session under (generated when omitted)
             
         Returns:
             session_id: Unique identifier for this workflow session
         """
-        session_id = str(uuid.uuid4())
+        session_id = session_id or str(uuid.uuid4())
         
         workflow_state = WorkflowState(
             session_id=session_id,
@@ -136,30 +166,32 @@ class AIOrchestrator:
             user_request=user_request
         )
         
-        self.active_sessions[session_id] = workflow_state
+        await self.active_sessions.set_async(session_id, workflow_state)
         
         self.logger.info(f"Started new GPT-Claude collaborative workflow session: {session_id}")
         self._log_workflow_event(workflow_state, "workflow_started", {
             "user_request_length": len(user_request),
             "workflow_type": "gpt_claude_collaborative"
         })
+        self._publish_status(workflow_state)
         
         # Start the workflow execution using workflow engine
-        asyncio.create_task(self._execute_workflow_with_engine(session_id))
+        self._spawn(session_id, "gpt_claude_collaborative", self._execute_workflow_with_engine(session_id))
         
         return session_id
     
-    async def create_adaptive_project(self, user_request: str) -> str:
+    async def create_adaptive_project(self, user_request: str, session_id: Optional[str] = None) -> str:
         """
         Create ANY type of project using the adaptive workflow system.
         
         Args:
             user_request: The project request from the user
+            session_id: Id to run the session under (generated when omitted)
             
         Returns:
             session_id: Unique identifier for this workflow session
         """
-        session_id = str(uuid.uuid4())
+        session_id = session_id or str(uuid.uuid4())
         
         # Create a simplified workflow state for adaptive projects
         workflow_state = WorkflowState(
@@ -168,27 +200,77 @@ class AIOrchestrator:
             user_request=user_request
         )
         
-        self.active_sessions[session_id] = workflow_state
+        await self.active_sessions.set_async(session_id, workflow_state)
         
         self.logger.info(f"Started new adaptive project workflow session: {session_id}")
         self._log_workflow_event(workflow_state, "adaptive_workflow_started", {
             "user_request_length": len(user_request),
             "workflow_type": "adaptive"
         })
+        self._publish_status(workflow_state, workflow_type="adaptive")
         
         # Start the adaptive workflow execution
-        asyncio.create_task(self._execute_adaptive_workflow(session_id))
+        self._spawn(session_id, "adaptive", self._execute_adaptive_workflow(session_id))
         
         return session_id
     
+    async def submit_workflow(self, user_request: str, workflow_type: str = "micro_phase") -> str:
+        """
+        Start a workflow in this process, or queue it for a worker process
+        when a job queue is configured.
+        
+        Args:
+            user_request: The initial project request
+            workflow_type: "micro_phase", "adaptive" or "legacy"
+            
+        Returns:
+            session_id: Unique identifier for this workflow session
+        """
+        if self.job_queue is None:
+            return await self.start_workflow_with_type(user_request, workflow_type)
+        
+        session_id = str(uuid.uuid4())
+        workflow_state = WorkflowState(
+            session_id=session_id,
+            current_phase=WorkflowPhase.INITIALIZATION,
+            user_request=user_request
+        )
+        await self.active_sessions.set_async(session_id, workflow_state)
+        self._publish_status(workflow_state, workflow_type=workflow_type, job_status="queued")
+        # The worker that claims the job owns the session from here on
+        await self.active_sessions.flush()
+        self.active_sessions.release(session_id)
+        self.job_queue.enqueue("workflow", {
+            "user_request": user_request,
+            "workflow_type": workflow_type
+        }, job_id=session_id)
+        
+        self.logger.info(f"Queued {workflow_type} workflow session: {session_id}")
+        return session_id
+    
+    async def run_job(self, job: Job):
+        """Run a queued workflow job to completion (worker side)."""
+        payload = job.payload
+        session_id = await self.start_workflow_with_type(
+            payload["user_request"],
+            payload.get("workflow_type", "micro_phase"),
+            session_id=job.job_id
+        )
+        task = self._workflow_tasks.get(session_id)
+        if task is not None:
+            await task
+    
     async def get_workflow_status(self, session_id: str) -> Dict[str, Any]:
         """Get the current status of a workflow."""
-        if session_id not in self.active_sessions:
-            return {"error": "Session not found"}
+        if self.job_queue is not None:
+            # A worker process may own the session; read its latest persisted state
+            self.active_sessions.refresh(session_id)
         
-        state = self.active_sessions[session_id]
+        state = await self.active_sessions.get_async(session_id)
+        if state is None:
+            return {"error": "Session not found"}
         
-        return {
+        status = {
             "session_id": session_id,
             "current_phase": state.current_phase.value,
             "created_at": state.created_at,
@@ -197,6 +279,28 @@ class AIOrchestrator:
             "progress": self._calculate_progress(state.current_phase),
             "workflow_type": "gpt_claude_collaborative"
         }
+        if self.job_queue is not None:
+            job = self.job_queue.get(session_id)
+            if job is not None:
+                status["job_status"] = job.status
+                if job.error:
+                    status["job_error"] = job.error
+        return status
+    
+    def _spawn(self, session_id: str, workflow_type: str, workflow):
+        """Run a workflow coroutine as a background task of this process."""
+        task = asyncio.create_task(self._run_traced(session_id, workflow_type, workflow))
+        self._workflow_tasks[session_id] = task
+        task.add_done_callback(lambda _: self._workflow_tasks.pop(session_id, None))
+    
+    async def _run_traced(self, session_id: str, workflow_type: str, workflow):
+        """Run a workflow coroutine as the root span of the session's trace."""
+        try:
+            with get_tracer().trace(session_id, "workflow", workflow_type=workflow_type):
+                await workflow
+        finally:
+            get_process_monitor().log_session_timings(session_id)
+            self.active_sessions.mark_finished(session_id)
     
     async def _execute_workflow_with_engine(self, session_id: str):
         """Execute workflow using the YAML-based workflow engine."""
@@ -218,26 +322,28 @@ class AIOrchestrator:
             }
             
             # Execute workflow using engine
-            final_state = await self.workflow_engine.execute_workflow(initial_state)
+            final_state = await self.workflow_engine.execute_workflow(initial_state, session_id)
             
             # Update our workflow state with results
             self._update_state_from_engine_result(state, final_state)
             
             state.current_phase = WorkflowPhase.COMPLETED
             state.total_execution_time = time.time() - start_time
+            self._publish_status(state, total_execution_time=state.total_execution_time)
             
             workflow_logger.log_workflow_complete(True)
             self.logger.info(f"GPT-Claude collaborative workflow completed successfully: {session_id}")
             
             # Auto-generate project files for successful workflows
             try:
-                self._create_successful_project_structure(session_id, final_state)
+                await self._create_successful_project_structure(session_id, final_state)
             except Exception as creation_error:
                 self.logger.error(f"Failed to auto-generate project files for successful workflow: {creation_error}")
             
         except Exception as e:
             state.current_phase = WorkflowPhase.FAILED
             state.error_count += 1
+            self._publish_status(state, error=str(e))
             workflow_logger.log_workflow_complete(False)
             self.logger.error(f"Workflow failed: {session_id} - {str(e)}")
             self._log_workflow_event(state, "workflow_failed", {
@@ -260,7 +366,7 @@ class AIOrchestrator:
                     'frontend_implementation': getattr(state, 'frontend_implementation', None),
                     'error': str(e)
                 }
-                self._create_failed_project_structure(session_id, available_state)
+                await self._create_failed_project_structure(session_id, available_state)
             except Exception as creation_error:
                 self.logger.error(f"Failed to create project structure for failed workflow: {creation_error}")
     
@@ -291,6 +397,7 @@ class AIOrchestrator:
                                        f"Features: {', '.join(workflow.project_analysis.features)}\\n" + \
                                        f"Tech Stack: {workflow.project_analysis.tech_stack}\\n" + \
                                        f"Complexity: {workflow.project_analysis.estimated_complexity}"
+            self._publish_status(state, workflow_type="adaptive", project_type=workflow.project_analysis.project_type.value)
             
             # Execute adaptive workflow
             final_state = await self.workflow_engine.execute_adaptive_workflow(workflow, session_id)
@@ -300,19 +407,21 @@ class AIOrchestrator:
             
             state.current_phase = WorkflowPhase.COMPLETED
             state.total_execution_time = time.time() - start_time
+            self._publish_status(state, workflow_type="adaptive", total_execution_time=state.total_execution_time)
             
             workflow_logger.log_workflow_complete(True)
             self.logger.info(f"Adaptive workflow completed successfully: {session_id} ({workflow.project_analysis.project_type.value})")
             
             # Auto-generate project files for successful workflows
             try:
-                self._create_adaptive_project_structure(session_id, final_state, workflow)
+                await self._create_adaptive_project_structure(session_id, final_state, workflow)
             except Exception as creation_error:
                 self.logger.error(f"Failed to auto-generate adaptive project files: {creation_error}")
             
         except Exception as e:
             state.current_phase = WorkflowPhase.FAILED
             state.error_count += 1
+            self._publish_status(state, workflow_type="adaptive", error=str(e))
             workflow_logger.log_workflow_complete(False)
             self.logger.error(f"Adaptive workflow failed: {session_id} - {str(e)}")
             self._log_workflow_event(state, "adaptive_workflow_failed", {
@@ -329,7 +438,7 @@ class AIOrchestrator:
                     'error': str(e),
                     'workflow_type': 'adaptive'
                 }
-                self._create_failed_project_structure(session_id, available_state)
+                await self._create_failed_project_structure(session_id, available_state)
             except Exception as creation_error:
                 self.logger.error(f"Failed to create adaptive project structure for failed workflow: {creation_error}")
     
@@ -399,6 +508,30 @@ class AIOrchestrator:
         state.execution_log.append(event)
         self.logger.info(f"Workflow event: {event_type}", extra=event)
     
+    def _publish_status(self, state: WorkflowState, **extra: Any):
+        """Persist the session and push its status to the status hub after a state transition."""
+        self.active_sessions.save(state.session_id)
+        status = {
+            "session_id": state.session_id,
+            "current_phase": state.current_phase.value,
+            "created_at": state.created_at,
+            "error_count": state.error_count,
+            "progress": self._calculate_progress(state.current_phase),
+            "workflow_type": "gpt_claude_collaborative"
+        }
+        status.update(extra)
+        get_status_hub().publish(state.session_id, **status)
+    
+    def _session_summary(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Fields of a session's ``to_dict`` output listed by /api/projects."""
+        user_request = data.get("user_request", "")
+        return {
+            "user_request": user_request[:100] + "..." if len(user_request) > 100 else user_request,
+            "current_phase": data["current_phase"],
+            "progress": self._calculate_progress(WorkflowPhase(data["current_phase"])),
+            "created_at": data.get("created_at")
+        }
+    
     def _calculate_progress(self, current_phase: WorkflowPhase) -> float:
         """Calculate workflow progress percentage based on current phase."""
         phase_weights = {
@@ -422,11 +555,10 @@ class AIOrchestrator:
     
     async def get_session_results(self, session_id: str) -> Dict[str, Any]:
         """Get the complete results of a completed workflow session."""
-        if session_id not in self.active_sessions:
+        state = await self.active_sessions.get_async(session_id)
+        if state is None:
             return {"error": "Session not found"}
         
-        state = self.active_sessions[session_id]
-        
         if state.current_phase != WorkflowPhase.COMPLETED:
             return {"error": "Workflow not completed yet"}
         
@@ -459,9 +591,9 @@ class AIOrchestrator:
             }
         }
     
-    def _create_failed_project_structure(self, session_id: str, final_state: Dict[str, Any]):
+    async def _create_failed_project_structure(self, session_id: str, final_state: Dict[str, Any]):
         """Create basic project structure even for failed workflows."""
-        from ..utils.file_manager import FileOutputManager, GeneratedFile, ProjectStructure
+        from ..utils.file_manager import FileOutputManager, GeneratedFile, ProjectStructure, parse_implementation
         from datetime import datetime
         import os
         
@@ -486,16 +618,19 @@ class AIOrchestrator:
             files = []
             
             # Extract and save any generated implementation code
+            executors = get_executor_manager()
             if workflow_state.get('backend_implementation'):
-                backend_files = file_manager.parser.parse_backend_implementation(
-                    workflow_state['backend_implementation'], session_id
+                backend_files = await executors.run_cpu(
+                    parse_implementation, "backend", workflow_state['backend_implementation'], session_id,
+                    task_name="parse_backend", size_hint=len(workflow_state['backend_implementation'])
                 )
                 files.extend(backend_files)
                 self.logger.info(f"Extracted {len(backend_files)} backend files from failed workflow")
             
             if workflow_state.get('frontend_implementation'):
-                frontend_files = file_manager.parser.parse_frontend_implementation(
-                    workflow_state['frontend_implementation'], session_id
+                frontend_files = await executors.run_cpu(
+                    parse_implementation, "frontend", workflow_state['frontend_implementation'], session_id,
+                    task_name="parse_frontend", size_hint=len(workflow_state['frontend_implementation'])
                 )
                 files.extend(frontend_files)
                 self.logger.info(f"Extracted {len(frontend_files)} frontend files from failed workflow")
@@ -550,13 +685,13 @@ Some files may be missing or incomplete.
             )
             
             # Write to disk
-            output_path = file_manager.write_project_to_disk(project_structure)
+            output_path = await file_manager.write_project_to_disk_async(project_structure)
             self.logger.info(f"Created basic project structure for failed workflow: {output_path}")
             
         except Exception as e:
             self.logger.error(f"Failed to create basic project structure: {str(e)}")
 
-    def _create_successful_project_structure(self, session_id: str, final_state: Dict[str, Any]):
+    async def _create_successful_project_structure(self, session_id: str, final_state: Dict[str, Any]):
         """Automatically create project structure for successful workflows."""
         from ..utils.file_manager import FileOutputManager
         
@@ -584,10 +719,10 @@ Some files may be missing or incomplete.
             
             # Initialize file manager and generate project structure
             file_manager = FileOutputManager()
-            project_structure = file_manager.create_project_structure(workflow_state_dict)
+            project_structure = await file_manager.create_project_structure_async(workflow_state_dict)
             
             # Write files to disk
-            output_path = file_manager.write_project_to_disk(project_structure)
+            output_path = await file_manager.write_project_to_disk_async(project_structure)
             
             self.logger.info(f"Auto-generated project files successfully: {output_path}")
             self.logger.info(f"Project name: {project_structure.name}")
@@ -599,7 +734,7 @@ Some files may be missing or incomplete.
             self.logger.error(f"Failed to auto-generate project structure: {str(e)}")
             raise
 
-    def _create_adaptive_project_structure(self, session_id: str, final_state: Dict[str, Any], workflow):
+    async def _create_adaptive_project_structure(self, session_id: str, final_state: Dict[str, Any], workflow):
         """Automatically create project structure for adaptive workflows."""
         from ..utils.file_manager import FileOutputManager
         
@@ -629,10 +764,10 @@ Some files may be missing or incomplete.
             
             # Initialize file manager and generate project structure
             file_manager = FileOutputManager()
-            project_structure = file_manager.create_project_structure(workflow_state_dict)
+            project_structure = await file_manager.create_project_structure_async(workflow_state_dict)
             
             # Write files to disk
-            output_path = file_manager.write_project_to_disk(project_structure)
+            output_path = await file_manager.write_project_to_disk_async(project_structure)
             
             self.logger.info(f"Auto-generated adaptive project files successfully: {output_path}")
             self.logger.info(f"Project type: {workflow.project_analysis.project_type.value}")
@@ -645,18 +780,19 @@ Some files may be missing or incomplete.
             self.logger.error(f"Failed to auto-generate adaptive project structure: {str(e)}")
             raise
 
-    async def start_micro_phase_workflow(self, user_request: str) -> str:
+    async def start_micro_phase_workflow(self, user_request: str, session_id: Optional[str] = None) -> str:
         """
         Start a new micro-phase workflow using the specialized agent system.
         
         Args:
             user_request: The initial project request from the user
+            session_id: Id to run the session under (generated when omitted)
             
         Returns:
             session_id: Unique identifier for this workflow session
         """
         self.logger.info("Starting micro-phase workflow")
-        session_id = await self.micro_phase_coordinator.start_micro_phase_workflow(user_request)
+        session_id = await self.micro_phase_coordinator.start_micro_phase_workflow(user_request, session_id)
         
         # Track session in our active sessions (for compatibility)
         workflow_state = WorkflowState(
@@ -664,13 +800,17 @@ Some files may be missing or incomplete.
             current_phase=WorkflowPhase.INITIALIZATION,
             user_request=user_request
         )
-        self.active_sessions[session_id] = workflow_state
+        await self.active_sessions.set_async(session_id, workflow_state)
+        # The coordinator has already run the workflow to the end
+        self.active_sessions.mark_finished(session_id)
         
         self.logger.info(f"Started micro-phase workflow session: {session_id}")
         return session_id
     
     async def get_micro_phase_status(self, session_id: str) -> Dict[str, Any]:
         """Get the current status of a micro-phase workflow."""
+        if self.job_queue is not None:
+            self.micro_phase_coordinator.active_workflows.refresh(session_id)
         status = await self.micro_phase_coordinator.get_workflow_status(session_id)
         
         # Add workflow type identifier
@@ -679,34 +819,42 @@ Some files may be missing or incomplete.
         
         return status
     
-    def is_micro_phase_workflow(self, session_id: str) -> bool:
+    async def is_micro_phase_workflow(self, session_id: str) -> bool:
         """Check if a session is using the micro-phase workflow."""
-        return session_id in self.micro_phase_coordinator.active_workflows
+        return await self.micro_phase_coordinator.active_workflows.contains_async(session_id)
     
     async def get_unified_workflow_status(self, session_id: str) -> Dict[str, Any]:
         """Get workflow status regardless of workflow type."""
         # Check if it's a micro-phase workflow first
-        if self.is_micro_phase_workflow(session_id):
+        if await self.is_micro_phase_workflow(session_id):
             return await self.get_micro_phase_status(session_id)
         else:
             # Fall back to legacy workflow status
             return await self.get_workflow_status(session_id)
     
-    async def start_workflow_with_type(self, user_request: str, workflow_type: str = "legacy") -> str:
+    async def start_workflow_with_type(
+        self,
+        user_request: str,
+        workflow_type: str = "legacy",
+        session_id: Optional[str] = None
+    ) -> str:
         """
         Start a workflow with specified type.
         
         Args:
             user_request: The initial project request
-            workflow_type: "legacy" or "micro_phase"
+            workflow_type: "legacy", "adaptive" or "micro_phase"
+            session_id: Id to run the session under (generated when omitted)
             
         Returns:
             session_id: Unique identifier for this workflow session
         """
         if workflow_type == "micro_phase":
-            return await self.start_micro_phase_workflow(user_request)
+            return await self.start_micro_phase_workflow(user_request, session_id)
+        elif workflow_type == "adaptive":
+            return await self.create_adaptive_project(user_request, session_id)
         else:
-            return await self.start_workflow(user_request)
+            return await self.start_workflow(user_request, session_id)
 
     async def cleanup(self):
         """Cleanup resources and active sessions."""
@@ -725,7 +873,8 @@ Some files may be missing or incomplete.
         # Cleanup micro-phase coordinator
         await self.micro_phase_coordinator.cleanup()
         
-        # Clear active sessions
-        self.active_sessions.clear()
+        # Drop in-memory sessions; they stay in the session store
+        await self.active_sessions.close()
+        self.active_sessions.clear_memory()
         
         self.logger.info("AI Orchestrator cleanup completed")
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Orchestration worker process.
+
+Workers claim workflow jobs queued by the web API and run them on their own
+orchestrator, a few at a time. API processes only enqueue and serve status,
+so long runs never compete with request handling and both sides scale
+independently.
+"""
+
+import asyncio
+import os
+import signal
+import socket
+import time
+from typing import Optional, Set
+
+from .config import get_config
+from ..utils.executors import shutdown_executors
+from ..utils.job_queue import Job, JobQueue
+from ..utils.logging_config import get_logger
+from ..utils.loop_monitor import get_loop_monitor
+from ..utils.status_hub import get_status_hub
+
+
+class OrchestrationWorker:
+    """Claims jobs from the job queue and runs them on a local orchestrator."""
+
+    def __init__(
+        self,
+        job_queue: JobQueue,
+        orchestrator,
+        concurrency: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+        poll_interval: float = 1.0,
+        worker_id: Optional[str] = None
+    ):
+        config = get_config()
+        self.job_queue = job_queue
+        self.orchestrator = orchestrator
+        self.concurrency = concurrency or config.worker_concurrency
+        self.lease_seconds = lease_seconds or config.job_lease_seconds
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.logger = get_logger("worker")
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self._tasks: Set[asyncio.Task] = set()
+        self._stopping: Optional[asyncio.Event] = None
+
+    async def run(self):
+        """Claim and run jobs until ``stop`` is called, then wait for running jobs."""
+        self._stopping = asyncio.Event()
+        slots = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+        self.logger.info(f"Worker {self.worker_id} started with concurrency {self.concurrency}")
+
+        def job_done(task: asyncio.Task):
+            self._tasks.discard(task)
+            slots.release()
+
+        while not self._stopping.is_set():
+            await slots.acquire()
+            try:
+                job = await loop.run_in_executor(None, self.job_queue.claim, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                self.logger.error(f"Failed to claim job: {str(e)}")
+                job = None
+            if job is None:
+                slots.release()
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._execute(job))
+            self._tasks.add(task)
+            task.add_done_callback(job_done)
+
+        if self._tasks:
+            self.logger.info(f"Worker {self.worker_id} waiting for {len(self._tasks)} running jobs")
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.logger.info(f"Worker {self.worker_id} stopped")
+
+    def stop(self):
+        """Stop claiming new jobs; running jobs are finished first."""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def _execute(self, job: Job):
+        """Run one job while renewing its lease, then record the outcome."""
+        loop = asyncio.get_running_loop()
+        hub = get_status_hub()
+        hub.publish(job.job_id, job_status="running", attempts=job.attempts)
+        self.logger.info(f"Running job {job.job_id} (attempt {job.attempts})")
+        start_time = time.time()
+
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        error = None
+        try:
+            await self.orchestrator.run_job(job)
+        except Exception as e:
+            error = str(e)
+            self.logger.error(f"Job {job.job_id} failed: {error}")
+        finally:
+            heartbeat.cancel()
+
+        await loop.run_in_executor(None, self.job_queue.complete, job.job_id, self.worker_id, error)
+        if error:
+            self.jobs_failed += 1
+            hub.publish(job.job_id, job_status="failed", job_error=error)
+        else:
+            self.jobs_completed += 1
+            hub.publish(job.job_id, job_status="completed")
+        self.logger.info(f"Job {job.job_id} finished in {time.time() - start_time:.1f}s")
+
+    async def _heartbeat(self, job: Job):
+        """Renew the job's lease at a third of its length."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                owned = await loop.run_in_executor(
+                    None, self.job_queue.heartbeat, job.job_id, self.worker_id, self.lease_seconds
+                )
+            except Exception as e:
+                self.logger.warning(f"Failed to renew lease of job {job.job_id}: {str(e)}")
+                continue
+            if not owned:
+                self.logger.warning(f"Lost the lease of job {job.job_id}; another worker may run it")
+                return
+
+
+async def run_worker(concurrency: Optional[int] = None):
+    """Run a worker with a fresh orchestrator until SIGINT/SIGTERM."""
+    from .orchestrator import AIOrchestrator
+
+    orchestrator = AIOrchestrator()
+    if orchestrator.job_queue is None:
+        raise RuntimeError("JOB_QUEUE_BACKEND is 'inline'; set it to 'sqlite' or 'redis' to run workers")
+
+    worker = OrchestrationWorker(orchestrator.job_queue, orchestrator, concurrency=concurrency)
+    loop_monitor = get_loop_monitor()
+    if get_config().loop_monitor_enabled:
+        loop_monitor.start()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: KeyboardInterrupt ends the worker instead
+
+    try:
+        await worker.run()
+    finally:
+        await loop_monitor.stop()
+        await orchestrator.cleanup()
+        shutdown_executors()
@@ -5,6 +5,7 @@ YAML-based workflow engine for dynamic orchestration configuration.
 import yaml
 import asyncio
 import logging
+import time
 from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass
 from pathlib import Path
@@ -12,6 +13,10 @@ from pathlib import Path
 from ..agents import TaskType, AgentTask, AgentRole
 from .config import get_config
 from ..utils.process_monitor import get_process_monitor
+from ..utils.status_hub import get_status_hub
+from ..utils.logging_config import get_metrics_collector
+from ..utils.tracing import traced
+from ..utils.executors import get_executor_manager
 from .adaptive_workflow import AdaptiveWorkflow, DynamicPhase
 
 
@@ -65,6 +70,81 @@ class WorkflowDefinition:
     monitoring: Dict[str, Any]
 
 
+def check_phase_content(validation: Dict[str, Any], content: str) -> Optional[str]:
+    """
+    Check phase output against a phase's validation rules. Returns the reason
+    of the first failed rule, or None when the output passes. Module-level so
+    large outputs can be checked in the process pool.
+    """
+    content_lower = content.lower()
+    
+    # Check minimum content length
+    if 'min_content_length' in validation:
+        if len(content) < validation['min_content_length']:
+            return f"Content too short: {len(content)} < {validation['min_content_length']}"
+    
+    # Check required elements (flexible matching)
+    for element in validation.get('required_elements', []):
+        # Try multiple formats for flexible matching
+        element_variations = [
+            element,
+            element.upper(),
+            element.replace('_', ' ').title(),
+            element.replace('_', ' ').upper(),
+            f"## {element.upper()}",
+            f"## {element.replace('_', ' ').title()}",
+            f"# {element.upper()}",
+            f"# {element.replace('_', ' ').title()}"
+        ]
+        if not any(variation in content for variation in element_variations):
+            return f"Missing required element: {element} (tried variations: {element_variations[:3]}...)"
+    
+    # Check required sections
+    for section in validation.get('required_sections', []):
+        if section.lower() not in content_lower:
+            return f"Missing required section: {section}"
+    
+    # Check required files (for project structure validation)
+    for file_name in validation.get('required_files', []):
+        # Structured format (===== filename =====) or a simple filename mention
+        if f"===== {file_name} =====" not in content and file_name not in content:
+            return f"Missing required file: {file_name}"
+    
+    # Check required features (for feature implementation validation)
+    for feature in validation.get('required_features', []):
+        if feature.lower() not in content_lower:
+            return f"Missing required feature: {feature}"
+    
+    # Check required components (for frontend validation)
+    for component in validation.get('required_components', []):
+        if component not in content:
+            return f"Missing required component: {component}"
+    
+    # Check required endpoints (for API validation)
+    for endpoint in validation.get('required_endpoints', []):
+        if endpoint not in content:
+            return f"Missing required endpoint: {endpoint}"
+    
+    # Check required operations (for CRUD validation)
+    for operation in validation.get('required_operations', []):
+        if operation.lower() not in content_lower:
+            return f"Missing required operation: {operation}"
+    
+    # Basic code quality: at least 2 code structure indicators
+    if validation.get('code_quality_check', False):
+        quality_indicators = ['class ', 'def ', 'import ', '"""', 'if __name__']
+        if sum(1 for indicator in quality_indicators if indicator in content) < 2:
+            return "Failed code quality check"
+    
+    # Basic integration: at least 3 integration indicators
+    if validation.get('integration_test', False):
+        integration_indicators = ['docker', 'config', 'environment', 'database', 'api', 'cors']
+        if sum(1 for indicator in integration_indicators if indicator in content_lower) < 3:
+            return "Failed integration check"
+    
+    return None
+
+
 class WorkflowEngine:
     """
     Engine for executing YAML-defined workflows with dynamic configuration.
@@ -88,6 +168,8 @@ class WorkflowEngine:
         
         # Process monitoring
         self.process_monitor = get_process_monitor()
+        self.status_hub = get_status_hub()
+        self.metrics = get_metrics_collector()
         self.current_session_id = None
         
         # Condition evaluators
@@ -167,10 +249,12 @@ class WorkflowEngine:
         self.workflow_state = initial_state.copy()
         self.execution_context = {
             'start_time': asyncio.get_event_loop().time(),
+            'started_at': time.time(),
             'current_phase': None,
             'completed_phases': [],
             'failed_phases': [],
-            'parallel_groups': {}
+            'parallel_groups': {},
+            'phase_timings': {}
         }
         
         self.logger.info(f"Starting workflow execution: {self.workflow_def.name}")
@@ -244,10 +328,12 @@ class WorkflowEngine:
         self.workflow_state = {"session_id": session_id, "user_request": workflow.project_analysis.description}
         self.execution_context = {
             'start_time': asyncio.get_event_loop().time(),
+            'started_at': time.time(),
             'current_phase': None,
             'completed_phases': [],
             'failed_phases': [],
-            'parallel_groups': {}
+            'parallel_groups': {},
+            'phase_timings': {}
         }
         
         self.logger.info(f"Starting adaptive workflow execution for {workflow.project_analysis.project_type.value}")
@@ -372,6 +458,7 @@ class WorkflowEngine:
         
         return groups
     
+    @traced("phase", name=lambda self, phase: phase.name, attributes=lambda self, phase: {"agent": phase.agent_type})
     async def _execute_single_dynamic_phase(self, phase: DynamicPhase):
         """Execute a single dynamic workflow phase."""
         self.execution_context['current_phase'] = phase.name
@@ -386,11 +473,14 @@ class WorkflowEngine:
                     "description": phase.description,
                     "agent": phase.agent_type,
                     "task_type": phase.task_type.value,
-                    "estimated_duration": phase.estimated_duration
+                    "estimated_duration": phase.estimated_duration,
+                    "depends_on": phase.depends_on
                 }
             )
+        self._publish_phase_status()
         
         phase_start_time = asyncio.get_event_loop().time()
+        self._start_phase_timing(phase.name, phase.agent_type, phase.depends_on)
         
         try:
             # Prepare inputs for dynamic phase
@@ -425,6 +515,8 @@ class WorkflowEngine:
             self.phase_results[phase.name] = result
             
             phase_duration = asyncio.get_event_loop().time() - phase_start_time
+            self._end_phase_timing(phase.name, success=True)
+            self.metrics.observe("phase_duration", phase_duration, {"phase": phase.name, "success": "true"}, "seconds")
             self.logger.info(f"Dynamic phase completed successfully: {phase.name}")
             
             # Log phase completion
@@ -439,11 +531,14 @@ class WorkflowEngine:
                         "agent_used": phase.agent_type
                     }
                 )
+            self._publish_phase_status()
             
             await asyncio.sleep(0.2)
             
         except Exception as e:
             phase_duration = asyncio.get_event_loop().time() - phase_start_time
+            self._end_phase_timing(phase.name, success=False)
+            self.metrics.observe("phase_duration", phase_duration, {"phase": phase.name, "success": "false"}, "seconds")
             self.logger.error(f"Dynamic phase failed: {phase.name} - {str(e)}")
             self.execution_context['failed_phases'].append(phase.name)
             
@@ -459,6 +554,7 @@ class WorkflowEngine:
                         "agent_used": phase.agent_type
                     }
                 )
+            self._publish_phase_status()
             
             if phase.required:
                 raise
@@ -654,6 +750,35 @@ class WorkflowEngine:
         
         return groups
     
+    def _start_phase_timing(self, name: str, agent: str, depends_on: List[str]):
+        """Record the wall-clock start of a phase for the session profile."""
+        self.execution_context.setdefault('phase_timings', {})[name] = {
+            'start': time.time(),
+            'end': None,
+            'agent': agent,
+            'depends_on': list(depends_on or []),
+            'status': 'running'
+        }
+    
+    def _end_phase_timing(self, name: str, success: bool):
+        """Record the wall-clock end and outcome of a phase."""
+        timing = self.execution_context.get('phase_timings', {}).get(name)
+        if timing is not None:
+            timing['end'] = time.time()
+            timing['status'] = 'completed' if success else 'failed'
+    
+    def _publish_phase_status(self):
+        """Push the engine's phase progress to the status hub."""
+        if not self.current_session_id:
+            return
+        self.status_hub.publish(
+            self.current_session_id,
+            active_phase=self.execution_context.get('current_phase'),
+            completed_phases=list(self.execution_context.get('completed_phases', [])),
+            failed_phases=list(self.execution_context.get('failed_phases', []))
+        )
+    
+    @traced("phase", name=lambda self, phase: phase.name, attributes=lambda self, phase: {"agent": phase.agent})
     async def _execute_single_phase(self, phase: WorkflowPhase):
         """Execute a single workflow phase."""
         self.execution_context['current_phase'] = phase.name
@@ -669,11 +794,14 @@ class WorkflowEngine:
                     "agent": phase.agent,
                     "task_type": phase.task_type,
                     "timeout": phase.timeout,
-                    "parallel": phase.parallel
+                    "parallel": phase.parallel,
+                    "depends_on": phase.depends_on
                 }
             )
+        self._publish_phase_status()
         
         phase_start_time = asyncio.get_event_loop().time()
+        self._start_phase_timing(phase.name, phase.agent, phase.depends_on)
         
         try:
             # Prepare inputs
@@ -702,13 +830,15 @@ class WorkflowEngine:
             self._process_phase_outputs(phase, result)
             
             # Validate results
-            if not self._validate_phase_result(phase, result):
+            if not await self._validate_phase_result(phase, result):
                 raise Exception(f"Phase validation failed: {phase.name}")
             
             self.execution_context['completed_phases'].append(phase.name)
             self.phase_results[phase.name] = result
             
             phase_duration = asyncio.get_event_loop().time() - phase_start_time
+            self._end_phase_timing(phase.name, success=True)
+            self.metrics.observe("phase_duration", phase_duration, {"phase": phase.name, "success": "true"}, "seconds")
             self.logger.info(f"Phase completed successfully: {phase.name}")
             
             # Log phase completion
@@ -723,12 +853,15 @@ class WorkflowEngine:
                         "agent_used": phase.agent
                     }
                 )
+            self._publish_phase_status()
             
             # Reduced delay between phases for faster execution
             await asyncio.sleep(0.2)
             
         except Exception as e:
             phase_duration = asyncio.get_event_loop().time() - phase_start_time
+            self._end_phase_timing(phase.name, success=False)
+            self.metrics.observe("phase_duration", phase_duration, {"phase": phase.name, "success": "false"}, "seconds")
             self.logger.error(f"Phase failed: {phase.name} - {str(e)}")
             self.execution_context['failed_phases'].append(phase.name)
             
@@ -744,6 +877,7 @@ class WorkflowEngine:
                         "agent_used": phase.agent
                     }
                 )
+            self._publish_phase_status()
             
             if phase.required:
                 raise
@@ -819,7 +953,7 @@ class WorkflowEngine:
                 parsed_value = parser(self.workflow_state[output_name])
                 self.workflow_state[output_name] = parsed_value
     
-    def _validate_phase_result(self, phase: WorkflowPhase, result: Any) -> bool:
+    async def _validate_phase_result(self, phase: WorkflowPhase, result: Any) -> bool:
         """Validate phase result based on configuration."""
         if not phase.validation:
             return True
@@ -837,95 +971,14 @@ class WorkflowEngine:
                     found = section.lower() in content.lower()
                     self.logger.info(f"Section '{section}': {'FOUND' if found else 'MISSING'}")
         
-        # Check minimum content length
-        if 'min_content_length' in validation:
-            if len(content) < validation['min_content_length']:
-                self.logger.warning(f"Phase {phase.name} - Content too short: {len(content)} < {validation['min_content_length']}")
-                return False
-        
-        # Check required elements (flexible matching)
-        required_elements = validation.get('required_elements', [])
-        if required_elements:
-            for element in required_elements:
-                # Try multiple formats for flexible matching
-                element_variations = [
-                    element,
-                    element.upper(),
-                    element.replace('_', ' ').title(),
-                    element.replace('_', ' ').upper(),
-                    f"## {element.upper()}",
-                    f"## {element.replace('_', ' ').title()}",
-                    f"# {element.upper()}",
-                    f"# {element.replace('_', ' ').title()}"
-                ]
-                
-                found = any(variation in content for variation in element_variations)
-                if not found:
-                    self.logger.warning(f"Phase {phase.name} - Missing required element: {element} (tried variations: {element_variations[:3]}...)")
-                    return False
-        
-        # Check required sections
-        required_sections = validation.get('required_sections', [])
-        if required_sections:
-            for section in required_sections:
-                if section.lower() not in content.lower():
-                    self.logger.warning(f"Phase {phase.name} - Missing required section: {section}")
-                    return False
-        
-        # Check required files (for project structure validation)
-        required_files = validation.get('required_files', [])
-        if required_files:
-            for file_name in required_files:
-                # Check for structured format: ===== filename =====
-                structured_pattern = f"===== {file_name} ====="
-                # Also check for simple filename mention
-                if structured_pattern not in content and file_name not in content:
-                    self.logger.warning(f"Phase {phase.name} - Missing required file: {file_name}")
-                    return False
-        
-        # Check required features (for feature implementation validation)
-        required_features = validation.get('required_features', [])
-        if required_features:
-            for feature in required_features:
-                if feature.lower() not in content.lower():
-                    self.logger.warning(f"Phase {phase.name} - Missing required feature: {feature}")
-                    return False
-        
-        # Check required components (for frontend validation)
-        required_components = validation.get('required_components', [])
-        if required_components:
-            for component in required_components:
-                if component not in content:
-                    self.logger.warning(f"Phase {phase.name} - Missing required component: {component}")
-                    return False
-        
-        # Check required endpoints (for API validation)
-        required_endpoints = validation.get('required_endpoints', [])
-        if required_endpoints:
-            for endpoint in required_endpoints:
-                if endpoint not in content:
-                    self.logger.warning(f"Phase {phase.name} - Missing required endpoint: {endpoint}")
-                    return False
-        
-        # Check required operations (for CRUD validation)
-        required_operations = validation.get('required_operations', [])
-        if required_operations:
-            for operation in required_operations:
-                if operation.lower() not in content.lower():
-                    self.logger.warning(f"Phase {phase.name} - Missing required operation: {operation}")
-                    return False
-        
-        # Check code quality if specified
-        if validation.get('code_quality_check', False):
-            if not self._basic_code_quality_check(content):
-                self.logger.warning(f"Phase {phase.name} - Failed code quality check")
-                return False
-        
-        # Check integration test if specified
-        if validation.get('integration_test', False):
-            if not self._basic_integration_check(content):
-                self.logger.warning(f"Phase {phase.name} - Failed integration check")
-                return False
+        # Large outputs are scanned in the process pool
+        failure = await get_executor_manager().run_cpu(
+            check_phase_content, validation, content,
+            task_name="validate_phase", size_hint=len(content)
+        )
+        if failure:
+            self.logger.warning(f"Phase {phase.name} - {failure}")
+            return False
         
         return True
     
@@ -1030,47 +1083,3 @@ class WorkflowEngine:
             "models": ["User", "Project"],
             "authentication": "JWT"
         }
-    
-    def _basic_code_quality_check(self, content: str) -> bool:
-        """Basic code quality validation."""
-        try:
-            # Check for basic code structure indicators
-            quality_indicators = [
-                'class ',  # Object-oriented structure
-                'def ',    # Function definitions
-                'import ', # Proper imports
-                '"""',     # Documentation
-                'if __name__' # Proper entry points
-            ]
-            
-            found_indicators = sum(1 for indicator in quality_indicators if indicator in content)
-            
-            # Require at least 2 quality indicators for basic validation
-            return found_indicators >= 2
-            
-        except Exception as e:
-            self.logger.warning(f"Code quality check failed: {str(e)}")
-            return False
-    
-    def _basic_integration_check(self, content: str) -> bool:
-        """Basic integration validation."""
-        try:
-            # Check for integration-related components
-            integration_indicators = [
-                'docker',      # Containerization
-                'config',      # Configuration
-                'environment', # Environment setup
-                'database',    # Database integration
-                'api',         # API integration
-                'cors'         # Cross-origin setup
-            ]
-            
-            found_indicators = sum(1 for indicator in integration_indicators 
-                                 if indicator.lower() in content.lower())
-            
-            # Require at least 3 integration indicators
-            return found_indicators >= 3
-            
-        except Exception as e:
-            self.logger.warning(f"Integration check failed: {str(e)}")
-            return False
\ No newline at end of file
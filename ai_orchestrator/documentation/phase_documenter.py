@@ -14,6 +14,14 @@ from enum import Enum
 import yaml
 
 from ..agents.base_agent import MicroPhase
+from ..utils.process_monitor import get_process_monitor
+from ..utils.executors import estimate_size, get_executor_manager
+
+
+def _load_yaml_file(path: str) -> Any:
+    """Read and parse a YAML file. Module-level so it can run in the process pool."""
+    with open(path, 'r') as f:
+        return yaml.safe_load(f)
 
 
 class DocumentationType(str, Enum):
@@ -501,9 +509,11 @@ class PhaseDocumenter:
         plan_file = self.doc_dirs["plans"] / f"{session_id}_architecture_plan.yaml"
         
         if plan_file.exists():
-            with open(plan_file, 'r') as f:
-                plan_data = yaml.safe_load(f)
-                return ArchitecturePlan(**plan_data)
+            plan_data = await get_executor_manager().run_cpu(
+                _load_yaml_file, str(plan_file),
+                task_name="load_architecture_plan", size_hint=plan_file.stat().st_size
+            )
+            return ArchitecturePlan(**plan_data)
         
         return None
     
@@ -626,6 +636,13 @@ class PhaseDocumenter:
     
     async def _save_phase_documentation(self, phase_doc: PhaseDocumentation):
         """Save phase documentation to disk."""
+        with get_process_monitor().track_time("docs_io", phase_doc.session_id):
+            await get_executor_manager().run_io(
+                self._write_phase_documentation, phase_doc, task_name="save_phase_documentation"
+            )
+    
+    def _write_phase_documentation(self, phase_doc: PhaseDocumentation):
+        """Write phase documentation and its generated files. Blocking; runs on the I/O pool."""
         # Save as JSON
         doc_file = self.doc_dirs["phases"] / f"{phase_doc.session_id}_{phase_doc.phase_type}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
         
@@ -645,9 +662,16 @@ class PhaseDocumenter:
     async def _save_architecture_plan(self, arch_plan: ArchitecturePlan):
         """Save architecture plan file."""
         plan_file = self.doc_dirs["plans"] / f"{arch_plan.session_id}_architecture_plan.yaml"
+        executors = get_executor_manager()
+        plan_data = asdict(arch_plan)
         
-        with open(plan_file, 'w') as f:
-            yaml.dump(asdict(arch_plan), f, default_flow_style=False)
+        # Render in the process pool, write on the I/O pool
+        plan_text = await executors.run_cpu(
+            yaml.dump, plan_data, default_flow_style=False,
+            task_name="dump_architecture_plan", size_hint=estimate_size(plan_data)
+        )
+        with get_process_monitor().track_time("docs_io", arch_plan.session_id):
+            await executors.run_io(plan_file.write_text, plan_text, task_name="save_architecture_plan")
         
         self.logger.info(f"Architecture plan saved: {plan_file}")
     
@@ -718,8 +742,8 @@ class PhaseDocumenter:
                 for filename in doc.generated_files.keys():
                     summary_content += f"- {filename}\n"
         
-        with open(summary_file, 'w') as f:
-            f.write(summary_content)
+        with get_process_monitor().track_time("docs_io", session_id):
+            await get_executor_manager().run_io(summary_file.write_text, summary_content, task_name="save_project_summary")
     
     async def _load_session_documentation(self, session_id: str):
         """Load session documentation from disk."""
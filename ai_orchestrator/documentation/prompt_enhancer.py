@@ -9,6 +9,12 @@ from typing import Dict, List, Optional, Any
 import yaml
 
 from .phase_documenter import PhaseDocumenter, ArchitecturePlan, PhaseDocumentation
+from ..utils.executors import estimate_size, get_executor_manager
+
+
+def dump_yaml_sections(sections: Dict[str, Any]) -> Dict[str, str]:
+    """Render each section as block-style YAML. Module-level so it can run in the process pool."""
+    return {name: yaml.dump(value, default_flow_style=False) for name, value in sections.items()}
 
 
 class PromptEnhancer:
@@ -24,6 +30,13 @@ class PromptEnhancer:
         self.phase_documenter = phase_documenter
         self.logger = logging.getLogger("prompt_enhancer")
     
+    async def _render_yaml(self, sections: Dict[str, Any]) -> Dict[str, str]:
+        """Render prompt sections as YAML off the event loop, in one executor call."""
+        return await get_executor_manager().run_cpu(
+            dump_yaml_sections, sections,
+            task_name="render_prompt_yaml", size_hint=estimate_size(sections)
+        )
+    
     async def enhance_architecture_prompt(self, base_prompt: str, session_id: str,
                                         unified_features: str) -> str:
         """Enhance architecture design prompt with brainstorming context."""
@@ -130,18 +143,24 @@ Use clear sections and structured data where possible.
 """
         
         if arch_plan:
+            blocks = await self._render_yaml({
+                "technology_stack": arch_plan.technology_stack,
+                "components": arch_plan.components,
+                "project_structure": arch_plan.project_structure,
+                "development_phases": arch_plan.development_phases
+            })
             enhanced_prompt += f"""
 **Technology Stack:**
-{yaml.dump(arch_plan.technology_stack, default_flow_style=False)}
+{blocks['technology_stack']}
 
 **Components:**
-{yaml.dump(arch_plan.components, default_flow_style=False)}
+{blocks['components']}
 
 **Project Structure:**
-{yaml.dump(arch_plan.project_structure, default_flow_style=False)}
+{blocks['project_structure']}
 
 **Development Phases:**
-{yaml.dump(arch_plan.development_phases, default_flow_style=False)}
+{blocks['development_phases']}
 """
         
         enhanced_prompt += """
@@ -224,18 +243,24 @@ Provide structured micro-phase definitions that can be used to create detailed i
 """
         
         if arch_plan:
+            blocks = await self._render_yaml({
+                "technology_stack": arch_plan.technology_stack,
+                "coding_standards": arch_plan.coding_standards,
+                "project_structure": arch_plan.project_structure,
+                "testing_strategy": arch_plan.testing_strategy
+            })
             enhanced_prompt += f"""
 ### Technology Stack
-{yaml.dump(arch_plan.technology_stack, default_flow_style=False)}
+{blocks['technology_stack']}
 
 ### Coding Standards
-{yaml.dump(arch_plan.coding_standards, default_flow_style=False)}
+{blocks['coding_standards']}
 
 ### Project Structure
-{yaml.dump(arch_plan.project_structure, default_flow_style=False)}
+{blocks['project_structure']}
 
 ### Testing Strategy
-{yaml.dump(arch_plan.testing_strategy, default_flow_style=False)}
+{blocks['testing_strategy']}
 """
         
         enhanced_prompt += """
@@ -244,15 +269,20 @@ Provide structured micro-phase definitions that can be used to create detailed i
 """
         
         if implementation_guide:
+            blocks = await self._render_yaml({
+                "files_to_create": implementation_guide.get('files_to_create', []),
+                "tests_to_write": implementation_guide.get('tests_to_write', []),
+                "integration_points": implementation_guide.get('integration_points', [])
+            })
             enhanced_prompt += f"""
 ### Files to Create
-{yaml.dump(implementation_guide.get('files_to_create', []), default_flow_style=False)}
+{blocks['files_to_create']}
 
 ### Tests to Write
-{yaml.dump(implementation_guide.get('tests_to_write', []), default_flow_style=False)}
+{blocks['tests_to_write']}
 
 ### Integration Points
-{yaml.dump(implementation_guide.get('integration_points', []), default_flow_style=False)}
+{blocks['integration_points']}
 
 ### Estimated Duration
 {implementation_guide.get('estimated_duration', 'Not specified')}
@@ -363,9 +393,13 @@ Structure your response with:
 """
         
         if arch_plan:
+            blocks = await self._render_yaml({
+                "coding_standards": arch_plan.coding_standards,
+                "testing_strategy": arch_plan.testing_strategy
+            })
             enhanced_prompt += f"""
 ### Coding Standards
-{yaml.dump(arch_plan.coding_standards, default_flow_style=False)}
+{blocks['coding_standards']}
 
 ### Quality Requirements
 **Performance**: {', '.join(arch_plan.performance_requirements)}
@@ -373,7 +407,7 @@ Structure your response with:
 **Scalability**: {', '.join(arch_plan.scalability_considerations)}
 
 ### Testing Strategy
-{yaml.dump(arch_plan.testing_strategy, default_flow_style=False)}
+{blocks['testing_strategy']}
 """
         
         enhanced_prompt += """
@@ -481,15 +515,19 @@ For each acceptance criteria:
 """
         
         if arch_plan:
+            blocks = await self._render_yaml({
+                "technology_stack": arch_plan.technology_stack,
+                "deployment_plan": arch_plan.deployment_plan
+            })
             enhanced_prompt += f"""
 ### System Overview
 {arch_plan.system_overview}
 
 ### Technology Stack
-{yaml.dump(arch_plan.technology_stack, default_flow_style=False)}
+{blocks['technology_stack']}
 
 ### Deployment Plan
-{yaml.dump(arch_plan.deployment_plan, default_flow_style=False)}
+{blocks['deployment_plan']}
 """
         
         enhanced_prompt += """
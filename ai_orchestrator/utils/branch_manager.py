@@ -4,13 +4,26 @@ Handles complex branching strategies, merge conflicts, and Git operations.
 """
 
 import asyncio
+import fnmatch
 import logging
-from typing import Dict, List, Optional, Any, Set, Tuple
+import os
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import re
 
-from .enhanced_github_client import EnhancedGitHubClient, MergeMethod
+from .conflict_analyzer import OURS, THEIRS, analyze_merge
+from .enhanced_github_client import EnhancedGitHubClient, MergeMethod, RequestStats
+from .executors import get_executor_manager
+from .git_mirror import GitMirror, GitMirrorError
+from .github_scheduler import BULK, github_priority
+from .logging_config import get_metrics_collector
+from .merge_queue import MergeQueue, PreviewValidator
+from ..core.config import get_config
+
+if TYPE_CHECKING:
+    from ..cache.cache_manager import CacheManager
 
 
 class BranchType(str, Enum):
@@ -76,9 +89,10 @@ class BranchManager:
     and complex Git operations across the development lifecycle.
     """
     
-    def __init__(self, github_client: EnhancedGitHubClient):
+    def __init__(self, github_client: EnhancedGitHubClient, cache_manager: Optional["CacheManager"] = None):
         """Initialize branch manager."""
         self.github_client = github_client
+        self.cache_manager = cache_manager
         self.logger = logging.getLogger("branch_manager")
         
         # Default branch rules
@@ -87,6 +101,30 @@ class BranchManager:
         # Track branch relationships
         self.branch_dependencies: Dict[str, List[str]] = {}
         self.merge_queue: List[str] = []
+        
+        # Merge queue verdicts ("clean"/"conflict") per (head SHA, base SHA)
+        self.merge_verdicts: Dict[Tuple[str, str], str] = {}
+        
+        # Local file state for conflict analysis: the micro-phases each branch
+        # carries, the integration files it was cut from, branch contents
+        # after a resolution, and the files of each integration branch
+        self.branch_phases: Dict[str, List[str]] = {}
+        self.branch_bases: Dict[str, Dict[str, str]] = {}
+        self.branch_files: Dict[str, Dict[str, str]] = {}
+        self.integration_files: Dict[str, Dict[str, str]] = {}
+        
+        # Branch metadata per repository and branch name, reused between runs
+        # while the branch head and its target do not move
+        self.branch_metadata: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._mirrors: Dict[str, GitMirror] = {}
+        
+        # Strategy used when the merge queue hits a conflict
+        self.conflict_resolution = ConflictResolution(
+            strategy="auto",
+            auto_resolve_patterns=["*.md", "*.txt", "*.lock", "docs/*", ".gitignore", "package-lock.json"],
+            manual_review_patterns=[],
+            escalation_contacts=[]
+        )
     
     def _setup_default_branch_rules(self) -> List[BranchRule]:
         """Set up default branch management rules."""
@@ -157,6 +195,8 @@ class BranchManager:
         dependencies = phase_info.get("dependencies", [])
         if dependencies:
             self.branch_dependencies[branch_name] = dependencies
+        if phase_info.get("id"):
+            self.track_phase_branch(branch_name, phase_info["id"], base_branch)
         
         # Apply branch rules
         await self._apply_branch_rules(repo_name, branch_name)
@@ -169,64 +209,57 @@ class BranchManager:
             "url": f"https://github.com/{await self._get_repo_owner(repo_name)}/{repo_name}/tree/{branch_name}"
         }
     
-    async def manage_merge_queue(self, repo_name: str, target_branch: str) -> Dict[str, Any]:
+    async def manage_merge_queue(self, repo_name: str, target_branch: str,
+                                 validate: Optional[PreviewValidator] = None) -> Dict[str, Any]:
         """
         Manage automated merge queue for validated micro-phases.
         
-        Handles dependency ordering, conflict resolution, and batch merging.
+        Independent branches land together in batches, dependent ones after
+        their dependencies; ``validate`` checks each batch preview (e.g. CI on
+        its commit) and failing batches are bisected. See ``MergeQueue``.
         """
         self.logger.info(f"Managing merge queue for {repo_name}:{target_branch}")
         
         # Get all ready-to-merge branches
         ready_branches = await self._get_ready_to_merge_branches(repo_name, target_branch)
         
-        # Sort by dependencies and priority
-        ordered_branches = self._order_branches_by_dependencies(ready_branches)
+        async def resolve(branch_name: str, conflicts: List[Dict[str, Any]]) -> Dict[str, Any]:
+            return await self._resolve_conflicts_automatically(repo_name, branch_name, target_branch, conflicts)
         
-        merge_results = []
+        # Conflicts visible in the local file state are handled before anything is pushed
+        local_checks = await asyncio.gather(*(
+            self._check_merge_conflicts(repo_name, branch["name"], target_branch) for branch in ready_branches
+        ))
+        held = {}
+        for branch, conflicts in zip(ready_branches, local_checks):
+            if conflicts:
+                resolution = await resolve(branch["name"], conflicts)
+                if not resolution.get("resolved"):
+                    held[branch["name"]] = {"branch": branch["name"], "status": "conflicts_require_manual_review",
+                                            "target_branch": target_branch, "conflicts": conflicts}
         
-        for branch_info in ordered_branches:
-            branch_name = branch_info["name"]
-            
-            try:
-                # Check for conflicts
-                conflicts = await self._check_merge_conflicts(repo_name, branch_name, target_branch)
-                
-                if conflicts:
-                    # Attempt automatic resolution
-                    resolution_result = await self._resolve_conflicts_automatically(
-                        repo_name, branch_name, target_branch, conflicts
-                    )
-                    
-                    if not resolution_result["resolved"]:
-                        # Add to manual review queue
-                        merge_results.append({
-                            "branch": branch_name,
-                            "status": "conflicts_require_manual_review",
-                            "conflicts": conflicts
-                        })
-                        continue
-                
-                # Attempt merge
-                merge_result = await self._execute_merge(repo_name, branch_info, target_branch)
-                merge_results.append(merge_result)
-                
-                # Remove from dependencies for subsequent branches
-                self._update_dependencies_after_merge(branch_name)
-                
-            except Exception as e:
-                self.logger.error(f"Failed to merge {branch_name}: {str(e)}")
-                merge_results.append({
-                    "branch": branch_name,
-                    "status": "failed",
-                    "error": str(e)
-                })
+        config = get_config()
+        queue = MergeQueue(
+            self.github_client, repo_name, target_branch,
+            verdicts=self.merge_verdicts,
+            max_batch=config.merge_queue_max_batch,
+            concurrency=config.merge_queue_concurrency,
+            validate=validate,
+            resolve_conflicts=resolve
+        )
+        merge_results = await queue.drain(ready_branches, self.branch_dependencies, held) if ready_branches else []
+        
+        for result in merge_results:
+            if result["status"] == "merged":
+                self.branch_dependencies.pop(result["branch"], None)
+                await self._record_merge(result["branch"], target_branch)
         
         return {
             "target_branch": target_branch,
             "processed_branches": len(merge_results),
             "successful_merges": len([r for r in merge_results if r.get("status") == "merged"]),
             "conflicts": len([r for r in merge_results if "conflicts" in r]),
+            "batches": queue.stats["batches"],
             "results": merge_results
         }
     
@@ -274,6 +307,12 @@ class BranchManager:
         # Check if all conflicts resolved
         unresolved = [r for r in resolution_results if r["status"] != "resolved"]
         
+        # A complete resolution is pushed to the branch as a single merge commit
+        commit_sha = None
+        if conflicts and not unresolved:
+            favors = {r["file"]: r["favor"] for r in resolution_results}
+            commit_sha = await self._commit_resolution(repo_name, branch_name, target_branch, favors)
+        
         return {
             "branch": branch_name,
             "target_branch": target_branch,
@@ -281,65 +320,70 @@ class BranchManager:
             "resolved_conflicts": len(conflicts) - len(unresolved),
             "unresolved_conflicts": len(unresolved),
             "resolution_details": resolution_results,
-            "fully_resolved": len(unresolved) == 0
+            "fully_resolved": len(unresolved) == 0,
+            "commit_sha": commit_sha
         }
     
+    def track_phase_branch(self, branch_name: str, phase_ids: List[str], base_branch: str = "develop"):
+        """Remember the micro-phases a branch carries and the integration files it starts from."""
+        self.branch_phases[branch_name] = list(phase_ids)
+        self.branch_bases[branch_name] = dict(self.integration_files.get(base_branch, {}))
+        self.branch_files.pop(branch_name, None)
+    
     async def cleanup_stale_branches(self, repo_name: str) -> Dict[str, Any]:
         """
         Clean up stale branches based on age and merge status.
+        
+        Stale branches that are merged and have no open pull request are
+        deleted together: in one ``git push`` with the ``git`` publish
+        backend, else with bounded concurrent ref deletions. Only branches
+        a rule gives a max age are considered, unless
+        BRANCH_CLEANUP_WITHOUT_RULE is set.
         """
         self.logger.info(f"Cleaning up stale branches for {repo_name}")
         
-        branches = await self._get_all_branches_with_metadata(repo_name)
-        stale_branches = []
-        cleanup_results = []
-        
-        for branch in branches:
-            branch_name = branch["name"]
-            
-            # Skip protected branches
-            if branch_name in ["main", "develop"]:
-                continue
-            
-            # Check if branch is stale
-            is_stale = await self._is_branch_stale(branch)
+        # Stale branch cleanup is bulk work and must not starve interactive calls
+        with github_priority(BULK):
+            branches, repository = await asyncio.gather(
+                self._get_all_branches_with_metadata(repo_name),
+                self.github_client.get_repository_info(repo_name)
+            )
+            stale_branches = []
+            cleanup_results = []
+            deletable = []
             
-            if is_stale:
-                stale_branches.append(branch_name)
+            for branch in branches:
+                branch_name = branch["name"]
                 
-                try:
-                    # Check if safe to delete
-                    safe_to_delete = await self._is_safe_to_delete(repo_name, branch_name)
+                # Skip integration branches and the repository's default branch
+                if branch_name in ["main", "develop", repository["default_branch"]]:
+                    continue
+                
+                # Check if branch is stale
+                is_stale = await self._is_branch_stale(branch)
+                
+                if is_stale:
+                    stale_branches.append(branch_name)
                     
-                    if safe_to_delete:
-                        # Delete the branch
-                        await self._delete_branch(repo_name, branch_name)
-                        cleanup_results.append({
-                            "branch": branch_name,
-                            "status": "deleted",
-                            "reason": "stale_and_merged"
-                        })
+                    # Check if safe to delete
+                    if await self._is_safe_to_delete(repo_name, branch):
+                        deletable.append(branch_name)
                     else:
                         cleanup_results.append({
                             "branch": branch_name,
                             "status": "kept",
                             "reason": "not_safe_to_delete"
                         })
-                
-                except Exception as e:
-                    cleanup_results.append({
-                        "branch": branch_name,
-                        "status": "error",
-                        "error": str(e)
-                    })
-        
-        return {
-            "repository": repo_name,
-            "total_branches_checked": len(branches),
-            "stale_branches_found": len(stale_branches),
-            "branches_deleted": len([r for r in cleanup_results if r["status"] == "deleted"]),
-            "cleanup_results": cleanup_results
-        }
+            
+            cleanup_results.extend(await self._delete_branches(repo_name, deletable))
+            
+            return {
+                "repository": repo_name,
+                "total_branches_checked": len(branches),
+                "stale_branches_found": len(stale_branches),
+                "branches_deleted": len([r for r in cleanup_results if r["status"] == "deleted"]),
+                "cleanup_results": cleanup_results
+            }
     
     async def get_branch_analytics(self, repo_name: str) -> Dict[str, Any]:
         """
@@ -409,15 +453,12 @@ class BranchManager:
         owner = await self._get_repo_owner(repo_name)
         url = f"{self.github_client.base_url}/repos/{owner}/{repo_name}/branches"
         
-        response = await self.github_client._make_request("GET", url)
+        response = await self.github_client.list_all(url)
         return [branch["name"] for branch in response]
     
     async def _get_repo_owner(self, repo_name: str) -> str:
         """Get repository owner."""
-        if self.github_client.org:
-            return self.github_client.org
-        else:
-            return await self.github_client._get_authenticated_user_login()
+        return await self.github_client.get_repo_owner()
     
     async def _apply_branch_rules(self, repo_name: str, branch_name: str):
         """Apply branch rules based on branch pattern matching."""
@@ -439,116 +480,300 @@ class BranchManager:
             return branch_name == pattern
     
     async def _get_ready_to_merge_branches(self, repo_name: str, target_branch: str) -> List[Dict[str, Any]]:
-        """Get branches that are ready to merge."""
-        # This would implement actual logic to check PR status, CI status, etc.
-        # For now, return empty list as placeholder
-        return []
-    
-    def _order_branches_by_dependencies(self, branches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Order branches based on their dependencies."""
-        # Implement topological sort based on dependencies
-        ordered = []
-        remaining = branches.copy()
-        
-        while remaining:
-            # Find branches with no unresolved dependencies
-            ready = []
-            for branch in remaining:
-                branch_name = branch["name"]
-                dependencies = self.branch_dependencies.get(branch_name, [])
-                
-                # Check if all dependencies are already merged
-                unresolved_deps = [dep for dep in dependencies 
-                                 if not self._is_dependency_resolved(dep, ordered)]
-                
-                if not unresolved_deps:
-                    ready.append(branch)
-            
-            if not ready:
-                # Circular dependency or unresolvable dependencies
-                # Add remaining branches anyway to avoid infinite loop
-                ordered.extend(remaining)
-                break
-            
-            # Add ready branches to ordered list
-            ordered.extend(ready)
-            
-            # Remove from remaining
-            for branch in ready:
-                remaining.remove(branch)
+        """
+        Get branches that are ready to merge: the head branches of open pull
+        requests into ``target_branch`` whose statuses and check runs passed
+        and whose latest reviews approve them with no changes requested.
+        """
+        owner = await self._get_repo_owner(repo_name)
+        base_url = f"{self.github_client.base_url}/repos/{owner}/{repo_name}"
+        pulls = await self.github_client.list_all(f"{base_url}/pulls", params={"state": "open", "base": target_branch})
+        semaphore = asyncio.Semaphore(get_config().branch_metadata_concurrency)
         
-        return ordered
-    
-    def _is_dependency_resolved(self, dependency: str, merged_branches: List[Dict[str, Any]]) -> bool:
-        """Check if a dependency has been resolved (merged)."""
-        for branch in merged_branches:
-            if dependency in branch.get("name", ""):
-                return True
-        return False
+        async def ready(pull: Dict[str, Any]) -> bool:
+            sha = pull["head"]["sha"]
+            async with semaphore:
+                status, checks, reviews = await asyncio.gather(
+                    self.github_client._make_request("GET", f"{base_url}/commits/{sha}/status"),
+                    self.github_client._make_request("GET", f"{base_url}/commits/{sha}/check-runs"),
+                    self.github_client.list_all(f"{base_url}/pulls/{pull['number']}/reviews")
+                )
+            ci_green = (status["state"] == "success" or not status.get("total_count")) and all(
+                run["status"] == "completed" and run["conclusion"] in ("success", "neutral", "skipped")
+                for run in checks.get("check_runs", [])
+            )
+            # Reviews are listed oldest first; a reviewer's latest verdict counts
+            verdicts = {}
+            for review in reviews:
+                if review["state"] in ("APPROVED", "CHANGES_REQUESTED", "DISMISSED"):
+                    verdicts[review["user"]["login"]] = review["state"]
+            approved = "APPROVED" in verdicts.values() and "CHANGES_REQUESTED" not in verdicts.values()
+            return ci_green and approved
+        
+        checks = await asyncio.gather(*(ready(pull) for pull in pulls))
+        return [
+            {"name": pull["head"]["ref"], "head_sha": pull["head"]["sha"], "pull_request_number": pull["number"]}
+            for pull, is_ready in zip(pulls, checks) if is_ready
+        ]
     
     async def _check_merge_conflicts(self, repo_name: str, source_branch: str, target_branch: str) -> List[Dict[str, Any]]:
-        """Check for merge conflicts between branches."""
-        # This would implement actual conflict detection
-        # For now, return empty list as placeholder
-        return []
+        """
+        Check for merge conflicts between branches, locally. Branches whose
+        contents are unknown report none and are left to the merge API.
+        """
+        conflicts = await self._get_detailed_conflicts(repo_name, source_branch, target_branch)
+        return [{"file": c["file"], "type": c["type"], "hunks": len(c["hunks"])} for c in conflicts]
     
     async def _resolve_conflicts_automatically(self, repo_name: str, source_branch: str, 
                                              target_branch: str, conflicts: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Attempt automatic conflict resolution."""
-        # This would implement automatic conflict resolution strategies
-        return {"resolved": False, "details": "Auto-resolution not implemented"}
-    
-    async def _execute_merge(self, repo_name: str, branch_info: Dict[str, Any], target_branch: str) -> Dict[str, Any]:
-        """Execute merge operation."""
-        # This would implement the actual merge logic
-        return {
-            "branch": branch_info["name"],
-            "status": "merged",
-            "target_branch": target_branch
-        }
-    
-    def _update_dependencies_after_merge(self, merged_branch: str):
-        """Update dependency tracking after successful merge."""
-        # Remove the merged branch from dependency lists
-        for branch_name, deps in self.branch_dependencies.items():
-            if merged_branch in deps:
-                deps.remove(merged_branch)
+        """Attempt automatic conflict resolution with ``self.conflict_resolution``."""
+        if await self._local_files(source_branch) is None:
+            return {"resolved": False, "details": "Branch contents are not known locally"}
+        
+        resolution = await self.handle_conflict_resolution(repo_name, source_branch, target_branch,
+                                                           self.conflict_resolution)
+        return {"resolved": resolution["commit_sha"] is not None, "details": resolution}
     
     async def _get_detailed_conflicts(self, repo_name: str, source_branch: str, target_branch: str) -> List[Dict[str, Any]]:
-        """Get detailed conflict information."""
-        # Placeholder implementation
-        return []
+        """Get detailed conflict information from a local three-way merge."""
+        analysis = await self._analyze_merge(source_branch, target_branch)
+        return analysis["conflicts"] if analysis else []
     
     async def _try_automatic_resolution(self, conflict: Dict[str, Any], 
                                        strategy: ConflictResolution) -> Dict[str, Any]:
-        """Try automatic conflict resolution."""
-        # Placeholder implementation
-        return {"file": conflict["file"], "status": "manual_review_required"}
+        """Resolve files matching the auto-resolve patterns with the micro-phase's version."""
+        file_path = conflict["file"]
+        if any(fnmatch.fnmatch(file_path, pattern) for pattern in strategy.manual_review_patterns):
+            return {"file": file_path, "status": "manual_review_required", "reason": "manual_review_pattern"}
+        if any(fnmatch.fnmatch(file_path, pattern) for pattern in strategy.auto_resolve_patterns):
+            return {"file": file_path, "status": "resolved", "method": "auto", "favor": OURS}
+        return {"file": file_path, "status": "manual_review_required", "conflict_type": conflict["type"]}
     
     async def _resolve_prefer_ours(self, repo_name: str, branch_name: str, file_path: str) -> Dict[str, Any]:
         """Resolve conflict by preferring our version."""
-        # Placeholder implementation
-        return {"file": file_path, "status": "resolved", "method": "prefer_ours"}
+        return {"file": file_path, "status": "resolved", "method": "prefer_ours", "favor": OURS}
     
     async def _resolve_prefer_theirs(self, repo_name: str, target_branch: str, file_path: str) -> Dict[str, Any]:
         """Resolve conflict by preferring their version."""
-        # Placeholder implementation
-        return {"file": file_path, "status": "resolved", "method": "prefer_theirs"}
+        return {"file": file_path, "status": "resolved", "method": "prefer_theirs", "favor": THEIRS}
+    
+    async def _local_files(self, branch_name: str) -> Optional[Dict[str, str]]:
+        """Files of a branch from the local state: its base plus the output of its phases; None if unknown."""
+        if branch_name in self.branch_files:
+            return self.branch_files[branch_name]
+        if branch_name not in self.branch_phases or self.cache_manager is None:
+            return None
+        files = dict(self.branch_bases.get(branch_name, {}))
+        for phase_id in self.branch_phases[branch_name]:
+            phase_files = await self.cache_manager.get_phase_files(phase_id)
+            if not phase_files:
+                return None
+            files.update(phase_files)
+        return files
+    
+    async def _analyze_merge(self, source_branch: str, target_branch: str,
+                             favor: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """Three-way merge of a branch into an integration branch on the CPU pool; None if contents are unknown."""
+        ours = await self._local_files(source_branch)
+        if ours is None:
+            return None
+        base = self.branch_bases.get(source_branch, {})
+        theirs = self.integration_files.get(target_branch, {})
+        size = sum(len(content) for files in (base, ours, theirs) for content in files.values())
+        return await get_executor_manager().run_cpu(
+            analyze_merge, base, ours, theirs, favor, task_name="merge_analysis", size_hint=size
+        )
+    
+    async def _record_merge(self, source_branch: str, target_branch: str):
+        """Apply a landed branch to the local files of the integration branch."""
+        analysis = await self._analyze_merge(source_branch, target_branch)
+        if analysis is None:
+            return
+        files = {**self.integration_files.get(target_branch, {}), **analysis["merged_files"]}
+        self.integration_files[target_branch] = {path: content for path, content in files.items() if content is not None}
+    
+    async def _commit_resolution(self, repo_name: str, branch_name: str, target_branch: str,
+                                 favors: Dict[str, str]) -> Optional[str]:
+        """
+        Merge the target into the branch with the resolved files, as one
+        merge commit on top of both heads. Returns the commit SHA.
+        """
+        analysis = await self._analyze_merge(branch_name, target_branch, favors)
+        if analysis is None:
+            return None
+        merged_files = analysis["merged_files"]
+        
+        owner = await self._get_repo_owner(repo_name)
+        base_url = f"{self.github_client.base_url}/repos/{owner}/{repo_name}"
+        branch_data, target_data = await asyncio.gather(
+            self.github_client._make_request("GET", f"{base_url}/branches/{branch_name}"),
+            self.github_client._make_request("GET", f"{base_url}/branches/{target_branch}")
+        )
+        tree_items = await self.github_client._build_tree_items(
+            base_url, {path: content for path, content in merged_files.items() if content is not None}, RequestStats()
+        )
+        tree_items += [{"path": path, "mode": "100644", "type": "blob", "sha": None}
+                       for path, content in merged_files.items() if content is None]
+        tree = await self.github_client._make_request("POST", f"{base_url}/git/trees", data={
+            "base_tree": target_data["commit"]["commit"]["tree"]["sha"],
+            "tree": tree_items
+        })
+        commit = await self.github_client._make_request("POST", f"{base_url}/git/commits", data={
+            "message": f"Merge {target_branch} into {branch_name}\n\nResolved: {', '.join(sorted(favors))}",
+            "tree": tree["sha"],
+            "parents": [branch_data["commit"]["sha"], target_data["commit"]["sha"]]
+        })
+        await self.github_client._make_request("PATCH", f"{base_url}/git/refs/heads/{branch_name}",
+                                               data={"sha": commit["sha"]})
+        
+        # The branch now contains the target: it merges cleanly into it from here on
+        theirs = self.integration_files.get(target_branch, {})
+        files = {**theirs, **merged_files}
+        self.branch_files[branch_name] = {path: content for path, content in files.items() if content is not None}
+        self.branch_bases[branch_name] = dict(theirs)
+        self.logger.info(f"Resolved {len(favors)} conflict(s) of {branch_name} with {target_branch} locally")
+        return commit["sha"]
     
     async def _get_all_branches_with_metadata(self, repo_name: str) -> List[Dict[str, Any]]:
-        """Get all branches with metadata."""
-        # Placeholder implementation
-        return []
+        """
+        Get all branches with metadata. Branches and pull requests are listed
+        page by page; per-branch metadata is fetched with bounded concurrency
+        and reused from earlier runs while the branch and its target have not
+        moved.
+        """
+        owner = await self._get_repo_owner(repo_name)
+        base_url = f"{self.github_client.base_url}/repos/{owner}/{repo_name}"
+        if repo_name not in self.branch_metadata:
+            await self._load_branch_metadata(repo_name)
+        known = self.branch_metadata[repo_name]
+        
+        branches, pulls = await asyncio.gather(
+            self.github_client.list_all(f"{base_url}/branches"),
+            self.github_client.list_all(f"{base_url}/pulls", params={"state": "all"})
+        )
+        heads = {branch["name"]: branch["commit"]["sha"] for branch in branches}
+        target = next((name for name in ("develop", "main", "master") if name in heads), None)
+        
+        # Pulls are listed newest first; keep the latest one per head branch
+        pull_requests = {}
+        for pull in pulls:
+            pull_requests.setdefault(pull["head"]["ref"], {
+                "number": pull["number"],
+                "state": "merged" if pull.get("merged_at") else pull["state"],
+                "head_sha": pull["head"].get("sha")
+            })
+        
+        semaphore = asyncio.Semaphore(get_config().branch_metadata_concurrency)
+        counts = {"fetched": 0, "cached": 0}
+        
+        async def describe(branch: Dict[str, Any]) -> Dict[str, Any]:
+            name, sha = branch["name"], branch["commit"]["sha"]
+            entry = known.get(name)
+            if (entry is None or entry["sha"] != sha or entry.get("target_sha") != heads.get(target)
+                    or entry.get("ci_status") == "pending"):
+                try:
+                    async with semaphore:
+                        entry = await self._fetch_branch_metadata(base_url, name, sha, target, heads.get(target), entry)
+                except Exception as e:
+                    self.logger.warning(f"Failed to fetch metadata of {repo_name}:{name}: {str(e)}")
+                    entry = {"name": name, "sha": sha, "error": str(e)}
+                else:
+                    known[name] = entry
+                counts["fetched"] += 1
+            else:
+                counts["cached"] += 1
+            pull_request = pull_requests.get(name)
+            # A merged pull request only vouches for the head it merged
+            merged = entry.get("merged", False) or bool(
+                pull_request and pull_request["state"] == "merged" and pull_request["head_sha"] == sha
+            )
+            return {**entry, "merged": merged, "protected": branch.get("protected", False), "pull_request": pull_request}
+        
+        described = await asyncio.gather(*(describe(branch) for branch in branches))
+        for name in set(known) - set(heads):
+            del known[name]
+        await self._save_branch_metadata(repo_name)
+        
+        metrics = get_metrics_collector()
+        for result, count in counts.items():
+            metrics.increment("branch_metadata", count, {"result": result})
+        self.logger.info(f"Listed {len(branches)} branch(es) of {repo_name}: "
+                         f"{counts['fetched']} fetched, {counts['cached']} from earlier runs")
+        return described
+    
+    async def _fetch_branch_metadata(self, base_url: str, name: str, sha: str, target: Optional[str],
+                                     target_sha: Optional[str], previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Metadata of one branch, requesting only what changed since ``previous``."""
+        same_head = previous is not None and previous["sha"] == sha
+        entry = dict(previous) if same_head else {"name": name, "sha": sha}
+        requests = {}
+        if not same_head:
+            requests["commit"] = f"{base_url}/commits/{sha}"
+        if not same_head or previous.get("ci_status") == "pending":
+            requests["status"] = f"{base_url}/commits/{sha}/status"
+        if target and name != target and (not same_head or previous.get("target_sha") != target_sha):
+            requests["compare"] = f"{base_url}/compare/{target_sha}...{sha}"
+        
+        responses = dict(zip(requests, await asyncio.gather(
+            *(self.github_client._make_request("GET", url) for url in requests.values())
+        )))
+        if "commit" in responses:
+            entry["last_commit_date"] = responses["commit"]["commit"]["committer"]["date"]
+        if "status" in responses:
+            status = responses["status"]
+            entry["ci_status"] = status["state"] if status.get("total_count") else "none"
+        if "compare" in responses:
+            compare = responses["compare"]
+            # A fresh branch is level with its target too: it only counts as
+            # merged once it has been seen ahead of the target
+            was_ahead = bool(previous and previous.get("was_ahead")) or compare["ahead_by"] > 0
+            entry.update(ahead_by=compare["ahead_by"], behind_by=compare["behind_by"],
+                         commit_count=compare["ahead_by"], was_ahead=was_ahead,
+                         merged=was_ahead and compare["ahead_by"] == 0)
+        elif not target or name == target:
+            entry.update(ahead_by=0, behind_by=0, commit_count=0, merged=False)
+        entry.update(target=target, target_sha=target_sha)
+        return entry
+    
+    async def _load_branch_metadata(self, repo_name: str):
+        """Branch metadata of an earlier run, from the cache manager if there is one."""
+        cached = await self.cache_manager.get(f"branch-metadata-{repo_name}") if self.cache_manager else None
+        self.branch_metadata[repo_name] = cached if isinstance(cached, dict) else {}
+    
+    async def _save_branch_metadata(self, repo_name: str):
+        if self.cache_manager is not None:
+            await self.cache_manager.set(
+                f"branch-metadata-{repo_name}", self.branch_metadata[repo_name],
+                {"agent_type": "branch_manager", "tags": ["branch_metadata", repo_name]}
+            )
+    
+    def _branch_age_days(self, branch: Dict[str, Any]) -> Optional[float]:
+        """Days since the last commit of a branch, or None if unknown."""
+        if not branch.get("last_commit_date"):
+            return None
+        last_commit = datetime.fromisoformat(branch["last_commit_date"].replace("Z", "+00:00"))
+        return (datetime.now(timezone.utc) - last_commit).total_seconds() / 86400
     
     async def _is_branch_stale(self, branch: Dict[str, Any]) -> bool:
         """Check if branch is stale based on age and activity."""
-        # Placeholder implementation
-        return False
+        age = self._branch_age_days(branch)
+        if age is None:
+            return False
+        rule = next((rule for rule in self.branch_rules
+                     if self._branch_matches_pattern(branch["name"], rule.branch_pattern)), None)
+        max_age = rule.max_age_days if rule is not None else None
+        if max_age is None:
+            config = get_config()
+            if not config.branch_cleanup_without_rule:
+                return False
+            max_age = config.branch_stale_days
+        return age > max_age
     
-    async def _is_safe_to_delete(self, repo_name: str, branch_name: str) -> bool:
-        """Check if branch is safe to delete."""
-        # Placeholder implementation
-        return False
+    async def _is_safe_to_delete(self, repo_name: str, branch: Dict[str, Any]) -> bool:
+        """Check if branch is safe to delete: merged into its target, unprotected and without an open PR."""
+        pull_request = branch.get("pull_request")
+        return (branch.get("merged", False) and not branch.get("protected", False)
+                and not (pull_request and pull_request["state"] == "open"))
     
     async def _delete_branch(self, repo_name: str, branch_name: str):
         """Delete a branch."""
@@ -556,6 +781,59 @@ class BranchManager:
         url = f"{self.github_client.base_url}/repos/{owner}/{repo_name}/git/refs/heads/{branch_name}"
         await self.github_client._make_request("DELETE", url)
     
+    async def _delete_branches(self, repo_name: str, branch_names: List[str]) -> List[Dict[str, Any]]:
+        """Delete branches together; returns one cleanup result per branch."""
+        if not branch_names:
+            return []
+        
+        deleted = {"status": "deleted", "reason": "stale_and_merged"}
+        results: Dict[str, Dict[str, Any]] = {}
+        if get_config().publish_backend == "git":
+            try:
+                mirror = self._get_mirror(repo_name, await self._get_repo_owner(repo_name))
+                failed = await get_executor_manager().run_io(mirror.delete_branches, branch_names, task_name="mirror_delete")
+                results = {name: {"branch": name, **deleted} for name in branch_names if name not in failed}
+                if failed:
+                    self.logger.warning(f"git push could not delete {', '.join(failed)}, deleting through the API")
+            except GitMirrorError as e:
+                self.logger.warning(f"Batched deletion of {len(branch_names)} branch(es) failed, "
+                                    f"deleting through the API: {str(e)}")
+        
+        remaining = [name for name in branch_names if name not in results]
+        if remaining:
+            semaphore = asyncio.Semaphore(get_config().branch_metadata_concurrency)
+            
+            async def delete(branch_name: str) -> Dict[str, Any]:
+                async with semaphore:
+                    try:
+                        await self._delete_branch(repo_name, branch_name)
+                        return {"branch": branch_name, **deleted}
+                    except Exception as e:
+                        return {"branch": branch_name, "status": "error", "error": str(e)}
+            
+            for result in await asyncio.gather(*(delete(name) for name in remaining)):
+                results[result["branch"]] = result
+        
+        known = self.branch_metadata.get(repo_name, {})
+        for result in results.values():
+            if result["status"] == "deleted":
+                known.pop(result["branch"], None)
+        if repo_name in self.branch_metadata:
+            await self._save_branch_metadata(repo_name)
+        return [results[name] for name in branch_names]
+    
+    def _get_mirror(self, repo_name: str, owner: str) -> GitMirror:
+        """Git mirror used to push branch deletions of a repository."""
+        mirror = self._mirrors.get(repo_name)
+        if mirror is None:
+            mirror = GitMirror(
+                os.path.join(get_config().git_mirror_dir, f"{repo_name}-branches.git"),
+                f"https://github.com/{owner}/{repo_name}.git",
+                token=self.github_client.token
+            )
+            self._mirrors[repo_name] = mirror
+        return mirror
+    
     def _classify_branch_type(self, branch_name: str) -> str:
         """Classify branch type based on name."""
         if branch_name.startswith("feature/"):
@@ -573,10 +851,20 @@ class BranchManager:
     
     def _classify_branch_age(self, branch: Dict[str, Any]) -> str:
         """Classify branch age."""
-        # Placeholder implementation
-        return "active"
+        age = self._branch_age_days(branch)
+        if age is None or 7 <= age < 30:
+            return "active"
+        if age < 7:
+            return "new"
+        return "old" if age < 90 else "stale"
     
     async def _assess_merge_readiness(self, repo_name: str, branch: Dict[str, Any]) -> str:
-        """Assess if branch is ready to merge."""
-        # Placeholder implementation
+        """Assess if branch is ready to merge, from its metadata and the local conflict analysis."""
+        if branch.get("ci_status") in ("failure", "error"):
+            return "ci_failing"
+        if branch.get("target") and await self._check_merge_conflicts(repo_name, branch["name"], branch["target"]):
+            return "has_conflicts"
+        pull_request = branch.get("pull_request")
+        if pull_request and pull_request["state"] == "open" and branch.get("ci_status") in ("success", "none"):
+            return "ready_to_merge"
         return "needs_review"
\ No newline at end of file
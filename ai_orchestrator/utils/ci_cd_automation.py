@@ -5,6 +5,7 @@ Handles automated testing, validation, deployment, and integration with GitHub A
 
 import asyncio
 import logging
+import time
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -12,7 +13,10 @@ import json
 import yaml
 from datetime import datetime, timedelta
 
+from .ci_webhooks import get_pipeline_tracker
 from .enhanced_github_client import EnhancedGitHubClient
+from .logging_config import get_metrics_collector
+from ..core.config import get_config
 
 
 class PipelineStage(str, Enum):
@@ -150,12 +154,18 @@ class CICDAutomation:
     async def monitor_pipeline_execution(self, repo_name: str, workflow_run_id: str) -> Dict[str, Any]:
         """
         Monitor CI/CD pipeline execution and provide real-time status.
+        
+        Served from webhook state, without job details, once a delivery for
+        the run has arrived; fetched through REST otherwise.
         """
         owner = await self._get_repo_owner(repo_name)
+        run = get_pipeline_tracker().get_run(f"{owner}/{repo_name}", workflow_run_id)
+        if run is not None and run.source == "webhook":
+            return run.to_status()
         
         # Get workflow run details
+        run_info = await self._fetch_run(owner, repo_name, workflow_run_id)
         run_url = f"{self.github_client.base_url}/repos/{owner}/{repo_name}/actions/runs/{workflow_run_id}"
-        run_info = await self.github_client._make_request("GET", run_url)
         
         # Get workflow jobs
         jobs_url = f"{run_url}/jobs"
@@ -169,6 +179,7 @@ class CICDAutomation:
             "started_at": run_info["created_at"],
             "updated_at": run_info["updated_at"],
             "duration_minutes": self._calculate_duration(run_info),
+            "source": "poll",
             "jobs": []
         }
         
@@ -195,6 +206,63 @@ class CICDAutomation:
         
         return pipeline_status
     
+    async def wait_for_pipeline(self, repo_name: str, workflow_run_id: str,
+                                timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for a workflow run to complete and return its final status.
+        
+        Webhook deliveries end the wait as soon as they arrive. Until the
+        repository has delivered a webhook, the run is polled every
+        CI_POLL_MIN_INTERVAL seconds, backing off to CI_POLL_MAX_INTERVAL while
+        its status stays the same. With webhooks flowing, a run silent for
+        CI_POLL_MAX_INTERVAL is checked once through REST in case a delivery
+        was lost.
+        """
+        config = get_config()
+        tracker = get_pipeline_tracker()
+        owner = await self._get_repo_owner(repo_name)
+        full_name = f"{owner}/{repo_name}"
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = config.ci_poll_min_interval
+        last_status = None
+        
+        while True:
+            run = tracker.get_run(full_name, workflow_run_id)
+            if run is not None and run.completed:
+                return run.to_status()
+            
+            webhooks = tracker.receives_webhooks(full_name)
+            if webhooks:
+                wait = config.ci_poll_max_interval
+            else:
+                status = await self.monitor_pipeline_execution(repo_name, workflow_run_id)
+                if status["status"] == "completed":
+                    return status
+                if status["status"] == last_status:
+                    interval = min(interval * 2, config.ci_poll_max_interval)
+                else:
+                    interval = config.ci_poll_min_interval
+                last_status = status["status"]
+                wait = interval
+            
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError(f"Workflow run {workflow_run_id} did not complete within {timeout}s")
+                wait = min(wait, remaining)
+            
+            updated = await tracker.wait_for_update(full_name, workflow_run_id, wait)
+            if updated is None and webhooks:
+                await self._fetch_run(owner, repo_name, workflow_run_id)
+    
+    async def _fetch_run(self, owner: str, repo_name: str, workflow_run_id: str) -> Dict[str, Any]:
+        """Fetch a workflow run through REST and record it in the pipeline tracker."""
+        run_url = f"{self.github_client.base_url}/repos/{owner}/{repo_name}/actions/runs/{workflow_run_id}"
+        run_info = await self.github_client._make_request("GET", run_url)
+        get_metrics_collector().increment("ci_pipeline_polls", 1, {"repository": repo_name})
+        get_pipeline_tracker().record_run(f"{owner}/{repo_name}", run_info, source="poll")
+        return run_info
+    
     async def handle_pipeline_failure(self, repo_name: str, pr_number: int, 
                                      failure_details: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -420,10 +488,7 @@ class CICDAutomation:
     
     async def _get_repo_owner(self, repo_name: str) -> str:
         """Get repository owner."""
-        if self.github_client.org:
-            return self.github_client.org
-        else:
-            return await self.github_client._get_authenticated_user_login()
+        return await self.github_client.get_repo_owner()
     
     async def _dispatch_workflow(self, repo_name: str, workflow_filename: str, 
                                  inputs: Dict[str, Any]) -> Dict[str, Any]:
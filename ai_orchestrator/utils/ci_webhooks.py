@@ -0,0 +1,340 @@
+"""
+GitHub webhook ingestion for CI pipeline state.
+
+``workflow_run``, ``check_suite``, ``pull_request`` and ``push`` deliveries
+update an in-memory view of each watched repository, and every change is
+forwarded to the process monitor of the sessions working on it. Waiters are
+woken as soon as a delivery for their run arrives, so callers only poll the
+REST API while no webhook has been received for the repository.
+
+Deliveries land on whichever API process GitHub reaches, while the sessions
+waiting on a pipeline run in the workers. When attached to an event bus,
+every accepted delivery is forwarded to the trackers of the other processes,
+which apply it as if they had received it themselves. Repositories are keyed
+by their full ``owner/name``.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from .logging_config import get_logger, get_metrics_collector
+from .process_monitor import get_process_monitor
+
+
+SUPPORTED_EVENTS = ("workflow_run", "check_suite", "pull_request", "push")
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Check an ``X-Hub-Signature-256`` header against the raw request body."""
+    if not secret or not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+def _duration_minutes(started_at: Optional[str], updated_at: Optional[str]) -> Optional[float]:
+    if not started_at or not updated_at:
+        return None
+    start = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
+    end = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
+    return (end - start).total_seconds() / 60
+
+
+@dataclass
+class PipelineRun:
+    """Last known state of a workflow run."""
+    repository: str
+    run_id: str
+    name: Optional[str]
+    head_branch: Optional[str]
+    head_sha: Optional[str]
+    status: str
+    conclusion: Optional[str]
+    started_at: Optional[str]
+    updated_at: Optional[str]
+    html_url: Optional[str] = None
+    pull_requests: List[int] = field(default_factory=list)
+    source: str = "webhook"  # "webhook" or "poll"
+    received_at: float = field(default_factory=time.time)
+
+    @property
+    def completed(self) -> bool:
+        return self.status == "completed"
+
+    @classmethod
+    def from_api(cls, repository: str, run: Dict[str, Any], source: str) -> "PipelineRun":
+        """Build from a workflow run object, as found in webhooks and REST responses."""
+        return cls(
+            repository=repository,
+            run_id=str(run["id"]),
+            name=run.get("name"),
+            head_branch=run.get("head_branch"),
+            head_sha=run.get("head_sha"),
+            status=run["status"],
+            conclusion=run.get("conclusion"),
+            started_at=run.get("run_started_at") or run.get("created_at"),
+            updated_at=run.get("updated_at"),
+            html_url=run.get("html_url"),
+            pull_requests=[pr["number"] for pr in run.get("pull_requests") or []],
+            source=source
+        )
+
+    def to_status(self) -> Dict[str, Any]:
+        """Pipeline status in the shape returned by ``CICDAutomation.monitor_pipeline_execution``."""
+        return {
+            "workflow_run_id": self.run_id,
+            "status": self.status,
+            "conclusion": self.conclusion,
+            "started_at": self.started_at,
+            "updated_at": self.updated_at,
+            "duration_minutes": _duration_minutes(self.started_at, self.updated_at),
+            "head_branch": self.head_branch,
+            "head_sha": self.head_sha,
+            "pull_requests": self.pull_requests,
+            "source": self.source,
+            "jobs": []
+        }
+
+
+class PipelineTracker:
+    """In-memory CI state of watched repositories, fed by webhooks and polling."""
+
+    def __init__(self, max_runs: int = 500, max_deliveries: int = 1000):
+        self.max_runs = max_runs
+        self.logger = get_logger("ci_webhooks")
+        self._runs: "OrderedDict[Tuple[str, str], PipelineRun]" = OrderedDict()
+        self._check_suites: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._pull_requests: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._branches: Dict[Tuple[str, str], str] = {}
+        self._last_webhook: Dict[str, float] = {}
+        self._sessions: Dict[str, Set[str]] = {}
+        self._deliveries: Deque[str] = deque(maxlen=max_deliveries)
+        self._waiters: Dict[Tuple[str, str], List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+        self._lock = threading.Lock()
+        self._bus = None
+
+    def attach_bus(self, bus):
+        """Forward accepted deliveries to other processes and apply theirs."""
+        self._bus = bus
+        bus.subscribe("ci", self._on_remote_event)
+
+    def watch(self, repository: str, session_id: str):
+        """Forward CI updates of ``repository`` to the session's process monitor."""
+        with self._lock:
+            self._sessions.setdefault(repository, set()).add(session_id)
+
+    def unwatch(self, session_id: str):
+        """Stop forwarding CI updates to a session."""
+        with self._lock:
+            for sessions in self._sessions.values():
+                sessions.discard(session_id)
+
+    def receives_webhooks(self, repository: str) -> bool:
+        """Whether any webhook has been delivered for the repository."""
+        return repository in self._last_webhook
+
+    def get_run(self, repository: str, run_id: str) -> Optional[PipelineRun]:
+        """Last known state of a workflow run, or None."""
+        with self._lock:
+            return self._runs.get((repository, str(run_id)))
+
+    def get_check_suite(self, repository: str, head_sha: str) -> Optional[Dict[str, Any]]:
+        """Last check suite state of a commit, or None."""
+        with self._lock:
+            return self._check_suites.get((repository, head_sha))
+
+    def get_pull_request(self, repository: str, number: int) -> Optional[Dict[str, Any]]:
+        """Last pull request state, or None."""
+        with self._lock:
+            return self._pull_requests.get((repository, number))
+
+    def get_branch_head(self, repository: str, branch: str) -> Optional[str]:
+        """Head SHA of a branch as of its last push event, or None."""
+        with self._lock:
+            return self._branches.get((repository, branch))
+
+    def handle_event(self, event: str, payload: Dict[str, Any], delivery_id: Optional[str] = None) -> Dict[str, Any]:
+        """Apply a webhook delivery. Returns what was done with it."""
+        if event not in SUPPORTED_EVENTS or "repository" not in payload:
+            return self._result(event, "ignored")
+        if not self._first_delivery(delivery_id):
+            return self._result(event, "duplicate")
+        repository = payload["repository"]["full_name"]
+        if not self._apply(repository, event, payload):
+            return self._result(event, "ignored")
+        if self._bus is not None:
+            self._bus.publish("ci", {"event": event, "payload": payload, "delivery_id": delivery_id})
+        return self._result(event, "accepted", repository=repository)
+
+    def _on_remote_event(self, message: Dict[str, Any]):
+        """Apply a delivery accepted by another process."""
+        if self._first_delivery(message.get("delivery_id")):
+            payload = message["payload"]
+            self._apply(payload["repository"]["full_name"], message["event"], payload)
+
+    def _first_delivery(self, delivery_id: Optional[str]) -> bool:
+        """Remember a delivery; False when it was already seen."""
+        if not delivery_id:
+            return True
+        with self._lock:
+            if delivery_id in self._deliveries:
+                return False
+            self._deliveries.append(delivery_id)
+        return True
+
+    def _apply(self, repository: str, event: str, payload: Dict[str, Any]) -> bool:
+        """Record a delivery and post it to the watching sessions. False when it carried nothing to track."""
+        self._last_webhook[repository] = time.time()
+        waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+        if event == "workflow_run":
+            run, waiters = self._store_run(repository, payload["workflow_run"], source="webhook")
+            details = run.to_status()
+        elif event == "check_suite":
+            details = self._record_check_suite(repository, payload["check_suite"])
+        elif event == "pull_request":
+            details = self._record_pull_request(repository, payload["action"], payload["pull_request"])
+        else:
+            details = self._record_push(repository, payload)
+            if details is None:
+                return False
+
+        # Sessions see the delivery in their monitor before anyone waiting on the run wakes up
+        self._publish(repository, event, details)
+        if waiters:
+            _wake(waiters, run)
+        return True
+
+    def record_run(self, repository: str, run_data: Dict[str, Any], source: str = "poll") -> PipelineRun:
+        """Store a workflow run state and wake the callers waiting on it."""
+        run, waiters = self._store_run(repository, run_data, source)
+        _wake(waiters, run)
+        return run
+
+    def _store_run(self, repository: str, run_data: Dict[str, Any],
+                   source: str) -> Tuple[PipelineRun, List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]]:
+        """Store a workflow run state; returns the run and the waiters to wake."""
+        run = PipelineRun.from_api(repository, run_data, source)
+        key = (repository, run.run_id)
+        with self._lock:
+            previous = self._runs.get(key)
+            # Deliveries can arrive out of order; never go back from a finished run
+            if previous is not None and previous.completed and not run.completed:
+                return previous, []
+            self._runs[key] = run
+            self._runs.move_to_end(key)
+            while len(self._runs) > self.max_runs:
+                self._runs.popitem(last=False)
+            return run, self._waiters.pop(key, [])
+
+    async def wait_for_update(self, repository: str, run_id: str, timeout: float) -> Optional[PipelineRun]:
+        """Wait up to ``timeout`` seconds for the next state of a run; None on timeout."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (repository, str(run_id))
+        with self._lock:
+            self._waiters.setdefault(key, []).append((loop, future))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(key, [])
+                if (loop, future) in waiters:
+                    waiters.remove((loop, future))
+                if not waiters:
+                    self._waiters.pop(key, None)
+
+    def _record_check_suite(self, repository: str, suite: Dict[str, Any]) -> Dict[str, Any]:
+        details = {
+            "head_sha": suite["head_sha"],
+            "head_branch": suite.get("head_branch"),
+            "status": suite["status"],
+            "conclusion": suite.get("conclusion"),
+            "app": (suite.get("app") or {}).get("slug"),
+            "pull_requests": [pr["number"] for pr in suite.get("pull_requests") or []]
+        }
+        key = (repository, suite["head_sha"])
+        with self._lock:
+            self._check_suites[key] = details
+            self._check_suites.move_to_end(key)
+            while len(self._check_suites) > self.max_runs:
+                self._check_suites.popitem(last=False)
+        return details
+
+    def _record_pull_request(self, repository: str, action: str, pull_request: Dict[str, Any]) -> Dict[str, Any]:
+        details = {
+            "number": pull_request["number"],
+            "action": action,
+            "state": pull_request["state"],
+            "merged": bool(pull_request.get("merged")),
+            "head_branch": pull_request["head"]["ref"],
+            "head_sha": pull_request["head"]["sha"]
+        }
+        with self._lock:
+            if pull_request["state"] == "closed":
+                self._pull_requests.pop((repository, pull_request["number"]), None)
+            else:
+                self._pull_requests[(repository, pull_request["number"])] = details
+        return details
+
+    def _record_push(self, repository: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        ref = payload.get("ref", "")
+        if not ref.startswith("refs/heads/"):
+            return None
+        branch = ref[len("refs/heads/"):]
+        details = {"branch": branch, "head_sha": payload["after"], "commits": len(payload.get("commits") or [])}
+        with self._lock:
+            if payload.get("deleted"):
+                self._branches.pop((repository, branch), None)
+            else:
+                self._branches[(repository, branch)] = payload["after"]
+        return details
+
+    def _publish(self, repository: str, event: str, details: Dict[str, Any]):
+        with self._lock:
+            sessions = list(self._sessions.get(repository, ()))
+        if not sessions:
+            return
+        monitor = get_process_monitor()
+        for session_id in sessions:
+            monitor.log_workflow_event(session_id, f"ci_{event}", details, {"repository": repository})
+
+    def _result(self, event: str, result: str, **extra: Any) -> Dict[str, Any]:
+        get_metrics_collector().increment("ci_webhook_events", 1, {"event": event, "result": result})
+        return {"event": event, "result": result, **extra}
+
+
+def _wake(waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]], run: PipelineRun):
+    for loop, future in waiters:
+        loop.call_soon_threadsafe(_resolve, future, run)
+
+
+def _resolve(future: asyncio.Future, run: PipelineRun):
+    if not future.done():
+        future.set_result(run)
+
+
+# Global pipeline tracker instance
+_pipeline_tracker: Optional[PipelineTracker] = None
+
+
+def get_pipeline_tracker() -> PipelineTracker:
+    """Get the global pipeline tracker."""
+    global _pipeline_tracker
+    if _pipeline_tracker is None:
+        _pipeline_tracker = PipelineTracker()
+
+        from .event_bus import get_event_bus
+        bus = get_event_bus()
+        if bus is not None:
+            _pipeline_tracker.attach_bus(bus)
+    return _pipeline_tracker
@@ -0,0 +1,148 @@
+"""
+Local three-way merge analysis of micro-phase file sets.
+
+Merges a branch's files ("ours") into an integration branch ("theirs")
+against their common base, per file and per line, in memory. Changes to
+different parts of a file merge cleanly; changes to overlapping (or
+touching) line ranges of the base are conflicts unless both sides made the
+same change. Conflicts can be resolved hunk by hunk in favor of either side,
+like ``git merge -X ours|theirs``.
+
+The functions are pure and picklable, so large file sets can run on the CPU
+pool via ``run_cpu``.
+"""
+
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+OURS = "ours"
+THEIRS = "theirs"
+
+# (base_start, base_end, side_start, side_end, side) of one change against the base
+_Change = Tuple[int, int, int, int, str]
+
+
+def _changes(base: List[str], other: List[str], side: str) -> List[_Change]:
+    matcher = SequenceMatcher(None, base, other, autojunk=False)
+    return [(b0, b1, o0, o1, side) for tag, b0, b1, o0, o1 in matcher.get_opcodes() if tag != "equal"]
+
+
+def _region(base: List[str], lines: List[str], changes: List[_Change], start: int, end: int) -> List[str]:
+    """Lines of one side over ``base[start:end]``, given that side's changes within it."""
+    region = []
+    position = start
+    for b0, b1, o0, o1, _ in changes:
+        region.extend(base[position:b0])
+        region.extend(lines[o0:o1])
+        position = b1
+    region.extend(base[position:end])
+    return region
+
+
+def merge_file(base: str, ours: str, theirs: str, favor: Optional[str] = None) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Three-way merge of one file. Returns the merged content and the conflict
+    hunks; unresolved hunks (``favor`` None) get conflict markers.
+    """
+    base_lines = base.splitlines(keepends=True)
+    sides = {OURS: ours.splitlines(keepends=True), THEIRS: theirs.splitlines(keepends=True)}
+    changes = sorted(
+        _changes(base_lines, sides[OURS], OURS) + _changes(base_lines, sides[THEIRS], THEIRS),
+        key=lambda change: (change[0], change[1])
+    )
+
+    # Group changes whose base ranges overlap or touch into chunks
+    chunks: List[List[_Change]] = []
+    end = -1
+    for change in changes:
+        if chunks and change[0] <= end:
+            chunks[-1].append(change)
+            end = max(end, change[1])
+        else:
+            chunks.append([change])
+            end = change[1]
+
+    merged: List[str] = []
+    hunks: List[Dict[str, Any]] = []
+    position = 0
+    for chunk in chunks:
+        start = chunk[0][0]
+        end = max(change[1] for change in chunk)
+        merged.extend(base_lines[position:start])
+        position = end
+
+        regions = {
+            side: _region(base_lines, lines, [change for change in chunk if change[4] == side], start, end)
+            for side, lines in sides.items()
+        }
+        changed_by = {change[4] for change in chunk}
+        if len(changed_by) == 1:
+            merged.extend(regions[changed_by.pop()])
+        elif regions[OURS] == regions[THEIRS]:
+            merged.extend(regions[OURS])
+        else:
+            hunks.append({
+                "base_start": start + 1,
+                "base_end": end,
+                "ours": "".join(regions[OURS]),
+                "theirs": "".join(regions[THEIRS])
+            })
+            if favor is not None:
+                merged.extend(regions[favor])
+            else:
+                merged.append("<<<<<<< ours\n")
+                merged.extend(_terminated(regions[OURS]))
+                merged.append("=======\n")
+                merged.extend(_terminated(regions[THEIRS]))
+                merged.append(">>>>>>> theirs\n")
+    merged.extend(base_lines[position:])
+    return "".join(merged), hunks
+
+
+def _terminated(lines: List[str]) -> List[str]:
+    if lines and not lines[-1].endswith("\n"):
+        return lines[:-1] + [lines[-1] + "\n"]
+    return lines
+
+
+def analyze_merge(base_files: Dict[str, str], ours_files: Dict[str, str], theirs_files: Dict[str, str],
+                  favor: Union[str, Dict[str, str], None] = None,
+                  paths: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Merge file sets (path -> content, a missing path is a deleted or absent
+    file) and report conflicts.
+
+    ``merged_files`` holds every path whose merged result differs from
+    ``theirs`` (None for a deletion), i.e. what merging would change on the
+    integration branch. With ``favor`` (a side, or a side per path),
+    conflicts are resolved in favor of that side and reported with
+    ``resolved`` set; ``paths`` restricts the analysis to some files.
+    """
+    merged_files: Dict[str, Optional[str]] = {}
+    conflicts: List[Dict[str, Any]] = []
+    for path in sorted(paths if paths is not None else set(base_files) | set(ours_files) | set(theirs_files)):
+        base, ours, theirs = base_files.get(path), ours_files.get(path), theirs_files.get(path)
+        if ours == theirs or ours == base:
+            continue
+        if theirs == base:
+            merged_files[path] = ours
+            continue
+        side = favor.get(path) if isinstance(favor, dict) else favor
+
+        if ours is None or theirs is None:
+            conflict = {"file": path, "type": "modify_delete", "deleted_in": OURS if ours is None else THEIRS, "hunks": []}
+            content = {OURS: ours, THEIRS: theirs}[side] if side else (ours if ours is not None else theirs)
+        else:
+            content, hunks = merge_file(base or "", ours, theirs, side)
+            if not hunks:
+                merged_files[path] = content
+                continue
+            conflict = {"file": path, "type": "add_add" if base is None else "content", "hunks": hunks}
+
+        conflict["resolved"] = side
+        conflicts.append(conflict)
+        if content != theirs:
+            merged_files[path] = content
+
+    return {"merged_files": merged_files, "conflicts": conflicts}
@@ -5,13 +5,19 @@ Provides advanced repository management, branch protection, CI/CD integration.
 
 import os
 import json
+import time
 import asyncio
 import aiohttp
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from .github_cache import get_github_cache
+from .github_scheduler import GitHubRateLimitError, get_github_scheduler
+from .logging_config import get_logger, get_metrics_collector
+from .tracing import get_tracer
+
 
 class BranchProtectionLevel(str, Enum):
     """Branch protection levels."""
@@ -105,26 +111,45 @@ Phase ID: {phase_id}
             self.default_labels = ["ai-generated", "micro-phase", "enhancement"]
 
 
+@dataclass
+class RequestStats:
+    """Round trips and payload bytes of a group of API requests."""
+    round_trips: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    blobs_uploaded: int = 0
+    blobs_inlined: int = 0
+
+
 class EnhancedGitHubClient:
     """
     Enhanced GitHub client for micro-phase workflows.
     
     Provides advanced repository management, branch protection,
     CI/CD integration, and automated PR workflows.
+    
+    Requests share one pooled HTTP session, so consecutive calls reuse
+    connections instead of paying a TCP and TLS handshake each.
     """
     
-    def __init__(self, token: Optional[str] = None, org: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, org: Optional[str] = None,
+                 max_connections: int = 10, upload_concurrency: int = 8,
+                 inline_blob_bytes: int = 64 * 1024):
         """Initialize enhanced GitHub client."""
         self.token = token or os.getenv('GITHUB_TOKEN')
         self.org = org or os.getenv('GITHUB_ORG')
         self.base_url = "https://api.github.com"
+        self.max_connections = max_connections
+        self.upload_concurrency = upload_concurrency
+        self.inline_blob_bytes = inline_blob_bytes
+        self.logger = get_logger("github_client")
         
         if not self.token:
             raise ValueError("GitHub token required. Set GITHUB_TOKEN environment variable.")
         
-        # Cache for repository information
-        self._repo_cache: Dict[str, Dict[str, Any]] = {}
-        self._user_cache: Optional[Dict[str, Any]] = None
+        # Pooled session, created on first use inside the event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
     
     def _get_headers(self) -> Dict[str, str]:
         """Get GitHub API headers with enhanced authentication."""
@@ -135,25 +160,82 @@ class EnhancedGitHubClient:
             "User-Agent": "AI-Orchestrator-Enhanced-Client/2.0"
         }
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled session of the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector, headers=self._get_headers())
+            self._session_loop = loop
+        return self._session
+    
     async def _make_request(self, method: str, url: str, 
                            data: Optional[Dict] = None, 
-                           params: Optional[Dict] = None) -> Dict[str, Any]:
-        """Make async HTTP request to GitHub API with error handling."""
-        headers = self._get_headers()
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.request(
-                method=method,
-                url=url,
-                json=data,
-                params=params,
-                headers=headers
-            ) as response:
-                if response.status >= 400:
-                    error_text = await response.text()
-                    raise Exception(f"GitHub API error {response.status}: {error_text}")
-                
-                return await response.json()
+                           params: Optional[Dict] = None,
+                           stats: Optional[RequestStats] = None) -> Dict[str, Any]:
+        """
+        Make async HTTP request to GitHub API with error handling. Requests
+        go through the shared GitHub scheduler, which paces them against the
+        token's rate limits and retries rate-limited responses. GET responses
+        are served from the shared response cache while fresh and revalidated
+        with conditional requests once stale; successful writes mark the
+        cached reads of their repository stale.
+        """
+        body = json.dumps(data).encode() if data is not None else None
+        scheduler = get_github_scheduler()
+        cache = get_github_cache()
+        attempt = 0
+        
+        path = url.replace(self.base_url, "")
+        reading = method.upper() == "GET"
+        cache_key = cache.key(self.token, url, params) if reading else None
+        cached = cache.get(cache_key) if reading else None
+        if cached is not None and cached.fresh:
+            return json.loads(cache.hit(cached))
+        
+        while True:
+            await scheduler.acquire(self.token, method, path)
+            with get_tracer().span("github.request", "http", method=method.upper(), path=path) as span:
+                async with self._get_session().request(
+                    method=method,
+                    url=url,
+                    data=body,
+                    params=params,
+                    headers=cached.conditional_headers() if cached is not None else None
+                ) as response:
+                    raw = await response.read()
+                    get_metrics_collector().increment(
+                        "github_api_calls",
+                        labels={"method": method.upper(), "status": str(response.status)}
+                    )
+                    if stats is not None:
+                        stats.round_trips += 1
+                        stats.bytes_sent += len(body or b"")
+                        stats.bytes_received += len(raw)
+                    if span is not None:
+                        span.set_attribute("status", response.status)
+            
+            retry = scheduler.record_response(self.token, path, response.status, response.headers, raw)
+            if retry is not None:
+                if attempt < scheduler.max_retries:
+                    attempt += 1
+                    continue
+                raise GitHubRateLimitError(
+                    f"GitHub API rate limit {response.status}: {raw.decode(errors='replace')}", time.time() + retry
+                )
+            if response.status == 304 and cached is not None:
+                return json.loads(cache.revalidated(cache_key, cached))
+            if response.status >= 400:
+                error_text = raw.decode(errors="replace")
+                raise Exception(f"GitHub API error {response.status}: {error_text}")
+            
+            if reading:
+                cache.store(cache_key, path, response.headers, raw)
+            else:
+                cache.invalidate(self.token, path)
+            
+            # 204 No Content (deletes, some PUTs) has no body
+            return json.loads(raw) if raw.strip() else {}
     
     async def create_micro_phase_repository(self, config: RepositoryConfig) -> Dict[str, Any]:
         """Create repository optimized for micro-phase workflow."""
@@ -180,9 +262,6 @@ class EnhancedGitHubClient:
         
         repository = await self._make_request("POST", url, data=repo_data)
         
-        # Cache repository info
-        self._repo_cache[config.name] = repository
-        
         # Set up development branch if different from default
         if config.development_branch != config.default_branch:
             await self.create_branch(
@@ -196,7 +275,7 @@ class EnhancedGitHubClient:
     async def setup_branch_protection(self, repo_name: str, branch: str, 
                                      config: BranchProtectionConfig) -> Dict[str, Any]:
         """Set up branch protection rules."""
-        owner = self.org or await self._get_authenticated_user_login()
+        owner = await self.get_repo_owner()
         url = f"{self.base_url}/repos/{owner}/{repo_name}/branches/{branch}/protection"
         
         protection_data = {
@@ -224,7 +303,7 @@ class EnhancedGitHubClient:
     async def create_branch(self, repo_name: str, branch_name: str, 
                            base_branch: str = "main") -> Dict[str, Any]:
         """Create a new branch from base branch."""
-        owner = self.org or await self._get_authenticated_user_login()
+        owner = await self.get_repo_owner()
         base_url = f"{self.base_url}/repos/{owner}/{repo_name}"
         
         # Get base branch reference
@@ -242,36 +321,98 @@ class EnhancedGitHubClient:
     
     async def commit_micro_phase_files(self, repo_name: str, branch: str, 
                                       files: Dict[str, str], phase_info: Dict[str, Any]) -> Dict[str, Any]:
-        """Commit micro-phase files with enhanced metadata."""
-        owner = self.org or await self._get_authenticated_user_login()
+        """
+        Commit micro-phase files with enhanced metadata. Small text files are
+        sent inline in the tree; larger ones are uploaded as blobs
+        concurrently. The response carries the round trips and bytes of the
+        commit under ``upload_stats``.
+        """
+        owner = await self.get_repo_owner()
         base_url = f"{self.base_url}/repos/{owner}/{repo_name}"
+        stats = RequestStats()
         
-        # Get current branch reference
-        ref_url = f"{base_url}/git/refs/heads/{branch}"
-        ref_data = await self._make_request("GET", ref_url)
-        current_sha = ref_data["object"]["sha"]
+        with get_tracer().span("github.commit", "github", repo=repo_name, files=len(files)) as span:
+            # Get current branch reference
+            ref_url = f"{base_url}/git/refs/heads/{branch}"
+            ref_data = await self._make_request("GET", ref_url, stats=stats)
+            current_sha = ref_data["object"]["sha"]
+            
+            # Create tree with all files
+            tree_items = await self._build_tree_items(base_url, files, stats)
+            tree_data = {"tree": tree_items}
+            tree_response = await self._make_request("POST", f"{base_url}/git/trees", data=tree_data, stats=stats)
+            tree_sha = tree_response["sha"]
+            
+            commit_response = await self._create_phase_commit(base_url, ref_url, tree_sha, current_sha, files, phase_info, stats)
+            
+            if span is not None:
+                for key, value in asdict(stats).items():
+                    span.set_attribute(key, value)
+        
+        metrics = get_metrics_collector()
+        metrics.observe("github_commit_round_trips", stats.round_trips, None, "count")
+        metrics.observe("github_commit_bytes", stats.bytes_sent, {"direction": "sent"}, "bytes")
+        metrics.observe("github_commit_bytes", stats.bytes_received, {"direction": "received"}, "bytes")
+        self.logger.info(
+            f"Committed {len(files)} files to {repo_name}:{branch} in {stats.round_trips} requests "
+            f"({stats.blobs_inlined} inline, {stats.blobs_uploaded} blobs, "
+            f"{stats.bytes_sent} bytes sent, {stats.bytes_received} received)"
+        )
+        
+        commit_response["upload_stats"] = asdict(stats)
+        return commit_response
+    
+    async def _build_tree_items(self, base_url: str, files: Dict[str, str], stats: RequestStats) -> List[Dict[str, Any]]:
+        """Tree entries for ``files``: inline content for small text, uploaded blobs for the rest."""
+        semaphore = asyncio.Semaphore(self.upload_concurrency)
+        
+        async def upload(content: str) -> str:
+            async with semaphore:
+                blob_data = {"content": content, "encoding": "utf-8"}
+                blob_response = await self._make_request("POST", f"{base_url}/git/blobs", data=blob_data, stats=stats)
+                return blob_response["sha"]
         
-        # Create tree with all files
         tree_items = []
+        uploads = {}
         for file_path, content in files.items():
-            # Create blob for file content
-            blob_data = {"content": content, "encoding": "utf-8"}
-            blob_response = await self._make_request("POST", f"{base_url}/git/blobs", data=blob_data)
-            blob_sha = blob_response["sha"]
-            
-            tree_items.append({
-                "path": file_path,
-                "mode": "100644",
-                "type": "blob",
-                "sha": blob_sha
-            })
-        
-        # Create tree
-        tree_data = {"tree": tree_items}
-        tree_response = await self._make_request("POST", f"{base_url}/git/trees", data=tree_data)
-        tree_sha = tree_response["sha"]
-        
-        # Create commit with enhanced metadata
+            item = {"path": file_path, "mode": "100644", "type": "blob"}
+            if len(content.encode("utf-8")) <= self.inline_blob_bytes and "\x00" not in content:
+                item["content"] = content
+                stats.blobs_inlined += 1
+            else:
+                uploads[file_path] = upload(content)
+            tree_items.append(item)
+        
+        if uploads:
+            shas = dict(zip(uploads, await asyncio.gather(*uploads.values())))
+            for item in tree_items:
+                if item["path"] in shas:
+                    item["sha"] = shas[item["path"]]
+            stats.blobs_uploaded += len(shas)
+        
+        return tree_items
+    
+    async def _create_phase_commit(self, base_url: str, ref_url: str, tree_sha: str, current_sha: str,
+                                   files: Dict[str, str], phase_info: Dict[str, Any],
+                                   stats: RequestStats) -> Dict[str, Any]:
+        """Create the micro-phase commit on ``tree_sha`` and move the branch to it."""
+        commit_data = {
+            "message": self._phase_commit_message(files, phase_info),
+            "tree": tree_sha,
+            "parents": [current_sha]
+        }
+        
+        commit_response = await self._make_request("POST", f"{base_url}/git/commits", data=commit_data, stats=stats)
+        commit_sha = commit_response["sha"]
+        
+        # Update branch reference
+        update_data = {"sha": commit_sha}
+        await self._make_request("PATCH", ref_url, data=update_data, stats=stats)
+        
+        return commit_response
+    
+    def _phase_commit_message(self, files: Dict[str, str], phase_info: Dict[str, Any]) -> str:
+        """Commit message of a micro-phase, with its metadata."""
         commit_message = f"🚀 Implement micro-phase: {phase_info.get('name', 'Unknown')}"
         
         metadata = {
@@ -284,31 +425,142 @@ class EnhancedGitHubClient:
             "ai_orchestrator_version": "2.0.0"
         }
         
-        full_message = f"{commit_message}\n\nMicro-Phase Metadata:\n{json.dumps(metadata, indent=2)}"
+        return f"{commit_message}\n\nMicro-Phase Metadata:\n{json.dumps(metadata, indent=2)}"
+    
+    async def publish_micro_phases(self, repo_name: str, branch: str, base_branch: str,
+                                   phases: List[Tuple[Dict[str, str], Dict[str, Any]]],
+                                   pr_info: Dict[str, Any],
+                                   template: Optional[PullRequestTemplate] = None,
+                                   comment: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Publish micro-phases as one pull request in as few requests as possible.
+        
+        Each ``(files, phase_info)`` of ``phases`` becomes one commit, stacked
+        in order on top of ``base_branch``. The trees build on the base tree
+        with inline content, the branch ref is created directly at the last
+        commit, and ``comment`` goes into the pull request body instead of a
+        separate comment. Blob uploads for large files run while the base is
+        looked up. Republishing onto an existing branch only fast-forwards it
+        and reuses its open pull request (``comment`` is then posted on it).
+        """
+        owner = await self.get_repo_owner()
+        base_url = f"{self.base_url}/repos/{owner}/{repo_name}"
+        stats = RequestStats()
+        started_at = time.perf_counter()
+        
+        with get_tracer().span("github.publish", "github", repo=repo_name, phases=len(phases)) as span:
+            async def base_commit() -> Tuple[str, str]:
+                # The branch endpoint returns the head commit with its tree in one request
+                branch_data = await self._make_request("GET", f"{base_url}/branches/{base_branch}", stats=stats)
+                head = branch_data["commit"]
+                return head["sha"], head["commit"]["tree"]["sha"]
+            
+            (parent_sha, parent_tree), *phase_trees = await asyncio.gather(
+                base_commit(), *(self._build_tree_items(base_url, files, stats) for files, _ in phases)
+            )
+            
+            commits = []
+            for (files, phase_info), tree_items in zip(phases, phase_trees):
+                tree_data = {"base_tree": parent_tree, "tree": tree_items}
+                tree_response = await self._make_request("POST", f"{base_url}/git/trees", data=tree_data, stats=stats)
+                commit_data = {
+                    "message": self._phase_commit_message(files, phase_info),
+                    "tree": tree_response["sha"],
+                    "parents": [parent_sha]
+                }
+                commit_response = await self._make_request("POST", f"{base_url}/git/commits", data=commit_data, stats=stats)
+                parent_sha, parent_tree = commit_response["sha"], tree_response["sha"]
+                commits.append(commit_response)
+            
+            head_sha, existed = await self._point_branch(base_url, branch, parent_sha, parent_tree, stats)
+            pull_request = None
+            if existed:
+                pull_request = await self.find_open_pull_request(repo_name, branch, base_branch, stats=stats)
+                if pull_request is not None and comment:
+                    await self._make_request("POST", f"{base_url}/issues/{pull_request['number']}/comments",
+                                             data={"body": comment}, stats=stats)
+            if pull_request is None:
+                pull_request = await self.create_micro_phase_pull_request(
+                    repo_name, pr_info, branch, base_branch, template, comment=comment, stats=stats
+                )
+            
+            if span is not None:
+                for key, value in asdict(stats).items():
+                    span.set_attribute(key, value)
+        
+        latency = time.perf_counter() - started_at
+        metrics = get_metrics_collector()
+        metrics.observe("github_publish_latency", latency, {"phases": str(len(phases))}, "seconds")
+        metrics.observe("github_publish_round_trips", stats.round_trips, None, "count")
+        self.logger.info(
+            f"Published {len(phases)} micro-phase(s) to {repo_name}:{branch} as PR #{pull_request['number']} "
+            f"in {stats.round_trips} requests, {latency:.2f}s"
+        )
         
-        commit_data = {
-            "message": full_message,
-            "tree": tree_sha,
-            "parents": [current_sha]
+        return {
+            "branch": branch,
+            "commits": commits,
+            "commit_sha": head_sha,
+            "pull_request": pull_request,
+            "publish_stats": {**asdict(stats), "latency": latency}
         }
-        
-        commit_response = await self._make_request("POST", f"{base_url}/git/commits", data=commit_data)
-        commit_sha = commit_response["sha"]
-        
-        # Update branch reference
-        update_data = {"sha": commit_sha}
-        await self._make_request("PATCH", ref_url, data=update_data)
-        
-        return commit_response
+    
+    async def _point_branch(self, base_url: str, branch: str, sha: str, tree: str,
+                            stats: RequestStats) -> Tuple[str, bool]:
+        """
+        Create ``branch`` at commit ``sha`` (with tree ``tree``). A branch left
+        by an earlier publish is fast-forwarded when its head is an ancestor of
+        ``sha``, and left alone when it already holds the commit or the same
+        tree; a branch with other work is never overwritten. Returns the
+        branch head and whether the branch already existed.
+        """
+        try:
+            await self._make_request("POST", f"{base_url}/git/refs",
+                                     data={"ref": f"refs/heads/{branch}", "sha": sha}, stats=stats)
+            return sha, False
+        except GitHubRateLimitError:
+            raise
+        except Exception as e:
+            if "Reference already exists" not in str(e):
+                raise
+        
+        head = (await self._make_request("GET", f"{base_url}/git/refs/heads/{branch}", stats=stats))["object"]["sha"]
+        if head == sha:
+            return head, True
+        comparison = await self._make_request("GET", f"{base_url}/compare/{head}...{sha}", stats=stats)
+        if comparison["status"] == "ahead":
+            await self._make_request("PATCH", f"{base_url}/git/refs/heads/{branch}",
+                                     data={"sha": sha, "force": False}, stats=stats)
+            return sha, True
+        if comparison["status"] == "behind":
+            return head, True
+        head_commit = await self._make_request("GET", f"{base_url}/git/commits/{head}", stats=stats)
+        if head_commit["tree"]["sha"] == tree:
+            return head, True
+        raise Exception(
+            f"Branch {branch} has diverged from the published commits ({comparison['status']}); not overwriting it"
+        )
+    
+    async def find_open_pull_request(self, repo_name: str, head_branch: str, base_branch: str,
+                                     stats: Optional[RequestStats] = None) -> Optional[Dict[str, Any]]:
+        """The open pull request of ``head_branch`` into ``base_branch``, if any."""
+        owner = await self.get_repo_owner()
+        pulls = await self._make_request(
+            "GET", f"{self.base_url}/repos/{owner}/{repo_name}/pulls",
+            params={"head": f"{owner}:{head_branch}", "base": base_branch, "state": "open"}, stats=stats
+        )
+        return pulls[0] if pulls else None
     
     async def create_micro_phase_pull_request(self, repo_name: str, phase_info: Dict[str, Any], 
                                              head_branch: str, base_branch: str = "develop",
-                                             template: Optional[PullRequestTemplate] = None) -> Dict[str, Any]:
-        """Create pull request for micro-phase with template."""
+                                             template: Optional[PullRequestTemplate] = None,
+                                             comment: Optional[str] = None,
+                                             stats: Optional[RequestStats] = None) -> Dict[str, Any]:
+        """Create pull request for micro-phase with template; ``comment`` is appended to the body."""
         if template is None:
             template = PullRequestTemplate()
         
-        owner = self.org or await self._get_authenticated_user_login()
+        owner = await self.get_repo_owner()
         url = f"{self.base_url}/repos/{owner}/{repo_name}/pulls"
         
         # Format title
@@ -326,6 +578,8 @@ class EnhancedGitHubClient:
             session_id=phase_info.get("session_id", "N/A"),
             phase_id=phase_info.get("id", "N/A")
         )
+        if comment:
+            body = f"{body}\n{comment}"
         
         pr_data = {
             "title": title,
@@ -335,24 +589,38 @@ class EnhancedGitHubClient:
             "draft": False
         }
         
-        pull_request = await self._make_request("POST", url, data=pr_data)
+        try:
+            pull_request = await self._make_request("POST", url, data=pr_data, stats=stats)
+        except GitHubRateLimitError:
+            raise
+        except Exception as e:
+            # The branch was pushed again while its pull request is still open
+            existing = None
+            if "A pull request already exists" in str(e):
+                existing = await self.find_open_pull_request(repo_name, head_branch, base_branch, stats=stats)
+            if existing is None:
+                raise
+            if comment:
+                await self.add_pr_comment(repo_name, existing["number"], comment)
+            return existing
         
         # Add labels if configured
         if template.auto_add_labels and template.default_labels:
-            await self.add_pr_labels(repo_name, pull_request["number"], template.default_labels)
+            await self.add_pr_labels(repo_name, pull_request["number"], template.default_labels, stats=stats)
         
         return pull_request
     
-    async def add_pr_labels(self, repo_name: str, pr_number: int, labels: List[str]) -> Dict[str, Any]:
+    async def add_pr_labels(self, repo_name: str, pr_number: int, labels: List[str],
+                            stats: Optional[RequestStats] = None) -> Dict[str, Any]:
         """Add labels to pull request."""
-        owner = self.org or await self._get_authenticated_user_login()
+        owner = await self.get_repo_owner()
         url = f"{self.base_url}/repos/{owner}/{repo_name}/issues/{pr_number}/labels"
         
-        return await self._make_request("POST", url, data={"labels": labels})
+        return await self._make_request("POST", url, data={"labels": labels}, stats=stats)
     
     async def add_pr_comment(self, repo_name: str, pr_number: int, comment: str) -> Dict[str, Any]:
         """Add comment to pull request."""
-        owner = self.org or await self._get_authenticated_user_login()
+        owner = await self.get_repo_owner()
         url = f"{self.base_url}/repos/{owner}/{repo_name}/issues/{pr_number}/comments"
         
         data = {"body": comment}
@@ -360,7 +628,7 @@ class EnhancedGitHubClient:
     
     async def setup_ci_cd_workflow(self, repo_name: str, workflow_config: Dict[str, Any]) -> Dict[str, Any]:
         """Set up GitHub Actions CI/CD workflow."""
-        owner = self.org or await self._get_authenticated_user_login()
+        owner = await self.get_repo_owner()
         
         workflow_content = self._generate_workflow_yaml(workflow_config)
         
@@ -458,7 +726,7 @@ jobs:
     async def merge_pull_request(self, repo_name: str, pr_number: int, 
                                 merge_method: MergeMethod = MergeMethod.SQUASH) -> Dict[str, Any]:
         """Merge pull request with specified method."""
-        owner = self.org or await self._get_authenticated_user_login()
+        owner = await self.get_repo_owner()
         url = f"{self.base_url}/repos/{owner}/{repo_name}/pulls/{pr_number}/merge"
         
         data = {
@@ -468,29 +736,38 @@ jobs:
         return await self._make_request("PUT", url, data=data)
     
     async def get_repository_info(self, repo_name: str) -> Dict[str, Any]:
-        """Get repository information with caching."""
-        if repo_name in self._repo_cache:
-            return self._repo_cache[repo_name]
-        
-        owner = self.org or await self._get_authenticated_user_login()
+        """Get repository information (cached and revalidated by _make_request)."""
+        owner = await self.get_repo_owner()
         url = f"{self.base_url}/repos/{owner}/{repo_name}"
         
-        repo_info = await self._make_request("GET", url)
-        self._repo_cache[repo_name] = repo_info
-        
-        return repo_info
+        return await self._make_request("GET", url)
     
     async def list_pull_requests(self, repo_name: str, state: str = "open") -> List[Dict[str, Any]]:
         """List pull requests for repository."""
-        owner = self.org or await self._get_authenticated_user_login()
+        owner = await self.get_repo_owner()
         url = f"{self.base_url}/repos/{owner}/{repo_name}/pulls"
         
         params = {"state": state}
-        return await self._make_request("GET", url, params=params)
+        return await self.list_all(url, params=params)
+    
+    async def list_all(self, url: str, params: Optional[Dict] = None, per_page: int = 100) -> List[Dict[str, Any]]:
+        """
+        All items of a paginated list endpoint, ``per_page`` at a time. Pages
+        are requested until one comes back short; each is cached and
+        revalidated by _make_request like any GET.
+        """
+        items = []
+        page = 1
+        while True:
+            batch = await self._make_request("GET", url, params={**(params or {}), "per_page": per_page, "page": page})
+            items.extend(batch)
+            if len(batch) < per_page:
+                return items
+            page += 1
     
     async def get_pr_status(self, repo_name: str, pr_number: int) -> Dict[str, Any]:
         """Get pull request status including CI/CD checks."""
-        owner = self.org or await self._get_authenticated_user_login()
+        owner = await self.get_repo_owner()
         
         # Get PR info
         pr_url = f"{self.base_url}/repos/{owner}/{repo_name}/pulls/{pr_number}"
@@ -507,15 +784,18 @@ jobs:
             "mergeable_state": pr_info.get("mergeable_state", "unknown")
         }
     
+    async def get_repo_owner(self) -> str:
+        """Owner of the repositories: the organization, else the authenticated user."""
+        return self.org or await self._get_authenticated_user_login()
+    
     async def _get_authenticated_user_login(self) -> str:
-        """Get authenticated user login with caching."""
-        if self._user_cache is None:
-            user_url = f"{self.base_url}/user"
-            self._user_cache = await self._make_request("GET", user_url)
-        
-        return self._user_cache["login"]
+        """Get authenticated user login; the response cache memoizes it per token."""
+        user = await self._make_request("GET", f"{self.base_url}/user")
+        return user["login"]
     
     async def cleanup(self):
         """Cleanup resources."""
-        self._repo_cache.clear()
-        self._user_cache = None
\ No newline at end of file
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
\ No newline at end of file
@@ -0,0 +1,265 @@
+"""
+Cross-process event bus for status and process monitor events.
+
+With several API workers and orchestration workers, the process running a
+workflow is rarely the one holding the client's WebSocket. Each process
+attaches its status hub and process monitor to the bus: local changes are
+forwarded to the other processes, and events from the other processes are
+replayed into the local hub and monitor, which push them to their
+subscribers as usual.
+
+Events are appended to an ordered log (a SQLite table or a Redis stream) and
+every process reads it from its own cursor, so a slow reader catches up
+instead of losing events. Writes and reads happen on one background thread
+per process, off the event loop.
+"""
+
+import json
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from .logging_config import get_logger
+
+
+class EventBus(ABC):
+    """Publish/subscribe over an append-only event log shared by processes."""
+
+    def __init__(self, poll_interval: float = 0.1, max_queue_size: int = 10000):
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.poll_interval = poll_interval
+        self.logger = get_logger("event_bus")
+        self._handlers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        self._outgoing: "queue.Queue[Tuple[str, str]]" = queue.Queue(maxsize=max_queue_size)
+        self._dropped = 0
+        self._published = 0
+        self._received = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def publish(self, channel: str, payload: Dict[str, Any]):
+        """Queue an event for the other processes. Never blocks."""
+        if self._closed:
+            return
+        try:
+            self._outgoing.put_nowait((channel, json.dumps(payload, default=str)))
+        except queue.Full:
+            self._dropped += 1
+        self._ensure_thread()
+
+    def subscribe(self, channel: str, handler: Callable[[Dict[str, Any]], None]):
+        """
+        Call ``handler`` with every event published on ``channel`` by other
+        processes from now on. Handlers run on the bus thread.
+        """
+        self._handlers.setdefault(channel, []).append(handler)
+        self._ensure_thread()
+
+    def close(self):
+        """Flush pending events and stop the bus thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bus statistics."""
+        return {
+            "origin": self.origin,
+            "published": self._published,
+            "received": self._received,
+            "dropped": self._dropped,
+            "queued": self._outgoing.qsize()
+        }
+
+    def _ensure_thread(self):
+        with self._thread_lock:
+            if self._thread is None:
+                self._start()
+                self._thread = threading.Thread(target=self._run, name="event-bus", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """Bus loop: write queued events, then dispatch new events from other processes."""
+        while True:
+            closing = self._closed
+            batch = []
+            while len(batch) < 500:
+                try:
+                    batch.append(self._outgoing.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if batch:
+                    self._write(batch)
+                    self._published += len(batch)
+                if closing:
+                    return
+                received = self._read(block=not batch and self._outgoing.empty())
+            except Exception as e:
+                self.logger.error(f"Event bus error: {e}")
+                time.sleep(self.poll_interval)
+                continue
+
+            for origin, channel, data in received:
+                if origin == self.origin:
+                    continue
+                self._received += 1
+                for handler in self._handlers.get(channel, ()):
+                    try:
+                        handler(json.loads(data))
+                    except Exception as e:
+                        self.logger.error(f"Event bus handler failed on {channel}: {e}")
+
+    @abstractmethod
+    def _start(self):
+        """Position the read cursor at the end of the log. Called once, before the bus thread starts."""
+
+    @abstractmethod
+    def _write(self, batch: List[Tuple[str, str]]):
+        """Append ``(channel, data)`` events to the log."""
+
+    @abstractmethod
+    def _read(self, block: bool) -> List[Tuple[str, str, str]]:
+        """Read ``(origin, channel, data)`` events after the cursor, waiting up to the poll interval when blocking."""
+
+
+class SQLiteEventBus(EventBus):
+    """Event bus on a SQLite table, polled by every process."""
+
+    def __init__(self, path: str, poll_interval: float = 0.1, retention_seconds: float = 300.0):
+        super().__init__(poll_interval)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.retention_seconds = retention_seconds
+        self._last_seq = 0
+        self._last_trim = 0.0
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS bus_events ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, origin TEXT NOT NULL, channel TEXT NOT NULL, "
+            "data TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+
+    def close(self):
+        super().close()
+        self._conn.close()
+
+    def _start(self):
+        self._last_seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM bus_events").fetchone()[0]
+
+    def _write(self, batch: List[Tuple[str, str]]):
+        now = time.time()
+        self._conn.execute("BEGIN")
+        self._conn.executemany(
+            "INSERT INTO bus_events (origin, channel, data, created_at) VALUES (?, ?, ?, ?)",
+            [(self.origin, channel, data, now) for channel, data in batch]
+        )
+        if now - self._last_trim >= self.retention_seconds / 10:
+            self._conn.execute("DELETE FROM bus_events WHERE created_at < ?", (now - self.retention_seconds,))
+            self._last_trim = now
+        self._conn.execute("COMMIT")
+
+    def _read(self, block: bool) -> List[Tuple[str, str, str]]:
+        rows = self._conn.execute(
+            "SELECT seq, origin, channel, data FROM bus_events WHERE seq > ? ORDER BY seq LIMIT 1000",
+            (self._last_seq,)
+        ).fetchall()
+        if not rows:
+            if block:
+                time.sleep(self.poll_interval)
+            return []
+        self._last_seq = rows[-1][0]
+        return [(origin, channel, data) for _, origin, channel, data in rows]
+
+
+class RedisEventBus(EventBus):
+    """Event bus on a capped Redis stream."""
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        prefix: str = "orchestrator",
+        poll_interval: float = 0.1,
+        max_len: int = 100000,
+        client: Any = None
+    ):
+        super().__init__(poll_interval)
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise ImportError("Redis event bus requires the redis package: pip install redis")
+            client = redis.Redis.from_url(url)
+        self._redis = client
+        self.stream = f"{prefix}:events"
+        self.max_len = max_len
+        self._last_id = "0-0"
+
+    def close(self):
+        super().close()
+        self._redis.close()
+
+    def _start(self):
+        latest = self._redis.xrevrange(self.stream, count=1)
+        if latest:
+            self._last_id = latest[0][0]
+
+    def _write(self, batch: List[Tuple[str, str]]):
+        pipe = self._redis.pipeline()
+        for channel, data in batch:
+            pipe.xadd(
+                self.stream,
+                {"origin": self.origin, "channel": channel, "data": data},
+                maxlen=self.max_len,
+                approximate=True
+            )
+        pipe.execute()
+
+    def _read(self, block: bool) -> List[Tuple[str, str, str]]:
+        block_ms = int(self.poll_interval * 1000) if block else None
+        response = self._redis.xread({self.stream: self._last_id}, count=1000, block=block_ms)
+        events = []
+        for _, entries in response or ():
+            for entry_id, fields in entries:
+                self._last_id = entry_id
+                fields = {_text(key): _text(value) for key, value in fields.items()}
+                events.append((fields["origin"], fields["channel"], fields["data"]))
+        return events
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+# Global event bus instance
+_event_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> Optional[EventBus]:
+    """
+    Get the global event bus, on the same backend as the job queue. None when
+    workflows run inline (JOB_QUEUE_BACKEND=inline) and one process serves
+    everything.
+    """
+    global _event_bus
+    if _event_bus is None:
+        from ..core.config import get_config
+        config = get_config()
+        backend = config.job_queue_backend.lower()
+        if backend == "redis":
+            _event_bus = RedisEventBus(config.job_queue_redis_url, poll_interval=config.event_bus_poll_interval)
+        elif backend == "sqlite":
+            _event_bus = SQLiteEventBus(config.job_queue_path, poll_interval=config.event_bus_poll_interval)
+    return _event_bus
@@ -0,0 +1,406 @@
+"""
+Durable, append-only event log for process monitor messages.
+
+Messages are handed to a background writer thread and appended as JSON Lines
+to rotating segment files. Sealed segments are optionally gzip-compressed and
+every segment is described in an index manifest (time range and per-session
+counts), so readers can skip segments that cannot contain the events asked for.
+
+Each writer holds an exclusive lock on the directory it writes to. When
+several processes log to the same directory (multi-worker deployments), the
+first one writes to the directory itself and the others to ``writer-N``
+subdirectories, which readers merge back together.
+"""
+
+import atexit
+import gzip
+import itertools
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+from .logging_config import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: one writer per log directory
+    fcntl = None
+
+
+INDEX_FILE = "index.json"
+SEGMENT_PREFIX = "segment-"
+WRITER_PREFIX = "writer-"
+LOCK_FILE = ".writer.lock"
+
+
+class EventLogWriter:
+    """Append-only segment writer that runs off the caller's thread."""
+
+    def __init__(
+        self,
+        log_dir: str,
+        max_segment_bytes: int = 16 * 1024 * 1024,
+        max_segment_age: float = 3600.0,
+        compress: bool = True,
+        max_queue_size: int = 10000,
+        flush_interval: float = 0.5
+    ):
+        # Segments left open in the claimed directory belong to a writer that
+        # is gone, since it would otherwise still hold the lock
+        self.log_dir, self._lock_file = _claim_writer_dir(Path(log_dir))
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self.logger = get_logger("event_log")
+
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue_size)
+        self._dropped = 0
+        self._written = 0
+        self._closed = False
+
+        # Writer-thread state
+        self._index = _load_index(self.log_dir)
+        self._segment_file = None
+        self._segment_entry: Optional[Dict[str, Any]] = None
+        self._segment_opened_at = 0.0
+        self._seal_stale_segments()
+
+        self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def append(self, event: Dict[str, Any]) -> bool:
+        """
+        Queue an event for writing. Never blocks; returns False and counts the
+        event as dropped when the queue is full or the writer is closed.
+        """
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self._dropped += 1
+            return False
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until every queued event has been written."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        done.wait(timeout)
+
+    def close(self):
+        """Drain the queue, seal the active segment and stop the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+        self._lock_file.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer statistics."""
+        return {
+            "log_dir": str(self.log_dir),
+            "written": self._written,
+            "dropped": self._dropped,
+            "queued": self._queue.qsize(),
+            "segments": len(self._index["segments"])
+        }
+
+    def _run(self):
+        """Writer loop: drain events in batches and write them to the active segment."""
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._maybe_rotate()
+                continue
+
+            batch = [item]
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            for entry in batch:
+                if entry is None:
+                    stop = True
+                elif isinstance(entry, tuple):
+                    self._sync()
+                    entry[1].set()
+                else:
+                    try:
+                        self._write_event(entry)
+                    except Exception as e:
+                        self.logger.error(f"Failed to write event: {e}")
+
+            self._sync()
+            if stop:
+                self._seal_segment()
+                return
+            self._maybe_rotate()
+
+    def _write_event(self, event: Dict[str, Any]):
+        """Append one event to the active segment and update its index entry."""
+        if self._segment_file is None:
+            self._open_segment()
+
+        line = json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        self._segment_file.write(line)
+        self._written += 1
+
+        timestamp = event.get("timestamp", time.time())
+        session_id = event.get("session_id", "")
+        entry = self._segment_entry
+        entry["count"] += 1
+        entry["start_ts"] = min(entry["start_ts"] or timestamp, timestamp)
+        entry["end_ts"] = max(entry["end_ts"] or timestamp, timestamp)
+
+        session = entry["sessions"].setdefault(session_id, {"first_ts": timestamp, "last_ts": timestamp, "count": 0})
+        session["first_ts"] = min(session["first_ts"], timestamp)
+        session["last_ts"] = max(session["last_ts"], timestamp)
+        session["count"] += 1
+
+    def _sync(self):
+        """Flush the active segment and persist the index."""
+        if self._segment_file is not None:
+            self._segment_file.flush()
+            self._segment_entry["bytes"] = self._segment_file.tell()
+        _save_index(self.log_dir, self._index)
+
+    def _open_segment(self):
+        """Start a new segment file."""
+        number = max((s["number"] for s in self._index["segments"]), default=0) + 1
+        name = f"{SEGMENT_PREFIX}{number:06d}.jsonl"
+        self._segment_file = open(self.log_dir / name, "a", encoding="utf-8")
+        self._segment_opened_at = time.time()
+        self._segment_entry = {
+            "number": number,
+            "file": name,
+            "sealed": False,
+            "count": 0,
+            "bytes": 0,
+            "start_ts": None,
+            "end_ts": None,
+            "sessions": {}
+        }
+        self._index["segments"].append(self._segment_entry)
+
+    def _maybe_rotate(self):
+        """Seal the active segment when it exceeds its size or age budget."""
+        if self._segment_file is None:
+            return
+        too_big = self._segment_file.tell() >= self.max_segment_bytes
+        too_old = time.time() - self._segment_opened_at >= self.max_segment_age
+        if too_big or too_old:
+            self._seal_segment()
+
+    def _seal_segment(self):
+        """Close the active segment, compress it if configured and mark it sealed."""
+        if self._segment_file is None:
+            _save_index(self.log_dir, self._index)
+            return
+
+        self._segment_file.close()
+        self._segment_file = None
+        self._finalize_segment(self._segment_entry)
+        self._segment_entry = None
+        _save_index(self.log_dir, self._index)
+
+    def _finalize_segment(self, entry: Dict[str, Any]):
+        """Compress a closed segment in place of the plain file."""
+        path = self.log_dir / entry["file"]
+        if self.compress and path.exists():
+            gz_path = path.with_suffix(".jsonl.gz")
+            with open(path, "rb") as src, gzip.open(gz_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            path.unlink()
+            entry["file"] = gz_path.name
+        entry["sealed"] = True
+
+    def _seal_stale_segments(self):
+        """Seal segments left open by a previous process that did not shut down cleanly."""
+        for entry in self._index["segments"]:
+            if not entry.get("sealed"):
+                self._finalize_segment(entry)
+        _save_index(self.log_dir, self._index)
+
+
+class EventLogReader:
+    """Reads events back from an event log directory using its index."""
+
+    def __init__(self, log_dir: str):
+        self.log_dir = Path(log_dir)
+
+    def list_sessions(self) -> Dict[str, Dict[str, Any]]:
+        """Get every logged session with its time range and event count."""
+        sessions: Dict[str, Dict[str, Any]] = {}
+        for _, entry in self._segments():
+            for session_id, info in entry["sessions"].items():
+                known = sessions.setdefault(session_id, {"first_ts": info["first_ts"], "last_ts": info["last_ts"], "count": 0})
+                known["first_ts"] = min(known["first_ts"], info["first_ts"])
+                known["last_ts"] = max(known["last_ts"], info["last_ts"])
+                known["count"] += info["count"]
+        return sessions
+
+    def read(
+        self,
+        session_id: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over logged events in write order, optionally restricted to one
+        session and/or a ``[start, end]`` timestamp range. Segments whose index
+        entry rules them out are never opened.
+        """
+        for directory, entry in self._candidate_segments(session_id, start, end):
+            for event in self._read_segment(directory, entry):
+                if session_id is not None and event.get("session_id") != session_id:
+                    continue
+                timestamp = event.get("timestamp", 0)
+                if start is not None and timestamp < start:
+                    continue
+                if end is not None and timestamp > end:
+                    continue
+                yield event
+
+    def read_session(self, session_id: str) -> List[Dict[str, Any]]:
+        """
+        Get all events of a session in time order. Sequence numbers restart
+        with each process and every writer directory counts on its own, so
+        they only order events within one writer: the sort is by timestamp,
+        and being stable it keeps write order between equal timestamps.
+        """
+        events = list(self.read(session_id=session_id))
+        events.sort(key=lambda e: e.get("timestamp", 0))
+        return events
+
+    def _segments(self) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+        """Iterate over the index entries of every writer directory."""
+        for directory in _writer_dirs(self.log_dir):
+            for entry in _load_index(directory)["segments"]:
+                yield directory, entry
+
+    def _candidate_segments(
+        self,
+        session_id: Optional[str],
+        start: Optional[float],
+        end: Optional[float]
+    ) -> List[Tuple[Path, Dict[str, Any]]]:
+        """Select the segments that may hold matching events."""
+        candidates = []
+        for directory, entry in self._segments():
+            if entry["count"] == 0:
+                continue
+            if session_id is not None:
+                info = entry["sessions"].get(session_id)
+                if info is None:
+                    continue
+                first_ts, last_ts = info["first_ts"], info["last_ts"]
+            else:
+                first_ts, last_ts = entry["start_ts"], entry["end_ts"]
+            if start is not None and last_ts < start:
+                continue
+            if end is not None and first_ts > end:
+                continue
+            candidates.append((directory, entry))
+        return candidates
+
+    def _read_segment(self, directory: Path, entry: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Iterate over the events of a single segment."""
+        path = directory / entry["file"]
+        if not path.exists():
+            # The segment may have been compressed since the index was read
+            path = directory / (entry["file"] + ".gz")
+            if not path.exists():
+                return
+
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Partially written trailing line of the active segment
+                    continue
+
+
+def format_timeline(events: List[Dict[str, Any]]) -> List[str]:
+    """Render events as human-readable timeline lines relative to the first event."""
+    if not events:
+        return []
+
+    origin = events[0].get("timestamp", 0)
+    lines = []
+    for event in events:
+        offset = event.get("timestamp", origin) - origin
+        content = event.get("content")
+        if isinstance(content, dict):
+            summary = ", ".join(f"{k}={_truncate(v)}" for k, v in content.items())
+        else:
+            summary = _truncate(content)
+        lines.append(
+            f"+{offset:9.3f}s  #{event.get('seq', '?'):<5} {event.get('level', 'info'):<7} "
+            f"{event.get('message_type', ''):<15} {event.get('source', ''):<22} {summary}"
+        )
+    return lines
+
+
+def _truncate(value: Any, length: int = 80) -> str:
+    """Shorten a value for single-line display."""
+    text = str(value).replace("\n", " ")
+    return text if len(text) <= length else text[:length - 3] + "..."
+
+
+def _claim_writer_dir(root: Path) -> Tuple[Path, Any]:
+    """Lock the log directory, or the first free writer subdirectory when another writer holds it."""
+    for number in itertools.count():
+        directory = root if number == 0 else root / f"{WRITER_PREFIX}{number}"
+        directory.mkdir(parents=True, exist_ok=True)
+        lock_file = open(directory / LOCK_FILE, "a")
+        if fcntl is None:
+            return directory, lock_file
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return directory, lock_file
+        except OSError:
+            lock_file.close()
+
+
+def _writer_dirs(root: Path) -> List[Path]:
+    """The log directory followed by its writer subdirectories."""
+    extra = [path for path in root.glob(f"{WRITER_PREFIX}*") if path.is_dir()]
+    extra.sort(key=lambda path: int(path.name[len(WRITER_PREFIX):]) if path.name[len(WRITER_PREFIX):].isdigit() else 0)
+    return [root] + extra
+
+
+def _load_index(log_dir: Path) -> Dict[str, Any]:
+    """Load the segment index, or an empty one."""
+    index_path = log_dir / INDEX_FILE
+    if index_path.exists():
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            pass
+    return {"version": 1, "segments": []}
+
+
+def _save_index(log_dir: Path, index: Dict[str, Any]):
+    """Atomically replace the segment index."""
+    tmp_path = log_dir / (INDEX_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, log_dir / INDEX_FILE)
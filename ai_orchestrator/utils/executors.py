@@ -0,0 +1,288 @@
+"""
+Managed executors for work that must stay off the event loop.
+
+Blocking file I/O runs on a thread pool; CPU-heavy pure functions (parsing
+generated code, scanning phase output, rendering YAML) run on a process pool
+so they neither block the loop nor hold the GIL against it. Each pool has a
+bounded number of pending calls per event loop: callers wait for a slot
+instead of piling up unbounded work. Every call records its queue wait and
+run time as metrics and, inside a workflow trace, as a span.
+
+Functions sent to the process pool, and their arguments and results, must be
+picklable, so they are module-level functions working on plain data. Small
+CPU payloads (``size_hint`` below ``EXECUTOR_CPU_MIN_BYTES``) run inline,
+where pickling would cost more than the work itself.
+"""
+
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional, Callable, Tuple
+
+from .logging_config import get_logger, get_metrics_collector
+from .tracing import get_tracer
+
+
+def _timed_call(func: Callable, args: tuple, kwargs: Dict[str, Any]) -> Tuple[float, float, Any]:
+    """Run ``func`` in a worker and report when it started and finished."""
+    started = time.time()
+    result = func(*args, **kwargs)
+    return started, time.time(), result
+
+
+class ExecutorManager:
+    """Thread pool for blocking I/O plus a process pool for CPU-bound work."""
+
+    def __init__(
+        self,
+        io_workers: int = 8,
+        cpu_workers: int = 0,
+        use_process_pool: bool = True,
+        max_pending: int = 64,
+        cpu_min_bytes: int = 32768
+    ):
+        self.io_workers = io_workers
+        self.cpu_workers = cpu_workers or min(4, os.cpu_count() or 1)
+        self.use_process_pool = use_process_pool
+        self.max_pending = max_pending
+        self.cpu_min_bytes = cpu_min_bytes
+        self.logger = get_logger("executors")
+
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._cpu_pool: Optional[Executor] = None
+        self._pool_lock = threading.Lock()
+        self._limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = \
+            weakref.WeakKeyDictionary()
+        self._stats: Dict[str, Dict[str, int]] = {
+            pool: {"submitted": 0, "completed": 0, "failed": 0, "timed_out": 0, "inline": 0, "pending": 0}
+            for pool in ("io", "cpu")
+        }
+        self._closed = False
+
+    async def run_io(
+        self,
+        func: Callable,
+        *args: Any,
+        task_name: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Run a blocking call on the I/O thread pool. Context variables (the
+        current trace span) are carried into the thread. On timeout the caller
+        stops waiting; the call itself cannot be interrupted.
+        """
+        call = functools.partial(contextvars.copy_context().run, _timed_call, func, args, kwargs)
+        return await self._submit("io", self._get_io_pool(), call, task_name or _task_name(func), timeout)
+
+    async def run_cpu(
+        self,
+        func: Callable,
+        *args: Any,
+        task_name: Optional[str] = None,
+        size_hint: Optional[int] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Run a CPU-bound call on the process pool. ``func`` must be a
+        module-level function and its arguments picklable. Payloads with a
+        ``size_hint`` below ``cpu_min_bytes`` run inline on the caller. If a
+        worker process dies, the pool is replaced and the call retried once.
+        """
+        name = task_name or _task_name(func)
+        if size_hint is not None and size_hint < self.cpu_min_bytes:
+            self._stats["cpu"]["inline"] += 1
+            return func(*args, **kwargs)
+
+        call = functools.partial(_timed_call, func, args, kwargs)
+        pool = self._get_cpu_pool()
+        try:
+            return await self._submit("cpu", pool, call, name, timeout)
+        except BrokenProcessPool:
+            self.logger.warning(f"Process pool broke while running {name}; replacing it")
+            self._discard_cpu_pool(pool)
+            return await self._submit("cpu", self._get_cpu_pool(), call, name, timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-pool counters and sizes."""
+        return {
+            "io": {**self._stats["io"], "workers": self.io_workers},
+            "cpu": {
+                **self._stats["cpu"],
+                "workers": self.cpu_workers,
+                "processes": isinstance(self._cpu_pool, ProcessPoolExecutor)
+            },
+            "max_pending": self.max_pending
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Shut the pools down; running calls finish first when ``wait`` is set."""
+        with self._pool_lock:
+            self._closed = True
+            pools = [pool for pool in (self._io_pool, self._cpu_pool) if pool is not None]
+            self._io_pool = None
+            self._cpu_pool = None
+        for pool in pools:
+            pool.shutdown(wait=wait)
+
+    async def _submit(
+        self,
+        pool_name: str,
+        executor: Executor,
+        call: Callable[[], Tuple[float, float, Any]],
+        task_name: str,
+        timeout: Optional[float]
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        stats = self._stats[pool_name]
+        submitted = time.time()
+        slot = self._slot(loop, pool_name)
+
+        await slot.acquire()
+        stats["submitted"] += 1
+        stats["pending"] += 1
+
+        def release():
+            stats["pending"] -= 1
+            slot.release()
+
+        try:
+            work = executor.submit(call)
+        except BaseException:
+            release()
+            raise
+        # Held until the call itself is done: a caller that stops waiting on a timeout leaves it running.
+        # Registered before wrap_future so the slot is free by the time the caller resumes.
+        work.add_done_callback(lambda _: _call_soon(loop, release))
+        try:
+            future = asyncio.wrap_future(work, loop=loop)
+            started, finished, result = await asyncio.wait_for(future, timeout) if timeout else await future
+        except asyncio.TimeoutError:
+            stats["timed_out"] += 1
+            self.logger.warning(f"{pool_name} task {task_name} timed out after {timeout}s")
+            raise
+        except Exception:
+            stats["failed"] += 1
+            self._record(pool_name, task_name, submitted, submitted, time.time(), success=False)
+            raise
+
+        stats["completed"] += 1
+        self._record(pool_name, task_name, submitted, started, finished, success=True)
+        return result
+
+    def _record(self, pool_name: str, task_name: str, submitted: float, started: float, finished: float, success: bool):
+        """Record queue wait and run time of one call."""
+        labels = {"pool": pool_name, "task": task_name}
+        metrics = get_metrics_collector()
+        metrics.observe("executor_queue_wait", max(0.0, started - submitted), labels, "seconds")
+        metrics.observe("executor_task_duration", max(0.0, finished - started), {**labels, "success": str(success).lower()}, "seconds")
+        get_tracer().record_span(
+            task_name, "executor", started, finished,
+            pool=pool_name, queue_wait=round(max(0.0, started - submitted), 6)
+        )
+
+    def _discard_cpu_pool(self, pool: Executor):
+        with self._pool_lock:
+            if self._cpu_pool is pool:
+                self._cpu_pool = None
+        pool.shutdown(wait=False)
+
+    def _slot(self, loop: asyncio.AbstractEventLoop, pool_name: str) -> asyncio.Semaphore:
+        """Bound of pending calls per pool, one per event loop (semaphores are bound to a loop)."""
+        limits = self._limits.get(loop)
+        if limits is None:
+            limits = {pool: asyncio.Semaphore(self.max_pending) for pool in ("io", "cpu")}
+            self._limits[loop] = limits
+        return limits[pool_name]
+
+    def _get_io_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._closed:
+                raise RuntimeError("Executors have been shut down")
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="orchestrator-io")
+            return self._io_pool
+
+    def _get_cpu_pool(self) -> Executor:
+        if not self.use_process_pool:
+            return self._get_io_pool()
+        with self._pool_lock:
+            if self._closed:
+                raise RuntimeError("Executors have been shut down")
+            if self._cpu_pool is None:
+                try:
+                    # spawn: forking a process with live threads and event loops is unsafe
+                    self._cpu_pool = ProcessPoolExecutor(
+                        max_workers=self.cpu_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                except (OSError, NotImplementedError, ValueError) as e:
+                    self.logger.warning(f"Process pool unavailable, running CPU tasks on threads: {e}")
+                    self.use_process_pool = False
+            pool = self._cpu_pool
+        return pool if pool is not None else self._get_io_pool()
+
+
+def _task_name(func: Callable) -> str:
+    func = getattr(func, "func", func)  # functools.partial
+    return getattr(func, "__name__", type(func).__name__)
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[[], None]):
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        # The loop is closed, and its semaphores with it
+        pass
+
+
+def estimate_size(data: Dict[str, Any]) -> int:
+    """
+    Cheap ``size_hint`` for a dict payload: the summed length of its string
+    values, and of the strings directly inside its list and dict values,
+    without serializing it.
+    """
+    size = 0
+    for value in data.values():
+        if isinstance(value, str):
+            size += len(value)
+        elif isinstance(value, (list, tuple, dict)):
+            items = value.values() if isinstance(value, dict) else value
+            size += sum(len(item) for item in items if isinstance(item, str))
+    return size
+
+
+# Global executor manager instance
+_executor_manager: Optional[ExecutorManager] = None
+
+
+def get_executor_manager() -> ExecutorManager:
+    """Get the global executor manager configured by the EXECUTOR_* settings."""
+    global _executor_manager
+    if _executor_manager is None:
+        from ..core.config import get_config
+        config = get_config()
+        _executor_manager = ExecutorManager(
+            io_workers=config.executor_io_workers,
+            cpu_workers=config.executor_cpu_workers,
+            use_process_pool=config.executor_cpu_pool,
+            max_pending=config.executor_max_pending,
+            cpu_min_bytes=config.executor_cpu_min_bytes
+        )
+    return _executor_manager
+
+
+def shutdown_executors(wait: bool = True):
+    """Shut down the global executors, if they were created."""
+    global _executor_manager
+    if _executor_manager is not None:
+        _executor_manager.shutdown(wait=wait)
+        _executor_manager = None
@@ -4,15 +4,22 @@ File output management and project structure generation.
 
 import os
 import shutil
+import asyncio
+import hashlib
 import json
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import logging
 
 from ..core.config import get_config
 from .logging_config import get_logger, TimedOperation
+from .process_monitor import get_process_monitor
+from .executors import get_executor_manager
 
 
 @dataclass
@@ -57,668 +64,424 @@ class ProjectStructure:
         return [f for f in self.files if f.file_type == 'documentation' or f.path.startswith('docs/')]
 
 
+MANIFEST_FILE = '.project_manifest.json'
+METADATA_FILE = 'project_metadata.json'
+
+
+@dataclass
+class WriteResult:
+    """Outcome of writing a project to disk."""
+    path: str
+    written: int
+    skipped: int
+    deleted: int
+
+
+@dataclass
+class _WritePlan:
+    """A project write being staged next to its output directory."""
+    output_path: Path
+    staging_path: Path
+    pending: List[Tuple[str, bytes]]
+    manifest: Dict[str, Dict[str, Any]]
+    skipped: int
+    deleted: int
+
+
+# Fence tags understood by the parser, by language
+_FENCE_LANGUAGES = {
+    'python': 'python', 'py': 'python',
+    'javascript': 'javascript', 'js': 'javascript',
+    'typescript': 'typescript', 'ts': 'typescript',
+    'jsx': 'jsx', 'tsx': 'jsx',
+    'css': 'css', 'scss': 'css'
+}
+
+_LANGUAGE_EXTENSIONS = {
+    'python': ('.py',),
+    'javascript': ('.js',),
+    'typescript': ('.ts', '.tsx'),
+    'jsx': ('.jsx', '.tsx'),
+    'css': ('.css', '.scss')
+}
+
+# Per output kind: base path, languages of fenced blocks, file type, and the
+# words that make the structure fallback create skeleton files
+_OUTPUT_KINDS = {
+    'backend': ('backend/', ('python',), 'code', ('main.py', 'models/', 'api/', 'core/')),
+    'frontend': ('frontend/', ('javascript', 'typescript', 'jsx', 'css'), 'code',
+                 ('App.js', 'React', 'components/', 'pages/', 'public/')),
+    'test': ('tests/', ('python', 'javascript'), 'test', ())
+}
+
+
+def _clean_filename(filename: str, base_path: str) -> str:
+    """Path of a file relative to ``base_path``."""
+    if filename.startswith(base_path):
+        filename = filename[len(base_path):]
+    if filename.startswith('./'):
+        filename = filename[2:]
+    return filename.lstrip('/')
+
+
+def _marker_file(filename: str, content_lines: List[str], base_path: str) -> GeneratedFile:
+    """Create a GeneratedFile from an ``===== filename =====`` section."""
+    clean_filename = _clean_filename(filename, base_path)
+    
+    # Determine file type and language
+    file_type = "code"
+    language = "text"
+    
+    if clean_filename.endswith(('.py',)):
+        language = "python"
+    elif clean_filename.endswith(('.js', '.jsx')):
+        language = "javascript"
+    elif clean_filename.endswith(('.ts', '.tsx')):
+        language = "typescript"
+    elif clean_filename.endswith(('.css', '.scss')):
+        language = "css"
+        file_type = "style"
+    elif clean_filename.endswith(('.json',)):
+        language = "json"
+        file_type = "config"
+    elif clean_filename.endswith(('.yml', '.yaml')):
+        language = "yaml"
+        file_type = "config"
+    elif clean_filename.endswith(('.md',)):
+        language = "markdown"
+        file_type = "documentation"
+    elif clean_filename.endswith(('.html',)):
+        language = "html"
+    elif clean_filename.endswith(('.txt',)):
+        file_type = "config"
+    elif 'Dockerfile' in clean_filename:
+        language = "dockerfile"
+        file_type = "config"
+    
+    return GeneratedFile(
+        path=f"{base_path}{clean_filename}",
+        content='\n'.join(content_lines).strip(),
+        file_type=file_type,
+        language=language
+    )
+
+
+def _default_filename(language: str, content: str, content_lines: List[str]) -> str:
+    """Name an unnamed code block after what it contains."""
+    if language == 'python':
+        if 'class User' in content or 'class Post' in content:
+            return 'models.py'
+        if 'FastAPI' in content or 'app = ' in content:
+            return 'main.py'
+        if 'router = APIRouter' in content:
+            return 'api.py'
+        return 'app.py'
+    if language == 'javascript':
+        if 'import React' in content or 'function App' in content:
+            return 'App.js'
+        return 'component.js' if 'export default' in content else 'script.js'
+    if language == 'typescript':
+        if 'interface ' in content or 'type ' in content:
+            return 'types.ts'
+        return 'component.ts' if 'export default' in content else 'index.ts'
+    if language == 'jsx':
+        if 'function App' in content or 'const App' in content:
+            return 'App.jsx'
+        if 'export default' not in content:
+            return 'component.jsx'
+        for line in content_lines:
+            if 'const ' in line and ' = ' in line:
+                return f"{line.split('const ')[1].split(' =')[0].strip()}.jsx"
+        return 'Component.jsx'
+    return 'styles.css'
+
+
+class StreamingCodeParser:
+    """
+    Single-pass, incremental parser for one agent response.
+    
+    ``feed`` takes the response in chunks of any size and returns the files
+    completed so far. One scan over the lines recognizes ``===== filename =====``
+    sections, fenced code blocks, and the headings or paths naming those
+    blocks. A section is complete when the next marker starts, so sections
+    are emitted while the response is still streaming. Fenced blocks are a
+    fallback for responses without sections and are emitted by ``close``.
+    """
+    
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.base_path, languages, self.file_type, self._keywords = _OUTPUT_KINDS[kind]
+        self.languages = set(languages)
+        self.extensions = tuple(ext for language in languages for ext in _LANGUAGE_EXTENSIONS[language])
+        self._extension_languages = {
+            ext: language for language in languages for ext in _LANGUAGE_EXTENSIONS[language]
+        }
+        
+        self.files: List[GeneratedFile] = []
+        self.mentions: Set[str] = set()
+        self.head = ""
+        self._partial: List[str] = []
+        self._paths: Set[str] = set()
+        self._closed = False
+        
+        # ===== filename ===== sections
+        self._section: Optional[str] = None
+        self._section_lines: List[str] = []
+        
+        # Fenced blocks and the path hint preceding them
+        self._fence: Optional[Tuple[Optional[str], Optional[str]]] = None
+        self._fence_lines: List[str] = []
+        self._hint: Optional[str] = None
+        self._fenced: List[GeneratedFile] = []
+    
+    def feed(self, chunk: str) -> List[GeneratedFile]:
+        """Scan the next chunk of the response; returns the files it completed."""
+        if not chunk:
+            return []
+        if len(self.head) < 500:
+            self.head += chunk[:500 - len(self.head)]
+        
+        end = chunk.rfind('\n')
+        if end < 0:
+            self._partial.append(chunk)
+            return []
+        lines = (''.join(self._partial) + chunk[:end]).split('\n')
+        self._partial = [chunk[end + 1:]]
+        
+        emitted = []
+        for line in lines:
+            self._scan_line(line, emitted)
+        return emitted
+    
+    def close(self) -> List[GeneratedFile]:
+        """Finish the response; returns the files not emitted yet."""
+        if self._closed:
+            return []
+        self._closed = True
+        emitted = []
+        if self._partial:
+            self._scan_line(''.join(self._partial), emitted)
+            self._partial = []
+        self._finish_section(emitted)
+        
+        # Fenced blocks only count when the response has no file sections
+        if not self.files:
+            for file in self._fenced:
+                self._emit(file, emitted)
+        return emitted
+    
+    def _scan_line(self, line: str, emitted: List[GeneratedFile]):
+        stripped = line.strip()
+        
+        if stripped.startswith('=====') and stripped.endswith('=====') and stripped[5:-5].strip():
+            self._finish_section(emitted)
+            self._section = stripped[5:-5].strip()
+            self._section_lines = []
+            return
+        if self._section is not None:
+            self._section_lines.append(line)
+        
+        # Once a section produced a file, fenced blocks and mentions are no longer needed
+        if self.files:
+            return
+        for keyword in self._keywords:
+            if keyword in line:
+                self.mentions.add(keyword)
+        
+        if self._fence is not None:
+            if stripped == '```':
+                self._finish_fence()
+            elif self._fence[0] is not None:
+                self._fence_lines.append(line)
+            return
+        
+        if stripped.startswith('```'):
+            self._open_fence(stripped[3:])
+        elif '.' in line:
+            hint = self._path_hint(line, stripped)
+            if hint:
+                self._hint = hint
+    
+    def _finish_section(self, emitted: List[GeneratedFile]):
+        if self._section and self._section_lines:
+            self._emit(_marker_file(self._section, self._section_lines, self.base_path), emitted)
+        self._section = None
+        self._section_lines = []
+    
+    def _open_fence(self, info: str):
+        """Start a fenced block; blocks in other languages are skipped."""
+        tag, _, comment = info.partition('#')
+        tag = tag.strip().lower()
+        comment = comment.strip()
+        name = comment if comment.endswith(self.extensions) else None
+        
+        language = _FENCE_LANGUAGES.get(tag.split()[0] if tag else '')
+        if not tag and (name or self._hint):
+            filename = name or self._hint
+            language = next(
+                (lang for ext, lang in self._extension_languages.items() if filename.endswith(ext)), None
+            )
+        if language not in self.languages:
+            language = None
+        self._fence = (language, name)
+        self._fence_lines = []
+    
+    def _finish_fence(self):
+        language, name = self._fence
+        self._fence = None
+        if language is None:
+            return
+        
+        if self._fence_lines:
+            content = '\n'.join(self._fence_lines)
+            filename = name or self._hint or _default_filename(language, content, self._fence_lines)
+            filename = _clean_filename(filename, self.base_path)
+            if filename.startswith('src/'):
+                filename = filename[4:]
+            self._fenced.append(GeneratedFile(
+                path=f"{self.base_path}{filename}",
+                content=content,
+                file_type=self.file_type,
+                language=language
+            ))
+        self._hint = None
+        self._fence_lines = []
+    
+    def _path_hint(self, line: str, stripped: str) -> Optional[str]:
+        """File path named by a heading (``## main.py``, ``### Models (app/models.py)``) or a path in prose."""
+        if not any(ext in line for ext in self.extensions):
+            return None
+        
+        if stripped.startswith('#'):
+            header = stripped.lstrip('#').strip()
+            if '(' in header and ')' in header:
+                candidates = [header.split('(')[1].split(')')[0]]
+            else:
+                candidates = header.split()
+        elif '/' in line:
+            candidates = [word for word in stripped.split() if '/' in word]
+        else:
+            return None
+        
+        for word in candidates:
+            word = word.strip('`*"\'').rstrip('.,:;')
+            if word.endswith(self.extensions):
+                return word
+        return None
+    
+    def _emit(self, file: GeneratedFile, emitted: List[GeneratedFile]):
+        """Emit a file, keeping the first of several with the same path."""
+        if file.path in self._paths:
+            return
+        self._paths.add(file.path)
+        self.files.append(file)
+        emitted.append(file)
+
+
 class CodeParser:
     """Parses generated code to extract files and structure."""
     
     def __init__(self):
         self.logger = get_logger("code_parser")
     
-    def parse_backend_implementation(self, content: str, session_id: str) -> List[GeneratedFile]:
-        """Parse backend implementation into individual files."""
-        files = []
-        
-        # Guard against None content
-        if not content:
-            return files
-        
-        # First, try to parse using the Claude agent format (===== filename =====)
-        claude_files = self._parse_claude_format_files(content, "backend/")
-        files.extend(claude_files)
-        
-        # Only try other parsing methods if Claude format didn't find files
-        if not claude_files:
-            # Parse structured implementation with multiple approaches
-            if "```python" in content or "```py" in content:
-                files.extend(self._extract_python_files(content, "backend/"))
-            
-            # Parse structured file descriptions
-            files.extend(self._parse_structured_files(content, "backend/", ["python", "py"]))
-            
-            # If no files were parsed, try to create from file structure documentation
-            if not files:
-                files.extend(self._create_files_from_structure(content, "backend/"))
-        
-        # Remove duplicates based on file path
-        files = self._remove_duplicate_files(files)
-        
-        # Add configuration files if not already present
-        has_requirements = any(f.path.endswith('requirements.txt') for f in files)
-        has_dockerfile = any(f.path.endswith('Dockerfile') for f in files)
-        has_readme = any(f.path.endswith('README.md') for f in files)
-        
-        if not has_requirements:
-            files.append(GeneratedFile(
-                path="backend/requirements.txt",
-                content=self._generate_requirements_txt(),
-                file_type="config",
-                language="text"
-            ))
-        
-        if not has_readme:
-            files.append(GeneratedFile(
-                path="backend/README.md",
-                content=self._generate_backend_readme(content),
-                file_type="documentation",
-                language="markdown"
-            ))
-        
-        if not has_dockerfile:
-            files.append(GeneratedFile(
-                path="backend/Dockerfile",
-                content=self._generate_dockerfile(),
-                file_type="config",
-                language="dockerfile"
-            ))
-        
-        return files
+    def stream(self, kind: str) -> StreamingCodeParser:
+        """Start parsing a ``backend``, ``frontend`` or ``test`` response as it streams in."""
+        return StreamingCodeParser(kind)
     
-    def parse_frontend_implementation(self, content: str, session_id: str) -> List[GeneratedFile]:
-        """Parse frontend implementation into individual files."""
-        files = []
+    def finish(self, stream: StreamingCodeParser) -> List[GeneratedFile]:
+        """Close a streamed response and return all its files, with fallbacks and default config files added."""
+        stream.close()
+        files = list(stream.files)
+        base_path = stream.base_path
         
-        # Guard against None content
-        if not content:
-            return files
+        # If no files were parsed, try to create from file structure documentation
+        if not files and stream.kind == 'backend':
+            files.extend(self._create_files_from_structure(stream.mentions, base_path))
+        elif not files and stream.kind == 'frontend':
+            files.extend(self._create_frontend_files_from_structure(stream.mentions, base_path))
         
-        # First, try to parse using the Claude agent format (===== filename =====)
-        claude_files = self._parse_claude_format_files(content, "frontend/")
-        files.extend(claude_files)
+        self.logger.info(f"Parsed {len(stream.files)} {stream.kind} files")
         
-        # Only try other parsing methods if Claude format didn't find files
-        if not claude_files:
-            # Parse different frontend file types with structured parsing
-            if "```javascript" in content or "```js" in content:
-                files.extend(self._extract_javascript_files(content, "frontend/"))
-            
-            if "```typescript" in content or "```ts" in content:
-                files.extend(self._extract_typescript_files(content, "frontend/"))
-            
-            if "```jsx" in content or "```tsx" in content:
-                files.extend(self._extract_react_files(content, "frontend/"))
-            
-            if "```css" in content or "```scss" in content:
-                files.extend(self._extract_style_files(content, "frontend/"))
+        # Add configuration files if not already present
+        if stream.kind == 'backend':
+            if not any(f.path.endswith('requirements.txt') for f in files):
+                files.append(GeneratedFile(
+                    path="backend/requirements.txt",
+                    content=self._generate_requirements_txt(),
+                    file_type="config",
+                    language="text"
+                ))
             
-            # Parse structured file descriptions
-            files.extend(self._parse_structured_files(content, "frontend/", ["js", "jsx", "ts", "tsx", "css", "scss"]))
+            if not any(f.path.endswith('README.md') for f in files):
+                files.append(GeneratedFile(
+                    path="backend/README.md",
+                    content=self._generate_backend_readme(stream.head),
+                    file_type="documentation",
+                    language="markdown"
+                ))
             
-            # If no files were parsed, try to create from file structure documentation
-            if not files:
-                files.extend(self._create_frontend_files_from_structure(content, "frontend/"))
-        
-        # Remove duplicates based on file path
-        files = self._remove_duplicate_files(files)
-        
-        # Add configuration files if not already present
-        has_package_json = any(f.path.endswith('package.json') for f in files)
-        has_dockerfile = any(f.path.endswith('Dockerfile') for f in files)
-        has_readme = any(f.path.endswith('README.md') for f in files)
-        
-        if not has_package_json:
-            files.append(GeneratedFile(
-                path="frontend/package.json",
-                content=self._generate_package_json(),
-                file_type="config",
-                language="json"
-            ))
-        
-        if not has_readme:
-            files.append(GeneratedFile(
-                path="frontend/README.md",
-                content=self._generate_frontend_readme(content),
-                file_type="documentation",
-                language="markdown"
-            ))
-        
-        if not has_dockerfile:
-            files.append(GeneratedFile(
-                path="frontend/Dockerfile",
-                content=self._generate_frontend_dockerfile(),
-                file_type="config",
-                language="dockerfile"
-            ))
-        
-        return files
-    
-    def parse_test_implementation(self, content: str, session_id: str) -> List[GeneratedFile]:
-        """Parse test implementation into individual files."""
-        files = []
-        
-        # Guard against None content
-        if not content:
-            return files
-        
-        # First, try to parse using the Claude agent format (===== filename =====)
-        claude_files = self._parse_claude_format_files(content, "tests/")
-        files.extend(claude_files)
+            if not any(f.path.endswith('Dockerfile') for f in files):
+                files.append(GeneratedFile(
+                    path="backend/Dockerfile",
+                    content=self._generate_dockerfile(),
+                    file_type="config",
+                    language="dockerfile"
+                ))
         
-        # Only try other parsing methods if Claude format didn't find files
-        if not claude_files:
-            # Parse test files
-            if "```python" in content:
-                files.extend(self._extract_python_files(content, "tests/", file_type="test"))
+        elif stream.kind == 'frontend':
+            if not any(f.path.endswith('package.json') for f in files):
+                files.append(GeneratedFile(
+                    path="frontend/package.json",
+                    content=self._generate_package_json(),
+                    file_type="config",
+                    language="json"
+                ))
             
-            if "```javascript" in content or "```js" in content:
-                files.extend(self._extract_javascript_files(content, "tests/", file_type="test"))
-        
-        # Remove duplicates based on file path
-        files = self._remove_duplicate_files(files)
-        
-        return files
-    
-    def _extract_python_files(self, content: str, base_path: str, file_type: str = "code") -> List[GeneratedFile]:
-        """Extract Python files from code blocks."""
-        files = []
-        lines = content.split('\n')
-        
-        current_file = None
-        current_content = []
-        in_code_block = False
-        
-        for i, line in enumerate(lines):
-            # Look for file path indicators before code blocks
-            if not in_code_block and ('.py' in line or 'models/' in line or 'api/' in line or 'core/' in line):
-                # Check if this line contains a file path
-                if '/' in line and '.py' in line:
-                    # Extract filename from various formats
-                    if '## ' in line or '### ' in line:  # Markdown headers
-                        if '(' in line and ')' in line:
-                            current_file = line.split('(')[1].split(')')[0]
-                        elif line.strip().endswith('.py'):
-                            current_file = line.split()[-1]
-                    elif line.strip().startswith('# ') and line.strip().endswith('.py'):
-                        current_file = line.strip()[2:]
-                    elif line.strip().startswith('//') and line.strip().endswith('.py'):
-                        current_file = line.strip()[2:].strip()
-                        
-            if line.strip().startswith('```python') or line.strip().startswith('```py'):
-                in_code_block = True
-                # Try to extract filename from comment after ```python
-                if '#' in line:
-                    comment = line.split('#', 1)[1].strip()
-                    if comment.endswith('.py'):
-                        current_file = comment
-                continue
-            elif line.strip() == '```' and in_code_block:
-                in_code_block = False
-                if current_content:
-                    if not current_file:
-                        # Try to infer filename from content
-                        content_str = '\n'.join(current_content)
-                        if 'class User' in content_str or 'class Post' in content_str:
-                            current_file = 'models.py'
-                        elif 'FastAPI' in content_str or 'app = ' in content_str:
-                            current_file = 'main.py'
-                        elif 'router = APIRouter' in content_str:
-                            current_file = 'api.py'
-                        else:
-                            current_file = 'app.py'
-                    
-                    # Clean up the file path
-                    if current_file and not current_file.startswith(base_path):
-                        if current_file.startswith('src/'):
-                            current_file = current_file[4:]  # Remove 'src/' prefix
-                        
-                    files.append(GeneratedFile(
-                        path=f"{base_path}{current_file}",
-                        content='\n'.join(current_content),
-                        file_type=file_type,
-                        language="python"
-                    ))
-                current_file = None
-                current_content = []
-                continue
-            elif in_code_block:
-                current_content.append(line)
-        
-        # If no files were extracted but we have content, create default files
-        if not files and '```python' in content:
-            # Extract all Python code blocks and create basic files
-            python_content = []
-            in_block = False
-            for line in lines:
-                if line.strip().startswith('```python'):
-                    in_block = True
-                    continue
-                elif line.strip() == '```' and in_block:
-                    in_block = False
-                    continue
-                elif in_block:
-                    python_content.append(line)
+            if not any(f.path.endswith('README.md') for f in files):
+                files.append(GeneratedFile(
+                    path="frontend/README.md",
+                    content=self._generate_frontend_readme(stream.head),
+                    file_type="documentation",
+                    language="markdown"
+                ))
             
-            if python_content:
+            if not any(f.path.endswith('Dockerfile') for f in files):
                 files.append(GeneratedFile(
-                    path=f"{base_path}main.py",
-                    content='\n'.join(python_content),
-                    file_type=file_type,
-                    language="python"
+                    path="frontend/Dockerfile",
+                    content=self._generate_frontend_dockerfile(),
+                    file_type="config",
+                    language="dockerfile"
                 ))
         
         return files
     
-    def _extract_javascript_files(self, content: str, base_path: str, file_type: str = "code") -> List[GeneratedFile]:
-        """Extract JavaScript files from code blocks."""
-        files = []
-        lines = content.split('\n')
-        
-        current_file = None
-        current_content = []
-        in_code_block = False
-        
-        for i, line in enumerate(lines):
-            # Look for file path indicators
-            if not in_code_block and ('.js' in line or 'src/' in line or 'components/' in line):
-                if '/' in line and '.js' in line:
-                    if '## ' in line or '### ' in line:
-                        if '(' in line and ')' in line:
-                            current_file = line.split('(')[1].split(')')[0]
-                        elif line.strip().endswith('.js'):
-                            current_file = line.split()[-1]
-                    elif line.strip().startswith('# ') and line.strip().endswith('.js'):
-                        current_file = line.strip()[2:]
-                        
-            if line.strip().startswith('```javascript') or line.strip().startswith('```js'):
-                in_code_block = True
-                if '#' in line:
-                    comment = line.split('#', 1)[1].strip()
-                    if comment.endswith('.js'):
-                        current_file = comment
-                continue
-            elif line.strip() == '```' and in_code_block:
-                in_code_block = False
-                if current_content:
-                    if not current_file:
-                        content_str = '\n'.join(current_content)
-                        if 'import React' in content_str or 'function App' in content_str:
-                            current_file = 'App.js'
-                        elif 'export default' in content_str:
-                            current_file = 'component.js'
-                        else:
-                            current_file = 'script.js'
-                    
-                    if current_file.startswith('src/'):
-                        current_file = current_file[4:]
-                        
-                    files.append(GeneratedFile(
-                        path=f"{base_path}{current_file}",
-                        content='\n'.join(current_content),
-                        file_type=file_type,
-                        language="javascript"
-                    ))
-                current_file = None
-                current_content = []
-                continue
-            elif in_code_block:
-                current_content.append(line)
-        
-        return files
-    
-    def _extract_typescript_files(self, content: str, base_path: str, file_type: str = "code") -> List[GeneratedFile]:
-        """Extract TypeScript files from code blocks."""
-        files = []
-        lines = content.split('\n')
-        
-        current_file = None
-        current_content = []
-        in_code_block = False
-        
-        for i, line in enumerate(lines):
-            if not in_code_block and ('.ts' in line or '.tsx' in line):
-                if '/' in line and ('.ts' in line or '.tsx' in line):
-                    if '## ' in line or '### ' in line:
-                        if '(' in line and ')' in line:
-                            current_file = line.split('(')[1].split(')')[0]
-                        elif line.strip().endswith(('.ts', '.tsx')):
-                            current_file = line.split()[-1]
-                    elif line.strip().startswith('# ') and line.strip().endswith(('.ts', '.tsx')):
-                        current_file = line.strip()[2:]
-                        
-            if line.strip().startswith('```typescript') or line.strip().startswith('```ts'):
-                in_code_block = True
-                if '#' in line:
-                    comment = line.split('#', 1)[1].strip()
-                    if comment.endswith(('.ts', '.tsx')):
-                        current_file = comment
-                continue
-            elif line.strip() == '```' and in_code_block:
-                in_code_block = False
-                if current_content:
-                    if not current_file:
-                        content_str = '\n'.join(current_content)
-                        if 'interface ' in content_str or 'type ' in content_str:
-                            current_file = 'types.ts'
-                        elif 'export default' in content_str:
-                            current_file = 'component.ts'
-                        else:
-                            current_file = 'index.ts'
-                    
-                    if current_file.startswith('src/'):
-                        current_file = current_file[4:]
-                        
-                    files.append(GeneratedFile(
-                        path=f"{base_path}{current_file}",
-                        content='\n'.join(current_content),
-                        file_type=file_type,
-                        language="typescript"
-                    ))
-                current_file = None
-                current_content = []
-                continue
-            elif in_code_block:
-                current_content.append(line)
-        
-        return files
+    def parse_backend_implementation(self, content: str, session_id: str) -> List[GeneratedFile]:
+        """Parse backend implementation into individual files."""
+        return self._parse("backend", content)
     
-    def _extract_react_files(self, content: str, base_path: str, file_type: str = "code") -> List[GeneratedFile]:
-        """Extract React component files from code blocks."""
-        files = []
-        lines = content.split('\n')
-        
-        current_file = None
-        current_content = []
-        in_code_block = False
-        
-        for i, line in enumerate(lines):
-            if not in_code_block and ('.jsx' in line or '.tsx' in line or 'components/' in line):
-                if '/' in line and ('.jsx' in line or '.tsx' in line):
-                    if '## ' in line or '### ' in line:
-                        if '(' in line and ')' in line:
-                            current_file = line.split('(')[1].split(')')[0]
-                        elif line.strip().endswith(('.jsx', '.tsx')):
-                            current_file = line.split()[-1]
-                    elif line.strip().startswith('# ') and line.strip().endswith(('.jsx', '.tsx')):
-                        current_file = line.strip()[2:]
-                        
-            if line.strip().startswith('```jsx') or line.strip().startswith('```tsx'):
-                in_code_block = True
-                if '#' in line:
-                    comment = line.split('#', 1)[1].strip()
-                    if comment.endswith(('.jsx', '.tsx')):
-                        current_file = comment
-                continue
-            elif line.strip() == '```' and in_code_block:
-                in_code_block = False
-                if current_content:
-                    if not current_file:
-                        content_str = '\n'.join(current_content)
-                        if 'function App' in content_str or 'const App' in content_str:
-                            current_file = 'App.jsx'
-                        elif 'export default' in content_str:
-                            # Try to extract component name
-                            for content_line in current_content:
-                                if 'const ' in content_line and ' = ' in content_line:
-                                    comp_name = content_line.split('const ')[1].split(' =')[0].strip()
-                                    current_file = f'{comp_name}.jsx'
-                                    break
-                            else:
-                                current_file = 'Component.jsx'
-                        else:
-                            current_file = 'component.jsx'
-                    
-                    if current_file.startswith('src/'):
-                        current_file = current_file[4:]
-                        
-                    files.append(GeneratedFile(
-                        path=f"{base_path}{current_file}",
-                        content='\n'.join(current_content),
-                        file_type=file_type,
-                        language="jsx"
-                    ))
-                current_file = None
-                current_content = []
-                continue
-            elif in_code_block:
-                current_content.append(line)
-        
-        return files
+    def parse_frontend_implementation(self, content: str, session_id: str) -> List[GeneratedFile]:
+        """Parse frontend implementation into individual files."""
+        return self._parse("frontend", content)
     
-    def _extract_style_files(self, content: str, base_path: str, file_type: str = "code") -> List[GeneratedFile]:
-        """Extract CSS/SCSS files from code blocks."""
-        files = []
-        lines = content.split('\n')
-        
-        current_file = None
-        current_content = []
-        in_code_block = False
-        
-        for i, line in enumerate(lines):
-            if not in_code_block and ('.css' in line or '.scss' in line or 'styles/' in line):
-                if '/' in line and ('.css' in line or '.scss' in line):
-                    if '## ' in line or '### ' in line:
-                        if '(' in line and ')' in line:
-                            current_file = line.split('(')[1].split(')')[0]
-                        elif line.strip().endswith(('.css', '.scss')):
-                            current_file = line.split()[-1]
-                    elif line.strip().startswith('# ') and line.strip().endswith(('.css', '.scss')):
-                        current_file = line.strip()[2:]
-                        
-            if line.strip().startswith('```css') or line.strip().startswith('```scss'):
-                in_code_block = True
-                if '#' in line:
-                    comment = line.split('#', 1)[1].strip()
-                    if comment.endswith(('.css', '.scss')):
-                        current_file = comment
-                continue
-            elif line.strip() == '```' and in_code_block:
-                in_code_block = False
-                if current_content:
-                    if not current_file:
-                        current_file = 'styles.css'
-                    
-                    if current_file.startswith('src/'):
-                        current_file = current_file[4:]
-                        
-                    files.append(GeneratedFile(
-                        path=f"{base_path}{current_file}",
-                        content='\n'.join(current_content),
-                        file_type=file_type,
-                        language="css"
-                    ))
-                current_file = None
-                current_content = []
-                continue
-            elif in_code_block:
-                current_content.append(line)
-        
-        return files
+    def parse_test_implementation(self, content: str, session_id: str) -> List[GeneratedFile]:
+        """Parse test implementation into individual files."""
+        return self._parse("test", content)
     
-    def _parse_claude_format_files(self, content: str, base_path: str) -> List[GeneratedFile]:
-        """Parse files in Claude agent format (===== filename =====)."""
-        files = []
-        
+    def _parse(self, kind: str, content: str) -> List[GeneratedFile]:
+        # Guard against None content
         if not content:
-            return files
-        
-        self.logger.info(f"Parsing Claude format files for base_path: {base_path}")
-        
-        lines = content.split('\n')
-        current_file = None
-        current_content = []
-        in_file_section = False
-        
-        for line in lines:
-            # Look for the Claude format: ===== filename =====
-            if line.strip().startswith('=====') and line.strip().endswith('====='):
-                # Save previous file if exists
-                if current_file and current_content:
-                    generated_file = self._create_generated_file(current_file, current_content, base_path)
-                    files.append(generated_file)
-                    self.logger.info(f"Parsed file: {generated_file.path} ({len(generated_file.content)} chars)")
-                
-                # Extract new filename
-                filename = line.strip()[5:-5].strip()  # Remove ===== from both ends
-                current_file = filename
-                current_content = []
-                in_file_section = True
-                self.logger.debug(f"Found Claude format file marker: {filename}")
-                continue
-            
-            # If we're in a file section, collect content
-            if in_file_section and current_file:
-                # Stop collecting if we hit another ===== or reach end
-                if line.strip().startswith('====='):
-                    # This is the start of a new file section, handle it in next iteration
-                    if current_file and current_content:
-                        generated_file = self._create_generated_file(current_file, current_content, base_path)
-                        files.append(generated_file)
-                        self.logger.info(f"Parsed file: {generated_file.path} ({len(generated_file.content)} chars)")
-                    
-                    # Extract new filename
-                    filename = line.strip()[5:-5].strip()
-                    current_file = filename
-                    current_content = []
-                    self.logger.debug(f"Found Claude format file marker: {filename}")
-                    continue
-                else:
-                    current_content.append(line)
-        
-        # Don't forget the last file
-        if current_file and current_content:
-            generated_file = self._create_generated_file(current_file, current_content, base_path)
-            files.append(generated_file)
-            self.logger.info(f"Parsed file: {generated_file.path} ({len(generated_file.content)} chars)")
-        
-        self.logger.info(f"Total Claude format files parsed: {len(files)}")
-        return files
-    
-    def _create_generated_file(self, filename: str, content_lines: List[str], base_path: str) -> GeneratedFile:
-        """Create a GeneratedFile object from filename and content lines."""
-        # Clean up filename - remove any path prefixes that match base_path
-        clean_filename = filename
-        if clean_filename.startswith(base_path):
-            clean_filename = clean_filename[len(base_path):]
-        if clean_filename.startswith('/'):
-            clean_filename = clean_filename[1:]
-        
-        # Determine file type and language
-        file_type = "code"
-        language = "text"
-        
-        if clean_filename.endswith(('.py',)):
-            language = "python"
-        elif clean_filename.endswith(('.js', '.jsx')):
-            language = "javascript"
-        elif clean_filename.endswith(('.ts', '.tsx')):
-            language = "typescript"
-        elif clean_filename.endswith(('.css', '.scss')):
-            language = "css"
-            file_type = "style"
-        elif clean_filename.endswith(('.json',)):
-            language = "json"
-            file_type = "config"
-        elif clean_filename.endswith(('.yml', '.yaml')):
-            language = "yaml"
-            file_type = "config"
-        elif clean_filename.endswith(('.md',)):
-            language = "markdown"
-            file_type = "documentation"
-        elif clean_filename.endswith(('.html',)):
-            language = "html"
-        elif clean_filename.endswith(('.txt',)):
-            file_type = "config"
-        elif 'Dockerfile' in clean_filename:
-            language = "dockerfile"
-            file_type = "config"
-        
-        # Join content and clean up
-        content = '\n'.join(content_lines).strip()
-        
-        return GeneratedFile(
-            path=f"{base_path}{clean_filename}",
-            content=content,
-            file_type=file_type,
-            language=language
-        )
-    
-    def _remove_duplicate_files(self, files: List[GeneratedFile]) -> List[GeneratedFile]:
-        """Remove duplicate files based on file path."""
-        seen_paths = set()
-        unique_files = []
-        
-        for file in files:
-            if file.path not in seen_paths:
-                seen_paths.add(file.path)
-                unique_files.append(file)
-            else:
-                self.logger.debug(f"Removing duplicate file: {file.path}")
-        
-        return unique_files
-    
-    def _parse_structured_files(self, content: str, base_path: str, extensions: List[str]) -> List[GeneratedFile]:
-        """Parse structured file descriptions from AI agent output."""
-        files = []
-        lines = content.split('\n')
-        
-        current_file = None
-        current_content = []
-        in_code_block = False
-        
-        for i, line in enumerate(lines):
-            # Look for file path patterns in various formats
-            if not in_code_block:
-                # Pattern: ## filename.ext or ### filename.ext
-                if line.strip().startswith(('#', '##', '###')) and any(f'.{ext}' in line for ext in extensions):
-                    # Extract filename after markdown header
-                    header_text = line.strip().lstrip('#').strip()
-                    if '(' in header_text and ')' in header_text:
-                        # Pattern: ## File (path/file.py):
-                        current_file = header_text.split('(')[1].split(')')[0]
-                    else:
-                        # Simple pattern: ## file.py
-                        words = header_text.split()
-                        for word in words:
-                            if any(f'.{ext}' in word for ext in extensions):
-                                current_file = word.strip(':')
-                                break
-                
-                # Pattern: src/path/file.py or backend/path/file.py
-                elif '/' in line and any(f'.{ext}' in line for ext in extensions):
-                    words = line.split()
-                    for word in words:
-                        if '/' in word and any(f'.{ext}' in word for ext in extensions):
-                            current_file = word.strip('`').strip(',').strip(':')
-                            # Remove base_path if it's already in the filename
-                            if current_file.startswith(base_path):
-                                current_file = current_file[len(base_path):]
-                            break
-            
-            # Handle code blocks
-            if any(line.strip().startswith(f'```{ext}') for ext in extensions) or line.strip().startswith('```python'):
-                in_code_block = True
-                continue
-            elif line.strip() == '```' and in_code_block:
-                in_code_block = False
-                if current_content and current_file:
-                    files.append(GeneratedFile(
-                        path=f"{base_path}{current_file}",
-                        content='\n'.join(current_content),
-                        file_type="code",
-                        language=extensions[0] if extensions else "text"
-                    ))
-                current_file = None
-                current_content = []
-                continue
-            elif in_code_block:
-                current_content.append(line)
+            return []
         
-        return files
+        stream = self.stream(kind)
+        stream.feed(content)
+        return self.finish(stream)
     
-    def _create_files_from_structure(self, content: str, base_path: str) -> List[GeneratedFile]:
-        """Create files based on file structure documentation in the content."""
+    def _create_files_from_structure(self, mentions: Set[str], base_path: str) -> List[GeneratedFile]:
+        """Create files for the parts of the structure the response mentions."""
         files = []
         
         # Look for common file structure patterns and create basic files
-        if 'main.py' in content and base_path == 'backend/':
+        if 'main.py' in mentions and base_path == 'backend/':
             main_content = self._generate_basic_fastapi_main()
             files.append(GeneratedFile(
                 path=f"{base_path}src/main.py",
@@ -727,7 +490,7 @@ class CodeParser:
                 language="python"
             ))
         
-        if 'models/' in content and base_path == 'backend/':
+        if 'models/' in mentions and base_path == 'backend/':
             user_model = self._generate_basic_user_model()
             files.append(GeneratedFile(
                 path=f"{base_path}src/models/user.py",
@@ -752,7 +515,7 @@ class CodeParser:
                 language="python"
             ))
         
-        if 'api/' in content and base_path == 'backend/':
+        if 'api/' in mentions and base_path == 'backend/':
             auth_api = self._generate_basic_auth_api()
             files.append(GeneratedFile(
                 path=f"{base_path}src/api/auth.py",
@@ -785,7 +548,7 @@ class CodeParser:
                 language="python"
             ))
         
-        if 'core/' in content and base_path == 'backend/':
+        if 'core/' in mentions and base_path == 'backend/':
             config_file = self._generate_basic_config()
             files.append(GeneratedFile(
                 path=f"{base_path}src/core/config.py",
@@ -1183,12 +946,12 @@ npm run build
 Generated on: {datetime.now().isoformat()}
 """
 
-    def _create_frontend_files_from_structure(self, content: str, base_path: str) -> List[GeneratedFile]:
-        """Create frontend files based on file structure documentation."""
+    def _create_frontend_files_from_structure(self, mentions: Set[str], base_path: str) -> List[GeneratedFile]:
+        """Create frontend files for the parts of the structure the response mentions."""
         files = []
         
         # Create basic React app structure
-        if 'App.js' in content or 'React' in content:
+        if 'App.js' in mentions or 'React' in mentions:
             app_content = self._generate_basic_react_app()
             files.append(GeneratedFile(
                 path=f"{base_path}src/App.js",
@@ -1205,7 +968,7 @@ Generated on: {datetime.now().isoformat()}
                 language="javascript"
             ))
         
-        if 'components/' in content:
+        if 'components/' in mentions:
             # Create basic components
             header_content = self._generate_basic_header_component()
             files.append(GeneratedFile(
@@ -1223,7 +986,7 @@ Generated on: {datetime.now().isoformat()}
                 language="javascript"
             ))
         
-        if 'pages/' in content:
+        if 'pages/' in mentions:
             # Create basic pages
             home_page = self._generate_basic_home_page()
             files.append(GeneratedFile(
@@ -1233,7 +996,7 @@ Generated on: {datetime.now().isoformat()}
                 language="javascript"
             ))
         
-        if 'public/' in content:
+        if 'public/' in mentions:
             # Create public files
             index_html = self._generate_basic_index_html()
             files.append(GeneratedFile(
@@ -1475,6 +1238,88 @@ CMD ["npm", "start"]
 '''
 
 
+def parse_implementation(kind: str, content: str, session_id: str) -> List[GeneratedFile]:
+    """
+    Parse a ``backend``, ``frontend`` or ``test`` implementation into files.
+    Module-level so large implementations can be parsed in the process pool.
+    """
+    parsers = {
+        "backend": CodeParser.parse_backend_implementation,
+        "frontend": CodeParser.parse_frontend_implementation,
+        "test": CodeParser.parse_test_implementation
+    }
+    return parsers[kind](CodeParser(), content, session_id)
+
+
+def _write_bytes(path: Path, data: bytes):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _load_manifest(output_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Content hashes of the last write, by path; empty if there is none."""
+    try:
+        with open(output_path / MANIFEST_FILE) as f:
+            return json.load(f).get('files', {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def _link_or_copy(source: Path, target: Path):
+    """Hard-link ``source`` to ``target``, copying where links are not supported."""
+    if source.is_symlink():
+        os.symlink(os.readlink(source), target)
+        return
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _carry_over(old_root: Path, new_root: Path, path: str, entry: Dict[str, Any]) -> bool:
+    """Stage an unchanged file from the previous write, unless it was edited since."""
+    source = old_root / path
+    try:
+        stat = source.stat()
+        if stat.st_size != entry.get('size') or stat.st_mtime_ns != entry.get('mtime_ns'):
+            return False
+        _link_or_copy(source, new_root / path)
+    except OSError:
+        return False
+    return True
+
+
+def _carry_over_untracked(old_root: Path, new_root: Path, tracked: set):
+    """Stage the files of the previous tree that were not written by us."""
+    for dirpath, dirnames, filenames in os.walk(old_root):
+        relative = Path(dirpath).relative_to(old_root)
+        (new_root / relative).mkdir(parents=True, exist_ok=True)
+        for name in [name for name in dirnames if (Path(dirpath) / name).is_symlink()]:
+            dirnames.remove(name)
+            filenames.append(name)
+        for name in filenames:
+            path = (relative / name).as_posix()
+            if path in tracked or path in (MANIFEST_FILE, METADATA_FILE):
+                continue
+            if not (new_root / path).exists():
+                _link_or_copy(old_root / path, new_root / path)
+
+
+def _swap_directory(staging_path: Path, output_path: Path):
+    """Replace ``output_path`` with ``staging_path``, restoring it if the rename fails."""
+    if not output_path.exists():
+        os.rename(staging_path, output_path)
+        return
+    backup_path = output_path.parent / f".{output_path.name}.old-{uuid.uuid4().hex[:8]}"
+    os.rename(output_path, backup_path)
+    try:
+        os.rename(staging_path, output_path)
+    except OSError:
+        os.rename(backup_path, output_path)
+        raise
+    shutil.rmtree(backup_path, ignore_errors=True)
+
+
 class FileOutputManager:
     """Manages file output and project structure generation."""
     
@@ -1489,96 +1334,196 @@ class FileOutputManager:
         
         with TimedOperation("create_project_structure", {"session_id": session_id}):
             files = []
+            for kind, code in self._implementations(workflow_state):
+                files.extend(parse_implementation(kind, code, session_id))
             
-            # Parse backend implementation (use improved version if available)
-            backend_code = workflow_state.get('improved_backend_implementation') or workflow_state.get('backend_implementation')
-            if backend_code:
-                backend_files = self.parser.parse_backend_implementation(
-                    backend_code,
-                    session_id
-                )
-                files.extend(backend_files)
-            
-            # Parse frontend implementation (use improved version if available)
-            frontend_code = workflow_state.get('improved_frontend_implementation') or workflow_state.get('frontend_implementation')
-            if frontend_code:
-                frontend_files = self.parser.parse_frontend_implementation(
-                    frontend_code,
-                    session_id
-                )
-                files.extend(frontend_files)
-            
-            # Parse test implementation
-            if 'test_implementation' in workflow_state:
-                test_files = self.parser.parse_test_implementation(
-                    workflow_state['test_implementation'],
-                    session_id
+            return self._assemble_project(workflow_state, files)
+    
+    async def create_project_structure_async(self, workflow_state: Dict[str, Any]) -> ProjectStructure:
+        """Create the project structure without blocking the event loop; large implementations are parsed in the process pool."""
+        session_id = workflow_state.get('session_id', 'unknown')
+        executors = get_executor_manager()
+        
+        with TimedOperation("create_project_structure", {"session_id": session_id}):
+            parsed = await asyncio.gather(*(
+                executors.run_cpu(
+                    parse_implementation, kind, code, session_id,
+                    task_name=f"parse_{kind}", size_hint=len(code)
                 )
-                files.extend(test_files)
-            
-            # Add documentation files
-            files.extend(self._generate_documentation_files(workflow_state))
-            
-            # Add project configuration files
-            files.extend(self._generate_project_config_files(workflow_state))
-            
-            project = ProjectStructure(
-                name=f"ai-generated-project-{session_id[:8]}",
-                description=workflow_state.get('refined_requirements', 'AI Generated Project')[:200],
-                session_id=session_id,
-                created_at=datetime.now(),
-                files=files,
-                metadata={
-                    'workflow_state': workflow_state,
-                    'generation_time': datetime.now().isoformat(),
-                    'file_count': len(files)
-                }
-            )
+                for kind, code in self._implementations(workflow_state)
+            ))
+            files = [file for kind_files in parsed for file in kind_files]
             
-            self.logger.info(f"Created project structure with {len(files)} files")
-            return project
+            return self._assemble_project(workflow_state, files)
+    
+    def _implementations(self, workflow_state: Dict[str, Any]) -> List[tuple]:
+        """Generated code to parse, as ``(kind, content)`` pairs."""
+        implementations = []
+        
+        # Use improved versions if available
+        backend_code = workflow_state.get('improved_backend_implementation') or workflow_state.get('backend_implementation')
+        if backend_code:
+            implementations.append(("backend", backend_code))
+        
+        frontend_code = workflow_state.get('improved_frontend_implementation') or workflow_state.get('frontend_implementation')
+        if frontend_code:
+            implementations.append(("frontend", frontend_code))
+        
+        if 'test_implementation' in workflow_state:
+            implementations.append(("test", workflow_state['test_implementation']))
+        
+        return implementations
+    
+    def _assemble_project(self, workflow_state: Dict[str, Any], files: List[GeneratedFile]) -> ProjectStructure:
+        """Add documentation and configuration files to the parsed files."""
+        session_id = workflow_state.get('session_id', 'unknown')
+        
+        # Add documentation files
+        files.extend(self._generate_documentation_files(workflow_state))
+        
+        # Add project configuration files
+        files.extend(self._generate_project_config_files(workflow_state))
+        
+        project = ProjectStructure(
+            name=f"ai-generated-project-{session_id[:8]}",
+            description=workflow_state.get('refined_requirements', 'AI Generated Project')[:200],
+            session_id=session_id,
+            created_at=datetime.now(),
+            files=files,
+            metadata={
+                'workflow_state': workflow_state,
+                'generation_time': datetime.now().isoformat(),
+                'file_count': len(files)
+            }
+        )
+        
+        self.logger.info(f"Created project structure with {len(files)} files")
+        return project
     
     def write_project_to_disk(self, project: ProjectStructure, output_dir: Optional[str] = None) -> str:
         """Write complete project structure to disk."""
+        return self.materialize_project(project, output_dir).path
+    
+    async def write_project_to_disk_async(self, project: ProjectStructure, output_dir: Optional[str] = None) -> str:
+        """Write the project on the I/O thread pool instead of the event loop."""
+        return (await self.materialize_project_async(project, output_dir)).path
+    
+    def materialize_project(self, project: ProjectStructure, output_dir: Optional[str] = None) -> WriteResult:
+        """
+        Write the project incrementally. Files unchanged since the last write
+        (per the manifest of content hashes) are carried over, the rest are
+        written concurrently into a staging directory, and the staging
+        directory then replaces the output directory in one rename.
+        """
+        with TimedOperation("write_project_to_disk", {"project": project.name}), \
+                get_process_monitor().track_time("file_io", project.session_id):
+            plan = self._plan_write(project, output_dir)
+            try:
+                with ThreadPoolExecutor(max_workers=self.config.executor_io_workers,
+                                        thread_name_prefix="project-write") as pool:
+                    list(pool.map(lambda item: _write_bytes(plan.staging_path / item[0], item[1]), plan.pending))
+                return self._commit_write(project, plan)
+            except Exception as e:
+                self.logger.error(f"Failed to write project {project.name}: {str(e)}")
+                shutil.rmtree(plan.staging_path, ignore_errors=True)
+                raise
+    
+    async def materialize_project_async(self, project: ProjectStructure, output_dir: Optional[str] = None) -> WriteResult:
+        """Incremental project write with the file writes spread over the I/O thread pool."""
+        executors = get_executor_manager()
+        with TimedOperation("write_project_to_disk", {"project": project.name}), \
+                get_process_monitor().track_time("file_io", project.session_id):
+            plan = await executors.run_io(self._plan_write, project, output_dir, task_name="plan_project_write")
+            try:
+                results = await asyncio.gather(*(
+                    executors.run_io(_write_bytes, plan.staging_path / path, data, task_name="write_project_file")
+                    for path, data in plan.pending
+                ), return_exceptions=True)
+                errors = [result for result in results if isinstance(result, BaseException)]
+                if errors:
+                    raise errors[0]
+                return await executors.run_io(self._commit_write, project, plan, task_name="commit_project_write")
+            except Exception as e:
+                self.logger.error(f"Failed to write project {project.name}: {str(e)}")
+                shutil.rmtree(plan.staging_path, ignore_errors=True)
+                raise
+    
+    def _plan_write(self, project: ProjectStructure, output_dir: Optional[str]) -> _WritePlan:
+        """Compare the project with the last write and stage everything that needs no rewrite."""
         if output_dir is None:
             output_dir = os.path.join(self.config.output_dir, project.name)
-        
         output_path = Path(output_dir)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        previous = _load_manifest(output_path)
         
-        with TimedOperation("write_project_to_disk", {"project": project.name}):
-            # Create base directory
-            output_path.mkdir(parents=True, exist_ok=True)
-            
-            # Write all files
-            for file in project.files:
-                file_path = output_path / file.path
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                try:
-                    with open(file_path, 'w', encoding=file.encoding) as f:
-                        f.write(file.content)
-                    
-                    self.logger.debug(f"Wrote file: {file.path}")
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to write file {file.path}: {str(e)}")
-                    raise
+        # Later duplicates of a path win, as when files were written in order
+        contents = {file.path: file.content.encode(file.encoding) for file in project.files}
+        
+        staging_path = Path(tempfile.mkdtemp(prefix=f".{output_path.name}.staging-", dir=output_path.parent))
+        try:
+            for directory in sorted({(staging_path / path).parent for path in contents}):
+                directory.mkdir(parents=True, exist_ok=True)
             
-            # Write project metadata
-            metadata_path = output_path / 'project_metadata.json'
-            with open(metadata_path, 'w') as f:
-                metadata = {
-                    'name': project.name,
-                    'description': project.description,
-                    'session_id': project.session_id,
-                    'created_at': project.created_at.isoformat(),
-                    'file_count': len(project.files),
-                    'metadata': project.metadata
-                }
-                json.dump(metadata, f, indent=2)
+            pending = []
+            manifest = {}
+            for path, data in contents.items():
+                digest = hashlib.sha256(data).hexdigest()
+                entry = previous.get(path)
+                if entry and entry.get('sha256') == digest and _carry_over(output_path, staging_path, path, entry):
+                    manifest[path] = dict(entry)
+                else:
+                    pending.append((path, data))
+                    manifest[path] = {'sha256': digest}
             
-            self.logger.info(f"Project written to disk: {output_path}")
-            return str(output_path)
+            # Keep files the manifest does not know about (a .git directory, hand-made files)
+            if output_path.is_dir():
+                _carry_over_untracked(output_path, staging_path, set(previous) | set(contents))
+        except Exception:
+            shutil.rmtree(staging_path, ignore_errors=True)
+            raise
+        
+        return _WritePlan(
+            output_path=output_path,
+            staging_path=staging_path,
+            pending=pending,
+            manifest=manifest,
+            skipped=len(contents) - len(pending),
+            deleted=len(set(previous) - set(contents))
+        )
+    
+    def _commit_write(self, project: ProjectStructure, plan: _WritePlan) -> WriteResult:
+        """Write the metadata and manifest, then swap the staging directory in."""
+        for path, entry in plan.manifest.items():
+            stat = (plan.staging_path / path).stat()
+            entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        
+        with open(plan.staging_path / METADATA_FILE, 'w') as f:
+            metadata = {
+                'name': project.name,
+                'description': project.description,
+                'session_id': project.session_id,
+                'created_at': project.created_at.isoformat(),
+                'file_count': len(project.files),
+                'metadata': project.metadata
+            }
+            json.dump(metadata, f, indent=2)
+        
+        with open(plan.staging_path / MANIFEST_FILE, 'w') as f:
+            json.dump({'version': 1, 'files': plan.manifest}, f, indent=2)
+        
+        _swap_directory(plan.staging_path, plan.output_path)
+        
+        result = WriteResult(
+            path=str(plan.output_path),
+            written=len(plan.pending),
+            skipped=plan.skipped,
+            deleted=plan.deleted
+        )
+        self.logger.info(
+            f"Project written to disk: {plan.output_path} "
+            f"({result.written} written, {result.skipped} unchanged, {result.deleted} deleted)"
+        )
+        return result
     
     def _generate_documentation_files(self, workflow_state: Dict[str, Any]) -> List[GeneratedFile]:
         """Generate project documentation files."""
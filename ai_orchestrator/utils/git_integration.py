@@ -2,12 +2,12 @@
 Git integration for automated repository management and GitHub integration.
 """
 
+import asyncio
 import os
-import subprocess
 import tempfile
 import shutil
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 import logging
@@ -32,7 +32,13 @@ except ImportError:
 
 from ..core.config import get_config
 from .logging_config import get_logger, TimedOperation
+from .executors import get_executor_manager
 from .file_manager import ProjectStructure
+from .git_mirror import git_auth_env
+from .github_scheduler import get_github_scheduler
+
+
+DEFAULT_GIT_USER = ("AI Orchestrator", "ai-orchestrator@example.com")
 
 
 @dataclass
@@ -56,7 +62,15 @@ class CommitInfo:
 
 
 class GitManager:
-    """Manages Git operations for AI-generated projects."""
+    """
+    Manages Git operations for AI-generated projects.
+    
+    The ``*_async`` methods run the git CLI with
+    ``asyncio.create_subprocess_exec`` and never block the event loop; the
+    synchronous methods use GitPython. Commits fall back to a default
+    identity through the environment when none is configured, so nothing is
+    written to the user's global git config.
+    """
     
     def __init__(self):
         self.config = get_config()
@@ -65,24 +79,140 @@ class GitManager:
         if not GIT_AVAILABLE:
             self.logger.warning("GitPython not available. Git operations will be disabled.")
         
-        # Configure Git user if not set
-        self._configure_git_user()
+        # GitPython handles per repository path, and the identity env once resolved
+        self._repos: Dict[str, Any] = {}
+        self._identity_env: Optional[Dict[str, str]] = None
+    
+    def _get_repo(self, repo_path: str):
+        """Cached GitPython handle of a repository."""
+        key = os.path.realpath(repo_path)
+        repo = self._repos.get(key)
+        if repo is None:
+            repo = self._repos[key] = Repo(key)
+        return repo
+    
+    def _default_actor(self, repo):
+        """Default commit identity when the repository has no user configured, else None."""
+        with repo.config_reader() as reader:
+            if reader.has_option("user", "name") and reader.has_option("user", "email"):
+                return None
+        return git.Actor(*DEFAULT_GIT_USER)
+    
+    async def _git(self, repo_path: str, *args: str, input: Optional[bytes] = None,
+                   env: Optional[Dict[str, str]] = None, check: bool = True) -> str:
+        """Run a git command in ``repo_path`` without blocking the event loop."""
+        process = await asyncio.create_subprocess_exec(
+            "git", *args,
+            cwd=repo_path,
+            stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0", **(env or {})}
+        )
+        stdout, stderr = await process.communicate(input)
+        if check and process.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {stderr.decode(errors='replace').strip()}")
+        return stdout.decode(errors="replace")
+    
+    async def _commit_env(self, repo_path: str) -> Dict[str, str]:
+        """Author and committer variables when git has no identity configured."""
+        if self._identity_env is None:
+            name = (await self._git(repo_path, "config", "user.name", check=False)).strip()
+            email = (await self._git(repo_path, "config", "user.email", check=False)).strip()
+            default_name, default_email = DEFAULT_GIT_USER
+            self._identity_env = {} if name and email else {
+                "GIT_AUTHOR_NAME": default_name, "GIT_AUTHOR_EMAIL": default_email,
+                "GIT_COMMITTER_NAME": default_name, "GIT_COMMITTER_EMAIL": default_email
+            }
+        return self._identity_env
+    
+    async def add_files_async(self, repo_path: str, paths: Optional[Sequence[str]] = None):
+        """Stage ``paths`` (all changes when None) with a single git process."""
+        if paths is None:
+            await self._git(repo_path, "add", "-A")
+        elif paths:
+            pathspec = "\0".join(paths).encode("utf-8")
+            await self._git(repo_path, "add", "-A", "--pathspec-from-file=-", "--pathspec-file-nul", input=pathspec)
+    
+    async def initialize_repository_async(self, project_path: str, project: ProjectStructure) -> GitRepository:
+        """Initialize a Git repository for the project and commit it, without blocking the loop."""
+        with TimedOperation("initialize_git_repo", {"project": project.name}):
+            try:
+                await self._git(project_path, "init", "--quiet")
+                if not (await self._git(project_path, "rev-parse", "--verify", "--quiet", "HEAD", check=False)).strip():
+                    await self._git(project_path, "symbolic-ref", "HEAD", "refs/heads/main")
+                
+                gitignore_path = Path(project_path) / '.gitignore'
+                if not gitignore_path.exists():
+                    await get_executor_manager().run_io(self._create_default_gitignore, gitignore_path)
+                
+                await self.add_files_async(project_path)
+                commit_hash = await self._commit_staged(project_path, self._generate_commit_message(project))
+                branch = (await self._git(project_path, "symbolic-ref", "--short", "HEAD")).strip()
+                
+                git_repo = GitRepository(
+                    local_path=project_path,
+                    branch=branch,
+                    commit_hash=commit_hash
+                )
+                
+                self.logger.info(f"Initialized Git repository: {project_path}")
+                return git_repo
+                
+            except Exception as e:
+                self.logger.error(f"Failed to initialize Git repository: {str(e)}")
+                raise
     
-    def _configure_git_user(self):
-        """Configure Git user for commits."""
+    async def commit_changes_async(self, repo_path: str, message: Optional[str] = None,
+                                   paths: Optional[Sequence[str]] = None) -> Optional[CommitInfo]:
+        """Commit changes (only ``paths`` when given) without blocking the loop; None if nothing changed."""
         try:
-            # Check if Git user is configured
-            result = subprocess.run(['git', 'config', 'user.name'], 
-                                  capture_output=True, text=True)
-            if result.returncode != 0:
-                # Set default user
-                subprocess.run(['git', 'config', '--global', 'user.name', 'AI Orchestrator'], 
-                             check=True)
-                subprocess.run(['git', 'config', '--global', 'user.email', 'ai-orchestrator@example.com'], 
-                             check=True)
-                self.logger.info("Configured default Git user")
-        except subprocess.CalledProcessError as e:
-            self.logger.warning(f"Failed to configure Git user: {str(e)}")
+            await self.add_files_async(repo_path, paths)
+            
+            if not message:
+                message = f"Auto-commit: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            
+            commit_hash = await self._commit_staged(repo_path, message, allow_empty=False)
+            if commit_hash is None:
+                self.logger.info("No changes to commit")
+                return None
+            
+            author, timestamp = (await self._git(repo_path, "log", "-1", "--format=%an <%ae>%n%ct", commit_hash)).splitlines()
+            changed = await self._git(repo_path, "diff-tree", "--root", "--no-commit-id", "--name-only", "-r", "-z", commit_hash)
+            
+            commit_info = CommitInfo(
+                hash=commit_hash,
+                message=message.strip(),
+                author=author,
+                timestamp=datetime.fromtimestamp(int(timestamp)),
+                files_changed=[path for path in changed.split("\0") if path]
+            )
+            
+            self.logger.info(f"Committed changes: {commit_hash[:8]} - {message}")
+            return commit_info
+            
+        except Exception as e:
+            self.logger.error(f"Failed to commit changes: {str(e)}")
+            raise
+    
+    async def create_branch_async(self, repo_path: str, branch_name: str) -> str:
+        """Create and checkout a new branch without blocking the loop."""
+        try:
+            await self._git(repo_path, "checkout", "--quiet", "-b", branch_name)
+            self.logger.info(f"Created and checked out branch: {branch_name}")
+            return branch_name
+        except Exception as e:
+            self.logger.error(f"Failed to create branch: {str(e)}")
+            raise
+    
+    async def _commit_staged(self, repo_path: str, message: str, allow_empty: bool = True) -> Optional[str]:
+        """Commit the index and return the new HEAD; with nothing staged, HEAD (or None if not ``allow_empty``)."""
+        head = (await self._git(repo_path, "rev-parse", "--verify", "--quiet", "HEAD", check=False)).strip() or None
+        if not await self._git(repo_path, "diff", "--cached", "--name-only", "-z"):
+            return head if allow_empty else None
+        await self._git(repo_path, "commit", "--quiet", "--no-verify", "-F", "-",
+                        input=message.encode("utf-8"), env=await self._commit_env(repo_path))
+        return (await self._git(repo_path, "rev-parse", "HEAD")).strip()
     
     def initialize_repository(self, project_path: str, project: ProjectStructure) -> GitRepository:
         """Initialize a Git repository for the project."""
@@ -93,6 +223,7 @@ class GitManager:
             try:
                 # Initialize repository
                 repo = Repo.init(project_path)
+                self._repos[os.path.realpath(project_path)] = repo
                 
                 # Create .gitignore if not exists
                 gitignore_path = Path(project_path) / '.gitignore'
@@ -104,7 +235,8 @@ class GitManager:
                 
                 # Initial commit
                 commit_message = self._generate_commit_message(project)
-                commit = repo.index.commit(commit_message)
+                actor = self._default_actor(repo)
+                commit = repo.index.commit(commit_message, author=actor, committer=actor)
                 
                 git_repo = GitRepository(
                     local_path=project_path,
@@ -125,7 +257,7 @@ class GitManager:
             raise RuntimeError("GitPython not available")
         
         try:
-            repo = Repo(repo_path)
+            repo = self._get_repo(repo_path)
             
             # Check for changes
             if not repo.is_dirty() and not repo.untracked_files:
@@ -140,7 +272,8 @@ class GitManager:
                 message = f"Auto-commit: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
             
             # Commit
-            commit = repo.index.commit(message)
+            actor = self._default_actor(repo)
+            commit = repo.index.commit(message, author=actor, committer=actor)
             
             commit_info = CommitInfo(
                 hash=commit.hexsha,
@@ -163,7 +296,7 @@ class GitManager:
             raise RuntimeError("GitPython not available")
         
         try:
-            repo = Repo(repo_path)
+            repo = self._get_repo(repo_path)
             
             # Create new branch
             new_branch = repo.create_head(branch_name)
@@ -259,10 +392,16 @@ class GitHubIntegration:
             self.github_client = None
         elif self.config.git.github_token:
             try:
-                self.github_client = Github(self.config.git.github_token)
+                # Pacing and rate-limit retries are left to the shared GitHub scheduler
+                self.github_client = Github(
+                    self.config.git.github_token,
+                    retry=None,
+                    seconds_between_requests=None,
+                    seconds_between_writes=None
+                )
                 # Test authentication
-                user = self.github_client.get_user()
-                self.logger.info(f"GitHub integration initialized for user: {user.login}")
+                login = self._call("GET", "/user", lambda: self.github_client.get_user().login)
+                self.logger.info(f"GitHub integration initialized for user: {login}")
             except Exception as e:
                 self.logger.error(f"Failed to initialize GitHub client: {str(e)}")
                 self.github_client = None
@@ -270,6 +409,18 @@ class GitHubIntegration:
             self.logger.info("No GitHub token provided. GitHub operations will be disabled.")
             self.github_client = None
     
+    def _call(self, method: str, path: str, func):
+        """Run a PyGithub call through the shared GitHub scheduler and record the quota it saw."""
+        scheduler = get_github_scheduler()
+        token = self.config.git.github_token
+        result = scheduler.run_sync(token, method, path, func)
+        
+        requester = self.github_client.requester
+        remaining, limit = requester.rate_limiting
+        if limit >= 0:
+            scheduler.update_quota(token, remaining, limit, requester.rate_limiting_resettime)
+        return result
+    
     def create_repository(self, project: ProjectStructure, 
                          repo_name: Optional[str] = None,
                          private: bool = True,
@@ -290,7 +441,7 @@ class GitHubIntegration:
                 user = self.github_client.get_user()
                 
                 # Create repository
-                repo = user.create_repo(
+                repo = self._call("POST", "/user/repos", lambda: user.create_repo(
                     name=repo_name,
                     description=description,
                     private=private,
@@ -298,7 +449,7 @@ class GitHubIntegration:
                     has_issues=True,
                     has_wiki=True,
                     has_downloads=True
-                )
+                ))
                 
                 repo_info = {
                     "name": repo.name,
@@ -343,6 +494,32 @@ class GitHubIntegration:
                 self.logger.error(f"Failed to push to GitHub: {str(e)}")
                 return False
     
+    async def push_to_github_async(self, local_repo_path: str, github_repo_url: str,
+                                   branch: str = "main") -> bool:
+        """Push local repository to GitHub with the git CLI, without blocking the loop."""
+        with TimedOperation("push_to_github", {"repo_url": github_repo_url}):
+            try:
+                # The token goes in an HTTP header through the environment, never in the URL or config
+                process = await asyncio.create_subprocess_exec(
+                    "git", "push", "--porcelain", github_repo_url, f"refs/heads/{branch}:refs/heads/{branch}",
+                    cwd=local_repo_path,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    env={**os.environ, "GIT_TERMINAL_PROMPT": "0",
+                         **git_auth_env(self.config.git.github_token, github_repo_url)}
+                )
+                _, stderr = await process.communicate()
+                if process.returncode != 0:
+                    raise RuntimeError(stderr.decode(errors="replace").strip())
+                
+                self.logger.info(f"Pushed to GitHub: {github_repo_url}")
+                return True
+                
+            except Exception as e:
+                self.logger.error(f"Failed to push to GitHub: {str(e)}")
+                return False
+    
     def create_release(self, repo_full_name: str, tag_name: str, 
                       release_name: str, description: str) -> Dict[str, Any]:
         """Create a GitHub release."""
@@ -350,15 +527,15 @@ class GitHubIntegration:
             raise RuntimeError("GitHub client not available")
         
         try:
-            repo = self.github_client.get_repo(repo_full_name)
+            repo = self._call("GET", f"/repos/{repo_full_name}", lambda: self.github_client.get_repo(repo_full_name))
             
-            release = repo.create_git_release(
+            release = self._call("POST", f"/repos/{repo_full_name}/releases", lambda: repo.create_git_release(
                 tag=tag_name,
                 name=release_name,
                 message=description,
                 draft=False,
                 prerelease=False
-            )
+            ))
             
             release_info = {
                 "id": release.id,
@@ -381,13 +558,13 @@ class GitHubIntegration:
             raise RuntimeError("GitHub client not available")
         
         try:
-            repo = self.github_client.get_repo(repo_full_name)
+            repo = self._call("GET", f"/repos/{repo_full_name}", lambda: self.github_client.get_repo(repo_full_name))
             
             # Add AI-related topics
             default_topics = ["ai-generated", "automated", "ai-orchestration"]
             all_topics = list(set(default_topics + topics))
             
-            repo.replace_topics(all_topics)
+            self._call("PUT", f"/repos/{repo_full_name}/topics", lambda: repo.replace_topics(all_topics))
             
             self.logger.info(f"Added topics to repository: {', '.join(all_topics)}")
             
@@ -460,6 +637,64 @@ class ProjectPublisher:
         
         return publish_result
     
+    async def publish_project_async(self, project: ProjectStructure, project_path: str,
+                                    push_to_github: bool = None) -> Dict[str, Any]:
+        """Complete project publishing workflow, keeping the event loop free throughout."""
+        if push_to_github is None:
+            push_to_github = self.config.git.auto_push
+        
+        publish_result = {
+            "local_repo": None,
+            "github_repo": None,
+            "success": False,
+            "errors": []
+        }
+        run_io = get_executor_manager().run_io
+        git_available = shutil.which("git") is not None
+        
+        try:
+            # Initialize Git repository
+            if git_available:
+                git_repo = await self.git_manager.initialize_repository_async(project_path, project)
+                publish_result["local_repo"] = {
+                    "path": git_repo.local_path,
+                    "commit_hash": git_repo.commit_hash
+                }
+                self.logger.info("Git repository initialized")
+            
+            # Push to GitHub if enabled
+            if push_to_github and self.github_integration.github_client:
+                # PyGithub is synchronous, so its calls go to the I/O pool
+                github_repo = await run_io(
+                    self.github_integration.create_repository, project, task_name="create_github_repository"
+                )
+                
+                if git_available:
+                    success = await self.github_integration.push_to_github_async(
+                        project_path,
+                        github_repo["clone_url"]
+                    )
+                    
+                    if success:
+                        publish_result["github_repo"] = github_repo
+                        
+                        topics = self._extract_topics_from_project(project)
+                        await run_io(
+                            self.github_integration.add_repository_topics, github_repo["full_name"], topics,
+                            task_name="add_repository_topics"
+                        )
+                        
+                        self.logger.info(f"Project published to GitHub: {github_repo['html_url']}")
+            
+            publish_result["success"] = True
+            
+        except Exception as e:
+            error_msg = f"Failed to publish project: {str(e)}"
+            self.logger.error(error_msg)
+            publish_result["errors"].append(error_msg)
+        
+        return publish_result
+    
     def _extract_topics_from_project(self, project: ProjectStructure) -> List[str]:
         """Extract relevant topics from project structure."""
         topics = []
@@ -0,0 +1,219 @@
+"""
+Local bare git mirror used to publish micro-phases with ``git push``.
+
+Commits are built in-process with ``git fast-import``: file contents are
+streamed straight into the object database on top of the base branch, so
+there is no working tree, no checkout and no per-file API call. Branches
+accumulate in the mirror and go to the remote in a single ``git push`` at
+checkpoints. Pushes never force: a branch is replaced only while it is
+still where this mirror last pushed it (``--force-with-lease``, with the
+pushed heads kept under ``refs/pushed/``), so work others pushed to it is
+reported back as rejected instead of overwritten.
+
+The GitHub token is passed to git through ``GIT_CONFIG_*`` environment
+variables as an HTTP header, so it never appears in a command line, a URL
+or the mirror's config.
+"""
+
+import base64
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .logging_config import get_logger
+
+
+class GitMirrorError(Exception):
+    """A git command of the mirror failed."""
+
+
+def _quote_path(path: str) -> str:
+    """Path as fast-import expects it, C-quoted when needed."""
+    if path.startswith('"') or "\n" in path:
+        return '"' + path.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+    return path
+
+
+def git_auth_env(token: Optional[str], remote_url: str) -> Dict[str, str]:
+    """Environment passing ``token`` to git as an HTTP header for an https remote."""
+    if not token or not remote_url.startswith("https://"):
+        return {}
+    credentials = base64.b64encode(f"x-access-token:{token}".encode()).decode()
+    return {
+        "GIT_CONFIG_COUNT": "1",
+        "GIT_CONFIG_KEY_0": "http.extraHeader",
+        "GIT_CONFIG_VALUE_0": f"AUTHORIZATION: basic {credentials}"
+    }
+
+
+def _data(payload: bytes) -> bytes:
+    return b"data %d\n" % len(payload) + payload + b"\n"
+
+
+class GitMirror:
+    """Bare repository of one session, committing with fast-import and pushing in batches."""
+
+    def __init__(self, path: str, remote_url: str, token: Optional[str] = None,
+                 author_name: str = "AI Orchestrator", author_email: str = "ai-orchestrator@example.com"):
+        self.path = path
+        self.remote_url = remote_url
+        self.token = token
+        self.author = f"{author_name} <{author_email}>"
+        self.logger = get_logger("git_mirror")
+        self._fetched: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def commit_phases(self, branch: str, base_branch: str,
+                      phases: Sequence[Tuple[Dict[str, str], str]]) -> List[str]:
+        """
+        Commit ``(files, message)`` phases in order on top of ``base_branch``
+        and point ``branch`` at the last one. Returns the commit SHAs.
+        """
+        with self._lock:
+            self._ensure()
+            parent = self._base(base_branch)
+            stream = []
+            for mark, (files, message) in enumerate(phases, start=1):
+                stream.append(f"commit refs/heads/{branch}\nmark :{mark}\n".encode())
+                stream.append(f"committer {self.author} {int(time.time())} +0000\n".encode())
+                stream.append(_data(message.encode("utf-8")))
+                stream.append(f"from {parent}\n".encode())
+                for path, content in files.items():
+                    stream.append(f"M 100644 inline {_quote_path(path)}\n".encode("utf-8"))
+                    stream.append(_data(content.encode("utf-8")))
+                stream.append(b"\n")
+                parent = f":{mark}"
+
+            marks_fd, marks_path = tempfile.mkstemp(prefix="marks-", dir=self.path)
+            os.close(marks_fd)
+            try:
+                self._git("fast-import", "--quiet", "--force", f"--export-marks={marks_path}", input=b"".join(stream))
+                with open(marks_path) as marks_file:
+                    marks = dict(line.split() for line in marks_file if line.strip())
+            finally:
+                os.unlink(marks_path)
+            return [marks[f":{mark}"] for mark in range(1, len(phases) + 1)]
+
+    def push(self, branches: Sequence[str]) -> Dict[str, str]:
+        """
+        Push ``branches`` to the remote in one ``git push``. A branch this
+        mirror pushed before may be rebuilt as long as nobody else moved it
+        since; other branches only fast-forward. Returns the rejected
+        branches with git's reason; the others are on the remote. Branches
+        this mirror does not have (e.g. committed in another worker's mirror)
+        are not pushed and come back as rejected.
+        """
+        if not branches:
+            return {}
+        with self._lock:
+            self._ensure()
+            local = set(self._git("for-each-ref", "--format=%(refname:lstrip=2)", "refs/heads").split())
+            rejected = {branch: "not in the local mirror" for branch in branches if branch not in local}
+            branches = [branch for branch in branches if branch not in rejected]
+            if not branches:
+                self.logger.warning(f"Nothing to push, missing from {self.path}: {', '.join(rejected)}")
+                return rejected
+            leases = [
+                f"--force-with-lease=refs/heads/{branch}:{pushed}"
+                for branch, pushed in ((branch, self._pushed(branch)) for branch in branches) if pushed
+            ]
+            refspecs = [f"refs/heads/{branch}:refs/heads/{branch}" for branch in branches]
+            started_at = time.perf_counter()
+            results = self._push(*leases, *refspecs)
+            # The base may move once our branches are merged, so look it up again next time
+            self._fetched.clear()
+
+            for branch in branches:
+                flag, summary = results.get(f"refs/heads/{branch}", ("!", "no result from git push"))
+                if flag == "!":
+                    rejected[branch] = summary
+            pushed = [branch for branch in branches if branch not in rejected]
+            if pushed:
+                self._git("update-ref", "--stdin", input="".join(
+                    f"update refs/pushed/{branch} refs/heads/{branch}\n" for branch in pushed
+                ).encode())
+            if rejected:
+                self.logger.warning(f"Push rejected for {', '.join(f'{b} {r}' for b, r in rejected.items())}")
+            self.logger.info(f"Pushed {len(pushed)} branch(es) from {self.path} in {time.perf_counter() - started_at:.2f}s")
+            return rejected
+
+    def delete_branches(self, branches: Sequence[str]) -> Dict[str, str]:
+        """
+        Delete ``branches`` on the remote in one ``git push``. Returns the
+        branches git could not delete with its reason; the others are gone.
+        """
+        if not branches:
+            return {}
+        with self._lock:
+            self._ensure()
+            started_at = time.perf_counter()
+            results = self._push(*(f":refs/heads/{branch}" for branch in branches))
+            failed = {}
+            for branch in branches:
+                flag, summary = results.get(f"refs/heads/{branch}", ("!", "no result from git push"))
+                if flag == "!":
+                    failed[branch] = summary
+            self.logger.info(f"Deleted {len(branches) - len(failed)} remote branch(es) in {time.perf_counter() - started_at:.2f}s")
+            return failed
+
+    def head(self, branch: str) -> Optional[str]:
+        """SHA of a branch in the mirror, or None."""
+        return self._resolve(f"refs/heads/{branch}")
+
+    def _pushed(self, branch: str) -> Optional[str]:
+        """Where this mirror last pushed ``branch`` to, or None."""
+        return self._resolve(f"refs/pushed/{branch}")
+
+    def _resolve(self, ref: str) -> Optional[str]:
+        try:
+            return self._git("rev-parse", "--verify", "--quiet", ref).strip() or None
+        except GitMirrorError:
+            return None
+
+    def _push(self, *args: str) -> Dict[str, Tuple[str, str]]:
+        """
+        ``git push --porcelain`` to the remote. Returns ``(flag, summary)``
+        per remote ref; a ref git could not update has flag "!". Raises
+        GitMirrorError only when the push failed as a whole.
+        """
+        result = self._run("push", "--porcelain", self.remote_url, *args, remote=True)
+        refs = {}
+        for line in result.stdout.decode(errors="replace").splitlines():
+            parts = line.split("\t")
+            if len(parts) == 3 and len(parts[0]) == 1:
+                refs[parts[1].rsplit(":", 1)[-1]] = (parts[0], parts[2])
+        if result.returncode != 0 and not refs:
+            raise GitMirrorError(f"git push failed: {result.stderr.decode(errors='replace').strip()}")
+        return refs
+
+    def _ensure(self):
+        if not os.path.isdir(os.path.join(self.path, "objects")):
+            os.makedirs(self.path, exist_ok=True)
+            self._git("init", "--bare", "--quiet")
+
+    def _base(self, base_branch: str) -> str:
+        """Head of the base branch on the remote, fetched once between pushes."""
+        if base_branch not in self._fetched:
+            self._git("fetch", "--quiet", "--no-tags", self.remote_url,
+                      f"+refs/heads/{base_branch}:refs/heads/{base_branch}", remote=True)
+            self._fetched[base_branch] = self.head(base_branch)
+        return self._fetched[base_branch]
+
+    def _git(self, *args: str, input: Optional[bytes] = None, remote: bool = False) -> str:
+        result = self._run(*args, input=input, remote=remote)
+        if result.returncode != 0:
+            error = result.stderr.decode(errors="replace").strip()
+            raise GitMirrorError(f"git {args[0]} failed: {error}")
+        return result.stdout.decode(errors="replace")
+
+    def _run(self, *args: str, input: Optional[bytes] = None, remote: bool = False) -> subprocess.CompletedProcess:
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+        if remote:
+            env.update(git_auth_env(self.token, self.remote_url))
+        return subprocess.run(
+            ["git", "--git-dir", self.path, *args],
+            input=input, capture_output=True, env=env
+        )
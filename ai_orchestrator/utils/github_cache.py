@@ -0,0 +1,171 @@
+"""
+Conditional-request cache for GitHub API reads.
+
+GET responses are kept with their ``ETag``/``Last-Modified`` validators.
+Within its resource's TTL a cached response is served without any request;
+after that it is revalidated with ``If-None-Match``, and a ``304 Not
+Modified`` (which GitHub does not charge against the rate limit) refreshes
+it. Content-addressed objects (commits, trees and blobs by SHA) and the
+token's own login never change and are never revalidated.
+
+Our own writes mark every cached read of the repository they touch as
+stale, so the next read revalidates instead of trusting its TTL.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Mapping, Optional, Pattern, Tuple
+
+from .github_scheduler import GitHubScheduler
+from .logging_config import get_metrics_collector
+
+
+# (path pattern, resource, TTL in seconds); the first match wins, None never expires
+RESOURCE_TTLS: List[Tuple[Pattern, str, Optional[float]]] = [
+    (re.compile(r"^/user$"), "user", None),
+    (re.compile(r"^/repos/[^/]+/[^/]+/git/(commits|trees|blobs)/[0-9a-f]{40}$"), "object", None),
+    (re.compile(r"^/repos/[^/]+/[^/]+/commits/[0-9a-f]{40}$"), "object", None),
+    (re.compile(r"^/repos/[^/]+/[^/]+/git/(ref|refs)/"), "ref", 0.0),
+    (re.compile(r"^/repos/[^/]+/[^/]+/branches/."), "ref", 0.0),
+    (re.compile(r"^/repos/[^/]+/[^/]+/commits/[^/]+/(status|statuses|check-runs)$"), "status", 10.0),
+    (re.compile(r"^/repos/[^/]+/[^/]+/actions/"), "actions", 10.0),
+    (re.compile(r"^/repos/[^/]+/[^/]+/pulls"), "pulls", 30.0),
+    (re.compile(r"^/repos/[^/]+/[^/]+/branches"), "branches", 30.0),
+    (re.compile(r"^/repos/[^/]+/[^/]+$"), "repo", 300.0),
+]
+DEFAULT_TTL = 60.0
+
+
+def resource_ttl(path: str) -> Tuple[str, Optional[float]]:
+    """Resource class and TTL of a GitHub API path."""
+    for pattern, resource, ttl in RESOURCE_TTLS:
+        if pattern.match(path):
+            return resource, ttl
+    return "other", DEFAULT_TTL
+
+
+def _scope(path: str) -> str:
+    """Part of a path whose cached reads a write to it may change."""
+    parts = path.split("/")
+    return "/".join(parts[:4]) if path.startswith("/repos/") else "/".join(parts[:2])
+
+
+@dataclass
+class CachedResponse:
+    """A cached GET response and its validators."""
+    path: str
+    resource: str
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    expires_at: Optional[float] = None
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at is None or self.expires_at > time.time()
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers revalidating this response."""
+        if self.etag:
+            return {"If-None-Match": self.etag}
+        if self.last_modified:
+            return {"If-Modified-Since": self.last_modified}
+        return {}
+
+
+class GitHubResponseCache:
+    """LRU cache of GitHub GET responses per token, URL and query."""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "invalidated": 0}
+
+    @staticmethod
+    def key(token: str, url: str, params: Optional[Mapping[str, Any]] = None) -> Tuple[str, str, str]:
+        """Cache key of a request; tokens are kept apart since they see different data."""
+        query = "&".join(f"{name}={params[name]}" for name in sorted(params)) if params else ""
+        return GitHubScheduler.token_id(token), url, query
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[CachedResponse]:
+        """Get a cached response, fresh or not; callers revalidate stale ones."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def hit(self, entry: CachedResponse) -> bytes:
+        """Count a response served from the cache without a request."""
+        self._count("hits", entry.resource)
+        return entry.body
+
+    def revalidated(self, key: Tuple[str, str, str], entry: CachedResponse) -> bytes:
+        """Mark a response as confirmed by a 304 and start a new TTL."""
+        _, ttl = resource_ttl(entry.path)
+        with self._lock:
+            entry.expires_at = None if ttl is None else time.time() + ttl
+        self._count("revalidated", entry.resource)
+        return entry.body
+
+    def store(self, key: Tuple[str, str, str], path: str, headers: Mapping[str, Any], body: bytes):
+        """Cache a 200 response if it can be revalidated or never changes."""
+        resource, ttl = resource_ttl(path)
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        self._count("misses", resource)
+        if self.max_entries <= 0 or (ttl is not None and not (etag or last_modified)):
+            return
+        entry = CachedResponse(
+            path=path, resource=resource, body=body, etag=etag, last_modified=last_modified,
+            expires_at=None if ttl is None else time.time() + ttl
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str, path: str):
+        """Mark the cached reads a write by this token may have changed as stale."""
+        token_id = GitHubScheduler.token_id(token)
+        scope = _scope(path)
+        with self._lock:
+            for (entry_token, _, _), entry in self._entries.items():
+                if entry_token != token_id or entry.expires_at is None:
+                    continue
+                if entry.path == scope or entry.path.startswith(scope + "/"):
+                    entry.expires_at = 0.0
+                    self.stats["invalidated"] += 1
+
+    def clear(self):
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            return {"entries": len(self._entries), **self.stats}
+
+    def _count(self, result: str, resource: str):
+        with self._lock:
+            self.stats[result] += 1
+        get_metrics_collector().increment("github_cache", 1, {"result": result, "resource": resource})
+
+
+# Global GitHub response cache instance
+_github_cache: Optional[GitHubResponseCache] = None
+
+
+def get_github_cache() -> GitHubResponseCache:
+    """Get the global GitHub response cache sized by GITHUB_CACHE_MAX_ENTRIES."""
+    global _github_cache
+    if _github_cache is None:
+        from ..core.config import get_config
+        _github_cache = GitHubResponseCache(max_entries=get_config().github_cache_max_entries)
+    return _github_cache
@@ -6,8 +6,40 @@ Provides repository management, commit handling, and PR creation for AI-generate
 import os
 import json
 from typing import Dict, List, Optional, Any
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
+from urllib.parse import urlparse
+
+from .github_scheduler import GitHubScheduler, get_github_scheduler
+from .logging_config import get_metrics_collector
+from .tracing import get_tracer
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """Transport adapter sending requests through the shared GitHub scheduler."""
+    
+    def __init__(self, token: str, scheduler: Optional[GitHubScheduler] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.token = token
+        self.scheduler = scheduler or get_github_scheduler()
+    
+    def send(self, request, **kwargs):
+        path = urlparse(request.url).path
+        attempt = 0
+        while True:
+            self.scheduler.acquire_sync(self.token, request.method, path)
+            response = super().send(request, **kwargs)
+            retry = self.scheduler.record_response(
+                self.token, path, response.status_code, response.headers, response.content
+            )
+            # Once retries are used up the response is returned and raise_for_status reports it
+            if retry is None or attempt >= self.scheduler.max_retries:
+                return response
+            attempt += 1
+            response.close()
+
 
 class GitHubIntegration:
     """GitHub integration for AI project management."""
@@ -20,6 +52,23 @@ class GitHubIntegration:
         
         if not self.token:
             raise ValueError("GitHub token required. Set GITHUB_TOKEN environment variable.")
+        
+        self.session = requests.Session()
+        self.session.mount(self.base_url, RateLimitedAdapter(self.token))
+        self.session.hooks["response"].append(self._count_api_call)
+    
+    @staticmethod
+    def _count_api_call(response: requests.Response, *args, **kwargs):
+        """Count GitHub API calls by method and status, and trace them."""
+        get_metrics_collector().increment(
+            "github_api_calls",
+            labels={"method": response.request.method, "status": str(response.status_code)}
+        )
+        end = time.time()
+        get_tracer().record_span(
+            "github.request", "http", end - response.elapsed.total_seconds(), end,
+            method=response.request.method, path=urlparse(response.url).path, status=response.status_code
+        )
     
     def _get_headers(self) -> Dict[str, str]:
         """Get GitHub API headers."""
@@ -41,7 +90,7 @@ class GitHubIntegration:
             "gitignore_template": "Python"
         }
         
-        response = requests.post(url, json=data, headers=self._get_headers())
+        response = self.session.post(url, json=data, headers=self._get_headers())
         response.raise_for_status()
         
         return response.json()
@@ -53,7 +102,7 @@ class GitHubIntegration:
         base_url = f"{self.base_url}/repos/{owner}/{repo_name}"
         
         # Get base branch reference
-        ref_response = requests.get(f"{base_url}/git/refs/heads/{base_branch}", headers=self._get_headers())
+        ref_response = self.session.get(f"{base_url}/git/refs/heads/{base_branch}", headers=self._get_headers())
         ref_response.raise_for_status()
         base_sha = ref_response.json()["object"]["sha"]
         
@@ -63,7 +112,7 @@ class GitHubIntegration:
             "sha": base_sha
         }
         
-        response = requests.post(f"{base_url}/git/refs", json=data, headers=self._get_headers())
+        response = self.session.post(f"{base_url}/git/refs", json=data, headers=self._get_headers())
         response.raise_for_status()
         
         return response.json()
@@ -75,7 +124,7 @@ class GitHubIntegration:
         base_url = f"{self.base_url}/repos/{owner}/{repo_name}"
         
         # Get current branch reference
-        ref_response = requests.get(f"{base_url}/git/refs/heads/{branch}", headers=self._get_headers())
+        ref_response = self.session.get(f"{base_url}/git/refs/heads/{branch}", headers=self._get_headers())
         ref_response.raise_for_status()
         current_sha = ref_response.json()["object"]["sha"]
         
@@ -84,7 +133,7 @@ class GitHubIntegration:
         for file_path, content in files.items():
             # Create blob for file content
             blob_data = {"content": content, "encoding": "utf-8"}
-            blob_response = requests.post(f"{base_url}/git/blobs", json=blob_data, headers=self._get_headers())
+            blob_response = self.session.post(f"{base_url}/git/blobs", json=blob_data, headers=self._get_headers())
             blob_response.raise_for_status()
             blob_sha = blob_response.json()["sha"]
             
@@ -97,7 +146,7 @@ class GitHubIntegration:
         
         # Create tree
         tree_data = {"tree": tree_items}
-        tree_response = requests.post(f"{base_url}/git/trees", json=tree_data, headers=self._get_headers())
+        tree_response = self.session.post(f"{base_url}/git/trees", json=tree_data, headers=self._get_headers())
         tree_response.raise_for_status()
         tree_sha = tree_response.json()["sha"]
         
@@ -112,13 +161,13 @@ class GitHubIntegration:
             "parents": [current_sha]
         }
         
-        commit_response = requests.post(f"{base_url}/git/commits", json=commit_data, headers=self._get_headers())
+        commit_response = self.session.post(f"{base_url}/git/commits", json=commit_data, headers=self._get_headers())
         commit_response.raise_for_status()
         commit_sha = commit_response.json()["sha"]
         
         # Update branch reference
         update_data = {"sha": commit_sha}
-        update_response = requests.patch(f"{base_url}/git/refs/heads/{branch}", 
+        update_response = self.session.patch(f"{base_url}/git/refs/heads/{branch}", 
                                        json=update_data, headers=self._get_headers())
         update_response.raise_for_status()
         
@@ -137,7 +186,7 @@ class GitHubIntegration:
             "body": body
         }
         
-        response = requests.post(url, json=data, headers=self._get_headers())
+        response = self.session.post(url, json=data, headers=self._get_headers())
         response.raise_for_status()
         
         return response.json()
@@ -149,14 +198,14 @@ class GitHubIntegration:
         
         data = {"body": comment}
         
-        response = requests.post(url, json=data, headers=self._get_headers())
+        response = self.session.post(url, json=data, headers=self._get_headers())
         response.raise_for_status()
         
         return response.json()
     
     def _get_authenticated_user(self) -> Dict[str, Any]:
         """Get authenticated user information."""
-        response = requests.get(f"{self.base_url}/user", headers=self._get_headers())
+        response = self.session.get(f"{self.base_url}/user", headers=self._get_headers())
         response.raise_for_status()
         return response.json()
     
@@ -0,0 +1,328 @@
+"""
+Rate-limit-aware scheduler shared by all GitHub API traffic.
+
+Every GitHub client of the process asks the scheduler before sending a
+request and reports the response back. The scheduler tracks the primary
+quota of each token (``X-RateLimit-*`` headers) and the pauses GitHub
+demands after secondary limits (``Retry-After``, or a 403/429 mentioning a
+rate limit). Mutating calls are spaced ``GITHUB_WRITE_INTERVAL`` apart per
+token, as GitHub recommends against secondary limits.
+
+Requests are ``interactive`` unless run under ``github_priority(BULK)``.
+Bulk calls leave the last ``GITHUB_QUOTA_RESERVE`` requests of a quota
+window to interactive ones and give way to interactive writes waiting for
+a slot. Remaining quota is exported as the ``github_rate_limit_remaining``
+gauge.
+
+The scheduler is thread-safe: the aiohttp client waits with
+``acquire``, the requests and PyGithub clients with ``acquire_sync``. The
+sync clients must run off the event loop (``run_io``); a sync wait on the
+loop thread is logged.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, Iterator, Mapping, Optional, Tuple, TypeVar
+
+from .logging_config import get_logger, get_metrics_collector
+
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+_priority: ContextVar[str] = ContextVar("github_priority", default=INTERACTIVE)
+
+T = TypeVar("T")
+
+
+@contextmanager
+def github_priority(priority: str) -> Iterator[None]:
+    """Run the GitHub requests of a block with the given priority."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class GitHubRateLimitError(Exception):
+    """A GitHub rate limit that retrying within the allowed wait cannot get past."""
+
+    def __init__(self, message: str, retry_at: Optional[float] = None):
+        super().__init__(message)
+        self.retry_at = retry_at
+
+
+@dataclass
+class _Quota:
+    """Rate limit state of one token and resource."""
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: float = 0.0
+    blocked_until: float = 0.0
+    next_write_at: float = 0.0
+    strikes: int = 0
+    interactive_writers: int = 0
+
+
+def _resource(path: str) -> str:
+    """Rate limit resource GitHub charges a request path to."""
+    if path.startswith("/search"):
+        return "search"
+    if path.startswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class GitHubScheduler:
+    """Paces GitHub requests per token and decides when rate-limited calls are retried."""
+
+    def __init__(
+        self,
+        write_interval: float = 1.0,
+        quota_reserve: int = 100,
+        max_retries: int = 3,
+        max_wait: float = 300.0,
+        secondary_backoff: float = 60.0
+    ):
+        self.write_interval = write_interval
+        self.quota_reserve = quota_reserve
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.secondary_backoff = secondary_backoff
+        self.logger = get_logger("github_scheduler")
+
+        self._quotas: Dict[Tuple[str, str], _Quota] = {}
+        self._lock = threading.Lock()
+
+    async def acquire(self, token: str, method: str, path: str):
+        """Wait until a request may be sent and reserve it."""
+        key, mutating, priority = self._describe(token, method, path)
+        waited = 0.0
+        while True:
+            delay = self._reserve(key, mutating, priority, waited)
+            if delay <= 0:
+                break
+            with self._waiting(key, mutating, priority):
+                await asyncio.sleep(delay)
+            waited += delay
+        self._record_wait(priority, waited)
+
+    def acquire_sync(self, token: str, method: str, path: str):
+        """Blocking ``acquire`` for synchronous clients, which must not run on the event loop."""
+        key, mutating, priority = self._describe(token, method, path)
+        waited = 0.0
+        while True:
+            delay = self._reserve(key, mutating, priority, waited)
+            if delay <= 0:
+                break
+            if waited == 0 and _on_event_loop():
+                self.logger.warning(f"Sync GitHub request {method} {path} blocks the event loop for {delay:.1f}s")
+            with self._waiting(key, mutating, priority):
+                time.sleep(delay)
+            waited += delay
+        self._record_wait(priority, waited)
+
+    def record_response(
+        self,
+        token: str,
+        path: str,
+        status: int,
+        headers: Mapping[str, Any],
+        body: bytes = b""
+    ) -> Optional[float]:
+        """
+        Update the quota from a response. For rate-limited responses, returns
+        the seconds to wait before retrying: ``Retry-After``, else the quota
+        reset when it is exhausted, else an exponential backoff from
+        ``secondary_backoff``. Returns None for anything else.
+        """
+        headers = {str(name).lower(): value for name, value in headers.items()}
+        remaining = _number(headers.get("x-ratelimit-remaining"))
+        limit = _number(headers.get("x-ratelimit-limit"))
+        reset_at = _number(headers.get("x-ratelimit-reset"))
+        resource = headers.get("x-ratelimit-resource") or _resource(path)
+        now = time.time()
+        retry = None
+
+        with self._lock:
+            quota = self._quota((self.token_id(token), _resource(path)))
+            if remaining is not None:
+                quota.remaining = int(remaining)
+                quota.limit = int(limit) if limit is not None else quota.limit
+                quota.reset_at = reset_at or quota.reset_at
+
+            if status in (403, 429):
+                retry_after = _number(headers.get("retry-after"))
+                if retry_after is not None:
+                    retry = retry_after
+                elif remaining == 0 and reset_at:
+                    retry = max(0.0, reset_at - now) + 1
+                elif status == 429 or b"rate limit" in body.lower():
+                    retry = self.secondary_backoff * 2 ** quota.strikes
+                if retry is not None:
+                    quota.strikes += 1
+                    quota.blocked_until = max(quota.blocked_until, now + retry)
+            elif status < 400:
+                quota.strikes = 0
+            quota_remaining = quota.remaining
+
+        metrics = get_metrics_collector()
+        if quota_remaining is not None:
+            metrics.set_gauge(
+                "github_rate_limit_remaining", quota_remaining,
+                {"resource": resource, "token": self.token_id(token)}
+            )
+        if retry is not None:
+            metrics.increment("github_rate_limited", 1, {"status": str(status), "resource": resource})
+            self.logger.warning(f"GitHub rate limit hit ({status} on {path}); retrying in {retry:.1f}s")
+        return retry
+
+    def update_quota(self, token: str, remaining: int, limit: int, reset_at: float, resource: str = "core"):
+        """Set the quota from a client that reads the rate limit headers itself (PyGithub)."""
+        self.record_response(token, "/", 200, {
+            "x-ratelimit-remaining": remaining,
+            "x-ratelimit-limit": limit,
+            "x-ratelimit-reset": reset_at,
+            "x-ratelimit-resource": resource
+        })
+
+    def run_sync(self, token: str, method: str, path: str, func: Callable[[], T]) -> T:
+        """
+        Run one call of a client that sends its own requests (PyGithub),
+        retrying when it fails with a rate-limited status.
+        """
+        attempt = 0
+        while True:
+            self.acquire_sync(token, method, path)
+            try:
+                return func()
+            except Exception as e:
+                status = getattr(e, "status", None)
+                if not isinstance(status, int):
+                    raise
+                retry = self.record_response(
+                    token, path, status, getattr(e, "headers", None) or {}, str(getattr(e, "data", "")).encode()
+                )
+                if retry is None:
+                    raise
+                if attempt >= self.max_retries:
+                    raise GitHubRateLimitError(f"GitHub rate limit on {method} {path}: {str(e)}", time.time() + retry) from e
+                attempt += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the known quota per token and resource."""
+        with self._lock:
+            return {
+                f"{token_id}/{resource}": {
+                    "remaining": quota.remaining,
+                    "limit": quota.limit,
+                    "reset_at": quota.reset_at,
+                    "blocked_until": quota.blocked_until
+                }
+                for (token_id, resource), quota in self._quotas.items()
+            }
+
+    @staticmethod
+    def token_id(token: str) -> str:
+        """Short, non-reversible id of a token for labels and logs."""
+        return hashlib.sha256((token or "").encode()).hexdigest()[:8]
+
+    def _describe(self, token: str, method: str, path: str) -> Tuple[Tuple[str, str], bool, str]:
+        return (self.token_id(token), _resource(path)), method.upper() in MUTATING_METHODS, _priority.get()
+
+    def _quota(self, key: Tuple[str, str]) -> _Quota:
+        quota = self._quotas.get(key)
+        if quota is None:
+            quota = self._quotas[key] = _Quota()
+        return quota
+
+    def _reserve(self, key: Tuple[str, str], mutating: bool, priority: str, waited: float) -> float:
+        """Seconds to wait before sending; when zero, the request is counted against the quota."""
+        now = time.time()
+        with self._lock:
+            quota = self._quota(key)
+            delay = 0.0
+            if quota.blocked_until > now:
+                delay = quota.blocked_until - now
+            elif quota.remaining is not None and quota.reset_at > now and \
+                    quota.remaining <= (self.quota_reserve if priority == BULK else 0):
+                delay = quota.reset_at - now
+            elif mutating and priority == BULK and quota.interactive_writers:
+                delay = self.write_interval
+            elif mutating and quota.next_write_at > now:
+                delay = quota.next_write_at - now
+
+            if delay <= 0:
+                if mutating:
+                    quota.next_write_at = now + self.write_interval
+                if quota.remaining is not None:
+                    quota.remaining -= 1
+                return 0.0
+            retry_at = now + delay
+
+        if waited + delay > self.max_wait:
+            raise GitHubRateLimitError(
+                f"GitHub rate limit would delay this request {delay:.0f}s, over the {self.max_wait:.0f}s limit",
+                retry_at
+            )
+        return delay
+
+    @contextmanager
+    def _waiting(self, key: Tuple[str, str], mutating: bool, priority: str) -> Iterator[None]:
+        """Mark an interactive write as waiting, so bulk writes let it go first."""
+        if not (mutating and priority == INTERACTIVE):
+            yield
+            return
+        with self._lock:
+            self._quota(key).interactive_writers += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._quota(key).interactive_writers -= 1
+
+    def _record_wait(self, priority: str, waited: float):
+        if waited:
+            get_metrics_collector().observe("github_scheduler_wait", waited, {"priority": priority}, "seconds")
+
+
+# Global scheduler instance
+_github_scheduler: Optional[GitHubScheduler] = None
+
+
+def get_github_scheduler() -> GitHubScheduler:
+    """Get the global GitHub scheduler configured by the GITHUB_* settings."""
+    global _github_scheduler
+    if _github_scheduler is None:
+        from ..core.config import get_config
+        config = get_config()
+        _github_scheduler = GitHubScheduler(
+            write_interval=config.github_write_interval,
+            quota_reserve=config.github_quota_reserve,
+            max_retries=config.github_max_retries,
+            max_wait=config.github_max_wait
+        )
+    return _github_scheduler
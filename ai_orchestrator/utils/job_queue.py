@@ -0,0 +1,356 @@
+"""
+Durable job queue between API processes and orchestration workers.
+
+The web API enqueues one job per workflow and returns immediately; worker
+processes (``ai-orchestrator worker``) claim jobs under a lease that they
+renew while the workflow runs. A job whose worker stops renewing its lease
+(crash, OOM kill) is handed to another worker, up to ``max_attempts`` times.
+
+Backends: SQLite (one file shared by the processes of a host) and Redis
+(optional ``redis`` package, for workers spread over several hosts).
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from ..core.config import get_config
+
+
+@dataclass
+class Job:
+    """A unit of work for an orchestration worker."""
+    job_id: str
+    kind: str
+    payload: Dict[str, Any]
+    status: str = "queued"  # queued, running, completed, failed
+    attempts: int = 0
+    worker_id: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+
+class JobQueue(ABC):
+    """Lease-based FIFO job queue shared by several processes."""
+
+    def __init__(self, max_attempts: int = 3):
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    def enqueue(self, kind: str, payload: Dict[str, Any], job_id: Optional[str] = None) -> str:
+        """Add a job and return its id."""
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        """Take the oldest runnable job (queued, or running with an expired lease), if any."""
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend a job's lease. Returns False when the worker no longer owns the job."""
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, error: Optional[str] = None):
+        """Mark a job completed, or failed when ``error`` is given."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by id."""
+
+    @abstractmethod
+    def depth(self) -> Dict[str, int]:
+        """Count jobs per status."""
+
+    def close(self):
+        """Release backend resources."""
+
+
+class SQLiteJobQueue(JobQueue):
+    """Job queue in a SQLite database; claims are serialized with ``BEGIN IMMEDIATE``."""
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        super().__init__(max_attempts)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker_id TEXT,
+                lease_until REAL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+            """
+        )
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], job_id: Optional[str] = None) -> str:
+        job = Job(job_id=job_id or str(uuid.uuid4()), kind=kind, payload=payload)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, kind, payload, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job.job_id, job.kind, json.dumps(payload, default=str), job.status, job.created_at)
+            )
+        return job.job_id
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'failed', finished_at = ?, lease_until = NULL, "
+                    "error = 'Worker lease expired ' || attempts || ' times' "
+                    "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                    (now, now, self.max_attempts)
+                )
+                row = self._conn.execute(
+                    "SELECT job_id FROM jobs WHERE status = 'queued' OR (status = 'running' AND lease_until < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker_id = ?, "
+                    "lease_until = ?, started_at = ? WHERE job_id = ?",
+                    (worker_id, now + lease_seconds, now, row["job_id"])
+                )
+                job = self._get(row["job_id"])
+                self._conn.execute("COMMIT")
+                return job
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                (time.time() + lease_seconds, job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, error: Optional[str] = None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_until = NULL "
+                "WHERE job_id = ? AND worker_id = ?",
+                ("failed" if error else "completed", error, time.time(), job_id, worker_id)
+            )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._get(job_id)
+
+    def depth(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                row["status"]: row["count"]
+                for row in self._conn.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status")
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, job_id: str) -> Optional[Job]:
+        """Load a job row. Caller holds the lock."""
+        row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        data = dict(row)
+        data.pop("lease_until")
+        data["payload"] = json.loads(data["payload"])
+        return Job(**data)
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Job queue in Redis: a list of queued job ids, a list of claimed job ids,
+    a sorted set of their leases (score = expiry) and one JSON document per
+    job. Claiming moves a job id to the claimed list and leases it in one
+    transaction, so a worker dying mid-claim cannot lose the job; lease
+    recovery scans the claimed list.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        prefix: str = "orchestrator",
+        max_attempts: int = 3,
+        client: Any = None
+    ):
+        super().__init__(max_attempts)
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("Redis job queue requires the redis package: pip install redis")
+        if client is None:
+            client = redis.Redis.from_url(url)
+        self._redis = client
+        self._watch_error = redis.WatchError
+        self.prefix = prefix
+        self._queued_key = f"{prefix}:jobs:queued"
+        self._leases_key = f"{prefix}:jobs:leases"
+        self._claimed_key = f"{prefix}:jobs:claimed"
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.prefix}:jobs:{job_id}"
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], job_id: Optional[str] = None) -> str:
+        job = Job(job_id=job_id or str(uuid.uuid4()), kind=kind, payload=payload)
+        pipe = self._redis.pipeline()
+        pipe.set(self._job_key(job.job_id), json.dumps(asdict(job), default=str))
+        pipe.lpush(self._queued_key, job.job_id)
+        pipe.execute()
+        return job.job_id
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        now = time.time()
+        self._requeue_expired(now)
+
+        job_id = self._move_and_lease(now + lease_seconds)
+        if job_id is None:
+            return None
+        job = self.get(job_id)
+        if job is None:
+            pipe = self._redis.pipeline()
+            pipe.lrem(self._claimed_key, 1, job_id)
+            pipe.zrem(self._leases_key, job_id)
+            pipe.execute()
+            return None
+
+        job.status = "running"
+        job.attempts += 1
+        job.worker_id = worker_id
+        job.started_at = now
+        pipe = self._redis.pipeline()
+        pipe.zadd(self._leases_key, {job_id: now + lease_seconds})
+        pipe.set(self._job_key(job_id), json.dumps(asdict(job), default=str))
+        pipe.execute()
+        return job
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        job = self.get(job_id)
+        if job is None or job.worker_id != worker_id or job.status != "running":
+            return False
+        # XX: only extend a lease that still exists, never resurrect a requeued job
+        return bool(self._redis.zadd(self._leases_key, {job_id: time.time() + lease_seconds}, xx=True, ch=True))
+
+    def complete(self, job_id: str, worker_id: str, error: Optional[str] = None):
+        job = self.get(job_id)
+        if job is None or job.worker_id != worker_id:
+            return
+        job.status = "failed" if error else "completed"
+        job.error = error
+        job.finished_at = time.time()
+        pipe = self._redis.pipeline()
+        pipe.zrem(self._leases_key, job_id)
+        pipe.lrem(self._claimed_key, 1, job_id)
+        pipe.set(self._job_key(job_id), json.dumps(asdict(job), default=str))
+        pipe.execute()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        data = self._redis.get(self._job_key(job_id))
+        return Job(**json.loads(data)) if data is not None else None
+
+    def depth(self) -> Dict[str, int]:
+        return {
+            "queued": self._redis.llen(self._queued_key),
+            "running": self._redis.llen(self._claimed_key)
+        }
+
+    def close(self):
+        self._redis.close()
+
+    def _move_and_lease(self, expires_at: float) -> Optional[str]:
+        """Atomically move the next queued job id to the claimed list and lease it."""
+        with self._redis.pipeline() as pipe:
+            while True:
+                try:
+                    # Retried when the queue changes between reading the id and moving it
+                    pipe.watch(self._queued_key)
+                    job_id = pipe.lindex(self._queued_key, -1)
+                    if job_id is None:
+                        return None
+                    job_id = job_id.decode() if isinstance(job_id, bytes) else job_id
+                    pipe.multi()
+                    pipe.lmove(self._queued_key, self._claimed_key, "RIGHT", "LEFT")
+                    pipe.zadd(self._leases_key, {job_id: expires_at})
+                    pipe.execute()
+                    return job_id
+                except self._watch_error:
+                    continue
+
+    def _requeue_expired(self, now: float):
+        """
+        Return claimed jobs whose lease expired (or was never written) to the
+        front of the queue, or fail them when out of attempts.
+        """
+        for job_id in self._redis.lrange(self._claimed_key, 0, -1):
+            job_id = job_id.decode() if isinstance(job_id, bytes) else job_id
+            expires_at = self._redis.zscore(self._leases_key, job_id)
+            if expires_at is not None and expires_at > now:
+                continue
+            # Whoever removes the claim owns the requeue; the lease goes with it so a heartbeat cannot revive it
+            pipe = self._redis.pipeline()
+            pipe.lrem(self._claimed_key, 1, job_id)
+            pipe.zrem(self._leases_key, job_id)
+            if not pipe.execute()[0]:
+                continue
+            job = self.get(job_id)
+            if job is None:
+                continue
+            if job.attempts >= self.max_attempts:
+                job.status = "failed"
+                job.error = f"Worker lease expired {job.attempts} times"
+                job.finished_at = now
+            else:
+                job.status = "queued"
+                job.worker_id = None
+            pipe = self._redis.pipeline()
+            pipe.set(self._job_key(job_id), json.dumps(asdict(job), default=str))
+            if job.status == "queued":
+                pipe.rpush(self._queued_key, job_id)
+            pipe.execute()
+
+
+# Global job queue instance
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> Optional[JobQueue]:
+    """
+    Get the global job queue configured by JOB_QUEUE_BACKEND, or None when
+    workflows run inline in the web process.
+    """
+    global _job_queue
+    if _job_queue is None:
+        config = get_config()
+        backend = config.job_queue_backend.lower()
+        if backend == "redis":
+            _job_queue = RedisJobQueue(config.job_queue_redis_url, max_attempts=config.job_max_attempts)
+        elif backend == "sqlite":
+            _job_queue = SQLiteJobQueue(config.job_queue_path, max_attempts=config.job_max_attempts)
+    return _job_queue
@@ -7,13 +7,20 @@ import logging.handlers
 import json
 import time
 import asyncio
-from typing import Dict, Any, Optional, List
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime
 import os
 
 from ..core.config import get_config, LogLevel
+from .metrics import (
+    Counter, Gauge, Histogram, WindowedHistogram, DEFAULT_PERCENTILES,
+    PROMETHEUS_BUCKETS, prometheus_name, format_labels, format_value
+)
+from .tracing import get_tracer
 
 
 @dataclass
@@ -58,25 +65,54 @@ class StructuredFormatter(logging.Formatter):
 
 
 class MetricsCollector:
-    """Collects and aggregates metrics from the AI orchestration system."""
+    """
+    Collects and aggregates metrics from the AI orchestration system.
+
+    Every metric name and label set maps to one fixed-size counter, gauge or
+    histogram that is updated in place, so memory does not grow with the number
+    of recorded values and summaries never rescan past samples.
+    """
+    
+    OVERFLOW_LABELS = (("overflow", "true"),)
     
-    def __init__(self):
-        self.metrics: List[MetricData] = []
-        self.aggregated_metrics: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, window_seconds: float = 300.0, window_slots: int = 10, max_series_per_metric: int = 1000):
         self.start_time = time.time()
         self.logger = logging.getLogger("metrics")
+        self.window_seconds = window_seconds
+        self.window_slots = window_slots
+        self.max_series_per_metric = max_series_per_metric
+        
+        self._lock = threading.Lock()
+        self._series: Dict[str, Dict[Tuple[Tuple[str, str], ...], _Series]] = {}
+        self._names: Dict[str, _Series] = {}  # per-name rollup across label sets
+        self._total_updates = 0
     
     def record_metric(self, name: str, value: float, labels: Optional[Dict[str, str]] = None, unit: str = "count"):
         """Record a metric value."""
-        metric = MetricData(
-            name=name,
-            value=value,
-            timestamp=time.time(),
-            labels=labels or {},
-            unit=unit
-        )
-        self.metrics.append(metric)
-        self.logger.debug(f"Metric recorded: {name}={value} {unit}")
+        self.observe(name, value, labels, unit)
+    
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None, unit: str = "count"):
+        """Record a value into the histogram for ``name`` and ``labels``."""
+        with self._lock:
+            now = time.time()
+            self._get_series(name, labels, Histogram, unit).observe(value, now)
+            self._get_rollup(name, Histogram, unit).observe(value, now)
+            self._total_updates += 1
+    
+    def increment(self, name: str, value: float = 1.0, labels: Optional[Dict[str, str]] = None, unit: str = "count"):
+        """Increase the counter for ``name`` and ``labels``."""
+        with self._lock:
+            self._get_series(name, labels, Counter, unit).update(value)
+            self._get_rollup(name, Counter, unit).update(value)
+            self._total_updates += 1
+    
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None, unit: str = "count"):
+        """Set the gauge for ``name`` and ``labels``."""
+        with self._lock:
+            self._get_series(name, labels, Gauge, unit).update(value)
+            if not labels:
+                self._get_rollup(name, Gauge, unit).update(value)
+            self._total_updates += 1
     
     def record_execution_time(self, operation: str, duration: float, labels: Optional[Dict[str, str]] = None):
         """Record execution time for an operation."""
@@ -91,51 +127,186 @@ class MetricsCollector:
         """Record API call metrics."""
         labels = {"agent": agent, "model": model, "success": str(success)}
         
-        self.record_metric("api_calls_total", 1, labels)
-        self.record_metric("tokens_used_total", tokens_used, labels)
+        self.increment("api_calls", 1, labels)
+        self.observe("tokens_used", tokens_used, labels)
         
         if not success:
-            self.record_metric("api_errors_total", 1, labels)
+            self.increment("api_errors", 1, labels)
     
     def record_workflow_phase(self, phase_name: str, duration: float, success: bool):
         """Record workflow phase metrics."""
         labels = {"phase": phase_name, "success": str(success)}
         
         self.record_metric("workflow_phase_duration", duration, labels, "seconds")
-        self.record_metric("workflow_phase_total", 1, labels)
+        self.increment("workflow_phase", 1, labels)
         
         if not success:
-            self.record_metric("workflow_phase_errors", 1, labels)
+            self.increment("workflow_phase_errors", 1, labels)
     
-    def get_summary(self) -> Dict[str, Any]:
-        """Get metrics summary."""
+    def get_percentiles(
+        self,
+        name: str,
+        labels: Optional[Dict[str, str]] = None,
+        percentiles: Tuple[float, ...] = DEFAULT_PERCENTILES,
+        window: bool = False
+    ) -> Dict[str, float]:
+        """
+        Get percentile estimates for a histogram metric, for one label set or
+        across all of them. With ``window`` only the recent rollup window counts.
+        """
+        with self._lock:
+            if labels is None:
+                series = self._names.get(name)
+            else:
+                series = self._series.get(name, {}).get(_label_key(labels))
+            if series is None or series.kind != "histogram":
+                return {}
+            histogram = series.window.snapshot() if window else series.histogram
+            return histogram.percentiles(percentiles)
+    
+    def get_series(self, name: str, window: bool = False) -> List[Dict[str, Any]]:
+        """Get every label set recorded for a metric with its current values."""
+        with self._lock:
+            return [
+                dict(series.to_dict(window), labels=dict(key))
+                for key, series in self._series.get(name, {}).items()
+            ]
+    
+    def get_summary(self, window: bool = False) -> Dict[str, Any]:
+        """
+        Get metrics summary aggregated per metric name. With ``window`` the
+        histogram figures only cover the last ``window_seconds``.
+        """
         total_runtime = time.time() - self.start_time
         
-        # Aggregate metrics by name
-        aggregated = {}
-        for metric in self.metrics:
-            if metric.name not in aggregated:
-                aggregated[metric.name] = {
-                    "count": 0,
-                    "total": 0.0,
-                    "min": float('inf'),
-                    "max": float('-inf'),
-                    "unit": metric.unit
-                }
-            
-            agg = aggregated[metric.name]
-            agg["count"] += 1
-            agg["total"] += metric.value
-            agg["min"] = min(agg["min"], metric.value)
-            agg["max"] = max(agg["max"], metric.value)
-            agg["average"] = agg["total"] / agg["count"]
+        with self._lock:
+            aggregated = {name: series.to_dict(window) for name, series in self._names.items()}
+            total_metrics = self._total_updates
+            series_count = sum(len(by_labels) for by_labels in self._series.values())
         
         return {
             "total_runtime": total_runtime,
-            "total_metrics": len(self.metrics),
+            "total_metrics": total_metrics,
+            "total_series": series_count,
+            "window_seconds": self.window_seconds if window else None,
             "aggregated_metrics": aggregated,
             "timestamp": datetime.now().isoformat()
         }
+    
+    def render_prometheus(self, prefix: str = "orchestrator") -> str:
+        """
+        Render every series in the Prometheus text exposition format. Lines are
+        cached per series and only rebuilt for series updated since the last call.
+        """
+        lines = []
+        with self._lock:
+            for name, by_labels in self._series.items():
+                if not by_labels:
+                    continue
+                first = next(iter(by_labels.values()))
+                family = prometheus_name(name, first.kind, first.unit, prefix)
+                lines.append(f"# TYPE {family} {first.kind}")
+                for key, series in by_labels.items():
+                    lines.extend(series.render(family, key))
+        lines.append("")
+        return "\n".join(lines)
+    
+    def _get_series(self, name: str, labels: Optional[Dict[str, str]], factory, unit: str) -> "_Series":
+        """
+        Find or create the series for a label set. Caller holds the lock.
+        Raises ValueError when ``name`` is already registered as another kind.
+        """
+        by_labels = self._series.setdefault(name, {})
+        if by_labels:
+            kind = next(iter(by_labels.values())).kind
+            if kind != factory.kind:
+                raise ValueError(f"Metric {name} is a {kind}, not a {factory.kind}")
+        elif factory.kind != "counter" and name.endswith("_total"):
+            raise ValueError(f"Metric {name}: the _total suffix is reserved for counters")
+        key = _label_key(labels)
+        series = by_labels.get(key)
+        if series is None:
+            if len(by_labels) >= self.max_series_per_metric:
+                # Unbounded label values (e.g. session ids) collapse into one series
+                if self.OVERFLOW_LABELS not in by_labels:
+                    self.logger.warning(f"Metric {name} exceeded {self.max_series_per_metric} label sets")
+                key = self.OVERFLOW_LABELS
+                series = by_labels.get(key)
+            if series is None:
+                series = _Series(factory, unit, self.window_seconds, self.window_slots)
+                by_labels[key] = series
+        return series
+    
+    def _get_rollup(self, name: str, factory, unit: str) -> "_Series":
+        """Find or create the per-name rollup series. Caller holds the lock."""
+        series = self._names.get(name)
+        if series is None:
+            series = _Series(factory, unit, self.window_seconds, self.window_slots)
+            self._names[name] = series
+        return series
+
+
+class _Series:
+    """One metric series: a counter, gauge or histogram plus its rollup window."""
+    
+    def __init__(self, factory, unit: str, window_seconds: float, window_slots: int):
+        self.unit = unit
+        self.kind = factory.kind
+        self.metric = factory()
+        self.histogram = self.metric if self.kind == "histogram" else None
+        self.window = WindowedHistogram(self.metric, window_seconds, window_slots) if self.histogram else None
+        self.version = 0
+        self._rendered: Tuple[int, List[str]] = (-1, [])
+    
+    def observe(self, value: float, now: float):
+        self.metric.observe(value)
+        self.window.observe(value, now)
+        self.version += 1
+    
+    def update(self, value: float):
+        if self.kind == "counter":
+            self.metric.inc(value)
+        else:
+            self.metric.set(value)
+        self.version += 1
+    
+    def render(self, family: str, key: Tuple[Tuple[str, str], ...]) -> List[str]:
+        """Exposition-format sample lines, rebuilt only when the series changed."""
+        if self._rendered[0] == self.version:
+            return self._rendered[1]
+        
+        if self.histogram is not None:
+            bounds = PROMETHEUS_BUCKETS.get(self.unit, PROMETHEUS_BUCKETS["count"])
+            lines = [
+                f"{family}_bucket{format_labels(key, ('le', format_value(float(bound))))} {count}"
+                for bound, count in zip(bounds, self.histogram.cumulative_buckets(bounds))
+            ]
+            lines.append(f"{family}_bucket{format_labels(key, ('le', '+Inf'))} {self.histogram.count}")
+            lines.append(f"{family}_sum{format_labels(key)} {format_value(self.histogram.sum)}")
+            lines.append(f"{family}_count{format_labels(key)} {self.histogram.count}")
+        else:
+            lines = [f"{family}{format_labels(key)} {format_value(self.metric.value)}"]
+        
+        self._rendered = (self.version, lines)
+        return lines
+    
+    def to_dict(self, window: bool = False) -> Dict[str, Any]:
+        if self.histogram is not None:
+            summary = (self.window.snapshot() if window else self.histogram).to_dict()
+        elif self.kind == "counter":
+            summary = {"count": self.metric.updates, "total": self.metric.value}
+        else:
+            summary = {"value": self.metric.value, "updated_at": self.metric.updated_at}
+        summary["type"] = self.kind
+        summary["unit"] = self.unit
+        return summary
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> Tuple[Tuple[str, str], ...]:
+    """Hashable, order-independent key for a label set."""
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
 
 
 class PerformanceMonitor:
@@ -144,7 +315,7 @@ class PerformanceMonitor:
     def __init__(self, metrics_collector: MetricsCollector):
         self.metrics = metrics_collector
         self.logger = logging.getLogger("performance_monitor")
-        self.alerts: List[Dict[str, Any]] = []
+        self.alerts: "deque[Dict[str, Any]]" = deque(maxlen=1000)
         
         # Performance thresholds
         self.thresholds = {
@@ -386,7 +557,11 @@ def get_metrics_collector() -> MetricsCollector:
     """Get the global metrics collector instance."""
     global _metrics_collector
     if _metrics_collector is None:
-        _metrics_collector = MetricsCollector()
+        config = get_config()
+        _metrics_collector = MetricsCollector(
+            window_seconds=config.metrics_window_seconds,
+            max_series_per_metric=config.metrics_max_series
+        )
     return _metrics_collector
 
 
@@ -418,15 +593,19 @@ class TimedOperation:
         self.start_time = None
         self.metrics = get_metrics_collector()
         self.logger = get_logger("timed_operation")
+        self._span = None
     
     def __enter__(self):
         self.start_time = time.time()
+        self._span = get_tracer().span(self.operation_name, "operation", **self.labels)
+        self._span.__enter__()
         self.logger.debug(f"Starting operation: {self.operation_name}")
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         duration = time.time() - self.start_time
         success = exc_type is None
+        self._span.__exit__(exc_type, exc_val, exc_tb)
         
         self.metrics.record_execution_time(
             self.operation_name,
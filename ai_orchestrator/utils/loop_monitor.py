@@ -0,0 +1,249 @@
+"""
+Event loop lag monitor and blocking-call detector.
+
+A sampler task sleeps for a fixed interval and measures how late it wakes
+up; the delay is the time the loop spent running other callbacks, so a
+blocking call anywhere shows up as lag. Lag is exported as the
+``event_loop_lag`` histogram.
+
+In debug mode (``LOOP_BLOCK_DEBUG``) every callback of the monitored loop is
+timed. A watchdog thread captures the loop thread's stack while a callback
+runs past the threshold, and when it finishes the callback is reported with
+that stack and the session and phase of the context it ran in. Callback
+timing hooks the default asyncio loop; under uvloop only the sampler runs.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+from .logging_config import get_logger, get_metrics_collector
+from .metrics import Histogram
+from .process_monitor import get_process_monitor, MessageType
+from .tracing import current_session_and_phase
+
+
+_original_handle_run = asyncio.events.Handle._run
+_active_monitor: Optional["LoopMonitor"] = None
+
+
+def _timed_handle_run(handle: asyncio.Handle):
+    """``Handle._run`` replacement that times callbacks of the monitored loop."""
+    monitor = _active_monitor
+    if monitor is None or threading.get_ident() != monitor._loop_thread:
+        return _original_handle_run(handle)
+
+    start = time.monotonic()
+    monitor._running = (start, handle)
+    try:
+        return _original_handle_run(handle)
+    finally:
+        monitor._running = None
+        duration = time.monotonic() - start
+        if duration >= monitor.block_threshold:
+            monitor._report_blocking(handle, duration)
+
+
+class LoopMonitor:
+    """Samples event loop lag and, in debug mode, reports blocking callbacks."""
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        block_threshold: float = 0.1,
+        debug: bool = False,
+        max_reports: int = 100,
+        stack_depth: int = 25
+    ):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.debug = debug
+        self.stack_depth = stack_depth
+        self.logger = get_logger("loop_monitor")
+
+        self.samples = 0
+        self.stalls = 0
+        self.blocked_calls = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._lag = Histogram()
+        self._reports: deque = deque(maxlen=max_reports)
+
+        self._task: Optional[asyncio.Task] = None
+        self._loop_thread: Optional[int] = None
+        self._running: Optional[Tuple[float, asyncio.Handle]] = None
+        self._captured: Optional[Tuple[asyncio.Handle, List[str], Tuple[Optional[str], Optional[str]]]] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def start(self):
+        """Start monitoring the running event loop."""
+        global _active_monitor
+        if self._task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stopping.clear()
+        self._task = loop.create_task(self._sample())
+
+        if self.debug:
+            if not isinstance(loop, asyncio.BaseEventLoop):
+                self.logger.warning(f"Callback timing needs the default asyncio loop, not {type(loop).__name__}")
+            elif _active_monitor is not None:
+                self.logger.warning("Another loop monitor already times callbacks in this process")
+            else:
+                _active_monitor = self
+                asyncio.events.Handle._run = _timed_handle_run
+                self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+                self._watchdog.start()
+        self.logger.info(
+            f"Loop monitor started (interval {self.interval}s, threshold {self.block_threshold}s, debug {self.debug})"
+        )
+
+    async def stop(self):
+        """Stop sampling and remove the callback timing hook."""
+        global _active_monitor
+        if _active_monitor is self:
+            asyncio.events.Handle._run = _original_handle_run
+            _active_monitor = None
+        self._stopping.set()
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lag statistics and blocking-call counts."""
+        return {
+            "running": self._task is not None,
+            "debug": self.debug,
+            "interval": self.interval,
+            "block_threshold": self.block_threshold,
+            "samples": self.samples,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+            "lag": self._lag.to_dict(),
+            "stalls": self.stalls,
+            "blocked_calls": self.blocked_calls
+        }
+
+    def get_blocking_calls(self, session_id: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the most recent blocking-call reports, newest first."""
+        reports = [report for report in reversed(self._reports) if session_id is None or report["session_id"] == session_id]
+        return reports[:limit] if limit else reports
+
+    async def _sample(self):
+        """Measure how late a fixed sleep wakes up."""
+        loop = asyncio.get_running_loop()
+        metrics = get_metrics_collector()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+
+            self.samples += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self._lag.observe(lag)
+            metrics.observe("event_loop_lag", lag, None, "seconds")
+            if lag >= self.block_threshold:
+                self.stalls += 1
+                if not self.debug:
+                    self.logger.warning(f"Event loop lagged {lag:.3f}s; set LOOP_BLOCK_DEBUG=true to find the blocking call")
+
+    def _watch(self):
+        """Capture the loop thread's stack while a callback runs past the threshold."""
+        poll = max(self.block_threshold / 4, 0.005)
+        while not self._stopping.wait(poll):
+            running = self._running
+            if running is None:
+                continue
+            start, handle = running
+            if time.monotonic() - start < self.block_threshold:
+                continue
+            captured = self._captured
+            if captured is not None and captured[0] is handle:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is not None:
+                # Read the attribution now: a phase may end before the callback returns
+                self._captured = (
+                    handle,
+                    traceback.format_stack(frame)[-self.stack_depth:],
+                    current_session_and_phase(getattr(handle, "_context", None))
+                )
+
+    def _report_blocking(self, handle: asyncio.Handle, duration: float):
+        """Record a callback that blocked the loop. Runs on the loop thread."""
+        captured, self._captured = self._captured, None
+        if captured is not None and captured[0] is handle:
+            _, stack, (session_id, phase) = captured
+        else:
+            stack = []
+            session_id, phase = current_session_and_phase(getattr(handle, "_context", None))
+        callback = _describe_callback(handle)
+
+        self.blocked_calls += 1
+        self._reports.append({
+            "timestamp": time.time(),
+            "duration": duration,
+            "callback": callback,
+            "session_id": session_id,
+            "phase": phase,
+            "stack": stack
+        })
+        get_metrics_collector().increment("event_loop_blocked", 1, {"phase": phase or "none"})
+
+        where = stack[-1].strip().splitlines()[0] if stack else "stack not captured"
+        self.logger.warning(
+            f"Event loop blocked {duration:.3f}s by {callback} "
+            f"(session {session_id or '-'}, phase {phase or '-'}) at {where}"
+        )
+        if session_id:
+            monitor = get_process_monitor()
+            monitor.record_timing(session_id, "loop_blocked", duration)
+            monitor.add_message(
+                session_id=session_id,
+                message_type=MessageType.WARNING,
+                source="loop_monitor",
+                content=f"Event loop blocked for {duration:.3f}s by {callback}",
+                metadata={"phase": phase, "duration": duration, "stack": stack[-5:]},
+                level="warning"
+            )
+
+
+def _describe_callback(handle: asyncio.Handle) -> str:
+    """Task name and coroutine for task steps, the handle's repr otherwise."""
+    owner = getattr(getattr(handle, "_callback", None), "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        coro = owner.get_coro()
+        return f"task {owner.get_name()} ({getattr(coro, '__qualname__', coro)})"
+    return repr(handle)[:200]
+
+
+# Global loop monitor instance
+_loop_monitor: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """Get the global loop monitor configured by the LOOP_* settings."""
+    global _loop_monitor
+    if _loop_monitor is None:
+        from ..core.config import get_config
+        config = get_config()
+        _loop_monitor = LoopMonitor(
+            interval=config.loop_monitor_interval,
+            block_threshold=config.loop_block_threshold,
+            debug=config.loop_block_debug
+        )
+    return _loop_monitor
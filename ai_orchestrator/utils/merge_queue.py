@@ -0,0 +1,303 @@
+"""
+Dependency-aware merge queue for micro-phase branches.
+
+Ready branches are grouped into dependency levels; the branches of a level
+are independent and land together. Each batch is merged onto a temporary
+preview ref cut from the target head (one ``POST /merges`` per branch), the
+combined preview is optionally validated, and the target is fast-forwarded
+to it in a single ref update. Branch protection rejects direct ref updates;
+on a protected target the validated branches land one by one through their
+pull requests instead. Since the preview is a chain, every prefix of
+the batch is already a preview of its own: a failing validation is bisected
+over those prefixes, the longest passing one lands and the culprit leaves the
+queue, without rebuilding anything.
+
+Merge verdicts are cached per (head SHA, base SHA), so a branch that
+conflicted with a base is not tried against it again.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .enhanced_github_client import EnhancedGitHubClient
+from .logging_config import get_logger, get_metrics_collector
+
+
+# Validates a preview commit SHA, e.g. by waiting for CI on it
+PreviewValidator = Callable[[str], Awaitable[bool]]
+# Tries to resolve the conflicts of a branch with the target; returns {"resolved": bool, ...}
+ConflictResolver = Callable[[str, List[Dict[str, Any]]], Awaitable[Dict[str, Any]]]
+
+CLEAN = "clean"
+CONFLICT = "conflict"
+
+# 422 message of a ref update refused by branch protection or a repository ruleset,
+# as opposed to "Update is not a fast forward" when the target moved
+_PROTECTION_ERRORS = ("Protected branch update failed", "Repository rule violations found")
+
+
+@dataclass
+class QueueEntry:
+    """A branch waiting in the merge queue."""
+    name: str
+    head_sha: str
+    info: Dict[str, Any] = field(default_factory=dict)
+
+
+def dependency_levels(branches: List[Dict[str, Any]], dependencies: Dict[str, List[str]]) -> List[List[Dict[str, Any]]]:
+    """
+    Group branches into levels whose members depend only on earlier levels.
+
+    A dependency matches every queued branch whose name contains it; branches
+    on a dependency cycle form a last level of their own.
+    """
+    names = [branch["name"] for branch in branches]
+    waiting_on = {
+        name: {other for other in names if other != name and any(dep in other for dep in dependencies.get(name, []))}
+        for name in names
+    }
+    levels = []
+    placed = set()
+    remaining = list(branches)
+    while remaining:
+        level = [branch for branch in remaining if waiting_on[branch["name"]] <= placed]
+        if not level:
+            levels.append(remaining)
+            break
+        levels.append(level)
+        placed.update(branch["name"] for branch in level)
+        remaining = [branch for branch in remaining if branch["name"] not in placed]
+    return levels
+
+
+class MergeQueue:
+    """Drains ready branches into a target branch in validated batches."""
+
+    def __init__(self, github_client: EnhancedGitHubClient, repo_name: str, target_branch: str,
+                 verdicts: Optional[Dict[Tuple[str, str], str]] = None, max_batch: int = 8,
+                 concurrency: int = 8, validate: Optional[PreviewValidator] = None,
+                 resolve_conflicts: Optional[ConflictResolver] = None, max_land_attempts: int = 3):
+        self.github_client = github_client
+        self.repo_name = repo_name
+        self.target_branch = target_branch
+        self.verdicts = verdicts if verdicts is not None else {}
+        self.max_batch = max(1, max_batch)
+        self.concurrency = concurrency
+        self.validate = validate
+        self.resolve_conflicts = resolve_conflicts
+        self.max_land_attempts = max_land_attempts
+        self.logger = get_logger("merge_queue")
+        self.stats = {"batches": 0, "merge_requests": 0, "validations": 0, "verdict_hits": 0}
+        self._repo_url: Optional[str] = None
+
+    async def drain(self, branches: List[Dict[str, Any]], dependencies: Dict[str, List[str]],
+                    held: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Merge ``branches`` level by level; returns one result per branch, in
+        queue order. Branches with a result in ``held`` (e.g. conflicts found
+        before queueing) are not merged, and block their dependents.
+        """
+        started_at = time.perf_counter()
+        self._repo_url = f"{self.github_client.base_url}/repos/{await self.github_client.get_repo_owner()}/{self.repo_name}"
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def head(name: str) -> str:
+            async with semaphore:
+                return await self._head(name)
+
+        results: Dict[str, Dict[str, Any]] = dict(held or {})
+        queued = [branch for branch in branches if branch["name"] not in results]
+        base_sha, *head_shas = await asyncio.gather(
+            self._head(self.target_branch), *(head(branch["name"]) for branch in queued)
+        )
+        heads = {branch["name"]: sha for branch, sha in zip(queued, head_shas)}
+        for level in dependency_levels(branches, dependencies):
+            pending = []
+            for branch in level:
+                if branch["name"] in results:
+                    continue
+                failed = [dep for dep in dependencies.get(branch["name"], [])
+                          if any(dep in name and result["status"] not in ("merged", "already_merged")
+                                 for name, result in results.items())]
+                if failed:
+                    results[branch["name"]] = self._result(branch["name"], "blocked_by_dependency", dependencies=failed)
+                else:
+                    pending.append(QueueEntry(branch["name"], heads[branch["name"]], branch))
+            attempts = 0
+            while pending:
+                batch, pending = pending[:self.max_batch], pending[self.max_batch:]
+                new_base, retry = await self._run_batch(batch, base_sha, results)
+                if new_base is None:
+                    # The target moved under us; rebuild the batch on its new head
+                    attempts += 1
+                    new_base = await self._head(self.target_branch)
+                    if attempts >= self.max_land_attempts:
+                        for entry in retry:
+                            results[entry.name] = self._result(entry.name, "failed", error="Target branch kept moving")
+                        retry = []
+                base_sha = new_base
+                pending = retry + pending
+
+        duration = time.perf_counter() - started_at
+        metrics = get_metrics_collector()
+        metrics.observe("merge_queue_drain_latency", duration, {"branches": str(len(branches))}, unit="seconds")
+        self.logger.info(f"Drained {len(branches)} branch(es) into {self.target_branch} in "
+                         f"{self.stats['batches']} batch(es), {duration:.2f}s")
+        return [results[branch["name"]] for branch in branches]
+
+    async def _run_batch(self, batch: List[QueueEntry], base_sha: str,
+                         results: Dict[str, Dict[str, Any]]) -> Tuple[Optional[str], List[QueueEntry]]:
+        """
+        Preview, validate and land one batch. Returns the new target head (None
+        if the target moved) and the entries to retry on it.
+        """
+        self.stats["batches"] += 1
+        get_metrics_collector().observe("merge_queue_batch_size", len(batch))
+        preview_ref = f"merge-queue/{self.target_branch}/{int(time.time() * 1000)}-{self.stats['batches']}"
+        await self.github_client._make_request("POST", f"{self._repo_url}/git/refs",
+                                               data={"ref": f"refs/heads/{preview_ref}", "sha": base_sha})
+        try:
+            chain, retry = await self._build_preview(preview_ref, batch, base_sha, results)
+            if not chain:
+                return base_sha, retry
+
+            passing = await self._longest_passing_prefix(chain)
+            if passing < len(chain):
+                culprit = chain[passing][0]
+                results[culprit.name] = self._result(culprit.name, "validation_failed", head_sha=culprit.head_sha)
+                retry = [entry for entry, _ in chain[passing + 1:]] + retry
+                chain = chain[:passing]
+                if not chain:
+                    return base_sha, retry
+
+            landing_sha = chain[-1][1]
+            try:
+                await self.github_client._make_request(
+                    "PATCH", f"{self._repo_url}/git/refs/heads/{self.target_branch}",
+                    data={"sha": landing_sha, "force": False}
+                )
+            except Exception as e:
+                if "GitHub API error 422" not in str(e):
+                    raise
+                if any(message in str(e) for message in _PROTECTION_ERRORS):
+                    return await self._land_through_pull_requests(chain, results), retry
+                return None, [entry for entry, _ in chain] + retry
+
+            for entry, _ in chain:
+                results[entry.name] = self._result(entry.name, "merged", merge_sha=landing_sha,
+                                                   batch=self.stats["batches"], batch_size=len(chain))
+            return landing_sha, retry
+        finally:
+            try:
+                await self.github_client._make_request("DELETE", f"{self._repo_url}/git/refs/heads/{preview_ref}")
+            except Exception as e:
+                self.logger.warning(f"Failed to delete preview ref {preview_ref}: {str(e)}")
+
+    async def _land_through_pull_requests(self, chain: List[Tuple[QueueEntry, str]],
+                                          results: Dict[str, Dict[str, Any]]) -> str:
+        """
+        Land a validated chain on a protected target by merging each entry's
+        pull request at the head SHA that was validated. Returns the new target head.
+        """
+        self.logger.info(f"{self.target_branch} is protected; merging {len(chain)} pull request(s) instead")
+        for entry, _ in chain:
+            number = entry.info.get("pull_request_number")
+            if number is None:
+                results[entry.name] = self._result(entry.name, "failed",
+                                                   error=f"{self.target_branch} is protected and {entry.name} has no pull request")
+                continue
+            try:
+                response = await self.github_client._make_request("PUT", f"{self._repo_url}/pulls/{number}/merge", data={
+                    "sha": entry.head_sha,
+                    "merge_method": "merge",
+                    "commit_title": f"Merge {entry.name} into {self.target_branch} (merge queue)"
+                })
+            except Exception as e:
+                # 405: not mergeable (checks, reviews), 409: the head moved since validation
+                if not any(f"GitHub API error {status}" in str(e) for status in (405, 409, 422)):
+                    raise
+                results[entry.name] = self._result(entry.name, "failed", pull_request_number=number, error=str(e))
+                continue
+            results[entry.name] = self._result(entry.name, "merged", merge_sha=response["sha"], pull_request_number=number,
+                                               batch=self.stats["batches"], batch_size=len(chain))
+        return await self._head(self.target_branch)
+
+    async def _build_preview(self, preview_ref: str, batch: List[QueueEntry], base_sha: str,
+                             results: Dict[str, Dict[str, Any]]) -> Tuple[List[Tuple[QueueEntry, str]], List[QueueEntry]]:
+        """Merge the batch onto the preview ref; returns (entry, preview SHA) per merged entry and entries to retry."""
+        chain: List[Tuple[QueueEntry, str]] = []
+        retry: List[QueueEntry] = []
+        current = base_sha
+        for entry in batch:
+            key = (entry.head_sha, current)
+            if self.verdicts.get(key) == CONFLICT:
+                self.stats["verdict_hits"] += 1
+                merged = None
+            else:
+                merged = await self._merge(preview_ref, entry)
+                self.verdicts[key] = CONFLICT if merged is None else CLEAN
+
+            if merged is None:
+                if current == base_sha:
+                    # Conflicts with the target itself, not with another branch of the batch
+                    results[entry.name] = await self._conflict_result(entry, base_sha)
+                else:
+                    retry.append(entry)
+            elif merged == current:
+                results[entry.name] = self._result(entry.name, "already_merged", head_sha=entry.head_sha)
+            else:
+                chain.append((entry, merged))
+                current = merged
+        return chain, retry
+
+    async def _longest_passing_prefix(self, chain: List[Tuple[QueueEntry, str]]) -> int:
+        """Number of leading chain entries whose preview validates, bisecting on failure."""
+        if self.validate is None or await self._validate(chain[-1][1]):
+            return len(chain)
+        # Invariant: the first ``low`` entries pass, the first ``high`` fail
+        low, high = 0, len(chain)
+        while high - low > 1:
+            middle = (low + high) // 2
+            if await self._validate(chain[middle - 1][1]):
+                low = middle
+            else:
+                high = middle
+        return low
+
+    async def _validate(self, sha: str) -> bool:
+        self.stats["validations"] += 1
+        return await self.validate(sha)
+
+    async def _merge(self, preview_ref: str, entry: QueueEntry) -> Optional[str]:
+        """Merge a branch into the preview ref; returns the new preview SHA, or None on conflict."""
+        self.stats["merge_requests"] += 1
+        try:
+            response = await self.github_client._make_request("POST", f"{self._repo_url}/merges", data={
+                "base": preview_ref,
+                "head": entry.head_sha,
+                "commit_message": f"Merge {entry.name} into {self.target_branch} (merge queue)"
+            })
+        except Exception as e:
+            if "GitHub API error 409" in str(e):
+                return None
+            raise
+        # 204 No Content: the branch is already contained in the preview
+        return response.get("sha") or await self._head(preview_ref)
+
+    async def _conflict_result(self, entry: QueueEntry, base_sha: str) -> Dict[str, Any]:
+        conflicts = [{"file": None, "type": "merge_conflict", "base_sha": base_sha, "head_sha": entry.head_sha}]
+        if self.resolve_conflicts is not None:
+            resolution = await self.resolve_conflicts(entry.name, conflicts)
+            if resolution.get("resolved"):
+                # The resolution changed the branch; it goes through the queue again next drain
+                return self._result(entry.name, "conflicts_resolved", resolution=resolution)
+        return self._result(entry.name, "conflicts_require_manual_review", conflicts=conflicts)
+
+    async def _head(self, branch: str) -> str:
+        response = await self.github_client._make_request("GET", f"{self._repo_url}/branches/{branch}")
+        return response["commit"]["sha"]
+
+    def _result(self, branch: str, status: str, **details: Any) -> Dict[str, Any]:
+        return {"branch": branch, "status": status, "target_branch": self.target_branch, **details}
@@ -0,0 +1,232 @@
+"""
+Fixed-memory metric primitives.
+
+Counters, gauges and log-bucketed histograms update in O(1) and never keep
+individual samples. Histogram buckets grow geometrically (HDR style), so
+percentile estimates have a bounded relative error no matter how many values
+were observed, and a histogram never holds more than a few hundred buckets.
+"""
+
+import math
+import re
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Any, Optional, Iterable, List, Tuple
+
+
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+# Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PROMETHEUS_BUCKETS = {
+    "seconds": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800),
+    "count": (1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000, 1000000)
+}
+
+
+class Counter:
+    """Monotonic counter."""
+
+    kind = "counter"
+
+    def __init__(self):
+        self.value = 0.0
+        self.updates = 0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+        self.updates += 1
+
+
+class Gauge:
+    """Point-in-time value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self):
+        self.value = 0.0
+        self.updated_at = 0.0
+
+    def set(self, value: float):
+        self.value = value
+        self.updated_at = time.time()
+
+    def inc(self, amount: float = 1.0):
+        self.set(self.value + amount)
+
+
+class Histogram:
+    """
+    Log-bucketed histogram.
+
+    Bucket ``i`` holds values in ``(min_value * growth**(i-1), min_value * growth**i]``;
+    values at or below ``min_value`` (including zero and negatives) share bucket 0
+    and values above ``max_value`` share the last bucket. Exact count, sum, min
+    and max are kept alongside the buckets.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, growth: float = 1.1, min_value: float = 1e-6, max_value: float = 1e9):
+        self.growth = growth
+        self.min_value = min_value
+        self.max_value = max_value
+        self._log_growth = math.log(growth)
+        self._max_index = math.ceil(math.log(max_value / min_value) / self._log_growth)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def observe(self, value: float):
+        """Record one value."""
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram"):
+        """Add another histogram with the same bucket layout into this one."""
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """Estimate the q-th percentile (0-100)."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(q / 100.0 * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Geometric midpoint of the bucket, never outside the observed range
+                estimate = self.upper_bound(index) / math.sqrt(self.growth)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def percentiles(self, qs: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, float]:
+        """Estimate several percentiles, keyed as ``p50``, ``p95``..."""
+        return {f"p{q:g}": self.percentile(q) for q in qs}
+
+    def upper_bound(self, index: int) -> float:
+        """Largest value that falls into bucket ``index``."""
+        return self.min_value * self.growth ** index
+
+    def cumulative_buckets(self, bounds: Tuple[float, ...]) -> List[int]:
+        """
+        Cumulative counts for fixed ``le`` bounds, derived from the log buckets.
+        A log bucket counts towards the first bound at or above its upper edge,
+        so counts err on the conservative side by at most one bucket width.
+        """
+        counts = [0] * len(bounds)
+        for index, count in self.buckets.items():
+            position = bisect_left(bounds, self.upper_bound(index))
+            if position < len(bounds):
+                counts[position] += count
+        running = 0
+        for position, count in enumerate(counts):
+            running += count
+            counts[position] = running
+        return counts
+
+    def copy_empty(self) -> "Histogram":
+        """New empty histogram with the same bucket layout."""
+        return Histogram(self.growth, self.min_value, self.max_value)
+
+    def to_dict(self, qs: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        """Summary of the histogram."""
+        empty = self.count == 0
+        summary = {
+            "count": self.count,
+            "total": self.sum,
+            "min": 0.0 if empty else self.min,
+            "max": 0.0 if empty else self.max,
+            "average": self.sum / self.count if self.count else 0.0
+        }
+        summary.update(self.percentiles(qs))
+        return summary
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        index = math.ceil(math.log(value / self.min_value) / self._log_growth)
+        return min(index, self._max_index)
+
+
+class WindowedHistogram:
+    """
+    Histogram over a sliding time window.
+
+    The window is split into ``slots`` sub-histograms; each observation goes to
+    the current slot and slots older than the window are discarded, so memory
+    stays bounded by ``slots`` histograms.
+    """
+
+    def __init__(self, template: Histogram, window_seconds: float = 300.0, slots: int = 10):
+        self.template = template
+        self.window_seconds = window_seconds
+        self.slot_seconds = window_seconds / slots
+        self._slots: "deque[Tuple[float, Histogram]]" = deque(maxlen=slots)
+
+    def observe(self, value: float, now: Optional[float] = None):
+        """Record one value in the current slot."""
+        now = time.time() if now is None else now
+        slot_start = now - (now % self.slot_seconds)
+        if not self._slots or self._slots[-1][0] != slot_start:
+            self._slots.append((slot_start, self.template.copy_empty()))
+        self._slots[-1][1].observe(value)
+
+    def snapshot(self, now: Optional[float] = None) -> Histogram:
+        """Merge the slots that are still inside the window."""
+        now = time.time() if now is None else now
+        merged = self.template.copy_empty()
+        for slot_start, histogram in self._slots:
+            if slot_start + self.slot_seconds > now - self.window_seconds:
+                merged.merge(histogram)
+        return merged
+
+
+def prometheus_name(name: str, kind: str, unit: str, prefix: str = "orchestrator") -> str:
+    """Build a valid Prometheus metric name with conventional unit/type suffixes."""
+    name = re.sub(r"[^a-zA-Z0-9_]", "_", f"{prefix}_{name}" if prefix else name)
+    if unit == "seconds" and not name.endswith("_seconds"):
+        name += "_seconds"
+    if kind == "counter" and not name.endswith("_total"):
+        name += "_total"
+    return name
+
+
+def format_labels(labels: Iterable[Tuple[str, str]], extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render a label set as ``{k="v",...}`` with exposition-format escaping."""
+    pairs = list(labels)
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    rendered = ",".join(
+        f'{re.sub(r"[^a-zA-Z0-9_]", "_", key)}="{_escape_label_value(value)}"' for key, value in pairs
+    )
+    return "{" + rendered + "}"
+
+
+def format_value(value: float) -> str:
+    """Render a sample value."""
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
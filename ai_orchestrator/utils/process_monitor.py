@@ -6,13 +6,16 @@ import asyncio
 import json
 import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Set
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Set, Callable, Awaitable, Deque, Iterator
 from dataclasses import dataclass, asdict
 from enum import Enum
 from threading import Lock
-import weakref
 
 from .logging_config import get_logger
+from .event_log import EventLogWriter
+from .tracing import current_trace_id
 
 
 class MessageType(Enum):
@@ -39,11 +42,13 @@ class ProcessMessage:
     content: Any
     metadata: Dict[str, Any]
     level: str = "info"  # debug, info, warning, error
+    seq: int = 0  # monotonic per-session sequence number, starts at 1
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         return {
             "id": self.id,
+            "seq": self.seq,
             "session_id": self.session_id,
             "timestamp": self.timestamp,
             "datetime": datetime.fromtimestamp(self.timestamp).isoformat(),
@@ -55,38 +60,251 @@ class ProcessMessage:
         }
 
 
+class MonitorSubscription:
+    """
+    A subscriber to one session's messages with its own bounded queue.
+    
+    Messages are handed over from any thread with ``loop.call_soon_threadsafe``
+    and delivered by a single drain task on the subscriber's event loop, which
+    batches everything queued since the last frame into one callback. When the
+    subscriber falls behind, the oldest queued messages are dropped and
+    reported as a single gap so the client can backfill by sequence number,
+    and queued status updates from the same source are coalesced to the newest.
+    """
+    
+    def __init__(
+        self,
+        session_id: str,
+        callback: Callable[[Dict[str, Any]], Awaitable[None]],
+        loop: asyncio.AbstractEventLoop,
+        max_queue: int = 500,
+        max_batch: int = 50
+    ):
+        self.session_id = session_id
+        self.callback = callback
+        self.loop = loop
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.closed = False
+        self.logger = get_logger("process_monitor")
+        
+        # Owned by the loop thread
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._gap: Optional[Dict[str, int]] = None
+        
+        # Lag metrics
+        self.created_at = time.time()
+        self.messages_offered = 0
+        self.messages_sent = 0
+        self.messages_dropped = 0
+        self.messages_coalesced = 0
+        self.frames_sent = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.max_queue_depth = 0
+        
+        self._task = loop.create_task(self._drain())
+    
+    def offer(self, message: Dict[str, Any]):
+        """Hand a message to this subscriber. Safe to call from any thread."""
+        if self.closed:
+            return
+        self.messages_offered += 1
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        
+        if running is self.loop:
+            self._enqueue(message)
+        else:
+            try:
+                self.loop.call_soon_threadsafe(self._enqueue, message)
+            except RuntimeError:
+                # Subscriber's loop is closed
+                self.closed = True
+    
+    def close(self):
+        """Stop delivering messages."""
+        if self.closed and self._task.done():
+            return
+        self.closed = True
+        try:
+            if asyncio.get_running_loop() is self.loop:
+                self._task.cancel()
+                return
+        except RuntimeError:
+            pass
+        try:
+            self.loop.call_soon_threadsafe(self._task.cancel)
+        except RuntimeError:
+            pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get delivery and lag statistics for this subscriber."""
+        return {
+            "session_id": self.session_id,
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self.max_queue_depth,
+            "messages_offered": self.messages_offered,
+            "messages_sent": self.messages_sent,
+            "messages_dropped": self.messages_dropped,
+            "messages_coalesced": self.messages_coalesced,
+            "frames_sent": self.frames_sent,
+            "last_lag_seconds": self.last_lag,
+            "max_lag_seconds": self.max_lag,
+            "connected_seconds": time.time() - self.created_at,
+            "closed": self.closed
+        }
+    
+    def _enqueue(self, message: Dict[str, Any]):
+        """Queue a message on the loop thread, applying the overflow policy."""
+        if self.closed:
+            return
+        
+        if message.get("message_type") == MessageType.STATUS_UPDATE.value and self._coalesce(message):
+            return
+        
+        self._queue.append(message)
+        while len(self._queue) > self.max_queue:
+            dropped = self._queue.popleft()
+            self.messages_dropped += 1
+            seq = dropped.get("seq", 0)
+            if self._gap is None:
+                self._gap = {"from_seq": seq, "to_seq": seq, "count": 0}
+            self._gap["from_seq"] = min(self._gap["from_seq"], seq)
+            self._gap["to_seq"] = max(self._gap["to_seq"], seq)
+            self._gap["count"] += 1
+        
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        self._wakeup.set()
+    
+    def _coalesce(self, message: Dict[str, Any]) -> bool:
+        """Replace a queued status update from the same source with a newer one."""
+        for index in range(len(self._queue) - 1, -1, -1):
+            queued = self._queue[index]
+            if queued.get("message_type") == message["message_type"] and queued.get("source") == message.get("source"):
+                self._queue[index] = message
+                self.messages_coalesced += 1
+                return True
+        return False
+    
+    async def _drain(self):
+        """Deliver queued messages in batched frames until closed."""
+        try:
+            while not self.closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                
+                while self._queue or self._gap:
+                    batch = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+                    gap, self._gap = self._gap, None
+                    
+                    if batch:
+                        self.last_lag = time.time() - batch[0].get("timestamp", time.time())
+                        self.max_lag = max(self.max_lag, self.last_lag)
+                    
+                    frame = {
+                        "type": "new_messages",
+                        "session_id": self.session_id,
+                        "messages": batch,
+                        "dropped": gap
+                    }
+                    try:
+                        await self.callback(frame)
+                    except Exception as e:
+                        self.logger.error(f"Error notifying subscriber: {e}")
+                        self.closed = True
+                        return
+                    
+                    self.frames_sent += 1
+                    self.messages_sent += len(batch)
+        except asyncio.CancelledError:
+            pass
+
+
 class ProcessMonitor:
     """Real-time process monitoring system for AI agent communications."""
     
-    def __init__(self):
+    def __init__(self, event_log: Optional[EventLogWriter] = None, max_sessions: int = 100):
         self.logger = get_logger("process_monitor")
-        self._messages: Dict[str, List[ProcessMessage]] = {}  # session_id -> messages
-        self._subscribers: Dict[str, Set[weakref.ref]] = {}  # session_id -> websocket refs
+        # session_id -> messages, least recently active session first
+        self._messages: "OrderedDict[str, List[ProcessMessage]]" = OrderedDict()
+        self._subscribers: Dict[str, Set[MonitorSubscription]] = {}  # session_id -> subscriptions
         self._lock = Lock()
         self._message_counter = 0
         self._max_messages_per_session = 1000
+        # In-memory sessions are capped; full history lives in the event log
+        self._max_sessions = max_sessions
+        self._event_log = event_log
+        # Last sequence number handed out per session. Kept across
+        # clear_session() so cursors held by clients never go backwards.
+        self._session_seq: Dict[str, int] = {}
+        # session_id -> category -> {"total": seconds, "count": n} for waits and local I/O
+        self._timings: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._bus = None
         
+    def attach_bus(self, bus):
+        """Forward messages to other processes and ingest theirs."""
+        self._bus = bus
+        bus.subscribe("monitor", self.ingest)
+    
     def _generate_message_id(self) -> str:
         """Generate a unique message ID."""
         self._message_counter += 1
         return f"msg_{int(time.time() * 1000)}_{self._message_counter}"
     
-    def subscribe(self, session_id: str, callback):
-        """Subscribe to messages for a specific session."""
+    def subscribe(
+        self,
+        session_id: str,
+        callback: Callable[[Dict[str, Any]], Awaitable[None]],
+        max_queue: int = 500,
+        max_batch: int = 50
+    ) -> MonitorSubscription:
+        """
+        Subscribe to messages for a specific session.
+        
+        Must be called from the event loop that should run ``callback``. The
+        callback receives batched frames (see ``MonitorSubscription``).
+        """
+        subscription = MonitorSubscription(
+            session_id,
+            callback,
+            asyncio.get_running_loop(),
+            max_queue=max_queue,
+            max_batch=max_batch
+        )
         with self._lock:
             if session_id not in self._subscribers:
                 self._subscribers[session_id] = set()
-            self._subscribers[session_id].add(weakref.ref(callback))
+            self._subscribers[session_id].add(subscription)
+        return subscription
     
-    def unsubscribe(self, session_id: str, callback):
+    def unsubscribe(self, session_id: str, subscription: MonitorSubscription):
         """Unsubscribe from messages for a specific session."""
+        subscription.close()
         with self._lock:
             if session_id in self._subscribers:
-                callback_ref = weakref.ref(callback)
-                self._subscribers[session_id].discard(callback_ref)
+                self._subscribers[session_id].discard(subscription)
                 if not self._subscribers[session_id]:
                     del self._subscribers[session_id]
     
+    def get_subscriber_stats(self, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get queue depth, drop and lag statistics for live subscribers."""
+        with self._lock:
+            subscriptions = [
+                subscription
+                for sid, subs in self._subscribers.items()
+                if session_id is None or sid == session_id
+                for subscription in subs
+            ]
+        return [subscription.get_stats() for subscription in subscriptions]
+    
+    def get_event_log_stats(self) -> Optional[Dict[str, Any]]:
+        """Get event log writer statistics, or None when the log is disabled."""
+        return self._event_log.get_stats() if self._event_log is not None else None
+    
     def add_message(
         self,
         session_id: str,
@@ -111,40 +329,111 @@ class ProcessMonitor:
         with self._lock:
             if session_id not in self._messages:
                 self._messages[session_id] = []
+                self._evict_idle_sessions()
+            else:
+                self._messages.move_to_end(session_id)
+            
+            # Assign the next per-session sequence number
+            message.seq = self._session_seq.get(session_id, 0) + 1
+            self._session_seq[session_id] = message.seq
             
             # Add message
             self._messages[session_id].append(message)
             
             # Limit messages per session
-            if len(self._messages[session_id]) > self._max_messages_per_session:
-                self._messages[session_id] = self._messages[session_id][-self._max_messages_per_session:]
+            overflow = len(self._messages[session_id]) - self._max_messages_per_session
+            if overflow > 0:
+                del self._messages[session_id][:overflow]
             
-            # Notify subscribers
-            self._notify_subscribers(session_id, message)
+            subscriptions = list(self._subscribers.get(session_id, ()))
+        
+        message_data = message.to_dict()
+        
+        # Notify subscribers outside the lock; each hand-off is a queue append
+        if subscriptions:
+            self._notify_subscribers(session_id, message_data, subscriptions)
+        
+        # Persist off the hot path; the writer thread does the I/O
+        if self._event_log is not None:
+            self._event_log.append(message_data)
+        if self._bus is not None:
+            self._bus.publish("monitor", message_data)
         
         return message.id
     
-    def _notify_subscribers(self, session_id: str, message: ProcessMessage):
-        """Notify all subscribers of a new message."""
-        if session_id not in self._subscribers:
-            return
+    def ingest(self, message_data: Dict[str, Any]):
+        """
+        Add a message recorded by another process, keeping its sequence
+        number. It is not written to this process's event log; the process
+        that recorded it already did.
+        """
+        session_id = message_data["session_id"]
+        message = ProcessMessage(
+            id=message_data["id"],
+            session_id=session_id,
+            timestamp=message_data["timestamp"],
+            message_type=MessageType(message_data["message_type"]),
+            source=message_data["source"],
+            content=message_data["content"],
+            metadata=message_data.get("metadata") or {},
+            level=message_data.get("level", "info"),
+            seq=message_data["seq"]
+        )
         
-        # Clean up dead references and notify live ones
-        live_refs = set()
-        for callback_ref in self._subscribers[session_id]:
-            callback = callback_ref()
-            if callback is not None:
-                live_refs.add(callback_ref)
-                try:
-                    # Use asyncio.create_task if callback is a coroutine
-                    if asyncio.iscoroutinefunction(callback):
-                        asyncio.create_task(callback(message.to_dict()))
-                    else:
-                        callback(message.to_dict())
-                except Exception as e:
-                    self.logger.error(f"Error notifying subscriber: {e}")
+        with self._lock:
+            last_seq = self._session_seq.get(session_id, 0)
+            if message.seq <= last_seq:
+                return  # already seen
+            if session_id not in self._messages:
+                self._messages[session_id] = []
+                self._evict_idle_sessions()
+            else:
+                self._messages.move_to_end(session_id)
+            
+            retained = self._messages[session_id]
+            if retained and message.seq != last_seq + 1:
+                # Keep retained sequence numbers contiguous for cursor lookups
+                retained.clear()
+            retained.append(message)
+            self._session_seq[session_id] = message.seq
+            
+            overflow = len(retained) - self._max_messages_per_session
+            if overflow > 0:
+                del retained[:overflow]
+            
+            subscriptions = list(self._subscribers.get(session_id, ()))
         
-        self._subscribers[session_id] = live_refs
+        if subscriptions:
+            self._notify_subscribers(session_id, message.to_dict(), subscriptions)
+    
+    def _evict_idle_sessions(self):
+        """Drop in-memory messages of the least recently active unsubscribed sessions. Caller holds the lock."""
+        if len(self._messages) <= self._max_sessions:
+            return
+        for session_id in list(self._messages.keys()):
+            if len(self._messages) <= self._max_sessions:
+                break
+            if session_id in self._subscribers:
+                continue
+            del self._messages[session_id]
+            self._timings.pop(session_id, None)
+            self.logger.debug(f"Evicted idle session from memory: {session_id}")
+    
+    def _notify_subscribers(self, session_id: str, message_data: Dict[str, Any], subscriptions: List[MonitorSubscription]):
+        """Hand a new message to every subscriber and forget closed ones."""
+        closed = []
+        for subscription in subscriptions:
+            subscription.offer(message_data)
+            if subscription.closed:
+                closed.append(subscription)
+        
+        if closed:
+            with self._lock:
+                live = self._subscribers.get(session_id)
+                if live is not None:
+                    live.difference_update(closed)
+                    if not live:
+                        del self._subscribers[session_id]
     
     def get_messages(
         self,
@@ -152,29 +441,110 @@ class ProcessMonitor:
         limit: Optional[int] = None,
         message_type: Optional[MessageType] = None,
         source: Optional[str] = None,
-        level: Optional[str] = None
+        level: Optional[str] = None,
+        since: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Get messages for a session with optional filtering."""
+        """
+        Get messages for a session with optional filtering.
+        
+        Without ``since`` the most recent ``limit`` messages are returned.
+        With ``since`` only messages with ``seq > since`` are returned, oldest
+        first, and ``limit`` caps the page size so clients can resume from the
+        last ``seq`` they received without skipping anything.
+        """
         with self._lock:
-            if session_id not in self._messages:
-                return []
-            
-            messages = self._messages[session_id]
-            
-            # Apply filters
-            if message_type:
-                messages = [m for m in messages if m.message_type == message_type]
-            if source:
-                messages = [m for m in messages if m.source == source]
-            if level:
-                messages = [m for m in messages if m.level == level]
+            messages = self._select_messages(session_id, message_type, source, level, since)
             
             # Apply limit
             if limit:
-                messages = messages[-limit:]
+                messages = messages[:limit] if since is not None else messages[-limit:]
             
             return [m.to_dict() for m in messages]
     
+    def get_message_batch(
+        self,
+        session_id: str,
+        since: int = 0,
+        limit: Optional[int] = None,
+        message_type: Optional[MessageType] = None,
+        source: Optional[str] = None,
+        level: Optional[str] = None,
+        encoding: str = "rows"
+    ) -> Dict[str, Any]:
+        """
+        Get a page of messages after a cursor, for incremental catch-up.
+        
+        Returns the messages together with the cursor to resume from
+        (``next_since``), whether more messages are pending (``has_more``) and
+        whether messages between ``since`` and the oldest retained message were
+        already dropped by the per-session cap (``truncated``).
+        """
+        if encoding not in ("rows", "columnar"):
+            raise ValueError(f"Unsupported encoding: {encoding}")
+        
+        with self._lock:
+            retained = self._messages.get(session_id, [])
+            first_seq = retained[0].seq if retained else None
+            last_seq = self._session_seq.get(session_id, 0)
+            
+            messages = self._select_messages(session_id, message_type, source, level, since)
+            has_more = bool(limit) and len(messages) > limit
+            if limit:
+                messages = messages[:limit]
+            
+            # Resume after the last message returned, or after everything that
+            # was scanned when the filters matched nothing further.
+            next_since = messages[-1].seq if has_more else max(since, last_seq)
+            
+            batch = {
+                "session_id": session_id,
+                "since": since,
+                "next_since": next_since,
+                "last_seq": last_seq,
+                "has_more": has_more,
+                "truncated": first_seq is not None and since + 1 < first_seq,
+                "count": len(messages)
+            }
+            
+            if encoding == "columnar":
+                batch.update(encode_messages_columnar(messages))
+            else:
+                batch["encoding"] = "rows"
+                batch["messages"] = [m.to_dict() for m in messages]
+            
+            return batch
+    
+    def get_last_seq(self, session_id: str) -> int:
+        """Get the last sequence number assigned for a session (0 if none)."""
+        with self._lock:
+            return self._session_seq.get(session_id, 0)
+    
+    def _select_messages(
+        self,
+        session_id: str,
+        message_type: Optional[MessageType],
+        source: Optional[str],
+        level: Optional[str],
+        since: Optional[int]
+    ) -> List[ProcessMessage]:
+        """Apply the cursor and filters to a session's messages. Caller holds the lock."""
+        messages = self._messages.get(session_id, [])
+        
+        # Retained messages carry contiguous sequence numbers (the cap only
+        # trims from the front), so the cursor maps directly to a list offset.
+        if since is not None and messages:
+            messages = messages[max(0, since + 1 - messages[0].seq):]
+        
+        # Apply filters
+        if message_type:
+            messages = [m for m in messages if m.message_type == message_type]
+        if source:
+            messages = [m for m in messages if m.source == source]
+        if level:
+            messages = [m for m in messages if m.level == level]
+        
+        return messages
+    
     def get_session_stats(self, session_id: str) -> Dict[str, Any]:
         """Get statistics for a session."""
         with self._lock:
@@ -225,8 +595,44 @@ class ProcessMonitor:
         with self._lock:
             if session_id in self._messages:
                 del self._messages[session_id]
-            if session_id in self._subscribers:
-                del self._subscribers[session_id]
+            self._timings.pop(session_id, None)
+            subscriptions = self._subscribers.pop(session_id, set())
+        
+        for subscription in subscriptions:
+            subscription.close()
+    
+    def record_timing(self, session_id: Optional[str], category: str, duration: float):
+        """
+        Add time spent waiting (rate limits, retry backoff) or in local I/O to a
+        session's totals. Without ``session_id`` the current trace's session is used.
+        """
+        session_id = session_id or current_trace_id()
+        if not session_id:
+            return
+        with self._lock:
+            totals = self._timings.setdefault(session_id, {}).setdefault(category, {"total": 0.0, "count": 0})
+            totals["total"] += duration
+            totals["count"] += 1
+    
+    @contextmanager
+    def track_time(self, category: str, session_id: Optional[str] = None) -> Iterator[None]:
+        """Time a block and add it to the session's ``category`` total."""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.record_timing(session_id, category, time.time() - start)
+    
+    def get_session_timings(self, session_id: str) -> Dict[str, Dict[str, float]]:
+        """Get accumulated wait and local I/O time per category for a session."""
+        with self._lock:
+            return {category: dict(totals) for category, totals in self._timings.get(session_id, {}).items()}
+    
+    def log_session_timings(self, session_id: str):
+        """Record the session's wait and local I/O totals as a workflow event, so they survive in the event log."""
+        timings = self.get_session_timings(session_id)
+        if timings:
+            self.log_workflow_event(session_id, "session_timings", timings)
     
     def get_active_sessions(self) -> List[str]:
         """Get list of active sessions being monitored."""
@@ -301,6 +707,37 @@ class ProcessMonitor:
         )
 
 
+# Fields emitted by encode_messages_columnar, in column order
+COLUMNAR_FIELDS = ("seq", "id", "timestamp", "message_type", "source", "level", "content", "metadata")
+
+
+def encode_messages_columnar(messages: List[ProcessMessage]) -> Dict[str, Any]:
+    """
+    Encode messages column-wise for compact bulk transfer.
+    
+    Each field becomes one array, so keys are sent once per batch instead of
+    once per message. ``session_id`` and ``datetime`` are omitted because the
+    session is known from the envelope and ``datetime`` derives from
+    ``timestamp``.
+    """
+    columns: Dict[str, List[Any]] = {name: [] for name in COLUMNAR_FIELDS}
+    for message in messages:
+        columns["seq"].append(message.seq)
+        columns["id"].append(message.id)
+        columns["timestamp"].append(message.timestamp)
+        columns["message_type"].append(message.message_type.value)
+        columns["source"].append(message.source)
+        columns["level"].append(message.level)
+        columns["content"].append(message.content)
+        columns["metadata"].append(message.metadata)
+    
+    return {
+        "encoding": "columnar",
+        "fields": list(COLUMNAR_FIELDS),
+        "columns": columns
+    }
+
+
 # Global process monitor instance
 _process_monitor: Optional[ProcessMonitor] = None
 
@@ -309,7 +746,26 @@ def get_process_monitor() -> ProcessMonitor:
     """Get the global process monitor instance."""
     global _process_monitor
     if _process_monitor is None:
-        _process_monitor = ProcessMonitor()
+        from ..core.config import get_config
+        config = get_config()
+        
+        event_log = None
+        if config.event_log_enabled:
+            try:
+                event_log = EventLogWriter(
+                    config.event_log_dir,
+                    max_segment_bytes=config.event_log_segment_mb * 1024 * 1024,
+                    compress=config.event_log_compress
+                )
+            except OSError as e:
+                get_logger("process_monitor").warning(f"Event log disabled: {e}")
+        
+        _process_monitor = ProcessMonitor(event_log=event_log, max_sessions=config.monitor_max_sessions)
+        
+        from .event_bus import get_event_bus
+        bus = get_event_bus()
+        if bus is not None:
+            _process_monitor.attach_bus(bus)
     return _process_monitor
 
 
@@ -0,0 +1,179 @@
+"""
+Streaming project archives.
+
+Generated projects are packed as ZIP or tar.gz straight from the in-memory
+``ProjectStructure``: each file is compressed and handed to the response as
+soon as it is written, so nothing is materialized on disk and the first
+bytes go out before the whole archive exists. Finished archives are kept in
+a small LRU cache keyed by project version, so repeated downloads of the
+same version are served without rebuilding anything.
+"""
+
+import hashlib
+import io
+import json
+import tarfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from .file_manager import GeneratedFile
+
+
+ARCHIVE_FORMATS = {
+    "zip": ("application/zip", "zip"),
+    "tar.gz": ("application/gzip", "tar.gz")
+}
+
+
+class _ChunkWriter:
+    """Write-only, unseekable file object collecting what the archiver writes."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def project_version(workflow_state: Dict[str, Any], archive_format: str) -> str:
+    """
+    Version of a project archive: a digest of the workflow outputs it is built
+    from. Used as the ETag; it changes whenever a regenerated phase changes
+    the project.
+
+    String outputs are hashed as they are (hashlib releases the GIL on large
+    buffers); only other values are serialized. Blocking for large projects,
+    so callers on the event loop run it on the I/O pool.
+    """
+    digest = hashlib.sha256(archive_format.encode())
+    for key in sorted(workflow_state):
+        value = workflow_state[key]
+        data = (value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=str)).encode()
+        # Length-prefixed, so moving text between outputs changes the version
+        digest.update(f"\0{key}\0{isinstance(value, str)}\0{len(data)}\0".encode())
+        digest.update(data)
+    return digest.hexdigest()[:32]
+
+
+def etag_matches(if_none_match: Optional[str], version: str) -> bool:
+    """Whether an If-None-Match header matches the ETag of ``version``."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == "*" or tag.strip('"') == version:
+            return True
+    return False
+
+
+def iter_project_archive(
+    files: List[GeneratedFile],
+    root: str,
+    archive_format: str = "zip",
+    mtime: Optional[float] = None
+) -> Iterator[bytes]:
+    """Yield a ZIP or tar.gz of ``files`` under ``root/``, one chunk per file."""
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unsupported archive format: {archive_format}")
+    mtime = mtime or time.time()
+    writer = _ChunkWriter()
+
+    if archive_format == "zip":
+        date_time = time.localtime(mtime)[:6]
+        with zipfile.ZipFile(writer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for file in files:
+                info = zipfile.ZipInfo(f"{root}/{file.path}", date_time=date_time)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                archive.writestr(info, file.content.encode(file.encoding))
+                chunk = writer.drain()
+                if chunk:
+                    yield chunk
+    else:
+        with tarfile.open(fileobj=writer, mode="w|gz") as archive:
+            for file in files:
+                data = file.content.encode(file.encoding)
+                info = tarfile.TarInfo(f"{root}/{file.path}")
+                info.size = len(data)
+                info.mtime = int(mtime)
+                info.mode = 0o644
+                archive.addfile(info, io.BytesIO(data))
+                chunk = writer.drain()
+                if chunk:
+                    yield chunk
+
+    chunk = writer.drain()
+    if chunk:
+        yield chunk
+
+
+class ArchiveCache:
+    """LRU cache of finished archives, bounded by total size."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._archives: "OrderedDict[Tuple[str, str], Tuple[str, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, session_id: str, archive_format: str, version: str) -> Optional[bytes]:
+        """Get the archive of a session if it was built for this version."""
+        key = (session_id, archive_format)
+        with self._lock:
+            entry = self._archives.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._archives.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, session_id: str, archive_format: str, version: str, data: bytes):
+        """Store an archive, replacing older versions; archives over the limit are not kept."""
+        if len(data) > self.max_bytes:
+            return
+        key = (session_id, archive_format)
+        with self._lock:
+            previous = self._archives.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._archives[key] = (version, data)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._archives.popitem(last=False)
+                self._size -= len(evicted)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            return {"archives": len(self._archives), "bytes": self._size, "hits": self.hits, "misses": self.misses}
+
+
+# Global archive cache instance
+_archive_cache: Optional[ArchiveCache] = None
+
+
+def get_archive_cache() -> ArchiveCache:
+    """Get the global archive cache sized by ARCHIVE_CACHE_MB."""
+    global _archive_cache
+    if _archive_cache is None:
+        from ..core.config import get_config
+        _archive_cache = ArchiveCache(max_bytes=get_config().archive_cache_mb * 1024 * 1024)
+    return _archive_cache
@@ -5,8 +5,10 @@ Orchestrates complete repository setup, configuration, and lifecycle management.
 
 import asyncio
 import logging
+import os
+import time
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, fields
 from datetime import datetime
 import json
 
@@ -15,6 +17,13 @@ from .enhanced_github_client import (
     PullRequestTemplate, BranchProtectionLevel, MergeMethod
 )
 from ..agents import MicroPhase
+from ..core.config import get_config
+from .branch_manager import BranchManager
+from .ci_webhooks import get_pipeline_tracker
+from .executors import get_executor_manager
+from .git_mirror import GitMirror
+from .logging_config import get_metrics_collector
+from .session_store import create_session_map
 
 
 @dataclass
@@ -30,6 +39,7 @@ class ProjectSetupConfig:
     private_repository: bool = True
     auto_merge_approved: bool = False
     required_reviewers: int = 1
+    stack_micro_phases: bool = False  # publish consecutive micro-phases as commits of one PR
 
 
 @dataclass
@@ -44,6 +54,16 @@ class RepositoryState:
     completed_micro_phases: List[str]
     ci_cd_status: str
     protection_enabled: bool
+    stack_micro_phases: bool = False
+    push_url: Optional[str] = None  # git remote for the "git" publish backend; defaults to repository_url
+    # "git" backend: branches committed to the mirror whose push or PR is still due -> pr_info and comment
+    pending_pushes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RepositoryState':
+        """Rebuild a repository state from its ``asdict`` form, ignoring fields it no longer has."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
 
 
 class RepositoryManager:
@@ -54,13 +74,21 @@ class RepositoryManager:
     and integration with the micro-phase development process.
     """
     
-    def __init__(self, github_token: Optional[str] = None, org: Optional[str] = None):
+    def __init__(self, github_token: Optional[str] = None, org: Optional[str] = None,
+                 publish_backend: Optional[str] = None):
         """Initialize repository manager."""
         self.github_client = EnhancedGitHubClient(token=github_token, org=org)
         self.logger = logging.getLogger("repository_manager")
+        self.publish_backend = publish_backend or get_config().publish_backend
         
         # Track managed repositories
-        self.repositories: Dict[str, RepositoryState] = {}
+        self.repositories = create_session_map("repositories", asdict, RepositoryState.from_dict)
+        
+        # "git" backend: mirror per session; branches awaiting a push are kept in the repository state
+        self._mirrors: Dict[str, GitMirror] = {}
+        
+        # Branch manager told about each published branch, for local conflict analysis
+        self.branch_manager: Optional[BranchManager] = None
     
     async def setup_micro_phase_project(self, config: ProjectSetupConfig) -> RepositoryState:
         """
@@ -98,10 +126,12 @@ class RepositoryManager:
             active_pull_requests={},
             completed_micro_phases=[],
             ci_cd_status="setting_up",
-            protection_enabled=False
+            protection_enabled=False,
+            stack_micro_phases=config.stack_micro_phases
         )
         
         self.repositories[config.session_id] = repo_state
+        get_pipeline_tracker().watch(repository["full_name"], config.session_id)
         
         # Set up branch protection
         if config.enable_branch_protection:
@@ -115,6 +145,7 @@ class RepositoryManager:
         
         # Create initial project structure
         await self._create_initial_structure(repo_name, config)
+        self.repositories.save(config.session_id)
         
         self.logger.info(f"Project setup completed: {repo_state.repository_url}")
         return repo_state
@@ -125,84 +156,232 @@ class RepositoryManager:
         Execute complete micro-phase workflow with GitHub integration.
         
         This handles branch creation, file commits, PR creation, and validation.
+        The phase is published with ``publish_micro_phases``: the branch is
+        created at the phase commit and the validation report is part of the
+        PR body.
+        """
+        return await self._publish(session_id, [(micro_phase, generated_files)], micro_phase.branch_name)
+    
+    async def execute_stacked_micro_phases(self, session_id: str,
+                                           micro_phases: List[Tuple[MicroPhase, Dict[str, str]]],
+                                           branch_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Publish several micro-phases, in order, as commits of one branch and
+        one pull request when the project allows stacking; otherwise each
+        phase gets its own branch and pull request.
         """
         if session_id not in self.repositories:
             raise ValueError(f"Repository not found for session: {session_id}")
         
-        repo_state = self.repositories[session_id]
-        repo_name = repo_state.repository_name
+        if not self.repositories[session_id].stack_micro_phases or len(micro_phases) < 2:
+            return [await self._publish(session_id, [phase], phase[0].branch_name) for phase in micro_phases]
         
-        self.logger.info(f"Executing micro-phase workflow: {micro_phase.name}")
+        result = await self._publish(session_id, micro_phases, branch_name or micro_phases[0][0].branch_name)
+        return [result]
+    
+    async def _publish(self, session_id: str, micro_phases: List[Tuple[MicroPhase, Dict[str, str]]],
+                       branch_name: str) -> Dict[str, Any]:
+        """Publish micro-phases as one branch and pull request and record them in the repository state."""
+        if session_id not in self.repositories:
+            raise ValueError(f"Repository not found for session: {session_id}")
         
-        # Create feature branch
-        branch_name = micro_phase.branch_name
-        await self.github_client.create_branch(
-            repo_name=repo_name,
-            branch_name=branch_name,
-            base_branch=repo_state.development_branch
-        )
+        repo_state = self.repositories[session_id]
+        repo_name = repo_state.repository_name
+        names = [micro_phase.name for micro_phase, _ in micro_phases]
         
-        repo_state.created_branches.append(branch_name)
+        self.logger.info(f"Executing micro-phase workflow: {', '.join(names)}")
         
-        # Commit files to branch
-        phase_info = {
-            "id": micro_phase.id,
-            "name": micro_phase.name,
-            "description": micro_phase.description,
-            "phase_type": micro_phase.phase_type,
-            "session_id": session_id,
-            "files_modified": list(generated_files.keys()),
-            "acceptance_criteria": micro_phase.acceptance_criteria
-        }
+        phases = [
+            (generated_files, self._phase_info(session_id, micro_phase, generated_files))
+            for micro_phase, generated_files in micro_phases
+        ]
+        if len(phases) == 1:
+            pr_info = phases[0][1]
+        else:
+            pr_info = {
+                "id": ", ".join(info["id"] for _, info in phases),
+                "name": " + ".join(names),
+                "description": "\n".join(f"- **{info['name']}**: {info['description']}" for _, info in phases),
+                "changes_summary": "\n".join(f"- {info['changes_summary']}" for _, info in phases),
+                "files_modified": [path for files, _ in phases for path in files],
+                "testing_notes": "Automated validation completed successfully",
+                "integration_notes": f"Stacked micro-phases, one commit each: {', '.join(names)}",
+                "session_id": session_id
+            }
         
-        commit_result = await self.github_client.commit_micro_phase_files(
-            repo_name=repo_name,
-            branch=branch_name,
-            files=generated_files,
-            phase_info=phase_info
+        # Validation reports go in the PR body (CI/CD automation disabled)
+        validation_comment = "\n---\n".join(
+            self._generate_validation_comment(micro_phase, generated_files)
+            for micro_phase, generated_files in micro_phases
         )
         
-        # Create pull request
-        pr_template = PullRequestTemplate()
-        
-        phase_info["changes_summary"] = f"Implemented {len(generated_files)} files for {micro_phase.phase_type} functionality"
-        phase_info["testing_notes"] = "Automated validation completed successfully"
-        phase_info["integration_notes"] = f"Dependencies: {', '.join(micro_phase.dependencies) if micro_phase.dependencies else 'None'}"
+        if self.publish_backend == "git":
+            result = await self._commit_to_mirror(session_id, branch_name, phases, pr_info, validation_comment)
+            self._track_branch(repo_state, branch_name, micro_phases)
+            return result
         
-        pull_request = await self.github_client.create_micro_phase_pull_request(
+        published = await self.github_client.publish_micro_phases(
             repo_name=repo_name,
-            phase_info=phase_info,
-            head_branch=branch_name,
+            branch=branch_name,
             base_branch=repo_state.development_branch,
-            template=pr_template
+            phases=phases,
+            pr_info=pr_info,
+            template=PullRequestTemplate(),
+            comment=validation_comment
         )
+        pull_request = published["pull_request"]
         
-        # Track PR
+        if branch_name not in repo_state.created_branches:
+            repo_state.created_branches.append(branch_name)
         repo_state.active_pull_requests[branch_name] = pull_request["number"]
         
-        # Add validation comment (CI/CD automation disabled)
-        validation_comment = self._generate_validation_comment(micro_phase, generated_files)
-        await self.github_client.add_pr_comment(
-            repo_name=repo_name,
-            pr_number=pull_request["number"],
-            comment=validation_comment
-        )
-        
         result = {
             "branch_name": branch_name,
-            "commit_sha": commit_result["sha"],
+            "commit_sha": published["commit_sha"],
             "pull_request": {
                 "number": pull_request["number"],
                 "url": pull_request["html_url"],
                 "title": pull_request["title"]
             },
-            "files_committed": list(generated_files.keys()),
-            "repository_url": repo_state.repository_url
+            "files_committed": [path for files, _ in phases for path in files],
+            "repository_url": repo_state.repository_url,
+            "publish_stats": published["publish_stats"]
         }
+        if len(phases) > 1:
+            result["micro_phases"] = [micro_phase.id for micro_phase, _ in micro_phases]
+            result["commits"] = [commit["sha"] for commit in published["commits"]]
         
+        self._track_branch(repo_state, branch_name, micro_phases)
+        self.repositories.save(session_id)
         self.logger.info(f"Micro-phase workflow completed: {pull_request['html_url']}")
         return result
     
+    def _track_branch(self, repo_state: RepositoryState, branch_name: str,
+                      micro_phases: List[Tuple[MicroPhase, Dict[str, str]]]):
+        """Tell the branch manager which micro-phases a published branch carries."""
+        if self.branch_manager is not None:
+            self.branch_manager.track_phase_branch(
+                branch_name, [micro_phase.id for micro_phase, _ in micro_phases], repo_state.development_branch
+            )
+    
+    async def _commit_to_mirror(self, session_id: str, branch_name: str,
+                                phases: List[Tuple[Dict[str, str], Dict[str, Any]]],
+                                pr_info: Dict[str, Any], comment: str) -> Dict[str, Any]:
+        """Commit micro-phases in the session's git mirror; the branch and PR follow at the next push."""
+        repo_state = self.repositories[session_id]
+        mirror = self._get_mirror(session_id)
+        
+        commits = [(files, self.github_client._phase_commit_message(files, info)) for files, info in phases]
+        shas = await get_executor_manager().run_io(
+            mirror.commit_phases, branch_name, repo_state.development_branch, commits, task_name="mirror_commit"
+        )
+        
+        repo_state.pending_pushes[branch_name] = {"pr_info": pr_info, "comment": comment}
+        if branch_name not in repo_state.created_branches:
+            repo_state.created_branches.append(branch_name)
+        self.repositories.save(session_id)
+        
+        self.logger.info(f"Committed {branch_name} to the git mirror, waiting for the next push")
+        result = {
+            "branch_name": branch_name,
+            "commit_sha": shas[-1],
+            "pull_request": None,
+            "pending_push": True,
+            "files_committed": [path for files, _ in phases for path in files],
+            "repository_url": repo_state.repository_url
+        }
+        if len(phases) > 1:
+            result["micro_phases"] = [info["id"] for _, info in phases]
+            result["commits"] = shas
+        return result
+    
+    async def push_pending(self, session_id: str) -> List[Dict[str, Any]]:
+        """
+        Checkpoint for the "git" publish backend: push every branch committed
+        to the session's mirror since the last push in one ``git push``, then
+        open their pull requests. Does nothing for the "api" backend.
+        
+        Pending branches are part of the persisted repository state, so a
+        worker taking over the session with the same mirror directory pushes
+        them at its next checkpoint.
+        A branch stays pending until its pull request is open; branches the
+        remote rejects (someone else pushed to them) and branches missing
+        from this worker's mirror are dropped and reported with ``rejected``.
+        """
+        if self.publish_backend != "git":
+            return []
+        repo_state = self.repositories.get(session_id)
+        if repo_state is None or not repo_state.pending_pushes:
+            return []
+        
+        pending = dict(repo_state.pending_pushes)
+        started_at = time.perf_counter()
+        # On failure the branches stay pending and the next checkpoint retries them
+        rejected = await get_executor_manager().run_io(
+            self._get_mirror(session_id).push, list(pending), task_name="mirror_push"
+        )
+        get_metrics_collector().observe("git_mirror_push_latency", time.perf_counter() - started_at,
+                                        {"branches": str(len(pending))}, "seconds")
+        
+        results = []
+        for branch_name, item in pending.items():
+            if branch_name in rejected:
+                del repo_state.pending_pushes[branch_name]
+                results.append({"branch_name": branch_name, "pull_request": None, "rejected": rejected[branch_name]})
+                continue
+            pull_request = await self.github_client.create_micro_phase_pull_request(
+                repo_name=repo_state.repository_name,
+                phase_info=item["pr_info"],
+                head_branch=branch_name,
+                base_branch=repo_state.development_branch,
+                template=PullRequestTemplate(),
+                comment=item["comment"]
+            )
+            repo_state.active_pull_requests[branch_name] = pull_request["number"]
+            del repo_state.pending_pushes[branch_name]
+            self.repositories.save(session_id)
+            results.append({
+                "branch_name": branch_name,
+                "pull_request": {
+                    "number": pull_request["number"],
+                    "url": pull_request["html_url"],
+                    "title": pull_request["title"]
+                }
+            })
+        
+        self.repositories.save(session_id)
+        self.logger.info(f"Pushed {len(pending) - len(rejected)} micro-phase branch(es) for session {session_id}")
+        return results
+    
+    def _get_mirror(self, session_id: str) -> GitMirror:
+        """Git mirror of a session's repository."""
+        mirror = self._mirrors.get(session_id)
+        if mirror is None:
+            repo_state = self.repositories[session_id]
+            remote_url = repo_state.push_url or f"{repo_state.repository_url}.git"
+            mirror = GitMirror(
+                os.path.join(get_config().git_mirror_dir, f"{session_id}.git"),
+                remote_url,
+                token=self.github_client.token
+            )
+            self._mirrors[session_id] = mirror
+        return mirror
+    
+    def _phase_info(self, session_id: str, micro_phase: MicroPhase, generated_files: Dict[str, str]) -> Dict[str, Any]:
+        """Commit and pull request metadata of a micro-phase."""
+        return {
+            "id": micro_phase.id,
+            "name": micro_phase.name,
+            "description": micro_phase.description,
+            "phase_type": micro_phase.phase_type,
+            "session_id": session_id,
+            "files_modified": list(generated_files.keys()),
+            "acceptance_criteria": micro_phase.acceptance_criteria,
+            "changes_summary": f"Implemented {len(generated_files)} files for {micro_phase.phase_type} functionality",
+            "testing_notes": "Automated validation completed successfully",
+            "integration_notes": f"Dependencies: {', '.join(micro_phase.dependencies) if micro_phase.dependencies else 'None'}"
+        }
+    
     async def validate_and_merge_phase(self, session_id: str, phase_id: str, 
                                       validation_results: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -213,6 +392,9 @@ class RepositoryManager:
         if session_id not in self.repositories:
             raise ValueError(f"Repository not found for session: {session_id}")
         
+        # Branches still in the git mirror get their PRs first
+        await self.push_pending(session_id)
+        
         repo_state = self.repositories[session_id]
         repo_name = repo_state.repository_name
         
@@ -267,6 +449,7 @@ class RepositoryManager:
             # Update state
             repo_state.completed_micro_phases.append(phase_id)
             del repo_state.active_pull_requests[branch_name]
+            self.repositories.save(session_id)
             
             self.logger.info(f"Merged micro-phase {phase_id}: {pr_status['pull_request']['html_url']}")
         
@@ -281,6 +464,8 @@ class RepositoryManager:
         if session_id not in self.repositories:
             raise ValueError(f"Repository not found for session: {session_id}")
         
+        await self.push_pending(session_id)
+        
         repo_state = self.repositories[session_id]
         repo_name = repo_state.repository_name
         
@@ -384,7 +569,7 @@ class RepositoryManager:
     async def _check_branch_differences(self, repo_name: str, head_branch: str, base_branch: str) -> bool:
         """Check if there are commits between two branches."""
         try:
-            owner = self.github_client.org or await self.github_client._get_authenticated_user_login()
+            owner = await self.github_client.get_repo_owner()
             url = f"{self.github_client.base_url}/repos/{owner}/{repo_name}/compare/{base_branch}...{head_branch}"
             
             comparison = await self.github_client._make_request("GET", url)
@@ -755,7 +940,16 @@ This pull request integrates all completed micro-phases into the main branch.
         """Get current repository status."""
         return self.repositories.get(session_id)
     
+    def finish_session(self, session_id: str):
+        """Mark a session's repository state as final so it can leave memory."""
+        self.repositories.mark_finished(session_id)
+        get_pipeline_tracker().unwatch(session_id)
+        repo_state = self.repositories.get(session_id)
+        if repo_state is None or not repo_state.pending_pushes:
+            self._mirrors.pop(session_id, None)
+    
     async def cleanup(self):
         """Cleanup resources."""
         await self.github_client.cleanup()
-        self.repositories.clear()
\ No newline at end of file
+        await self.repositories.close()
+        self.repositories.clear_memory()
\ No newline at end of file
@@ -0,0 +1,379 @@
+"""
+Per-session performance profile.
+
+Builds a post-run report from process monitor events (live or replayed from
+the event log) and, when available, the workflow engine's execution context:
+a waterfall of phases and agent calls, the critical path through the phase
+dependency graph, time lost to rate-limit waits and retry backoff, time spent
+in local I/O, and the speedup that unlimited parallelism could give.
+"""
+
+import time
+from collections import defaultdict, deque
+from typing import Dict, Any, List, Optional, Tuple
+
+
+WAIT_CATEGORIES = ("rate_limit_wait", "retry_backoff")
+IO_CATEGORIES = ("cache_io", "file_io", "docs_io")
+
+# Phases ending this close to another phase's start are treated as its predecessor
+_SEQUENCE_TOLERANCE = 0.05
+
+
+def build_session_profile(
+    session_id: str,
+    events: List[Dict[str, Any]],
+    execution_context: Optional[Dict[str, Any]] = None,
+    timings: Optional[Dict[str, Dict[str, float]]] = None
+) -> Dict[str, Any]:
+    """
+    Build the profile of a session.
+
+    ``events`` are process monitor messages in ``ProcessMessage.to_dict`` form.
+    ``execution_context`` (from the ``WorkflowEngine`` that ran the session)
+    supplies authoritative phase timings and dependencies; ``timings`` are
+    the monitor's wait and I/O totals, otherwise the last ``session_timings``
+    workflow event is used.
+    """
+    # Sequence numbers restart with each process; a stable sort by time keeps write order on ties
+    events = sorted(events, key=lambda event: event.get("timestamp", 0))
+    phases = _collect_phases(events, execution_context)
+    calls = _collect_agent_calls(events, phases)
+
+    starts = [item["start"] for item in phases + calls]
+    ends = [item["end"] for item in phases + calls]
+    if events:
+        starts.append(events[0].get("timestamp", 0))
+        ends.append(events[-1].get("timestamp", 0))
+    if execution_context and execution_context.get("started_at"):
+        starts.append(execution_context["started_at"])
+    origin = min(starts) if starts else 0.0
+    wall_time = (max(ends) - origin) if ends else 0.0
+
+    leaves = _leaf_phases(phases)
+    critical_path, critical_time, dependency_source = _critical_path(leaves, phases)
+    busy_time = _union_length([(phase["start"], phase["end"]) for phase in leaves])
+    phase_work = sum(phase["end"] - phase["start"] for phase in leaves)
+
+    if timings is None:
+        timings = _timings_from_events(events)
+
+    by_agent: Dict[str, Dict[str, float]] = {}
+    for call in calls:
+        totals = by_agent.setdefault(call["agent"], {"total": 0.0, "count": 0, "failed": 0})
+        totals["total"] += call["end"] - call["start"]
+        totals["count"] += 1
+        totals["failed"] += call["status"] == "failed"
+
+    waterfall = _waterfall(phases, calls, origin)
+    on_critical_path = set(critical_path)
+    for entry in waterfall:
+        entry["critical"] = entry["kind"] == "phase" and entry["name"] in on_critical_path
+
+    return {
+        "session_id": session_id,
+        "generated_at": time.time(),
+        "start_time": origin,
+        "wall_time": wall_time,
+        "phase_count": len(phases),
+        "agent_call_count": len(calls),
+        "waterfall": waterfall,
+        "critical_path": {
+            "phases": critical_path,
+            "duration": critical_time,
+            "dependencies": dependency_source
+        },
+        "parallelism": {
+            "phase_work": phase_work,
+            "average_parallelism": phase_work / wall_time if wall_time else 0.0,
+            "theoretical_speedup": wall_time / critical_time if critical_time else 1.0,
+            "min_wall_time": critical_time
+        },
+        "agent_time": {
+            "total": sum(totals["total"] for totals in by_agent.values()),
+            "by_agent": by_agent
+        },
+        "waits": {category: timings.get(category, {"total": 0.0, "count": 0}) for category in WAIT_CATEGORIES},
+        "local_io": {category: timings.get(category, {"total": 0.0, "count": 0}) for category in IO_CATEGORIES},
+        "loop_blocked": timings.get("loop_blocked", {"total": 0.0, "count": 0}),
+        "untracked_time": max(0.0, wall_time - busy_time)
+    }
+
+
+def format_profile_report(profile: Dict[str, Any], width: int = 40) -> List[str]:
+    """Render a profile as human-readable lines with an ASCII waterfall."""
+    wall_time = profile["wall_time"]
+    scale = width / wall_time if wall_time else 0.0
+    lines = [f"Wall time: {wall_time:.1f}s | Phases: {profile['phase_count']} | Agent calls: {profile['agent_call_count']}", ""]
+
+    lines.append("Waterfall:")
+    for entry in profile["waterfall"]:
+        offset = int(entry["start"] * scale)
+        length = max(1, int(entry["duration"] * scale))
+        bar = (" " * offset + ("#" if entry["kind"] == "phase" else "=") * length)[:width].ljust(width)
+        marker = "*" if entry.get("critical") else " "
+        status = "" if entry["status"] == "completed" else f" [{entry['status']}]"
+        label = "  " * entry["depth"] + entry["name"]
+        lines.append(f"  {marker}|{bar}| +{entry['start']:8.2f}s {entry['duration']:8.2f}s  {label}{status}")
+
+    critical = profile["critical_path"]
+    parallelism = profile["parallelism"]
+    lines.append("")
+    lines.append(f"Critical path ({critical['dependencies']} dependencies): {critical['duration']:.1f}s")
+    if critical["phases"]:
+        lines.append("  " + " -> ".join(critical["phases"]))
+    lines.append(
+        f"Parallelism: {parallelism['average_parallelism']:.2f} average, "
+        f"theoretical speedup {parallelism['theoretical_speedup']:.2f}x "
+        f"(min wall time {parallelism['min_wall_time']:.1f}s)"
+    )
+
+    lines.append("")
+    lines.append(f"Agent time: {profile['agent_time']['total']:.1f}s")
+    for agent, totals in sorted(profile["agent_time"]["by_agent"].items(), key=lambda item: -item[1]["total"]):
+        lines.append(f"  {agent:<24} {totals['total']:8.1f}s  {totals['count']} calls, {totals['failed']} failed")
+    lines.append("Waits:")
+    for category, totals in profile["waits"].items():
+        lines.append(f"  {category:<24} {totals['total']:8.1f}s  ({totals['count']})")
+    lines.append("Local I/O:")
+    for category, totals in profile["local_io"].items():
+        lines.append(f"  {category:<24} {totals['total']:8.1f}s  ({totals['count']})")
+    if profile["loop_blocked"]["count"]:
+        lines.append(
+            f"Event loop blocked: {profile['loop_blocked']['total']:.1f}s "
+            f"({profile['loop_blocked']['count']} callbacks)"
+        )
+    lines.append(f"Outside any phase: {profile['untracked_time']:.1f}s")
+    return lines
+
+
+def _collect_phases(events: List[Dict[str, Any]], execution_context: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Pair phase start/end events; execution context timings take precedence."""
+    phases: Dict[str, Dict[str, Any]] = {}
+    last_timestamp = events[-1].get("timestamp", 0) if events else time.time()
+
+    for event in events:
+        message_type = event.get("message_type")
+        if message_type not in ("phase_start", "phase_end"):
+            continue
+        content = event.get("content") or {}
+        metadata = event.get("metadata") or {}
+        name = content.get("phase")
+        if not name:
+            continue
+        if message_type == "phase_start":
+            phases[name] = {
+                "name": name,
+                "start": event["timestamp"],
+                "end": None,
+                "status": "running",
+                "agent": metadata.get("agent"),
+                "parent": metadata.get("parent"),
+                "depends_on": metadata.get("depends_on")
+            }
+        elif name in phases:
+            phases[name]["end"] = event["timestamp"]
+            phases[name]["status"] = "completed" if content.get("success") else "failed"
+
+    for name, timing in ((execution_context or {}).get("phase_timings") or {}).items():
+        phase = phases.setdefault(name, {"name": name, "parent": None})
+        phase.update(
+            start=timing["start"],
+            end=timing["end"],
+            status=timing["status"],
+            agent=timing.get("agent"),
+            depends_on=timing.get("depends_on")
+        )
+
+    for phase in phases.values():
+        if phase["end"] is None:
+            phase["end"] = max(last_timestamp, phase["start"])
+    return sorted(phases.values(), key=lambda phase: phase["start"])
+
+
+def _collect_agent_calls(events: List[Dict[str, Any]], phases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Pair agent requests with their responses (or errors) per agent and task type."""
+    pending: Dict[Tuple[str, str], deque] = defaultdict(deque)
+    calls = []
+    for event in events:
+        message_type = event.get("message_type")
+        key = (event.get("source"), (event.get("metadata") or {}).get("task_type"))
+        if message_type == "agent_request":
+            pending[key].append(event["timestamp"])
+        elif message_type in ("agent_response", "error") and pending.get(key):
+            start = pending[key].popleft()
+            calls.append({
+                "name": f"{key[0]}:{key[1]}",
+                "agent": key[0],
+                "start": start,
+                "end": event["timestamp"],
+                "status": "completed" if message_type == "agent_response" else "failed",
+                "phase": _enclosing_phase(phases, start)
+            })
+
+    last_timestamp = events[-1].get("timestamp", 0) if events else 0.0
+    for (agent, task_type), starts in pending.items():
+        for start in starts:
+            calls.append({
+                "name": f"{agent}:{task_type}",
+                "agent": agent,
+                "start": start,
+                "end": max(last_timestamp, start),
+                "status": "running",
+                "phase": _enclosing_phase(phases, start)
+            })
+    return sorted(calls, key=lambda call: call["start"])
+
+
+def _enclosing_phase(phases: List[Dict[str, Any]], timestamp: float) -> Optional[str]:
+    """Most recently started phase that was running at ``timestamp``."""
+    enclosing = None
+    for phase in phases:
+        if phase["start"] <= timestamp <= phase["end"]:
+            enclosing = phase["name"]
+    return enclosing
+
+
+def _leaf_phases(phases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Phases that are not the parent of other phases (the units of scheduled work)."""
+    parents = {phase["parent"] for phase in phases if phase.get("parent")}
+    return [phase for phase in phases if phase["name"] not in parents]
+
+
+def _critical_path(leaves: List[Dict[str, Any]], phases: List[Dict[str, Any]]) -> Tuple[List[str], float, str]:
+    """
+    Longest duration-weighted path through the phase dependency graph.
+
+    Declared dependencies are used where phases carry them; otherwise a phase
+    depends on the latest phase that finished before it started. Sub-phases
+    also inherit the predecessors of their parent. Returns the path, its
+    length and whether dependencies were declared, inferred or mixed.
+    """
+    if not leaves:
+        return [], 0.0, "none"
+
+    by_name = {phase["name"]: phase for phase in leaves}
+    all_by_name = {phase["name"]: phase for phase in phases}
+
+    def inferred(phase: Dict[str, Any]) -> List[str]:
+        candidates = [
+            other for other in leaves
+            if other is not phase and other["end"] <= phase["start"] + _SEQUENCE_TOLERANCE
+            and other.get("parent") != phase["name"]
+        ]
+        if not candidates:
+            return []
+        return [max(candidates, key=lambda other: other["end"])["name"]]
+
+    predecessors: Dict[str, List[str]] = {}
+    declared = inferred_count = 0
+    for phase in leaves:
+        depends_on = phase.get("depends_on")
+        if depends_on is None:
+            preds = inferred(phase)
+            inferred_count += 1
+        else:
+            preds = [name for name in depends_on if name in by_name]
+            declared += 1
+        parent = all_by_name.get(phase.get("parent") or "")
+        if parent is not None:
+            preds.extend(name for name in inferred(parent) if name not in preds)
+        predecessors[phase["name"]] = [name for name in preds if name != phase["name"]]
+
+    # Longest path by memoized DFS; a dependency cycle is cut where it closes
+    finish: Dict[str, float] = {}
+    best_pred: Dict[str, Optional[str]] = {}
+    visiting = set()
+
+    def longest(name: str) -> float:
+        if name in finish:
+            return finish[name]
+        visiting.add(name)
+        best, best_name = 0.0, None
+        for pred in predecessors[name]:
+            if pred in visiting:
+                continue
+            length = longest(pred)
+            if length > best:
+                best, best_name = length, pred
+        visiting.discard(name)
+        phase = by_name[name]
+        finish[name] = best + (phase["end"] - phase["start"])
+        best_pred[name] = best_name
+        return finish[name]
+
+    for name in by_name:
+        longest(name)
+
+    tail = max(finish, key=finish.get)
+    path = []
+    cursor: Optional[str] = tail
+    while cursor is not None:
+        path.append(cursor)
+        cursor = best_pred[cursor]
+    path.reverse()
+
+    if declared and inferred_count:
+        source = "mixed"
+    else:
+        source = "declared" if declared else "inferred"
+    return path, finish[tail], source
+
+
+def _waterfall(phases: List[Dict[str, Any]], calls: List[Dict[str, Any]], origin: float) -> List[Dict[str, Any]]:
+    """Phases and agent calls in start order, with nesting depth and offsets from ``origin``."""
+    depth_of: Dict[str, int] = {}
+    for phase in phases:
+        parent = phase.get("parent")
+        depth_of[phase["name"]] = depth_of.get(parent, -1) + 1 if parent else 0
+
+    entries = []
+    for phase in phases:
+        entries.append({
+            "name": phase["name"],
+            "kind": "phase",
+            "depth": depth_of[phase["name"]],
+            "start": phase["start"] - origin,
+            "duration": phase["end"] - phase["start"],
+            "status": phase["status"],
+            "agent": phase.get("agent"),
+            "parent": phase.get("parent")
+        })
+    for call in calls:
+        entries.append({
+            "name": call["name"],
+            "kind": "agent_call",
+            "depth": depth_of.get(call["phase"], -1) + 1,
+            "start": call["start"] - origin,
+            "duration": call["end"] - call["start"],
+            "status": call["status"],
+            "agent": call["agent"],
+            "parent": call["phase"]
+        })
+    entries.sort(key=lambda entry: (entry["start"], entry["kind"] != "phase"))
+    return entries
+
+
+def _timings_from_events(events: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Wait and I/O totals from the last ``session_timings`` workflow event."""
+    for event in reversed(events):
+        content = event.get("content") or {}
+        if event.get("message_type") == "workflow_event" and content.get("event") == "session_timings":
+            return content.get("details") or {}
+    return {}
+
+
+def _union_length(intervals: List[Tuple[float, float]]) -> float:
+    """Total length covered by possibly overlapping intervals."""
+    total = 0.0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
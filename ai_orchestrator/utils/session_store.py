@@ -0,0 +1,706 @@
+"""
+Durable session state.
+
+Workflow sessions are persisted as a full snapshot followed by deltas holding
+only the top-level fields that changed, so frequent progress updates do not
+rewrite large generated artifacts. ``PersistentSessionMap`` keeps recently
+used sessions in memory, evicts finished ones after a TTL and rehydrates
+them from the store on demand. On an event loop, saves are coalesced and
+written on the I/O pool. Each stored session also keeps a small summary, so
+sessions can be listed without loading their state.
+
+Backends: SQLite (default), Redis (optional ``redis`` package) and an
+in-memory store for tests or when persistence is disabled.
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple, Callable, Iterator
+
+from ..core.config import get_config
+from .executors import get_executor_manager
+
+
+class SessionStore(ABC):
+    """Persistence backend for session state, partitioned by namespace."""
+
+    @abstractmethod
+    def save_snapshot(self, namespace: str, session_id: str, data: Dict[str, Any], finished: bool = False,
+                      summary: Optional[Dict[str, Any]] = None):
+        """Replace the stored state of a session and drop its deltas."""
+
+    @abstractmethod
+    def append_delta(self, namespace: str, session_id: str, changes: Dict[str, Any], finished: bool = False,
+                     summary: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Append changed fields to a session. Returns the number of deltas since
+        the last snapshot. The stored summary is kept when ``summary`` is None.
+        """
+
+    @abstractmethod
+    def load(self, namespace: str, session_id: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """Load a session's state (snapshot with deltas applied) and finished flag."""
+
+    @abstractmethod
+    def list_sessions(self, namespace: str) -> List[str]:
+        """Get the ids of all stored sessions in a namespace."""
+
+    @abstractmethod
+    def list_summaries(self, namespace: str, offset: int = 0,
+                       limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get a page of session summaries, most recently updated first, and the
+        total number of sessions. Each summary has ``session_id``,
+        ``finished`` and ``updated_at`` plus the fields saved with the session.
+        """
+
+    @abstractmethod
+    def delete(self, namespace: str, session_id: str):
+        """Remove a session from the store."""
+
+    def close(self):
+        """Release backend resources."""
+
+
+class MemorySessionStore(SessionStore):
+    """Non-durable store, for tests or with persistence disabled."""
+
+    def __init__(self):
+        self._sessions: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def save_snapshot(self, namespace: str, session_id: str, data: Dict[str, Any], finished: bool = False,
+                      summary: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self._sessions[(namespace, session_id)] = {
+                "data": _encode(data), "deltas": [], "finished": finished,
+                "summary": summary or {}, "updated_at": time.time()
+            }
+
+    def append_delta(self, namespace: str, session_id: str, changes: Dict[str, Any], finished: bool = False,
+                     summary: Optional[Dict[str, Any]] = None) -> int:
+        with self._lock:
+            entry = self._sessions.setdefault(
+                (namespace, session_id), {"data": _encode({}), "deltas": [], "finished": False, "summary": {}}
+            )
+            entry["deltas"].append(_encode(changes))
+            entry["finished"] = entry["finished"] or finished
+            entry["updated_at"] = time.time()
+            if summary is not None:
+                entry["summary"] = summary
+            return len(entry["deltas"])
+
+    def load(self, namespace: str, session_id: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        with self._lock:
+            entry = self._sessions.get((namespace, session_id))
+            if entry is None:
+                return None
+            return _apply(entry["data"], entry["deltas"]), entry["finished"]
+
+    def list_sessions(self, namespace: str) -> List[str]:
+        with self._lock:
+            return [session_id for ns, session_id in self._sessions if ns == namespace]
+
+    def list_summaries(self, namespace: str, offset: int = 0,
+                       limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        with self._lock:
+            entries = sorted(
+                ((session_id, entry) for (ns, session_id), entry in self._sessions.items() if ns == namespace),
+                key=lambda item: item[1]["updated_at"], reverse=True
+            )
+            page = entries[offset:None if limit is None else offset + limit]
+            return [
+                {**entry["summary"], "session_id": session_id, "finished": entry["finished"],
+                 "updated_at": entry["updated_at"]}
+                for session_id, entry in page
+            ], len(entries)
+
+    def delete(self, namespace: str, session_id: str):
+        with self._lock:
+            self._sessions.pop((namespace, session_id), None)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Session store in a local SQLite database (WAL mode)."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS session_snapshots (
+                namespace TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                finished INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                summary TEXT,
+                PRIMARY KEY (namespace, session_id)
+            );
+            CREATE TABLE IF NOT EXISTS session_deltas (
+                namespace TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_session_deltas ON session_deltas (namespace, session_id, seq);
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(session_snapshots)")}
+        if "summary" not in columns:
+            # Databases created before summaries were stored
+            self._conn.execute("ALTER TABLE session_snapshots ADD COLUMN summary TEXT")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_session_snapshots_updated ON session_snapshots (namespace, updated_at)"
+        )
+
+    def save_snapshot(self, namespace: str, session_id: str, data: Dict[str, Any], finished: bool = False,
+                      summary: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO session_snapshots (namespace, session_id, data, finished, updated_at, summary) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, session_id, _encode(data), int(finished), time.time(), _encode(summary or {}))
+            )
+            self._conn.execute(
+                "DELETE FROM session_deltas WHERE namespace = ? AND session_id = ?", (namespace, session_id)
+            )
+            self._conn.execute("COMMIT")
+
+    def append_delta(self, namespace: str, session_id: str, changes: Dict[str, Any], finished: bool = False,
+                     summary: Optional[Dict[str, Any]] = None) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT OR IGNORE INTO session_snapshots (namespace, session_id, data, finished, updated_at) "
+                "VALUES (?, ?, '{}', 0, ?)",
+                (namespace, session_id, time.time())
+            )
+            self._conn.execute(
+                "INSERT INTO session_deltas (namespace, session_id, data) VALUES (?, ?, ?)",
+                (namespace, session_id, _encode(changes))
+            )
+            self._conn.execute(
+                "UPDATE session_snapshots SET finished = MAX(finished, ?), updated_at = ?, "
+                "summary = COALESCE(?, summary) WHERE namespace = ? AND session_id = ?",
+                (int(finished), time.time(), None if summary is None else _encode(summary), namespace, session_id)
+            )
+            count = self._conn.execute(
+                "SELECT COUNT(*) FROM session_deltas WHERE namespace = ? AND session_id = ?", (namespace, session_id)
+            ).fetchone()[0]
+            self._conn.execute("COMMIT")
+            return count
+
+    def load(self, namespace: str, session_id: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, finished FROM session_snapshots WHERE namespace = ? AND session_id = ?",
+                (namespace, session_id)
+            ).fetchone()
+            if row is None:
+                return None
+            deltas = [
+                delta for (delta,) in self._conn.execute(
+                    "SELECT data FROM session_deltas WHERE namespace = ? AND session_id = ? ORDER BY seq",
+                    (namespace, session_id)
+                )
+            ]
+        return _apply(row[0], deltas), bool(row[1])
+
+    def list_sessions(self, namespace: str) -> List[str]:
+        with self._lock:
+            return [
+                session_id for (session_id,) in self._conn.execute(
+                    "SELECT session_id FROM session_snapshots WHERE namespace = ? ORDER BY updated_at", (namespace,)
+                )
+            ]
+
+    def list_summaries(self, namespace: str, offset: int = 0,
+                       limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COUNT(*) FROM session_snapshots WHERE namespace = ?", (namespace,)
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT session_id, summary, finished, updated_at FROM session_snapshots WHERE namespace = ? "
+                "ORDER BY updated_at DESC LIMIT ? OFFSET ?",
+                (namespace, -1 if limit is None else limit, offset)
+            ).fetchall()
+        return [
+            {**json.loads(summary or "{}"), "session_id": session_id, "finished": bool(finished), "updated_at": updated_at}
+            for session_id, summary, finished, updated_at in rows
+        ], total
+
+    def delete(self, namespace: str, session_id: str):
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "DELETE FROM session_snapshots WHERE namespace = ? AND session_id = ?", (namespace, session_id)
+            )
+            self._conn.execute(
+                "DELETE FROM session_deltas WHERE namespace = ? AND session_id = ?", (namespace, session_id)
+            )
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Session store in Redis. Each session is a snapshot string plus a delta
+    list; a set per namespace indexes the stored sessions, and a sorted set
+    (by update time) plus a hash hold their summaries.
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "orchestrator", client: Any = None):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise ImportError("Redis session store requires the redis package: pip install redis")
+            client = redis.Redis.from_url(url)
+        self._redis = client
+        self.prefix = prefix
+
+    def _key(self, namespace: str, session_id: str, part: str) -> str:
+        return f"{self.prefix}:sessions:{namespace}:{session_id}:{part}"
+
+    def _index(self, namespace: str) -> str:
+        return f"{self.prefix}:sessions:{namespace}"
+
+    def _touch(self, pipe: Any, namespace: str, session_id: str, summary: Optional[Dict[str, Any]]):
+        pipe.sadd(self._index(namespace), session_id)
+        pipe.zadd(f"{self._index(namespace)}:updated", {session_id: time.time()})
+        if summary is not None:
+            pipe.hset(f"{self._index(namespace)}:summaries", session_id, _encode(summary))
+
+    def save_snapshot(self, namespace: str, session_id: str, data: Dict[str, Any], finished: bool = False,
+                      summary: Optional[Dict[str, Any]] = None):
+        pipe = self._redis.pipeline()
+        pipe.set(self._key(namespace, session_id, "snapshot"), _encode(data))
+        pipe.delete(self._key(namespace, session_id, "deltas"))
+        pipe.set(self._key(namespace, session_id, "finished"), int(finished))
+        self._touch(pipe, namespace, session_id, summary or {})
+        pipe.execute()
+
+    def append_delta(self, namespace: str, session_id: str, changes: Dict[str, Any], finished: bool = False,
+                     summary: Optional[Dict[str, Any]] = None) -> int:
+        pipe = self._redis.pipeline()
+        pipe.setnx(self._key(namespace, session_id, "snapshot"), "{}")
+        pipe.rpush(self._key(namespace, session_id, "deltas"), _encode(changes))
+        if finished:
+            pipe.set(self._key(namespace, session_id, "finished"), 1)
+        self._touch(pipe, namespace, session_id, summary)
+        return pipe.execute()[1]
+
+    def load(self, namespace: str, session_id: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        pipe = self._redis.pipeline()
+        pipe.get(self._key(namespace, session_id, "snapshot"))
+        pipe.lrange(self._key(namespace, session_id, "deltas"), 0, -1)
+        pipe.get(self._key(namespace, session_id, "finished"))
+        snapshot, deltas, finished = pipe.execute()
+        if snapshot is None:
+            return None
+        return _apply(snapshot, deltas), bool(int(finished or 0))
+
+    def list_sessions(self, namespace: str) -> List[str]:
+        return [
+            member.decode() if isinstance(member, bytes) else member
+            for member in self._redis.smembers(self._index(namespace))
+        ]
+
+    def list_summaries(self, namespace: str, offset: int = 0,
+                       limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        updated = f"{self._index(namespace)}:updated"
+        stop = -1 if limit is None else offset + limit - 1
+        pipe = self._redis.pipeline()
+        pipe.zcard(updated)
+        pipe.zrevrange(updated, offset, stop, withscores=True)
+        total, page = pipe.execute()
+        if not page:
+            return [], total
+
+        session_ids = [member.decode() if isinstance(member, bytes) else member for member, _ in page]
+        pipe = self._redis.pipeline()
+        pipe.hmget(f"{self._index(namespace)}:summaries", session_ids)
+        pipe.mget([self._key(namespace, session_id, "finished") for session_id in session_ids])
+        summaries, finished = pipe.execute()
+        return [
+            {**json.loads(summary or "{}"), "session_id": session_id, "finished": bool(int(done or 0)), "updated_at": score}
+            for session_id, (_, score), summary, done in zip(session_ids, page, summaries, finished)
+        ], total
+
+    def delete(self, namespace: str, session_id: str):
+        pipe = self._redis.pipeline()
+        for part in ("snapshot", "deltas", "finished"):
+            pipe.delete(self._key(namespace, session_id, part))
+        pipe.srem(self._index(namespace), session_id)
+        pipe.zrem(f"{self._index(namespace)}:updated", session_id)
+        pipe.hdel(f"{self._index(namespace)}:summaries", session_id)
+        pipe.execute()
+
+    def close(self):
+        self._redis.close()
+
+
+class PersistentSessionMap(MutableMapping):
+    """
+    Dict of session objects backed by a ``SessionStore``.
+
+    Reads fall through to the store, so sessions evicted from memory (or
+    written before a restart) are rehydrated lazily. Call ``save`` after
+    mutating a session to persist the fields that changed, and
+    ``mark_finished`` once it completes so it can be evicted from memory
+    ``ttl_seconds`` later.
+
+    Saved on an event loop, a session is written ``save_delay`` seconds
+    later on the I/O pool, together with whatever else was saved meanwhile;
+    ``flush`` writes pending saves right away. Expired sessions are evicted
+    every ``evict_interval`` seconds while the map has sessions in memory.
+    ``summarize`` turns a session's ``to_dict`` output into the summary kept
+    in the store for ``summaries``.
+
+    Coroutines use ``get_async``, ``contains_async`` and ``set_async``, which
+    do the store I/O of a lookup miss or a new session on the I/O pool; the
+    mapping methods do it inline, for synchronous callers.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        store: SessionStore,
+        to_dict: Callable[[Any], Dict[str, Any]],
+        from_dict: Callable[[Dict[str, Any]], Any],
+        ttl_seconds: float = 3600,
+        snapshot_every: int = 20,
+        summarize: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        save_delay: float = 0.5,
+        evict_interval: float = 60
+    ):
+        self.namespace = namespace
+        self.store = store
+        self.to_dict = to_dict
+        self.from_dict = from_dict
+        self.ttl_seconds = ttl_seconds
+        self.snapshot_every = snapshot_every
+        self.summarize = summarize
+        self.save_delay = save_delay
+        self.evict_interval = evict_interval
+        self.logger = logging.getLogger("session_store")
+        self._memory: Dict[str, Any] = {}
+        # Last persisted state per session, to compute deltas against
+        self._persisted: Dict[str, Dict[str, Any]] = {}
+        # session_id -> time the session finished (or was rehydrated finished)
+        self._finished: Dict[str, float] = {}
+        # Unfinished sessions created by this process, which owns their state
+        self._owned: Set[str] = set()
+        # Sessions saved on the event loop and not written yet -> finished flag
+        self._dirty: Dict[str, bool] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flushing: Optional[asyncio.Task] = None
+        self._evict_handle: Optional[asyncio.TimerHandle] = None
+        self._lock = threading.RLock()
+
+    def __getitem__(self, session_id: str) -> Any:
+        with self._lock:
+            if session_id in self._memory:
+                return self._memory[session_id]
+            loaded = self.store.load(self.namespace, session_id)
+            if loaded is None:
+                raise KeyError(session_id)
+            data, finished = loaded
+            # The session gets its own copy; nested values shared with the baseline would hide their changes
+            session = self.from_dict(copy.deepcopy(data))
+            self._memory[session_id] = session
+            self._persisted[session_id] = data
+            if finished:
+                self._finished[session_id] = time.time()
+            self.logger.debug(f"Rehydrated session {self.namespace}/{session_id}")
+            return session
+
+    def __setitem__(self, session_id: str, session: Any):
+        with self._lock:
+            # Written right away, so the session is listed and loadable by other processes
+            self._write([self._adopt(session_id, session)])
+
+    def __delitem__(self, session_id: str):
+        with self._lock:
+            known = session_id in self._memory or self.store.load(self.namespace, session_id) is not None
+            if not known:
+                raise KeyError(session_id)
+            self._forget(session_id)
+            self.store.delete(self.namespace, session_id)
+
+    def __contains__(self, session_id: object) -> bool:
+        try:
+            self[session_id]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            session_ids = list(self._memory)
+        seen = set(session_ids)
+        session_ids.extend(session_id for session_id in self.store.list_sessions(self.namespace) if session_id not in seen)
+        return iter(session_ids)
+
+    def __len__(self) -> int:
+        return len(set(self._memory) | set(self.store.list_sessions(self.namespace)))
+
+    async def get_async(self, session_id: str, default: Any = None) -> Any:
+        """``get`` for coroutines: a session not in memory is loaded on the I/O pool."""
+        with self._lock:
+            if session_id in self._memory:
+                return self._memory[session_id]
+        return await get_executor_manager().run_io(self.get, session_id, default, task_name="session_load")
+
+    async def contains_async(self, session_id: str) -> bool:
+        """``in`` for coroutines: a session not in memory is looked up on the I/O pool."""
+        return await self.get_async(session_id) is not None
+
+    async def set_async(self, session_id: str, session: Any):
+        """``map[session_id] = session`` for coroutines: the store write runs on the I/O pool."""
+        with self._lock:
+            # Encoded on the loop, where the session is mutated
+            item = self._adopt(session_id, session)
+        await get_executor_manager().run_io(self._write, [item], task_name="session_save")
+
+    def _adopt(self, session_id: str, session: Any) -> Tuple[str, str, bool]:
+        """Hold a new session in memory as owned by this process; returns its first write. Caller holds the lock."""
+        self._memory[session_id] = session
+        self._persisted.pop(session_id, None)
+        self._finished.pop(session_id, None)
+        self._dirty.pop(session_id, None)
+        self._owned.add(session_id)
+        return session_id, _encode(self.to_dict(session)), False
+
+    def save(self, session_id: str, finished: bool = False):
+        """
+        Persist the changes of an in-memory session since it was last saved:
+        coalesced and written off the loop when called on an event loop,
+        immediately otherwise.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            session = self._memory.get(session_id)
+            if session is None:
+                return
+            if loop is None:
+                self._write([(session_id, _encode(self.to_dict(session)), finished)])
+                self.evict_expired()
+                return
+            self._dirty[session_id] = self._dirty.get(session_id, False) or finished
+            if self._flush_handle is None and self._flushing is None:
+                self._flush_handle = loop.call_later(self.save_delay, self._start_flush)
+            if self._evict_handle is None:
+                self._evict_handle = loop.call_later(self.evict_interval, self._evict_periodically)
+
+    def mark_finished(self, session_id: str):
+        """Persist a completed or failed session and start its in-memory TTL."""
+        self.save(session_id, finished=True)
+
+    async def flush(self):
+        """Write the pending saves now, e.g. before another process takes a session over."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flushing is None and self._dirty:
+            self._start_flush()
+        if self._flushing is not None:
+            await self._flushing
+
+    async def close(self):
+        """Write the pending saves and stop the eviction timer."""
+        await self.flush()
+        if self._evict_handle is not None:
+            self._evict_handle.cancel()
+            self._evict_handle = None
+
+    def summaries(self, offset: int = 0, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """A page of stored session summaries (newest first) and the session count, without loading sessions."""
+        return self.store.list_summaries(self.namespace, offset, limit)
+
+    def _start_flush(self):
+        self._flush_handle = None
+        self._flushing = asyncio.get_running_loop().create_task(self._flush_dirty())
+
+    async def _flush_dirty(self):
+        try:
+            while True:
+                # Encode on the loop, where the sessions are mutated; diff and write on the I/O pool
+                with self._lock:
+                    batch = [
+                        (session_id, _encode(self.to_dict(self._memory[session_id])), finished)
+                        for session_id, finished in self._dirty.items() if session_id in self._memory
+                    ]
+                    self._dirty.clear()
+                if not batch:
+                    return
+                try:
+                    await get_executor_manager().run_io(self._write, batch, task_name="session_save")
+                except Exception as e:
+                    self.logger.error(f"Failed to save sessions ({self.namespace}): {str(e)}")
+                    with self._lock:
+                        for session_id, _, finished in batch:
+                            self._dirty[session_id] = self._dirty.get(session_id, False) or finished
+                    # Retried on the next save
+                    return
+        finally:
+            self._flushing = None
+
+    def _write(self, batch: List[Tuple[str, str, bool]]):
+        """Write encoded sessions to the store, as deltas against what was last written."""
+        for session_id, encoded, finished in batch:
+            data = json.loads(encoded)
+            summary = self.summarize(data) if self.summarize else None
+            with self._lock:
+                previous = self._persisted.get(session_id)
+                if previous is None:
+                    self.store.save_snapshot(self.namespace, session_id, data, finished, summary)
+                else:
+                    changes = {key: value for key, value in data.items() if previous.get(key) != value}
+                    if changes or finished:
+                        deltas = self.store.append_delta(self.namespace, session_id, changes, finished, summary)
+                        if deltas >= self.snapshot_every:
+                            # Compact: fold the deltas into a fresh snapshot
+                            self.store.save_snapshot(self.namespace, session_id, data, finished, summary)
+                if session_id not in self._memory:
+                    # Released or deleted while the write was pending
+                    continue
+                self._persisted[session_id] = data
+                if finished:
+                    self._finished[session_id] = time.time()
+                    self._owned.discard(session_id)
+
+    def _evict_periodically(self):
+        self._evict_handle = None
+        self.evict_expired()
+        if self._memory:
+            self._evict_handle = asyncio.get_running_loop().call_later(self.evict_interval, self._evict_periodically)
+
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        """Drop finished sessions older than the TTL from memory. They stay in the store."""
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [
+                session_id for session_id, finished_at in self._finished.items()
+                if now - finished_at >= self.ttl_seconds and session_id not in self._dirty
+            ]
+            for session_id in expired:
+                self._forget(session_id)
+        if expired:
+            self.logger.debug(f"Evicted {len(expired)} finished sessions from memory ({self.namespace})")
+        return len(expired)
+
+    def refresh(self, session_id: str):
+        """
+        Drop the in-memory copy of a session another process may have
+        changed, so the next read loads it from the store. Sessions this
+        process is still running are kept.
+        """
+        with self._lock:
+            if session_id not in self._owned:
+                self._forget(session_id)
+
+    def release(self, session_id: str):
+        """
+        Drop a session another process will continue from memory. It stays in
+        the store; a save still pending is written first (``flush`` beforehand
+        keeps that off the loop).
+        """
+        with self._lock:
+            if session_id in self._dirty and session_id in self._memory:
+                self._write([(session_id, _encode(self.to_dict(self._memory[session_id])), self._dirty[session_id])])
+            self._forget(session_id)
+
+    def in_memory(self) -> List[str]:
+        """Ids of the sessions currently held in memory."""
+        with self._lock:
+            return list(self._memory)
+
+    def clear_memory(self):
+        """Drop all sessions from memory without touching the store."""
+        with self._lock:
+            self._memory.clear()
+            self._persisted.clear()
+            self._finished.clear()
+            self._owned.clear()
+            self._dirty.clear()
+
+    def _forget(self, session_id: str):
+        self._memory.pop(session_id, None)
+        self._persisted.pop(session_id, None)
+        self._finished.pop(session_id, None)
+        self._owned.discard(session_id)
+        self._dirty.pop(session_id, None)
+
+
+def _encode(data: Dict[str, Any]) -> str:
+    return json.dumps(data, default=str)
+
+
+def _apply(snapshot: Any, deltas: List[Any]) -> Dict[str, Any]:
+    """Merge deltas (in order) into a snapshot."""
+    data = json.loads(snapshot)
+    for delta in deltas:
+        data.update(json.loads(delta))
+    return data
+
+
+# Global session store instance
+_session_store: Optional[SessionStore] = None
+
+
+def get_session_store() -> SessionStore:
+    """Get the global session store configured by SESSION_STORE_BACKEND."""
+    global _session_store
+    if _session_store is None:
+        config = get_config()
+        backend = config.session_store_backend.lower()
+        if backend == "redis":
+            _session_store = RedisSessionStore(config.session_store_redis_url)
+        elif backend == "memory":
+            _session_store = MemorySessionStore()
+        else:
+            _session_store = SQLiteSessionStore(config.session_store_path)
+    return _session_store
+
+
+def create_session_map(
+    namespace: str,
+    to_dict: Callable[[Any], Dict[str, Any]],
+    from_dict: Callable[[Dict[str, Any]], Any],
+    summarize: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+) -> PersistentSessionMap:
+    """Create a session map on the global store with the configured TTL and save delay."""
+    config = get_config()
+    return PersistentSessionMap(
+        namespace,
+        get_session_store(),
+        to_dict,
+        from_dict,
+        ttl_seconds=config.session_timeout,
+        snapshot_every=config.session_snapshot_every,
+        summarize=summarize,
+        save_delay=config.session_save_delay,
+        evict_interval=config.session_evict_interval
+    )
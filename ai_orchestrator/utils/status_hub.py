@@ -0,0 +1,260 @@
+"""
+Push-based workflow status distribution.
+
+Workflow components publish status fields as their state changes; the hub
+keeps the latest status per session, turns each change into a versioned delta
+and serializes every frame once so all subscribers of a session share the same
+payload. When attached to an event bus, changes are also exchanged with the
+hubs of other processes.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Any, Optional, Set, Callable, Awaitable
+
+from .logging_config import get_logger
+
+
+class _SessionStatus:
+    """Latest status of one session plus its cached frames."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.status: Dict[str, Any] = {}
+        self.version = 0
+        self.updated_at = time.time()
+        self.delta_text: Optional[str] = None  # delta from version - 1 to version
+        self._snapshot_text: Optional[str] = None
+        self._snapshot_version = -1
+
+    def snapshot_text(self) -> str:
+        """Serialized full status for the current version, built at most once per version."""
+        if self._snapshot_version != self.version:
+            self._snapshot_text = json.dumps({
+                "type": "status_snapshot",
+                "session_id": self.session_id,
+                "version": self.version,
+                "status": self.status
+            }, default=str)
+            self._snapshot_version = self.version
+        return self._snapshot_text
+
+
+class StatusSubscription:
+    """One connection's view of a session's status stream."""
+
+    def __init__(
+        self,
+        hub: "StatusHub",
+        session_id: str,
+        send: Callable[[str], Awaitable[None]],
+        loop: asyncio.AbstractEventLoop
+    ):
+        self.hub = hub
+        self.session_id = session_id
+        self.send = send
+        self.loop = loop
+        self.closed = False
+        self.sent_version = 0
+        self.frames_sent = 0
+        self.snapshots_sent = 0
+        self._wakeup = asyncio.Event()
+        self._wakeup.set()  # deliver the initial snapshot
+        self._task = loop.create_task(self._drain())
+
+    def notify(self):
+        """Wake the sender. Safe to call from any thread."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._wakeup.set()
+        else:
+            try:
+                self.loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                self.closed = True
+
+    def close(self):
+        """Stop sending."""
+        self.closed = True
+        try:
+            if asyncio.get_running_loop() is self.loop:
+                self._task.cancel()
+                return
+        except RuntimeError:
+            pass
+        try:
+            self.loop.call_soon_threadsafe(self._task.cancel)
+        except RuntimeError:
+            pass
+
+    async def _drain(self):
+        """Send a delta when exactly one version behind, otherwise a snapshot."""
+        try:
+            while not self.closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+
+                frame = self.hub._next_frame(self.session_id, self.sent_version)
+                if frame is None:
+                    continue
+                version, text, is_snapshot = frame
+                try:
+                    await self.send(text)
+                except Exception as e:
+                    self.hub.logger.debug(f"Status subscriber gone for {self.session_id}: {e}")
+                    self.closed = True
+                    return
+                self.sent_version = version
+                self.frames_sent += 1
+                if is_snapshot:
+                    self.snapshots_sent += 1
+        except asyncio.CancelledError:
+            pass
+
+
+class StatusHub:
+    """Keeps the latest workflow status per session and pushes changes to subscribers."""
+
+    def __init__(self, max_sessions: int = 500):
+        self.logger = get_logger("status_hub")
+        self._sessions: "OrderedDict[str, _SessionStatus]" = OrderedDict()
+        self._subscribers: Dict[str, Set[StatusSubscription]] = {}
+        self._lock = Lock()
+        self._max_sessions = max_sessions
+        self._bus = None
+
+    def attach_bus(self, bus):
+        """Forward status changes to other processes and apply theirs."""
+        self._bus = bus
+        bus.subscribe("status", self._on_remote_status)
+
+    def publish(self, session_id: str, /, **fields: Any) -> int:
+        """
+        Merge status fields for a session. Subscribers are only woken when a
+        value actually changed. Returns the session's status version.
+        """
+        return self._merge(session_id, fields, forward=True)
+
+    def _on_remote_status(self, event: Dict[str, Any]):
+        """Apply a status change published by another process."""
+        self._merge(event["session_id"], event["changes"], forward=False)
+
+    def _merge(self, session_id: str, fields: Dict[str, Any], forward: bool) -> int:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                entry = _SessionStatus(session_id)
+                self._sessions[session_id] = entry
+                self._evict_idle_sessions()
+            else:
+                self._sessions.move_to_end(session_id)
+
+            changes = {key: value for key, value in fields.items() if entry.status.get(key, _MISSING) != value}
+            if not changes:
+                return entry.version
+
+            entry.status.update(changes)
+            entry.version += 1
+            entry.updated_at = time.time()
+            entry.delta_text = json.dumps({
+                "type": "status_delta",
+                "session_id": session_id,
+                "version": entry.version,
+                "changes": changes
+            }, default=str)
+            subscribers = list(self._subscribers.get(session_id, ()))
+
+        for subscriber in subscribers:
+            subscriber.notify()
+        if forward and self._bus is not None:
+            self._bus.publish("status", {"session_id": session_id, "changes": changes})
+        return entry.version
+
+    def seed(self, session_id: str, status: Dict[str, Any]):
+        """Initialize a session's status if nothing has been published for it yet."""
+        with self._lock:
+            known = session_id in self._sessions and self._sessions[session_id].version > 0
+        if not known:
+            self.publish(session_id, **status)
+
+    def get_status(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of the latest published status of a session."""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            return dict(entry.status) if entry else None
+
+    def subscribe(self, session_id: str, send: Callable[[str], Awaitable[None]]) -> StatusSubscription:
+        """
+        Subscribe to a session's status. ``send`` receives pre-serialized JSON
+        frames: a snapshot first, then deltas. Must be called from the loop
+        that should run ``send``.
+        """
+        subscription = StatusSubscription(self, session_id, send, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(session_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: StatusSubscription):
+        """Remove a subscription."""
+        subscription.close()
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.session_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.session_id]
+
+    def discard(self, session_id: str):
+        """Forget a session's status (subscribers stay attached)."""
+        with self._lock:
+            if session_id not in self._subscribers:
+                self._sessions.pop(session_id, None)
+
+    def get_subscriber_count(self, session_id: Optional[str] = None) -> int:
+        """Count live status subscribers, optionally for one session."""
+        with self._lock:
+            if session_id is not None:
+                return len(self._subscribers.get(session_id, ()))
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    def _next_frame(self, session_id: str, sent_version: int):
+        """Pick the shared frame that brings a subscriber from sent_version to current."""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None or entry.version == sent_version:
+                return None
+            if sent_version and entry.version == sent_version + 1:
+                return entry.version, entry.delta_text, False
+            return entry.version, entry.snapshot_text(), True
+
+    def _evict_idle_sessions(self):
+        """Drop the least recently updated sessions without subscribers. Caller holds the lock."""
+        for session_id in list(self._sessions.keys()):
+            if len(self._sessions) <= self._max_sessions:
+                break
+            if session_id not in self._subscribers:
+                del self._sessions[session_id]
+
+
+_MISSING = object()
+
+# Global status hub instance
+_status_hub: Optional[StatusHub] = None
+
+
+def get_status_hub() -> StatusHub:
+    """Get the global status hub instance."""
+    global _status_hub
+    if _status_hub is None:
+        _status_hub = StatusHub()
+        from .event_bus import get_event_bus
+        bus = get_event_bus()
+        if bus is not None:
+            _status_hub.attach_bus(bus)
+    return _status_hub
@@ -0,0 +1,310 @@
+"""
+Lightweight hierarchical tracing.
+
+Spans are tracked in a context variable, so nesting follows the call chain
+across ``await`` points and into tasks created inside a span (session → phase
+→ agent call → HTTP attempt). When a trace's root span ends, the trace is
+written as a Chrome trace event file that can be opened as a flame chart in
+``chrome://tracing`` or https://ui.perfetto.dev. Files are serialized and
+written by a background thread, never on the caller's event loop.
+
+Spans opened outside of a trace are no-ops, so instrumented code paths cost
+almost nothing when no workflow is being traced.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import Context, ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator, Callable, Union, Tuple
+
+from ..core.config import get_config
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    category: str
+    start: float
+    end: Optional[float] = None
+    lane: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def to_chrome_event(self, origin: float) -> Dict[str, Any]:
+        """Convert to a Chrome trace complete ("X") event."""
+        args = dict(self.attributes, span_id=self.span_id, parent_id=self.parent_id)
+        if self.error:
+            args["error"] = self.error
+        end = self.end if self.end is not None else time.time()
+        return {
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": round((self.start - origin) * 1_000_000, 3),
+            "dur": round((end - self.start) * 1_000_000, 3),
+            "pid": 1,
+            "tid": self.lane,
+            "args": args
+        }
+
+
+class _Trace:
+    """Finished spans of one trace."""
+
+    def __init__(self, trace_id: str, root: Span):
+        self.trace_id = trace_id
+        self.root = root
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self.lanes: Dict[int, int] = {}
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_current_phase: ContextVar[Optional[str]] = ContextVar("current_phase", default=None)
+
+
+class Tracer:
+    """Collects spans per trace and writes finished traces to disk."""
+
+    def __init__(self, trace_dir: str = "./logs/traces", enabled: bool = True, max_spans_per_trace: int = 50000):
+        self.trace_dir = Path(trace_dir)
+        self.enabled = enabled
+        self.max_spans_per_trace = max_spans_per_trace
+        self.logger = logging.getLogger("tracing")
+        self._traces: Dict[str, _Trace] = {}
+        self._lock = threading.Lock()
+        self._pending: "queue.Queue[Union[_Trace, threading.Event]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+    @contextmanager
+    def trace(self, trace_id: str, name: str = "session", **attributes: Any) -> Iterator[Optional[Span]]:
+        """
+        Open the root span of a trace. The trace file is written when the block
+        exits. Nested calls for an already active trace behave like ``span``.
+        With tracing disabled only the trace id is tracked (see ``current_trace_id``).
+        """
+        current = _current_span.get()
+        if not self.enabled:
+            token = _current_span.set(Span(trace_id, "", None, name, "session", 0.0))
+            try:
+                yield None
+            finally:
+                _current_span.reset(token)
+            return
+        if current is not None and current.trace_id == trace_id:
+            with self.span(name, "session", **attributes) as span:
+                yield span
+            return
+
+        root = Span(trace_id, _new_id(), None, name, "session", time.time(), attributes=dict(attributes))
+        trace = _Trace(trace_id, root)
+        with self._lock:
+            self._traces[trace_id] = trace
+        root.lane = self._lane(trace)
+        token = _current_span.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            root.end = time.time()
+            with self._lock:
+                self._traces.pop(trace_id, None)
+            self._enqueue(trace)
+
+    @contextmanager
+    def span(self, name: str, category: str = "function", **attributes: Any) -> Iterator[Optional[Span]]:
+        """Open a child span of the current span; a no-op outside of a trace."""
+        parent = _current_span.get()
+        if parent is None or not self.enabled:
+            yield None
+            return
+
+        with self._lock:
+            trace = self._traces.get(parent.trace_id)
+        if trace is None:
+            yield None
+            return
+
+        span = Span(
+            parent.trace_id, _new_id(), parent.span_id, name, category, time.time(),
+            lane=self._lane(trace), attributes=dict(attributes)
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end = time.time()
+            self._finish(trace, span)
+
+    def record_span(self, name: str, category: str, start: float, end: float, **attributes: Any):
+        """Record an already finished operation as a child of the current span."""
+        parent = _current_span.get()
+        if parent is None or not self.enabled:
+            return
+        with self._lock:
+            trace = self._traces.get(parent.trace_id)
+        if trace is None:
+            return
+        span = Span(
+            parent.trace_id, _new_id(), parent.span_id, name, category, start, end,
+            lane=self._lane(trace), attributes=dict(attributes)
+        )
+        self._finish(trace, span)
+
+    def _finish(self, trace: _Trace, span: Span):
+        with self._lock:
+            if len(trace.spans) >= self.max_spans_per_trace:
+                trace.dropped += 1
+            else:
+                trace.spans.append(span)
+
+    def _lane(self, trace: _Trace) -> int:
+        """
+        Timeline lane for the calling task or thread. Concurrent tasks get
+        separate lanes so their spans nest correctly in the flame chart.
+        """
+        try:
+            owner = id(asyncio.current_task())
+        except RuntimeError:
+            owner = threading.get_ident()
+        with self._lock:
+            return trace.lanes.setdefault(owner, len(trace.lanes) + 1)
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until every finished trace has been written."""
+        done = threading.Event()
+        self._enqueue(done)
+        done.wait(timeout)
+
+    def _enqueue(self, item: Union[_Trace, threading.Event]):
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+                self._writer.start()
+        self._pending.put(item)
+
+    def _run(self):
+        """Writer loop: write finished traces in the order they ended."""
+        while True:
+            item = self._pending.get()
+            if isinstance(item, threading.Event):
+                item.set()
+            else:
+                self._write(item)
+
+    def _write(self, trace: _Trace):
+        """Write a finished trace as a Chrome trace event file."""
+        origin = trace.root.start
+        events = [trace.root.to_chrome_event(origin)]
+        events.extend(span.to_chrome_event(origin) for span in trace.spans)
+        document = {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "trace_id": trace.trace_id,
+                "start_time": origin,
+                "span_count": len(events),
+                "dropped_spans": trace.dropped
+            }
+        }
+        try:
+            self.trace_dir.mkdir(parents=True, exist_ok=True)
+            path = self.trace_dir / f"{trace.trace_id}.trace.json"
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(document, f, default=str)
+            os.replace(tmp_path, path)
+            self.logger.info(f"Trace written: {path} ({len(events)} spans)")
+        except OSError as e:
+            self.logger.error(f"Failed to write trace {trace.trace_id}: {e}")
+
+
+def traced(
+    category: str = "function",
+    name: Optional[Union[str, Callable[..., str]]] = None,
+    attributes: Optional[Callable[..., Dict[str, Any]]] = None
+):
+    """
+    Decorator that runs an async function inside a span. ``name`` and
+    ``attributes`` may be callables receiving the call's arguments.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            tracer = get_tracer()
+            if _current_span.get() is None:
+                return await func(*args, **kwargs)
+            span_name = name(*args, **kwargs) if callable(name) else (name or func.__qualname__)
+            # Phases are tracked even with tracing disabled, for attribution
+            phase_token = _current_phase.set(span_name) if category == "phase" else None
+            try:
+                if not tracer.enabled:
+                    return await func(*args, **kwargs)
+                span_attributes = attributes(*args, **kwargs) if attributes else {}
+                with tracer.span(span_name, category, **span_attributes):
+                    return await func(*args, **kwargs)
+            finally:
+                if phase_token is not None:
+                    _current_phase.reset(phase_token)
+        return wrapper
+    return decorator
+
+
+def current_trace_id() -> Optional[str]:
+    """Trace (session) id of the calling context, or None outside of a trace."""
+    span = _current_span.get()
+    return span.trace_id if span is not None else None
+
+
+def current_session_and_phase(context: Optional[Context] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Session id and innermost phase of the calling context, or of ``context``
+    (e.g. the context an event loop callback runs in).
+    """
+    if context is None:
+        span, phase = _current_span.get(), _current_phase.get()
+    else:
+        span, phase = context.get(_current_span), context.get(_current_phase)
+    return (span.trace_id if span is not None else None), phase
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+# Global tracer instance
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Get the global tracer instance."""
+    global _tracer
+    if _tracer is None:
+        config = get_config()
+        _tracer = Tracer(trace_dir=config.trace_dir, enabled=config.tracing_enabled)
+    return _tracer
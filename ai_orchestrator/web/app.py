@@ -2,13 +2,14 @@
 FastAPI web application for AI Orchestration System dashboard.
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, WebSocket, WebSocketDisconnect, Query
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import asyncio
+import json
 from pathlib import Path
 
 from ..core.orchestrator import AIOrchestrator
@@ -18,6 +19,14 @@ from ..utils.validation import SystemHealthChecker, APIKeyValidator
 from ..utils.file_manager import FileOutputManager
 from ..utils.env_manager import update_api_keys, validate_api_key
 from ..utils.process_monitor import get_process_monitor, MessageType
+from ..utils.event_log import EventLogReader
+from ..utils.session_profile import build_session_profile
+from ..utils.status_hub import get_status_hub
+from ..utils.executors import get_executor_manager, shutdown_executors
+from ..utils.loop_monitor import get_loop_monitor
+from ..utils.project_archive import ARCHIVE_FORMATS, etag_matches, get_archive_cache, iter_project_archive, project_version
+from ..utils.metrics import PROMETHEUS_CONTENT_TYPE
+from ..utils.ci_webhooks import get_pipeline_tracker, verify_signature
 # from ..core.code_generator import get_code_generator  # Temporarily disabled
 
 
@@ -102,6 +111,8 @@ def create_app() -> FastAPI:
         nonlocal orchestrator
         try:
             orchestrator = AIOrchestrator()
+            if get_config().loop_monitor_enabled:
+                get_loop_monitor().start()
             logger.info("AI Orchestration System web interface started")
         except Exception as e:
             logger.error(f"Failed to initialize orchestrator: {str(e)}")
@@ -110,8 +121,10 @@ def create_app() -> FastAPI:
     @app.on_event("shutdown")
     async def shutdown_event():
         """Clean up on shutdown."""
+        await get_loop_monitor().stop()
         if orchestrator:
             await orchestrator.cleanup()
+        shutdown_executors()
         logger.info("AI Orchestration System web interface stopped")
     
     # Web UI Routes
@@ -176,8 +189,9 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=503, detail="Orchestrator not available")
         
         try:
-            # Start workflow using micro-phase system (working version from July 2nd)
-            session_id = await orchestrator.start_micro_phase_workflow(project.description)
+            # Start workflow using micro-phase system (working version from July 2nd);
+            # queued for a worker process when a job queue is configured
+            session_id = await orchestrator.submit_workflow(project.description, "micro_phase")
             
             logger.info(f"Started new project: {session_id}")
             
@@ -212,83 +226,193 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/api/projects")
-    async def list_projects():
-        """List all active projects."""
+    async def list_projects(limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0)):
+        """List projects, most recently updated first, from the summaries in the session store."""
         if not orchestrator:
             raise HTTPException(status_code=503, detail="Orchestrator not available")
         
         try:
-            active_sessions = []
-            for session_id, state in orchestrator.active_sessions.items():
-                status_info = await orchestrator.get_workflow_status(session_id)
-                active_sessions.append({
-                    "session_id": session_id,
-                    "user_request": state.user_request[:100] + "..." if len(state.user_request) > 100 else state.user_request,
-                    "current_phase": status_info.get('current_phase', 'unknown'),
-                    "progress": status_info.get('progress', 0),
-                    "created_at": state.created_at
-                })
+            summaries, total_count = await get_executor_manager().run_io(
+                orchestrator.active_sessions.summaries, offset, limit, task_name="list_projects"
+            )
+            projects = [
+                {
+                    "session_id": summary["session_id"],
+                    "user_request": summary.get("user_request", ""),
+                    "current_phase": summary.get("current_phase", "unknown"),
+                    "progress": summary.get("progress", 0),
+                    "created_at": summary.get("created_at")
+                }
+                for summary in summaries
+            ]
             
-            return {"projects": active_sessions}
+            return {"projects": projects, "total_count": total_count, "has_more": offset + len(projects) < total_count}
             
         except Exception as e:
             logger.error(f"Failed to list projects: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
     
-    @app.get("/api/projects/{session_id}/download")
-    async def download_project(session_id: str):
-        """Generate and download project files."""
+    async def _completed_project_state(session_id: str) -> Dict[str, Any]:
+        """Workflow outputs of a completed session, from which its project files are built."""
         if not orchestrator:
             raise HTTPException(status_code=503, detail="Orchestrator not available")
         
+        # Check if session exists and is completed
+        workflow_state = await orchestrator.active_sessions.get_async(session_id)
+        if workflow_state is None:
+            raise HTTPException(status_code=404, detail="Project session not found")
+        
+        status_info = await orchestrator.get_workflow_status(session_id)
+        
+        if status_info['current_phase'] != 'completed':
+            raise HTTPException(status_code=400, detail=f"Project not completed yet. Current phase: {status_info['current_phase']}")
+        
+        # Get session results
+        session_results = await orchestrator.get_session_results(session_id)
+        if 'error' in session_results:
+            raise HTTPException(status_code=400, detail=session_results['error'])
+        
+        return {
+            'session_id': session_id,
+            'refined_requirements': workflow_state.refined_requirements,
+            'gpt_brainstorm': workflow_state.gpt_brainstorm,
+            'claude_brainstorm': workflow_state.claude_brainstorm,
+            'final_strategy': workflow_state.final_strategy,
+            'claude_plan': workflow_state.claude_plan,
+            'improved_backend_implementation': workflow_state.improved_backend_implementation,
+            'improved_frontend_implementation': workflow_state.improved_frontend_implementation,
+            'backend_implementation': workflow_state.backend_implementation,
+            'frontend_implementation': workflow_state.frontend_implementation,
+            'test_implementation': workflow_state.test_implementation,
+            'code_review_feedback': workflow_state.code_review_feedback,
+            'final_documentation': workflow_state.final_documentation,
+            'quality_report': workflow_state.quality_report
+        }
+    
+    # Archives being built, by (session, format, version). Concurrent downloads of the
+    # same version wait for that build instead of building the project again.
+    archive_builds: Dict[Tuple[str, str, str], asyncio.Task] = {}
+    
+    async def _build_archive(key: Tuple[str, str, str], project, queue: asyncio.Queue) -> Optional[bytes]:
+        """
+        Build an archive on the I/O pool ahead of its transfer and cache it.
+        ``queue`` gets the chunk iterator, each chunk and then None. An
+        archive over the cache size is left to the client to build at its
+        own pace: the build returns None as soon as it is that large, so
+        waiters build their own.
+        """
+        executors = get_executor_manager()
+        archive_cache = get_archive_cache()
+        session_id, archive_format, version = key
+        built = []
+        size = 0
         try:
-            # Check if session exists and is completed
-            if session_id not in orchestrator.active_sessions:
-                raise HTTPException(status_code=404, detail="Project session not found")
-            
-            workflow_state = orchestrator.active_sessions[session_id]
-            status_info = await orchestrator.get_workflow_status(session_id)
+            structure = await file_manager.create_project_structure_async(project)
+            chunks = iter_project_archive(structure.files, structure.name, archive_format)
+            queue.put_nowait(chunks)
+            while True:
+                chunk = await executors.run_io(next, chunks, None, task_name="build_archive")
+                if chunk is None:
+                    break
+                queue.put_nowait(chunk)
+                size += len(chunk)
+                if size > archive_cache.max_bytes:
+                    return None
+                built.append(chunk)
+            data = b"".join(built)
+            archive_cache.put(session_id, archive_format, version, data)
+            return data
+        finally:
+            queue.put_nowait(None)
+            if archive_builds.get(key) is asyncio.current_task():
+                del archive_builds[key]
+    
+    async def _stream_archive(build: asyncio.Task, queue: asyncio.Queue, chunks):
+        """Stream the chunks of an archive build, continuing it here when the archive outgrew the cache."""
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                break
+            yield chunk
+        # Raises when the build failed; None means the rest is ours to build
+        if await build is None:
+            executors = get_executor_manager()
+            while True:
+                chunk = await executors.run_io(next, chunks, None, task_name="build_archive")
+                if chunk is None:
+                    break
+                yield chunk
+    
+    @app.get("/api/projects/{session_id}/download")
+    async def download_project(session_id: str, request: Request, archive_format: str = Query("zip", alias="format")):
+        """Download the project files as a streamed ZIP or tar.gz archive."""
+        if archive_format not in ARCHIVE_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Unsupported archive format: {archive_format}")
+        
+        try:
+            workflow_state_dict = await _completed_project_state(session_id)
+            version = await get_executor_manager().run_io(
+                project_version, workflow_state_dict, archive_format, task_name="project_version"
+            )
+            media_type, extension = ARCHIVE_FORMATS[archive_format]
+            headers = {"ETag": f'"{version}"', "Cache-Control": "private, no-cache"}
+            
+            # Repeat downloads of an unchanged project
+            if etag_matches(request.headers.get("if-none-match"), version):
+                return Response(status_code=304, headers=headers)
+            
+            headers["Content-Disposition"] = f'attachment; filename="ai-project-{session_id}.{extension}"'
+            key = (session_id, archive_format, version)
+            cached = get_archive_cache().get(session_id, archive_format, version)
+            if cached is None and key in archive_builds:
+                # Resolves once the archive is built, not when its first client has it
+                cached = await asyncio.shield(archive_builds[key])
+            if cached is not None:
+                return Response(cached, media_type=media_type, headers=headers)
+            
+            # Registered before the response starts, so downloads arriving meanwhile wait for this build
+            queue: asyncio.Queue = asyncio.Queue()
+            build = asyncio.create_task(_build_archive(key, workflow_state_dict, queue))
+            archive_builds[key] = build
+            chunks = await queue.get()
+            if chunks is None:
+                # The project structure could not be created
+                await build
+            return StreamingResponse(
+                _stream_archive(build, queue, chunks),
+                media_type=media_type,
+                headers=headers
+            )
             
-            if status_info['current_phase'] != 'completed':
-                raise HTTPException(status_code=400, detail=f"Project not completed yet. Current phase: {status_info['current_phase']}")
-            
-            # Get session results
-            session_results = await orchestrator.get_session_results(session_id)
-            if 'error' in session_results:
-                raise HTTPException(status_code=400, detail=session_results['error'])
-            
-            # Create project structure and write to disk
-            workflow_state_dict = {
-                'session_id': session_id,
-                'refined_requirements': workflow_state.refined_requirements,
-                'gpt_brainstorm': workflow_state.gpt_brainstorm,
-                'claude_brainstorm': workflow_state.claude_brainstorm,
-                'final_strategy': workflow_state.final_strategy,
-                'claude_plan': workflow_state.claude_plan,
-                'improved_backend_implementation': workflow_state.improved_backend_implementation,
-                'improved_frontend_implementation': workflow_state.improved_frontend_implementation,
-                'backend_implementation': workflow_state.backend_implementation,
-                'frontend_implementation': workflow_state.frontend_implementation,
-                'test_implementation': workflow_state.test_implementation,
-                'code_review_feedback': workflow_state.code_review_feedback,
-                'final_documentation': workflow_state.final_documentation,
-                'quality_report': workflow_state.quality_report
-            }
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to build project archive: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to build project archive: {str(e)}")
+    
+    @app.post("/api/projects/{session_id}/generate")
+    async def generate_project_files(session_id: str):
+        """Generate project files for a completed workflow and write them to the output directory."""
+        try:
+            workflow_state_dict = await _completed_project_state(session_id)
             
             # Generate project structure
-            project_structure = file_manager.create_project_structure(workflow_state_dict)
+            project_structure = await file_manager.create_project_structure_async(workflow_state_dict)
             
-            # Write files to disk
-            output_path = file_manager.write_project_to_disk(project_structure)
+            # Write files to disk, rewriting only what changed
+            result = await file_manager.materialize_project_async(project_structure)
             
-            logger.info(f"Project files generated successfully: {output_path}")
+            logger.info(f"Project files generated successfully: {result.path}")
             
             return {
                 "status": "success",
                 "message": "Project files generated successfully",
-                "output_path": output_path,
+                "output_path": result.path,
                 "project_name": project_structure.name,
                 "file_count": len(project_structure.files),
+                "files_written": result.written,
+                "files_unchanged": result.skipped,
+                "files_deleted": result.deleted,
                 "session_id": session_id
             }
             
@@ -298,12 +422,6 @@ def create_app() -> FastAPI:
             logger.error(f"Failed to generate project files: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Failed to generate project files: {str(e)}")
     
-    @app.post("/api/projects/{session_id}/generate")
-    async def generate_project_files(session_id: str):
-        """Generate project files for a completed workflow."""
-        # Same logic as download but as POST endpoint
-        return await download_project(session_id)
-    
     @app.get("/api/health", response_model=HealthStatus)
     async def health_check():
         """Get system health status."""
@@ -315,14 +433,45 @@ def create_app() -> FastAPI:
             logger.error(f"Health check failed: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
     
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        """Expose metrics in the Prometheus text format for scrapers."""
+        try:
+            metrics_collector = get_metrics_collector()
+            monitor = get_process_monitor()
+            hub = get_status_hub()
+            
+            # Point-in-time gauges are sampled at scrape time
+            subscriber_stats = monitor.get_subscriber_stats()
+            event_log_stats = monitor.get_event_log_stats()
+            metrics_collector.set_gauge("active_sessions", len(orchestrator.active_sessions.in_memory()) if orchestrator else 0, {"source": "orchestrator"})
+            metrics_collector.set_gauge("active_sessions", len(monitor.get_active_sessions()), {"source": "process_monitor"})
+            metrics_collector.set_gauge("websocket_subscribers", len(subscriber_stats), {"stream": "process_monitor"})
+            metrics_collector.set_gauge("websocket_subscribers", hub.get_subscriber_count(), {"stream": "project_status"})
+            metrics_collector.set_gauge("queue_depth", sum(s["queue_depth"] for s in subscriber_stats), {"queue": "monitor_subscribers"})
+            metrics_collector.set_gauge("queue_depth", event_log_stats["queued"] if event_log_stats else 0, {"queue": "event_log"})
+            if orchestrator and orchestrator.job_queue is not None:
+                job_depth = orchestrator.job_queue.depth()
+                metrics_collector.set_gauge("queue_depth", job_depth.get("queued", 0), {"queue": "jobs"})
+                metrics_collector.set_gauge("queue_depth", job_depth.get("running", 0), {"queue": "jobs_running"})
+            executor_stats = get_executor_manager().get_stats()
+            metrics_collector.set_gauge("queue_depth", executor_stats["io"]["pending"], {"queue": "executor_io"})
+            metrics_collector.set_gauge("queue_depth", executor_stats["cpu"]["pending"], {"queue": "executor_cpu"})
+            
+            return PlainTextResponse(metrics_collector.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+            
+        except Exception as e:
+            logger.error(f"Failed to render Prometheus metrics: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+    
     @app.get("/api/metrics")
-    async def get_metrics():
-        """Get system metrics."""
+    async def get_metrics(window: bool = False):
+        """Get system metrics, optionally restricted to the recent rollup window."""
         try:
             metrics_collector = get_metrics_collector()
             performance_monitor = get_performance_monitor()
             
-            metrics_summary = metrics_collector.get_summary()
+            metrics_summary = metrics_collector.get_summary(window=window)
             health_status = performance_monitor.get_health_status()
             
             return {
@@ -452,6 +601,15 @@ def create_app() -> FastAPI:
             logger.error(f"Failed to update API keys: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
     
+    async def _github_user(token: str) -> Dict[str, Any]:
+        """
+        Look up the user a GitHub token authenticates as. The sync client waits
+        out rate limits in the calling thread, so it runs on the I/O pool.
+        """
+        from ..utils.github_integration import GitHubIntegration
+        github = GitHubIntegration(token=token)
+        return await get_executor_manager().run_io(github._get_authenticated_user, task_name="github_user")
+    
     @app.post("/api/settings/github")
     async def save_github_settings(request: Request):
         """Save GitHub integration settings."""
@@ -463,10 +621,8 @@ def create_app() -> FastAPI:
                 raise HTTPException(status_code=400, detail="GitHub token is required")
             
             # Test the token by getting user info
-            from ..utils.github_integration import GitHubIntegration
             try:
-                github = GitHubIntegration(token=token)
-                user_info = github._get_authenticated_user()
+                user_info = await _github_user(token)
                 
                 # Save settings to environment
                 from ..utils.env_manager import save_github_settings_to_env
@@ -476,7 +632,7 @@ def create_app() -> FastAPI:
                     'GIT_AUTO_COMMIT': str(data.get('auto_commit', True)).lower(),
                     'GIT_AUTO_PUSH': str(data.get('create_pr', False)).lower()
                 }
-                save_github_settings_to_env(env_data)
+                await get_executor_manager().run_io(save_github_settings_to_env, env_data, task_name="save_github_settings")
                 
                 # Update config
                 config = get_config()
@@ -514,10 +670,8 @@ def create_app() -> FastAPI:
                 return {"connected": False}
             
             # Try to get user info
-            from ..utils.github_integration import GitHubIntegration
             try:
-                github = GitHubIntegration(token=config.git.github_token)
-                user_info = github._get_authenticated_user()
+                user_info = await _github_user(config.git.github_token)
                 
                 return {
                     "connected": True,
@@ -543,10 +697,8 @@ def create_app() -> FastAPI:
             if not config.git.enabled or not config.git.github_token:
                 return {"connected": False, "message": "GitHub not configured"}
             
-            from ..utils.github_integration import GitHubIntegration
             try:
-                github = GitHubIntegration(token=config.git.github_token)
-                user_info = github._get_authenticated_user()
+                user_info = await _github_user(config.git.github_token)
                 
                 return {
                     "connected": True,
@@ -567,9 +719,17 @@ def create_app() -> FastAPI:
         limit: Optional[int] = None,
         message_type: Optional[str] = None,
         source: Optional[str] = None,
-        level: Optional[str] = None
+        level: Optional[str] = None,
+        since: Optional[int] = None,
+        encoding: Optional[str] = None
     ):
-        """Get process messages for a session with optional filtering."""
+        """
+        Get process messages for a session with optional filtering.
+        
+        Pass ``since=<seq>`` to receive only messages newer than that cursor
+        (oldest first, paged by ``limit``) and ``encoding=columnar`` for a
+        compact column-wise payload suited to bulk catch-up.
+        """
         try:
             monitor = get_process_monitor()
             
@@ -581,6 +741,20 @@ def create_app() -> FastAPI:
                 except ValueError:
                     raise HTTPException(status_code=400, detail=f"Invalid message_type: {message_type}")
             
+            if encoding and encoding not in ("rows", "columnar"):
+                raise HTTPException(status_code=400, detail=f"Invalid encoding: {encoding}")
+            
+            if since is not None or encoding:
+                return monitor.get_message_batch(
+                    session_id=session_id,
+                    since=since or 0,
+                    limit=limit,
+                    message_type=msg_type_enum,
+                    source=source,
+                    level=level,
+                    encoding=encoding or "rows"
+                )
+            
             messages = monitor.get_messages(
                 session_id=session_id,
                 limit=limit,
@@ -589,8 +763,10 @@ def create_app() -> FastAPI:
                 level=level
             )
             
-            return {"messages": messages}
+            return {"messages": messages, "last_seq": monitor.get_last_seq(session_id)}
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error getting process messages: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -607,6 +783,57 @@ def create_app() -> FastAPI:
             logger.error(f"Error getting process stats: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
     
+    @app.get("/api/process-monitor/{session_id}/profile")
+    async def get_process_profile(session_id: str):
+        """Get the critical-path and waterfall profile of a session."""
+        try:
+            monitor = get_process_monitor()
+            events = monitor.get_messages(session_id)
+            config = get_config()
+            if not events and config.event_log_enabled:
+                events = EventLogReader(config.event_log_dir).read_session(session_id)
+            if not events:
+                raise HTTPException(status_code=404, detail="Session not found")
+            
+            engine = orchestrator.workflow_engine if orchestrator else None
+            execution_context = (
+                engine.execution_context
+                if engine is not None and engine.current_session_id == session_id else None
+            )
+            timings = monitor.get_session_timings(session_id) or None
+            return {"profile": build_session_profile(session_id, events, execution_context, timings)}
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error building session profile: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    @app.get("/api/loop-monitor")
+    async def get_loop_monitor_report(session_id: Optional[str] = None, limit: int = 20):
+        """Get event loop lag statistics and recent blocking calls."""
+        try:
+            loop_monitor = get_loop_monitor()
+            return {
+                "stats": loop_monitor.get_stats(),
+                "blocking_calls": loop_monitor.get_blocking_calls(session_id, limit)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting loop monitor report: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    @app.get("/api/process-monitor/subscribers")
+    async def get_monitor_subscribers(session_id: Optional[str] = None):
+        """Get queue depth, drop and lag statistics for live monitor subscribers."""
+        try:
+            monitor = get_process_monitor()
+            return {"subscribers": monitor.get_subscriber_stats(session_id)}
+            
+        except Exception as e:
+            logger.error(f"Error getting subscriber stats: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+    
     @app.get("/api/process-monitor/sessions")
     async def get_monitored_sessions():
         """Get list of sessions being monitored."""
@@ -631,6 +858,33 @@ def create_app() -> FastAPI:
             logger.error(f"Error clearing process messages: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
     
+    @app.post("/api/github/webhook")
+    async def receive_github_webhook(request: Request):
+        """Ingest GitHub CI webhooks (workflow_run, check_suite, pull_request, push)."""
+        secret = get_config().ci_webhook_secret
+        if not secret:
+            raise HTTPException(status_code=503, detail="CI_WEBHOOK_SECRET is not configured")
+        
+        body = await request.body()
+        if not verify_signature(secret, body, request.headers.get("X-Hub-Signature-256")):
+            raise HTTPException(status_code=401, detail="Invalid webhook signature")
+        
+        event = request.headers.get("X-GitHub-Event", "")
+        if event == "ping":
+            return {"event": "ping", "result": "pong"}
+        
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Webhook body is not JSON")
+        
+        try:
+            return get_pipeline_tracker().handle_event(event, payload, request.headers.get("X-GitHub-Delivery"))
+            
+        except Exception as e:
+            logger.error(f"Error handling {event} webhook: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+    
     # Universal Project Generator API Endpoints
     @app.post("/api/universal-generator/analyze")
     async def analyze_project_idea(request: dict):
@@ -645,7 +899,7 @@ def create_app() -> FastAPI:
             session_id = str(uuid.uuid4())
             
             # Use micro-phase workflow system (working version from July 2nd)
-            session_id = await orchestrator.start_micro_phase_workflow(user_idea)
+            session_id = await orchestrator.submit_workflow(user_idea, "micro_phase")
             
             return {
                 "session_id": session_id,
@@ -705,7 +959,7 @@ def create_app() -> FastAPI:
             logger.info(f"Starting adaptive project build for: {user_idea[:100]}...")
             
             # Use micro-phase workflow system to generate the complete project (working version from July 2nd)
-            session_id = await orchestrator.start_micro_phase_workflow(user_idea)
+            session_id = await orchestrator.submit_workflow(user_idea, "micro_phase")
             
             return {
                 "status": "success", 
@@ -723,53 +977,101 @@ def create_app() -> FastAPI:
     # WebSocket endpoints for real-time updates
     @app.websocket("/ws/projects/{session_id}")
     async def websocket_project_updates(websocket: WebSocket, session_id: str):
-        """WebSocket endpoint for real-time project updates."""
+        """
+        WebSocket endpoint for real-time project updates.
+
+        Sends a ``status_snapshot`` on connect and then a ``status_delta`` with
+        only the changed fields whenever the workflow changes state.
+        """
         await websocket.accept()
-        
+        hub = get_status_hub()
+        subscription = None
+
         try:
-            while True:
-                if orchestrator and session_id in orchestrator.active_sessions:
-                    status_info = await orchestrator.get_workflow_status(session_id)
-                    await websocket.send_json(status_info)
-                else:
+            if hub.get_status(session_id) is None:
+                known = orchestrator and (
+                    await orchestrator.active_sessions.contains_async(session_id) or
+                    await orchestrator.is_micro_phase_workflow(session_id)
+                )
+                if not known:
                     await websocket.send_json({"error": "Session not found"})
-                    break
-                
-                await asyncio.sleep(2)  # Update every 2 seconds
-                
+                    return
+                status_info = await orchestrator.get_unified_workflow_status(session_id)
+                status_info.pop("execution_time", None)
+                hub.seed(session_id, status_info)
+
+            subscription = hub.subscribe(session_id, websocket.send_text)
+
+            # Updates are pushed by the hub; the receive loop only detects disconnects
+            while True:
+                await websocket.receive_text()
+
         except WebSocketDisconnect:
             logger.info(f"WebSocket disconnected for session {session_id}")
         except Exception as e:
             logger.error(f"WebSocket error: {str(e)}")
             await websocket.close()
+        finally:
+            if subscription:
+                hub.unsubscribe(subscription)
     
     @app.websocket("/ws/process-monitor/{session_id}")
     async def websocket_process_monitor(websocket: WebSocket, session_id: str):
-        """WebSocket endpoint for real-time process monitoring."""
+        """
+        WebSocket endpoint for real-time process monitoring.
+        
+        Reconnecting clients pass ``?since=<seq>`` with the last sequence
+        number they saw and receive everything newer instead of the last 50.
+        A cursor past the monitor's last sequence number comes from before a
+        restart; such clients get a fresh snapshot flagged with ``reset``.
+        """
         await websocket.accept()
         monitor = get_process_monitor()
         
+        since_param = websocket.query_params.get("since")
+        resume_since = int(since_param) if since_param and since_param.isdigit() else None
+        
+        # Messages up to this cursor are covered by the initial payload; live
+        # messages at or below it are skipped so nothing is delivered twice.
+        initial_last_seq = 0
+        
+        # Subscribe to new messages; the monitor batches queued messages into
+        # one frame and reports dropped ranges when this client falls behind.
+        async def send_frame(frame):
+            messages = [m for m in frame["messages"] if m.get("seq", 0) > initial_last_seq]
+            if not messages and not frame["dropped"]:
+                return
+            await websocket.send_json({**frame, "messages": messages})
+        
+        # Subscribe before taking the snapshot so no message falls in between
+        subscription = monitor.subscribe(session_id, send_frame)
+        
         # Send current messages first
         try:
-            messages = monitor.get_messages(session_id, limit=50)
-            await websocket.send_json({
-                "type": "initial_messages",
-                "messages": messages
-            })
-        except Exception as e:
-            logger.error(f"Error sending initial messages: {str(e)}")
-        
-        # Subscribe to new messages
-        async def message_callback(message_data):
-            try:
+            stale_cursor = resume_since is not None and resume_since > monitor.get_last_seq(session_id)
+            if stale_cursor:
+                logger.info(f"Stale monitor cursor {resume_since} for session {session_id}, sending a snapshot")
+            
+            if resume_since is not None and not stale_cursor:
+                batch = monitor.get_message_batch(session_id, since=resume_since)
+                initial_last_seq = batch["next_since"]
                 await websocket.send_json({
-                    "type": "new_message",
-                    "message": message_data
+                    "type": "initial_messages",
+                    "messages": batch["messages"],
+                    "last_seq": batch["last_seq"],
+                    "truncated": batch["truncated"]
                 })
-            except Exception as e:
-                logger.error(f"Error sending message via WebSocket: {str(e)}")
-        
-        monitor.subscribe(session_id, message_callback)
+            else:
+                initial_last_seq = monitor.get_last_seq(session_id)
+                messages = monitor.get_messages(session_id, limit=50)
+                await websocket.send_json({
+                    "type": "initial_messages",
+                    "messages": messages,
+                    "last_seq": initial_last_seq,
+                    "reset": stale_cursor
+                })
+        except Exception as e:
+            logger.error(f"Error sending initial messages: {str(e)}")
         
         try:
             # Keep connection alive and handle client messages
@@ -782,14 +1084,33 @@ def create_app() -> FastAPI:
                         stats = monitor.get_session_stats(session_id)
                         await websocket.send_json({
                             "type": "stats_update",
-                            "stats": stats
+                            "stats": stats,
+                            "subscription": subscription.get_stats()
                         })
                     elif data.get("command") == "get_messages":
                         filters = data.get("filters", {})
+                        message_type = MessageType(filters["message_type"]) if filters.get("message_type") else None
+                        
+                        if filters.get("since") is not None or data.get("encoding"):
+                            batch = monitor.get_message_batch(
+                                session_id=session_id,
+                                since=int(filters.get("since") or 0),
+                                limit=filters.get("limit"),
+                                message_type=message_type,
+                                source=filters.get("source"),
+                                level=filters.get("level"),
+                                encoding=data.get("encoding", "rows")
+                            )
+                            await websocket.send_json({
+                                "type": "message_batch",
+                                "batch": batch
+                            })
+                            continue
+                        
                         messages = monitor.get_messages(
                             session_id=session_id,
                             limit=filters.get("limit"),
-                            message_type=MessageType(filters["message_type"]) if filters.get("message_type") else None,
+                            message_type=message_type,
                             source=filters.get("source"),
                             level=filters.get("level")
                         )
@@ -807,7 +1128,7 @@ def create_app() -> FastAPI:
         except Exception as e:
             logger.error(f"Process monitor WebSocket error: {str(e)}")
         finally:
-            monitor.unsubscribe(session_id, message_callback)
+            monitor.unsubscribe(session_id, subscription)
     
     # Error handlers
     @app.exception_handler(404)
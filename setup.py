@@ -39,6 +39,7 @@ setup(
     extras_require={
         "git": ["GitPython>=3.1.40", "PyGithub>=1.59.1"],
         "web": ["fastapi>=0.104.1", "uvicorn[standard]>=0.24.0"],
+        "redis": ["redis>=5.0.1"],
         "dev": [
             "pytest>=7.4.3",
             "pytest-asyncio>=0.21.1", 
@@ -4,7 +4,7 @@ Startup script for the AI Orchestrator Web Interface
 """
 
 import uvicorn
-from ai_orchestrator.web.app import create_app
+from ai_orchestrator.core.config import get_config
 
 def main():
     """Start the web application."""
@@ -14,15 +14,20 @@ def main():
     print("📊 Health: http://localhost:8000/api/health")
     print()
     
-    # Create the app
-    app = create_app()
+    config = get_config()
+    workers = config.web_workers
+    if workers > 1 and config.job_queue_backend == "inline":
+        print("⚠️  WEB_WORKERS > 1 needs JOB_QUEUE_BACKEND=sqlite or redis; starting a single worker")
+        workers = 1
     
-    # Run the server
+    # Run the server; each worker process builds its own app from the factory
     try:
         uvicorn.run(
-            app, 
+            "ai_orchestrator.web.app:create_app",
+            factory=True,
             host="0.0.0.0", 
             port=8000, 
+            workers=workers,
             reload=False,  # Disable reload to avoid import issues
             log_level="info"
         )
@@ -11,6 +11,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 from ai_orchestrator.core.config import OrchestratorConfig
 from ai_orchestrator.agents.base_agent import AgentResponse, TaskType, AgentRole
+from ai_orchestrator.utils import github_cache, github_scheduler
 
 
 @pytest.fixture(scope="session")
@@ -127,4 +128,12 @@ def sample_workflow_state():
         "backend_implementation": "# Backend code here",
         "frontend_implementation": "// Frontend code here",
         "test_implementation": "# Test code here"
-    }
\ No newline at end of file
+    }
+
+@pytest.fixture
+def isolated_github(monkeypatch):
+    """Fresh GitHub response cache and an unpaced write scheduler, for clients talking to local stubs."""
+    cache = github_cache.GitHubResponseCache()
+    monkeypatch.setattr(github_cache, "_github_cache", cache)
+    monkeypatch.setattr(github_scheduler, "_github_scheduler", github_scheduler.GitHubScheduler(write_interval=0))
+    return cache
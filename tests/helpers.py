@@ -0,0 +1,41 @@
+"""
+Helpers shared by the unit tests: GitHub API stubs served locally and git
+commands against throwaway repositories.
+"""
+
+import os
+import subprocess
+from typing import Tuple
+
+from aiohttp.test_utils import TestServer
+
+from ai_orchestrator.utils.enhanced_github_client import EnhancedGitHubClient
+
+
+# Commits made by the tests do not depend on the user's git config
+GIT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "Dev", "GIT_AUTHOR_EMAIL": "dev@example.com",
+    "GIT_COMMITTER_NAME": "Dev", "GIT_COMMITTER_EMAIL": "dev@example.com"
+}
+
+
+async def start_github_stub(stub, org="acme", **kwargs) -> Tuple[TestServer, EnhancedGitHubClient]:
+    """Serve ``stub.app()`` locally and return the server and a client pointed at it."""
+    server = TestServer(stub.app())
+    await server.start_server()
+    client = EnhancedGitHubClient(token="test-token", org=org, **kwargs)
+    client.base_url = str(server.make_url("")).rstrip("/")
+    return server, client
+
+
+def run_git(*args, cwd=None, check=True, input=None) -> subprocess.CompletedProcess:
+    """Run a git command with the test identity."""
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=check, capture_output=True, text=True, input=input,
+        env={**os.environ, **GIT_IDENTITY}
+    )
+
+
+def git(*args, cwd=None) -> str:
+    """Output of a git command that must succeed."""
+    return run_git(*args, cwd=cwd).stdout
@@ -0,0 +1,240 @@
+"""
+Unit tests for stale branch cleanup and branch analytics against a paginated GitHub stub.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from aiohttp import web
+
+from ai_orchestrator.core.config import get_config
+from ai_orchestrator.utils.branch_manager import BranchManager
+from tests.helpers import start_github_stub
+
+
+def _days_ago(days: int) -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class BranchesStub:
+    """Branches of acme/demo with commit dates, merge state and pull requests, listed in pages."""
+
+    def __init__(self, branches, pulls=(), reviews=None, check_runs=None, default_branch="develop",
+                 latency: float = 0.002):
+        # name -> {"sha", "age", "ahead"}
+        self.branches = dict(branches)
+        self.default_branch = default_branch
+        self.pulls = list(pulls)
+        # pull number -> reviews, head sha -> check runs
+        self.reviews = dict(reviews or {})
+        self.check_runs = dict(check_runs or {})
+        self.latency = latency
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self.track])
+        base = "/repos/acme/demo"
+        app.router.add_get(base, self.repository)
+        app.router.add_get(base + "/branches", self.list_branches)
+        app.router.add_get(base + "/pulls", self.list_pulls)
+        app.router.add_get(base + "/commits/{sha}", self.commit)
+        app.router.add_get(base + "/commits/{sha}/status", self.status)
+        app.router.add_get(base + "/commits/{sha}/check-runs", self.list_check_runs)
+        app.router.add_get(base + "/pulls/{number}/reviews", self.list_reviews)
+        app.router.add_get(base + "/compare/{spec}", self.compare)
+        app.router.add_delete(base + "/git/refs/heads/{branch:.+}", self.delete_ref)
+        return app
+
+    @web.middleware
+    async def track(self, request, handler):
+        self.requests.append((request.method, (request.path.split("/") + ["repo"])[4], request.query.get("page")))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            return await handler(request)
+        finally:
+            self.in_flight -= 1
+
+    def count(self, kind: str) -> int:
+        return len([r for r in self.requests if r[1] == kind])
+
+    def _page(self, request, items):
+        per_page, page = int(request.query["per_page"]), int(request.query["page"])
+        return web.json_response(items[(page - 1) * per_page:page * per_page])
+
+    async def repository(self, request):
+        return web.json_response({"name": "demo", "default_branch": self.default_branch})
+
+    async def list_branches(self, request):
+        return self._page(request, [{"name": name, "commit": {"sha": b["sha"]}, "protected": name == "develop"}
+                                    for name, b in self.branches.items()])
+
+    async def list_pulls(self, request):
+        state, base = request.query.get("state", "open"), request.query.get("base")
+        return self._page(request, [pull for pull in self.pulls if state in ("all", pull["state"])
+                                    and base in (None, pull.get("base", {}).get("ref"))])
+
+    async def list_reviews(self, request):
+        return self._page(request, self.reviews.get(int(request.match_info["number"]), []))
+
+    async def list_check_runs(self, request):
+        runs = self.check_runs.get(request.match_info["sha"], [])
+        return web.json_response({"total_count": len(runs), "check_runs": runs})
+
+    def _by_sha(self, sha):
+        return next(b for b in self.branches.values() if b["sha"] == sha)
+
+    async def commit(self, request):
+        return web.json_response({"commit": {"committer": {"date": _days_ago(self._by_sha(request.match_info["sha"])["age"])}}})
+
+    async def status(self, request):
+        return web.json_response({"state": "success", "total_count": 1})
+
+    async def compare(self, request):
+        head = request.match_info["spec"].split("...")[1]
+        return web.json_response({"ahead_by": self._by_sha(head)["ahead"], "behind_by": 0})
+
+    async def delete_ref(self, request):
+        del self.branches[request.match_info["branch"]]
+        return web.Response(status=204)
+
+
+@pytest.fixture(autouse=True)
+def api_backend(isolated_github, monkeypatch):
+    monkeypatch.setattr(get_config(), "publish_backend", "api")
+    monkeypatch.setattr(get_config(), "branch_metadata_concurrency", 4)
+
+
+def _merged_pull(number, branch, sha):
+    return {"number": number, "state": "closed", "merged_at": _days_ago(50), "head": {"ref": branch, "sha": sha}}
+
+
+def _branches():
+    """develop, 200 old merged, 30 old unmerged and 20 recent micro-phase branches."""
+    branches = {"develop": {"sha": "d0", "age": 1, "ahead": 0}}
+    for i in range(250):
+        age, ahead = (60, 0) if i < 200 else (60, 2) if i < 230 else (2, 1)
+        branches[f"feature/phase-{i}"] = {"sha": f"s{i}", "age": age, "ahead": ahead}
+    return branches
+
+
+class TestBranchCleanup:
+    """Test paginated listing, bounded metadata fetches, batched deletion and incremental analytics."""
+
+    @pytest.mark.asyncio
+    async def test_cleanup_deletes_merged_stale_branches(self):
+        """Test that every page is listed and only stale, merged branches without an open PR are deleted."""
+        stub = BranchesStub(_branches(), pulls=[
+            {"number": 7, "state": "open", "merged_at": None, "head": {"ref": "feature/phase-3"}}
+        ] + [_merged_pull(100 + i, f"feature/phase-{i}", f"s{i}") for i in range(200) if i != 3])
+        server, client = await start_github_stub(stub)
+        try:
+            result = await BranchManager(client).cleanup_stale_branches("demo")
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert [page for _, kind, page in stub.requests if kind == "branches"] == ["1", "2", "3"]
+        assert [page for _, kind, page in stub.requests if kind == "pulls"] == ["1", "2", "3"]
+        assert result["total_branches_checked"] == 251
+        assert result["stale_branches_found"] == 230
+        assert result["branches_deleted"] == 199
+        assert "feature/phase-3" in stub.branches and len(stub.branches) == 52
+        assert stub.max_in_flight <= 4 * 3
+
+    @pytest.mark.asyncio
+    async def test_analytics_reuse_metadata_between_runs(self, isolated_github):
+        """Test that a second run only fetches metadata of the branch that moved."""
+        stub = BranchesStub(_branches())
+        server, client = await start_github_stub(stub)
+        manager = BranchManager(client)
+        try:
+            first = await manager.get_branch_analytics("demo")
+            fetched = stub.count("commits"), stub.count("compare")
+            stub.branches["feature/phase-240"].update(sha="moved", age=0)
+            isolated_github.clear()
+            second = await manager.get_branch_analytics("demo")
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert fetched == (251 * 2, 250)
+        assert stub.count("commits") - fetched[0] == 2 and stub.count("compare") - fetched[1] == 1
+        assert first["total_branches"] == second["total_branches"] == 251
+        assert first["age_distribution"] == {"new": 21, "active": 0, "old": 230, "stale": 0}
+        assert second["age_distribution"]["new"] == 21
+
+    @pytest.mark.asyncio
+    async def test_only_branches_that_landed_count_as_merged(self, monkeypatch, isolated_github):
+        """Test merged detection, the default branch and branches without a max age rule."""
+        stub = BranchesStub({
+            "develop": {"sha": "d0", "age": 1, "ahead": 0},
+            "trunk": {"sha": "t0", "age": 60, "ahead": 0},
+            "feature/fresh": {"sha": "f0", "age": 60, "ahead": 0},
+            "feature/landed": {"sha": "l0", "age": 60, "ahead": 2},
+            "feature/moved": {"sha": "m1", "age": 60, "ahead": 1},
+            "feature/squashed": {"sha": "q0", "age": 60, "ahead": 3},
+            "misc/old": {"sha": "o0", "age": 60, "ahead": 1}
+        }, pulls=[
+            _merged_pull(1, "feature/moved", "m0"), _merged_pull(2, "feature/squashed", "q0"),
+            _merged_pull(3, "misc/old", "o0"), _merged_pull(4, "trunk", "t0")
+        ], default_branch="trunk")
+        server, client = await start_github_stub(stub)
+        manager = BranchManager(client)
+        try:
+            first = await manager.cleanup_stale_branches("demo")
+            # feature/landed is merged: develop moves and the branch is no longer ahead
+            stub.branches["develop"]["sha"] = "d1"
+            stub.branches["feature/landed"]["ahead"] = 0
+            isolated_github.clear()
+            monkeypatch.setattr(get_config(), "branch_cleanup_without_rule", True)
+            second = await manager.cleanup_stale_branches("demo")
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        def deleted(result):
+            return [r["branch"] for r in result["cleanup_results"] if r["status"] == "deleted"]
+
+        assert deleted(first) == ["feature/squashed"]
+        assert deleted(second) == ["feature/landed", "misc/old"]
+        assert set(stub.branches) == {"develop", "trunk", "feature/fresh", "feature/moved"}
+
+
+class TestReadyToMerge:
+    """Test the merge queue's ready set."""
+
+    @pytest.mark.asyncio
+    async def test_ready_branches_have_green_checks_and_approval(self):
+        """Test that only open pull requests into the target with passing checks and an approval are ready."""
+        def pull(number, branch, base="develop", state="open"):
+            return {"number": number, "state": state, "merged_at": None,
+                    "head": {"ref": branch, "sha": f"h{number}"}, "base": {"ref": base}}
+
+        def review(login, state):
+            return {"user": {"login": login}, "state": state}
+
+        stub = BranchesStub({}, pulls=[
+            pull(1, "feature/ready"), pull(2, "feature/unreviewed"), pull(3, "feature/changes"),
+            pull(4, "feature/running"), pull(5, "feature/main", base="main"), pull(6, "feature/closed", state="closed")
+        ], reviews={
+            1: [review("ana", "CHANGES_REQUESTED"), review("ana", "APPROVED")],
+            3: [review("ana", "APPROVED"), review("bo", "CHANGES_REQUESTED")],
+            4: [review("ana", "APPROVED")],
+            5: [review("ana", "APPROVED")]
+        }, check_runs={
+            "h1": [{"status": "completed", "conclusion": "success"}, {"status": "completed", "conclusion": "skipped"}],
+            "h4": [{"status": "in_progress", "conclusion": None}]
+        })
+        server, client = await start_github_stub(stub)
+        try:
+            ready = await BranchManager(client)._get_ready_to_merge_branches("demo", "develop")
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert ready == [{"name": "feature/ready", "head_sha": "h1", "pull_request_number": 1}]
@@ -0,0 +1,189 @@
+"""
+Unit tests for CI webhook ingestion, replayed from recorded GitHub payloads.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ai_orchestrator.core.config import get_config
+from ai_orchestrator.utils import ci_webhooks, process_monitor
+from ai_orchestrator.utils.ci_cd_automation import CICDAutomation
+from ai_orchestrator.utils.ci_webhooks import PipelineTracker, verify_signature
+from ai_orchestrator.utils.event_bus import SQLiteEventBus
+from ai_orchestrator.utils.process_monitor import ProcessMonitor
+from ai_orchestrator.web.app import create_app
+
+
+PAYLOADS = Path(__file__).parent.parent / "fixtures" / "github_webhooks"
+REPO = "ai-demo-1a2b3c4d"
+FULL_NAME = f"acme/{REPO}"
+RUN_ID = "30433642"
+SECRET = "webhook-secret"
+
+
+def _payload(name: str) -> dict:
+    return json.loads((PAYLOADS / f"{name}.json").read_text())
+
+
+def _sign(body: bytes, secret: str = SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = PipelineTracker()
+    monkeypatch.setattr(ci_webhooks, "_pipeline_tracker", tracker)
+    monkeypatch.setattr(process_monitor, "_process_monitor", ProcessMonitor())
+    monkeypatch.setattr(get_config(), "ci_poll_min_interval", 0.01)
+    monkeypatch.setattr(get_config(), "ci_poll_max_interval", 0.04)
+    return tracker
+
+
+class RunsStub:
+    """Answers workflow run requests from a list of statuses, repeating the last one."""
+
+    base_url = "https://api.github.test"
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.requests = 0
+
+    async def get_repo_owner(self):
+        return "acme"
+
+    async def _make_request(self, method, url, **kwargs):
+        self.requests += 1
+        if url.endswith("/jobs"):
+            return {"jobs": []}
+        run = _payload("workflow_run_in_progress")["workflow_run"]
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        run.update(status=status, conclusion="success" if status == "completed" else None)
+        return run
+
+
+class TestWebhookEndpoint:
+    """Test signature checks and ingestion through the FastAPI route."""
+
+    def _deliver(self, client, event, name, delivery="d-1", signature=None):
+        body = (PAYLOADS / f"{name}.json").read_bytes()
+        return client.post("/api/github/webhook", content=body, headers={
+            "X-GitHub-Event": event,
+            "X-GitHub-Delivery": delivery,
+            "X-Hub-Signature-256": signature or _sign(body),
+            "Content-Type": "application/json"
+        })
+
+    def test_signed_deliveries_update_state_and_monitor(self, tracker, monkeypatch):
+        """Test that a signed delivery is applied once and reaches the watching session's monitor."""
+        monkeypatch.setattr(get_config(), "ci_webhook_secret", SECRET)
+        tracker.watch(FULL_NAME, "s1")
+        client = TestClient(create_app())
+
+        accepted = self._deliver(client, "workflow_run", "workflow_run_completed")
+        duplicate = self._deliver(client, "workflow_run", "workflow_run_completed")
+        forged = self._deliver(client, "push", "push", delivery="d-2", signature=_sign(b"{}"))
+
+        assert accepted.json() == {"event": "workflow_run", "result": "accepted", "repository": FULL_NAME}
+        assert duplicate.json()["result"] == "duplicate"
+        assert forged.status_code == 401
+        assert tracker.get_run(FULL_NAME, RUN_ID).conclusion == "failure"
+        messages = process_monitor.get_process_monitor().get_messages("s1")
+        assert [m["content"]["event"] for m in messages] == ["ci_workflow_run"]
+        assert messages[0]["content"]["details"]["pull_requests"] == [2]
+
+    def test_rejects_deliveries_without_secret(self, tracker, monkeypatch):
+        """Test that nothing is accepted while no webhook secret is configured."""
+        monkeypatch.setattr(get_config(), "ci_webhook_secret", None)
+        response = self._deliver(TestClient(create_app()), "push", "push")
+        assert response.status_code == 503
+        assert not tracker.receives_webhooks(FULL_NAME)
+
+
+class TestPipelineTracker:
+    """Test state kept from recorded payloads."""
+
+    def test_recorded_events(self, tracker):
+        """Test check suite, pull request and push state, and that late deliveries never reopen a run."""
+        tracker.handle_event("workflow_run", _payload("workflow_run_completed"), "d-1")
+        tracker.handle_event("workflow_run", _payload("workflow_run_in_progress"), "d-2")
+        tracker.handle_event("check_suite", _payload("check_suite_completed"), "d-3")
+        tracker.handle_event("pull_request", _payload("pull_request_synchronize"), "d-4")
+        tracker.handle_event("push", _payload("push"), "d-5")
+        sha = "acb5820ced9479c074f688cc328bf03f341a511d"
+
+        assert tracker.get_run(FULL_NAME, RUN_ID).status == "completed"
+        assert tracker.get_check_suite(FULL_NAME, sha)["conclusion"] == "success"
+        assert tracker.get_pull_request(FULL_NAME, 2)["head_sha"] == sha
+        assert tracker.get_branch_head(FULL_NAME, "feature/models") == sha
+        assert tracker.handle_event("issues", {"repository": {"name": REPO}})["result"] == "ignored"
+        assert verify_signature(SECRET, b"{}", _sign(b"{}"))
+        assert not verify_signature(SECRET, b"{}", _sign(b"{}", "other"))
+
+    @pytest.mark.asyncio
+    async def test_deliveries_reach_trackers_of_other_processes(self, tracker, tmp_path):
+        """Test that a worker waiting on a run is woken by a delivery received by an API process."""
+        api_bus = SQLiteEventBus(str(tmp_path / "bus.db"), poll_interval=0.01)
+        worker_bus = SQLiteEventBus(str(tmp_path / "bus.db"), poll_interval=0.01)
+        api, worker = PipelineTracker(), tracker
+        api.attach_bus(api_bus)
+        worker.attach_bus(worker_bus)
+        worker.watch(FULL_NAME, "s1")
+
+        try:
+            waiting = asyncio.ensure_future(worker.wait_for_update(FULL_NAME, RUN_ID, timeout=5))
+            await asyncio.sleep(0.05)
+            api.handle_event("workflow_run", _payload("workflow_run_completed"), "d-1")
+            run = await waiting
+
+            assert run.conclusion == "failure" and worker.receives_webhooks(FULL_NAME)
+            assert worker.handle_event("workflow_run", _payload("workflow_run_completed"), "d-1")["result"] == "duplicate"
+            messages = process_monitor.get_process_monitor().get_messages("s1")
+            assert [m["content"]["event"] for m in messages] == ["ci_workflow_run"]
+            # Remote deliveries are not echoed back to the bus
+            await asyncio.sleep(0.05)
+            assert worker_bus.get_stats()["published"] == 0
+        finally:
+            api_bus.close()
+            worker_bus.close()
+
+
+class TestWaitForPipeline:
+    """Test webhook wake-ups and the polling fallback."""
+
+    @pytest.mark.asyncio
+    async def test_webhook_ends_wait_without_polling(self, tracker):
+        """Test that with webhooks flowing a delivery completes the wait and REST is not called."""
+        stub = RunsStub(["in_progress"])
+        cicd = CICDAutomation(stub)
+        tracker.handle_event("workflow_run", _payload("workflow_run_in_progress"), "d-1")
+
+        waiting = asyncio.ensure_future(cicd.wait_for_pipeline(REPO, RUN_ID, timeout=5))
+        await asyncio.sleep(0.01)
+        tracker.handle_event("workflow_run", _payload("workflow_run_completed"), "d-2")
+        status = await waiting
+
+        assert status["conclusion"] == "failure" and status["source"] == "webhook"
+        assert stub.requests == 0
+
+    @pytest.mark.asyncio
+    async def test_polls_with_backoff_without_webhooks(self, tracker):
+        """Test that runs are polled until completion while no webhook has arrived."""
+        stub = RunsStub(["queued", "in_progress", "in_progress", "in_progress", "completed"])
+        status = await CICDAutomation(stub).wait_for_pipeline(REPO, RUN_ID, timeout=5)
+
+        assert status["status"] == "completed" and status["source"] == "poll"
+        # Each poll fetches the run and its jobs
+        assert stub.requests == 10
+        assert tracker.get_run(FULL_NAME, RUN_ID).source == "poll"
+
+    @pytest.mark.asyncio
+    async def test_times_out(self, tracker):
+        """Test that a run that never completes raises once the timeout passes."""
+        with pytest.raises(asyncio.TimeoutError):
+            await CICDAutomation(RunsStub(["in_progress"])).wait_for_pipeline(REPO, RUN_ID, timeout=0.05)
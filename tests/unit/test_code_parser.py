@@ -0,0 +1,108 @@
+"""
+Unit tests for the single-pass streaming code parser.
+"""
+
+from ai_orchestrator.utils.file_manager import CodeParser
+
+
+MARKER_RESPONSE = """Here is the backend.
+===== backend/main.py =====
+from fastapi import FastAPI
+app = FastAPI()
+
+===== models/user.py =====
+class User:
+    pass
+===== requirements.txt =====
+fastapi
+"""
+
+FENCED_RESPONSE = """# Backend
+
+## File: main.py
+```python
+from fastapi import FastAPI
+app = FastAPI()
+```
+
+```bash
+pip install fastapi
+```
+
+### Models (backend/app/models.py)
+```python
+class User:
+    pass
+```
+
+```python
+print('unnamed')
+```
+"""
+
+
+class TestStreamingCodeParser:
+    """Test section, fence and heading recognition."""
+
+    def test_sections_are_emitted_while_streaming(self):
+        """Test that a section is emitted as soon as the next marker arrives."""
+        parser = CodeParser()
+        stream = parser.stream("backend")
+
+        second_marker = MARKER_RESPONSE.index("===== models")
+        assert stream.feed(MARKER_RESPONSE[:second_marker]) == []
+        emitted = stream.feed(MARKER_RESPONSE[second_marker:second_marker + 30])
+        assert [f.path for f in emitted] == ["backend/main.py"]
+        assert emitted[0].content == "from fastapi import FastAPI\napp = FastAPI()"
+
+        stream.feed(MARKER_RESPONSE[second_marker + 30:])
+        files = parser.finish(stream)
+        assert [f.path for f in files] == [
+            "backend/main.py", "backend/models/user.py", "backend/requirements.txt",
+            "backend/README.md", "backend/Dockerfile"
+        ]
+        assert files[2].file_type == "config"
+
+    def test_chunk_size_does_not_change_result(self):
+        """Test that one-character chunks parse like the whole response."""
+        parser = CodeParser()
+        for response in (MARKER_RESPONSE, FENCED_RESPONSE):
+            stream = parser.stream("backend")
+            for char in response:
+                stream.feed(char)
+            stream.close()
+            whole = parser.stream("backend")
+            whole.feed(response)
+            whole.close()
+
+            assert [(f.path, f.content) for f in stream.files] == [(f.path, f.content) for f in whole.files]
+
+    def test_fenced_blocks_named_by_headings(self):
+        """Test that fenced blocks take names from headings, then from their content."""
+        files = CodeParser().parse_backend_implementation(FENCED_RESPONSE, "s1")
+        by_path = {f.path: f for f in files}
+
+        assert list(by_path)[:3] == ["backend/main.py", "backend/app/models.py", "backend/app.py"]
+        assert by_path["backend/app/models.py"].content == "class User:\n    pass"
+        assert by_path["backend/app.py"].content == "print('unnamed')"
+        assert not any("pip install" in f.content for f in files if f.language == "python")
+
+    def test_sections_take_precedence_over_fences(self):
+        """Test that fenced blocks are ignored once the response has file sections."""
+        stream = CodeParser().stream("backend")
+        stream.feed("```python\nprint('example')\n```\n" + MARKER_RESPONSE)
+        stream.close()
+
+        assert [f.path for f in stream.files] == ["backend/main.py", "backend/models/user.py", "backend/requirements.txt"]
+
+    def test_frontend_languages_and_structure_fallback(self):
+        """Test frontend fence languages and skeleton files for structure-only responses."""
+        parser = CodeParser()
+        files = parser.parse_frontend_implementation(
+            "## src/App.jsx\n```jsx\nconst App = () => null\nexport default App\n```\n```css\nbody {}\n```\n", "s1"
+        )
+        assert [(f.path, f.language) for f in files[:2]] == [("frontend/App.jsx", "jsx"), ("frontend/styles.css", "css")]
+
+        skeleton = parser.parse_frontend_implementation("A React app with components/ and pages/.", "s1")
+        assert "frontend/src/components/Header.js" in [f.path for f in skeleton]
+        assert "frontend/public/index.html" not in [f.path for f in skeleton]
@@ -0,0 +1,147 @@
+"""
+Unit tests for local three-way conflict analysis and its use by the branch manager.
+"""
+
+import pytest
+
+from ai_orchestrator.utils.branch_manager import BranchManager, ConflictResolution
+from ai_orchestrator.utils.conflict_analyzer import OURS, THEIRS, analyze_merge, merge_file
+
+
+BASE = "import os\n\ndef main():\n    print('hello')\n\nmain()\n"
+
+
+class PhaseCache:
+    """Phase files by phase id, like ``CacheManager.get_phase_files``."""
+
+    def __init__(self, phases):
+        self.phases = phases
+
+    async def get_phase_files(self, phase_id):
+        return self.phases.get(phase_id, {})
+
+
+class GitDataStub:
+    """Records GitHub requests and answers the ones a resolution commit makes."""
+
+    base_url = "https://api.github.test"
+
+    def __init__(self):
+        self.requests = []
+
+    async def get_repo_owner(self):
+        return "acme"
+
+    async def _build_tree_items(self, base_url, files, stats):
+        return [{"path": path, "mode": "100644", "type": "blob", "content": content} for path, content in files.items()]
+
+    async def _make_request(self, method, url, data=None, **kwargs):
+        self.requests.append((method, url.rsplit("/demo", 1)[-1], data))
+        if "/branches/" in url:
+            name = url.rsplit("/branches/", 1)[-1]
+            return {"commit": {"sha": f"{name}-sha", "commit": {"tree": {"sha": f"{name}-tree"}}}}
+        return {"sha": "new-sha"}
+
+
+class TestMergeFile:
+    """Test line-level three-way merging."""
+
+    def test_separate_edits_merge_cleanly(self):
+        """Test that edits to different lines are both kept."""
+        ours = BASE.replace("import os", "import os\nimport sys")
+        theirs = BASE[:BASE.rindex("main()")] + "if __name__ == '__main__':\n    main()\n"
+
+        merged, hunks = merge_file(BASE, ours, theirs)
+
+        assert hunks == []
+        assert merged == "import os\nimport sys\n\ndef main():\n    print('hello')\n\nif __name__ == '__main__':\n    main()\n"
+
+    def test_overlapping_edits_conflict(self):
+        """Test that two different edits of a line conflict, and that either side can win."""
+        ours = BASE.replace("'hello'", "'hi'")
+        theirs = BASE.replace("'hello'", "'hey'")
+
+        merged, hunks = merge_file(BASE, ours, theirs)
+        assert hunks == [{"base_start": 4, "base_end": 4, "ours": "    print('hi')\n", "theirs": "    print('hey')\n"}]
+        assert "<<<<<<< ours\n    print('hi')\n=======\n    print('hey')\n>>>>>>> theirs\n" in merged
+
+        assert merge_file(BASE, ours, theirs, OURS)[0] == ours
+        assert merge_file(BASE, ours, theirs, THEIRS)[0] == theirs
+        assert merge_file(BASE, ours, ours) == (ours, [])
+
+    def test_file_sets(self):
+        """Test file-level outcomes: one-sided changes, add/add, modify/delete and per-file favors."""
+        base = {"app.py": BASE, "old.py": "x = 1\n"}
+        ours = {"app.py": BASE.replace("'hello'", "'hi'"), "new.py": "A = 1\n", "shared.py": "S = 1\n"}
+        theirs = {"app.py": BASE, "old.py": "x = 2\n", "shared.py": "S = 2\n"}
+
+        analysis = analyze_merge(base, ours, theirs)
+        assert analysis["merged_files"]["app.py"] == ours["app.py"]
+        assert analysis["merged_files"]["new.py"] == "A = 1\n"
+        assert [(c["file"], c["type"]) for c in analysis["conflicts"]] == [("old.py", "modify_delete"), ("shared.py", "add_add")]
+
+        resolved = analyze_merge(base, ours, theirs, favor={"old.py": OURS, "shared.py": THEIRS})
+        assert resolved["merged_files"]["old.py"] is None
+        assert "shared.py" not in resolved["merged_files"]
+        assert [c["resolved"] for c in resolved["conflicts"]] == [OURS, THEIRS]
+
+
+class TestBranchManagerConflicts:
+    """Test that the branch manager finds and resolves conflicts without asking GitHub."""
+
+    def _manager(self, stub):
+        manager = BranchManager(stub, cache_manager=PhaseCache({
+            "p1": {"src/app.py": BASE.replace("'hello'", "'phase one'"), "README.md": "# Phase one\n"},
+            "p2": {"src/app.py": BASE.replace("'hello'", "'phase two'"), "README.md": "# Phase two\n"},
+        }))
+        manager.integration_files["develop"] = {"src/app.py": BASE, "README.md": "# Demo\n"}
+        manager.track_phase_branch("feature/one", ["p1"])
+        manager.track_phase_branch("feature/two", ["p2"])
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_conflicts_are_flagged_before_any_push(self, monkeypatch):
+        """Test that a branch conflicting with landed work is held back and never sent to the merge API."""
+        stub = GitDataStub()
+        manager = self._manager(stub)
+        await manager._record_merge("feature/one", "develop")
+        assert await manager._check_merge_conflicts("demo", "feature/one", "develop") == []
+
+        async def ready(repo_name, target_branch):
+            return [{"name": "feature/two"}]
+
+        monkeypatch.setattr(manager, "_get_ready_to_merge_branches", ready)
+        result = await manager.manage_merge_queue("demo", "develop")
+
+        assert result["results"][0]["status"] == "conflicts_require_manual_review"
+        assert [c["file"] for c in result["results"][0]["conflicts"]] == ["README.md", "src/app.py"]
+        assert all(method == "GET" for method, _, _ in stub.requests)
+
+    @pytest.mark.asyncio
+    async def test_resolution_is_one_merge_commit(self):
+        """Test that a full resolution is pushed as one merge commit and the branch then merges cleanly."""
+        stub = GitDataStub()
+        manager = self._manager(stub)
+        await manager._record_merge("feature/one", "develop")
+        strategy = ConflictResolution(strategy="prefer_theirs", auto_resolve_patterns=[],
+                                      manual_review_patterns=[], escalation_contacts=[])
+
+        resolution = await manager.handle_conflict_resolution("demo", "feature/two", "develop", strategy)
+
+        assert resolution["fully_resolved"] and resolution["commit_sha"] == "new-sha"
+        assert [method for method, _, _ in stub.requests] == ["GET", "GET", "POST", "POST", "PATCH"]
+        commit = stub.requests[3][2]
+        assert commit["parents"] == ["feature/two-sha", "develop-sha"]
+        assert await manager._check_merge_conflicts("demo", "feature/two", "develop") == []
+
+    @pytest.mark.asyncio
+    async def test_auto_strategy_follows_patterns(self):
+        """Test that only files matching the auto-resolve patterns are resolved automatically."""
+        manager = self._manager(GitDataStub())
+        await manager._record_merge("feature/one", "develop")
+
+        resolution = await manager._resolve_conflicts_automatically("demo", "feature/two", "develop", [])
+
+        assert resolution["resolved"] is False
+        details = {r["file"]: r["status"] for r in resolution["details"]["resolution_details"]}
+        assert details == {"README.md": "resolved", "src/app.py": "manual_review_required"}
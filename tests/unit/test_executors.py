@@ -0,0 +1,147 @@
+"""
+Unit tests for the managed I/O and CPU executors.
+"""
+
+import asyncio
+import os
+import threading
+import time
+import pytest
+
+from ai_orchestrator.core.workflow_engine import check_phase_content
+from ai_orchestrator.utils.executors import ExecutorManager, estimate_size
+from ai_orchestrator.utils.file_manager import parse_implementation
+from ai_orchestrator.utils.logging_config import get_metrics_collector
+
+
+def _worker_pid(value):
+    return os.getpid(), value * 2
+
+
+class TestExecutorManager:
+    """Test pool selection, bounds and timing."""
+
+    @pytest.mark.asyncio
+    async def test_cpu_tasks_run_in_another_process(self):
+        """Test that large CPU tasks leave the event loop's process."""
+        executors = ExecutorManager(cpu_workers=1, cpu_min_bytes=100)
+        try:
+            pid, result = await executors.run_cpu(_worker_pid, 21, size_hint=1000)
+            assert result == 42
+            assert pid != os.getpid()
+            assert executors.get_stats()["cpu"]["processes"] is True
+        finally:
+            executors.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_small_cpu_tasks_run_inline(self):
+        """Test that payloads below the threshold skip the pool."""
+        executors = ExecutorManager(cpu_min_bytes=100)
+        pid, result = await executors.run_cpu(_worker_pid, 1, size_hint=10)
+
+        assert (pid, result) == (os.getpid(), 2)
+        assert executors.get_stats()["cpu"]["inline"] == 1
+        assert executors._cpu_pool is None
+        executors.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_pending_io_calls_are_bounded(self):
+        """Test that no more than max_pending calls are in flight."""
+        executors = ExecutorManager(io_workers=8, max_pending=2)
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def blocking_call():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+
+        await asyncio.gather(*(executors.run_io(blocking_call) for _ in range(6)))
+        executors.shutdown()
+
+        assert max(peak) == 2
+        assert executors.get_stats()["io"]["completed"] == 6
+        assert executors.get_stats()["io"]["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_timed_out_call_keeps_its_slot_until_done(self):
+        """Test that a call the caller stopped waiting for still counts against max_pending."""
+        executors = ExecutorManager(io_workers=2, max_pending=1)
+        release = threading.Event()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await executors.run_io(release.wait, 5, timeout=0.05)
+        assert executors.get_stats()["io"]["pending"] == 1
+
+        second = asyncio.ensure_future(executors.run_io(time.sleep, 0))
+        await asyncio.sleep(0.05)
+        assert not second.done()
+
+        release.set()
+        await second
+        executors.shutdown()
+        assert executors.get_stats()["io"]["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_io_call_timing_and_errors(self):
+        """Test that calls are timed per task and failures propagate."""
+        executors = ExecutorManager()
+
+        def failing_call():
+            raise ValueError("disk full")
+
+        await executors.run_io(time.sleep, 0.01, task_name="test_sleep")
+        with pytest.raises(ValueError):
+            await executors.run_io(failing_call, task_name="test_fail")
+        executors.shutdown()
+
+        summary = get_metrics_collector().get_summary()["aggregated_metrics"]
+        assert summary["executor_task_duration"]["max"] >= 0.01
+        assert summary["executor_task_duration"]["unit"] == "seconds"
+        assert executors.get_stats()["io"]["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cpu_pool_can_be_disabled(self):
+        """Test that CPU tasks fall back to threads when the process pool is off."""
+        executors = ExecutorManager(use_process_pool=False, cpu_min_bytes=0)
+        pid, _ = await executors.run_cpu(_worker_pid, 1, size_hint=10)
+        executors.shutdown()
+
+        assert pid == os.getpid()
+        assert executors.get_stats()["cpu"]["processes"] is False
+
+
+class TestOffloadedFunctions:
+    """Test the module-level functions sent to the process pool."""
+
+    def test_estimate_size(self):
+        """Test that the size hint sums top-level strings and strings one level down."""
+        data = {"name": "abc", "files": ["de", 3], "meta": {"k": "fgh", "n": {"deep": "x" * 100}}, "count": 7}
+
+        assert estimate_size(data) == 8
+
+    def test_check_phase_content(self):
+        """Test that the first failed rule is reported."""
+        validation = {"min_content_length": 10, "required_sections": ["Overview", "API"]}
+
+        assert check_phase_content(validation, "## Overview\n## API endpoints") is None
+        assert check_phase_content(validation, "short") == "Content too short: 5 < 10"
+        assert check_phase_content(validation, "## Overview only here") == "Missing required section: API"
+
+    @pytest.mark.asyncio
+    async def test_parse_implementation_in_process_pool(self):
+        """Test that generated code parses the same in the process pool."""
+        content = "===== backend/main.py =====\nprint('hello')\n" + "# padding\n" * 50
+        executors = ExecutorManager(cpu_workers=1, cpu_min_bytes=0)
+        try:
+            pooled = await executors.run_cpu(parse_implementation, "backend", content, "s1", size_hint=len(content))
+        finally:
+            executors.shutdown()
+
+        inline = parse_implementation("backend", content, "s1")
+        assert [f.path for f in pooled] == [f.path for f in inline]
+        assert pooled[0].content == inline[0].content
@@ -0,0 +1,94 @@
+"""
+Unit tests for the non-blocking git layer of GitManager.
+"""
+
+import asyncio
+import subprocess
+import time
+from datetime import datetime
+
+import pytest
+
+from ai_orchestrator.utils.file_manager import GeneratedFile, ProjectStructure
+from ai_orchestrator.utils.git_integration import GitManager
+from tests.helpers import git
+
+
+@pytest.fixture(autouse=True)
+def no_user_identity(tmp_path, monkeypatch):
+    """Run git with an empty global config and no system config."""
+    global_config = tmp_path / "gitconfig"
+    global_config.write_text("")
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(global_config))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    return global_config
+
+
+def _project(root, count: int) -> ProjectStructure:
+    files = []
+    for index in range(count):
+        path = f"src/module_{index}.py"
+        (root / "src").mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(f"VALUE = {index}\n")
+        files.append(GeneratedFile(path=path, content=f"VALUE = {index}\n", file_type="code", language="python"))
+    return ProjectStructure(
+        name="demo", description="Demo project", session_id="s1",
+        created_at=datetime.now(), files=files, metadata={}
+    )
+
+
+class TestAsyncGitManager:
+    """Test async initialization, batched commits and the absence of global side effects."""
+
+    def test_constructor_runs_nogit(self, monkeypatch):
+        """Test that creating a GitManager spawns no process."""
+        def fail(*args, **kwargs):
+            raise AssertionError("subprocess.run called")
+
+        monkeypatch.setattr(subprocess, "run", fail)
+        GitManager()
+
+    @pytest.mark.asyncio
+    async def test_initialize_large_project_keeps_loop_free(self, tmp_path, no_user_identity):
+        """Test that committing 500 files leaves the event loop responsive."""
+        project_path = tmp_path / "project"
+        project = _project(project_path, 500)
+        gaps = []
+
+        async def ticker():
+            while True:
+                started_at = time.perf_counter()
+                await asyncio.sleep(0.005)
+                gaps.append(time.perf_counter() - started_at)
+
+        ticking = asyncio.create_task(ticker())
+        try:
+            repo = await GitManager().initialize_repository_async(str(project_path), project)
+        finally:
+            ticking.cancel()
+
+        files = git("ls-tree", "-r", "--name-only", "HEAD", cwd=project_path).split()
+        assert repo.branch == "main"
+        assert repo.commit_hash == git("rev-parse", "HEAD", cwd=project_path).strip()
+        assert len(files) == 501 and ".gitignore" in files
+        assert max(gaps) < 0.2
+        assert git("log", "-1", "--format=%an <%ae>", cwd=project_path).strip() == "AI Orchestrator <ai-orchestrator@example.com>"
+        assert no_user_identity.read_text() == ""
+
+    @pytest.mark.asyncio
+    async def test_commit_only_given_paths(self, tmp_path):
+        """Test that a batched commit stages just the given paths and reports them."""
+        project_path = tmp_path / "project"
+        manager = GitManager()
+        await manager.initialize_repository_async(str(project_path), _project(project_path, 3))
+        (project_path / "src" / "module_0.py").write_text("VALUE = 'changed'\n")
+        (project_path / "src" / "module_1.py").write_text("VALUE = 'changed'\n")
+        (project_path / "notes.md").write_text("new\n")
+
+        commit = await manager.commit_changes_async(str(project_path), "Update", paths=["src/module_0.py", "notes.md"])
+        again = await manager.commit_changes_async(str(project_path), "Nothing", paths=["notes.md"])
+
+        assert sorted(commit.files_changed) == ["notes.md", "src/module_0.py"]
+        assert commit.hash == git("rev-parse", "HEAD", cwd=project_path).strip()
+        assert again is None
+        assert git("status", "--porcelain", cwd=project_path).strip() == "M src/module_1.py"
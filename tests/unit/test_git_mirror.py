@@ -0,0 +1,290 @@
+"""
+Unit tests for the local git mirror publish backend, against local bare repositories.
+"""
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ai_orchestrator.agents import MicroPhase
+from ai_orchestrator.core.config import get_config
+from ai_orchestrator.utils import session_store
+from ai_orchestrator.utils.branch_manager import BranchManager
+from ai_orchestrator.utils.git_mirror import GitMirror, GitMirrorError
+from ai_orchestrator.utils.repository_manager import RepositoryManager, RepositoryState
+from ai_orchestrator.utils.session_store import MemorySessionStore
+from tests.helpers import git
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """Bare repository with a develop branch holding README.md."""
+    remote = tmp_path / "remote.git"
+    work = tmp_path / "work"
+    git("init", "--bare", "--quiet", str(remote))
+    git("init", "--quiet", "-b", "develop", str(work))
+    (work / "README.md").write_text("# Demo\n")
+    git("add", "README.md", cwd=work)
+    git("-c", "user.name=Dev", "-c", "user.email=dev@example.com", "commit", "--quiet", "-m", "Initial", cwd=work)
+    git("push", "--quiet", str(remote), "develop", cwd=work)
+    return remote
+
+
+class PhaseCache:
+    """Phase files by phase id, like ``CacheManager``."""
+
+    def __init__(self):
+        self.phases = {}
+
+    async def cache_phase_files(self, phase_id, files, session_id):
+        self.phases[phase_id] = files
+
+    async def get_phase_files(self, phase_id):
+        return self.phases.get(phase_id, {})
+
+
+def _repository_state(remote) -> RepositoryState:
+    return RepositoryState(
+        repository_url="https://github.test/acme/demo", repository_name="demo",
+        default_branch="main", development_branch="develop", created_branches=["main", "develop"],
+        active_pull_requests={}, completed_micro_phases=[], ci_cd_status="active",
+        protection_enabled=False, push_url=str(remote)
+    )
+
+
+def _phase(name) -> MicroPhase:
+    return MicroPhase(
+        id=name, name=name.title(), description=f"{name} phase", phase_type="backend",
+        files_to_generate=[], dependencies=[], priority=1, estimated_duration=5,
+        acceptance_criteria=["works"], branch_name=f"feature/{name}"
+    )
+
+
+class TestGitMirror:
+    """Test fast-import commits and batched pushes."""
+
+    def test_stacked_commits_and_single_push(self, tmp_path, remote):
+        """Test that phases become chained commits on the base and all branches go out in one push."""
+        mirror = GitMirror(str(tmp_path / "mirror.git"), str(remote))
+        models = mirror.commit_phases("feature/models", "develop", [
+            ({"src/models.py": "class User: pass\n"}, "Models"),
+            ({"src/schemas.py": "SCHEMA = {}\n", "docs/my notes.md": "notes ✓\n"}, "Schemas")
+        ])
+        api = mirror.commit_phases("feature/api", "develop", [({"src/api.py": "app = None\n"}, "API")])
+        mirror.push(["feature/models", "feature/api"])
+
+        assert git("--git-dir", str(remote), "rev-parse", "refs/heads/feature/models").strip() == models[-1]
+        assert git("--git-dir", str(remote), "rev-parse", f"{models[1]}^").strip() == models[0]
+        assert git("--git-dir", str(remote), "rev-parse", "refs/heads/feature/api").strip() == api[0]
+        files = git("--git-dir", str(remote), "ls-tree", "-r", "--name-only", "feature/models").split("\n")
+        assert {"README.md", "src/models.py", "src/schemas.py", "docs/my notes.md"} <= set(files)
+        assert git("--git-dir", str(remote), "show", "feature/models:docs/my notes.md") == "notes ✓\n"
+        assert git("--git-dir", str(remote), "log", "-1", "--format=%s", "feature/models").strip() == "Schemas"
+
+    def test_republish_replaces_branch(self, tmp_path, remote):
+        """Test that a branch this mirror pushed is rebuilt from the base and replaced by the next push."""
+        mirror = GitMirror(str(tmp_path / "mirror.git"), str(remote))
+        mirror.commit_phases("feature/models", "develop", [({"a.py": "1\n"}, "First")])
+        mirror.push(["feature/models"])
+        second = mirror.commit_phases("feature/models", "develop", [({"b.py": "2\n"}, "Second")])
+        mirror.push(["feature/models"])
+
+        files = git("--git-dir", str(remote), "ls-tree", "-r", "--name-only", "feature/models").split()
+        assert git("--git-dir", str(remote), "rev-parse", "feature/models").strip() == second[0]
+        assert files == ["README.md", "b.py"]
+
+    def test_push_does_not_overwrite_others_work(self, tmp_path, remote):
+        """Test that a branch moved by someone else is rejected while the other branches go out."""
+        mirror = GitMirror(str(tmp_path / "mirror.git"), str(remote))
+        mirror.commit_phases("feature/models", "develop", [({"a.py": "1\n"}, "First")])
+        mirror.push(["feature/models"])
+        other = GitMirror(str(tmp_path / "other.git"), str(remote))
+        theirs = other.commit_phases("feature/models", "feature/models", [({"c.py": "3\n"}, "Theirs")])
+        assert other.push(["feature/models"]) == {}
+
+        mirror.commit_phases("feature/models", "develop", [({"b.py": "2\n"}, "Second")])
+        api = mirror.commit_phases("feature/api", "develop", [({"api.py": "A\n"}, "API")])
+        rejected = mirror.push(["feature/models", "feature/api"])
+
+        assert list(rejected) == ["feature/models"]
+        assert git("--git-dir", str(remote), "rev-parse", "feature/models").strip() == theirs[0]
+        assert git("--git-dir", str(remote), "rev-parse", "feature/api").strip() == api[0]
+
+    def test_branches_missing_from_the_mirror_do_not_block_the_push(self, tmp_path, remote):
+        """Test that a branch the mirror does not have is reported and the others still go out."""
+        mirror = GitMirror(str(tmp_path / "mirror.git"), str(remote))
+        mirror.commit_phases("feature/models", "develop", [({"a.py": "1\n"}, "Models")])
+
+        rejected = mirror.push(["feature/gone", "feature/models"])
+
+        assert rejected == {"feature/gone": "not in the local mirror"}
+        assert git("--git-dir", str(remote), "branch", "--format=%(refname:short)").split() == ["develop", "feature/models"]
+        assert GitMirror(str(tmp_path / "wiped.git"), str(remote)).push(["feature/models"]) == {
+            "feature/models": "not in the local mirror"
+        }
+
+    def test_delete_branches_in_one_push(self, tmp_path, remote):
+        """Test that several remote branches are deleted by one push and refused ones are reported."""
+        mirror = GitMirror(str(tmp_path / "mirror.git"), str(remote))
+        for name in ("feature/a", "feature/b", "feature/c", "feature/locked"):
+            mirror.commit_phases(name, "develop", [({"a.py": "1\n"}, name)])
+        mirror.push(["feature/a", "feature/b", "feature/c", "feature/locked"])
+        hook = remote / "hooks" / "update"
+        hook.write_text('#!/bin/sh\ntest "$1" != refs/heads/feature/locked\n')
+        hook.chmod(0o755)
+
+        failed = mirror.delete_branches(["feature/a", "feature/locked", "feature/c"])
+
+        assert list(failed) == ["feature/locked"]
+        assert git("--git-dir", str(remote), "branch", "--format=%(refname:short)").split() == [
+            "develop", "feature/b", "feature/locked"
+        ]
+
+    def test_missing_base_branch(self, tmp_path, remote):
+        """Test that an unknown base branch fails with GitMirrorError."""
+        mirror = GitMirror(str(tmp_path / "mirror.git"), str(remote))
+        with pytest.raises(GitMirrorError):
+            mirror.commit_phases("feature/x", "missing", [({"a.py": "1\n"}, "X")])
+
+
+class PullStub:
+    """Records the pull requests opened after a push."""
+
+    def __init__(self, remote):
+        self.remote = remote
+        self.pulls = []
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/repos/acme/demo/pulls", self.create_pull)
+        app.router.add_post("/repos/acme/demo/issues/{number}/labels", self.add_labels)
+        return app
+
+    async def create_pull(self, request):
+        body = await request.json()
+        # GitHub rejects pull requests for branches it does not have
+        branches = git("--git-dir", str(self.remote), "branch", "--format=%(refname:short)").split()
+        if body["head"] not in branches:
+            return web.json_response({"message": "Validation Failed"}, status=422)
+        self.pulls.append(body)
+        number = len(self.pulls)
+        return web.json_response({"number": number, "html_url": f"https://github.test/pull/{number}", "title": body["title"]}, status=201)
+
+    async def add_labels(self, request):
+        return web.json_response([])
+
+
+class TestGitPublishBackend:
+    """Test RepositoryManager with the git publish backend."""
+
+    @pytest.mark.asyncio
+    async def test_phases_are_pushed_at_checkpoint(self, tmp_path, remote, monkeypatch, isolated_github):
+        """Test that phases wait in the mirror and the checkpoint, even in another worker, pushes them and opens their PRs."""
+        monkeypatch.setattr(session_store, "_session_store", MemorySessionStore())
+        monkeypatch.setattr(get_config(), "git_mirror_dir", str(tmp_path / "mirrors"))
+
+        stub = PullStub(remote)
+        server = TestServer(stub.app())
+        await server.start_server()
+        manager = RepositoryManager(github_token="test-token", org="acme", publish_backend="git")
+        manager.github_client.base_url = str(server.make_url("")).rstrip("/")
+        manager.repositories["s1"] = _repository_state(remote)
+
+        try:
+            first = await manager.execute_micro_phase_workflow("s1", _phase("models"), {"src/models.py": "M = 1\n"})
+            await manager.execute_micro_phase_workflow("s1", _phase("api"), {"src/api.py": "A = 1\n"})
+            assert first["pending_push"] and first["pull_request"] is None
+            assert stub.pulls == []
+            await manager.cleanup()
+
+            # The pending branches are persisted with the session, so whoever continues it pushes them
+            manager = RepositoryManager(github_token="test-token", org="acme", publish_backend="git")
+            manager.github_client.base_url = str(server.make_url("")).rstrip("/")
+            pushed = await manager.push_pending("s1")
+            assert await manager.push_pending("s1") == []
+        finally:
+            await manager.cleanup()
+            await server.close()
+
+        assert [item["branch_name"] for item in pushed] == ["feature/models", "feature/api"]
+        assert manager.repositories["s1"].pending_pushes == {}
+        assert git("--git-dir", str(remote), "rev-parse", "feature/models").strip() == first["commit_sha"]
+        assert stub.pulls[0]["body"].rstrip().endswith("*Automated validation by AI Orchestrator*")
+        assert manager.repositories["s1"].active_pull_requests == {"feature/models": 1, "feature/api": 2}
+
+    @pytest.mark.asyncio
+    async def test_stacked_phases_share_one_branch_and_pull_request(self, tmp_path, remote, monkeypatch, isolated_github):
+        """Test that a stack becomes one commit per phase on a single branch, pushed with one pull request."""
+        monkeypatch.setattr(session_store, "_session_store", MemorySessionStore())
+        monkeypatch.setattr(get_config(), "git_mirror_dir", str(tmp_path / "mirrors"))
+
+        stub = PullStub(remote)
+        server = TestServer(stub.app())
+        await server.start_server()
+        manager = RepositoryManager(github_token="test-token", org="acme", publish_backend="git")
+        manager.github_client.base_url = str(server.make_url("")).rstrip("/")
+        manager.repositories["s1"] = _repository_state(remote)
+        manager.repositories["s1"].stack_micro_phases = True
+        phases = [(_phase(name), {f"src/{name}.py": f"{name.upper()} = 1\n"}) for name in ("models", "api", "ui")]
+
+        try:
+            results = await manager.execute_stacked_micro_phases("s1", phases)
+            pushed = await manager.push_pending("s1")
+        finally:
+            await manager.cleanup()
+            await server.close()
+
+        assert len(results) == 1
+        assert results[0]["micro_phases"] == ["models", "api", "ui"]
+        assert git("--git-dir", str(remote), "rev-list", "--count", "develop..feature/models").strip() == "3"
+        assert [item["branch_name"] for item in pushed] == ["feature/models"]
+        assert len(stub.pulls) == 1
+
+    @pytest.mark.asyncio
+    async def test_unstacked_project_publishes_each_phase(self, tmp_path, remote, monkeypatch):
+        """Test that without the stacking policy every phase gets its own branch."""
+        monkeypatch.setattr(session_store, "_session_store", MemorySessionStore())
+        monkeypatch.setattr(get_config(), "git_mirror_dir", str(tmp_path / "mirrors"))
+        manager = RepositoryManager(github_token="test-token", org="acme", publish_backend="git")
+        manager.repositories["s1"] = _repository_state(remote)
+        phases = [(_phase(name), {f"src/{name}.py": "X = 1\n"}) for name in ("models", "api")]
+
+        try:
+            results = await manager.execute_stacked_micro_phases("s1", phases)
+        finally:
+            await manager.cleanup()
+
+        assert [result["branch_name"] for result in results] == ["feature/models", "feature/api"]
+        assert set(manager.repositories["s1"].pending_pushes) == {"feature/models", "feature/api"}
+
+    @pytest.mark.asyncio
+    async def test_published_branches_reach_conflict_analysis(self, tmp_path, remote, monkeypatch):
+        """Test that every published branch is tracked, so conflicts are found from local state."""
+        monkeypatch.setattr(session_store, "_session_store", MemorySessionStore())
+        monkeypatch.setattr(get_config(), "git_mirror_dir", str(tmp_path / "mirrors"))
+        cache = PhaseCache()
+        manager = RepositoryManager(github_token="test-token", org="acme", publish_backend="git")
+        manager.branch_manager = BranchManager(manager.github_client, cache_manager=cache)
+        manager.branch_manager.integration_files["develop"] = {"README.md": "# Demo\n"}
+        manager.repositories["s1"] = _repository_state(remote)
+        phases = {
+            "models": {"README.md": "# Models\n", "src/models.py": "M = 1\n"},
+            "api": {"README.md": "# API\n", "src/api.py": "A = 1\n"},
+            "ui": {"src/ui.py": "U = 1\n"}
+        }
+
+        try:
+            for name, files in phases.items():
+                await cache.cache_phase_files(name, files, "s1")
+                await manager.execute_micro_phase_workflow("s1", _phase(name), files)
+            branches = manager.branch_manager
+            await branches._record_merge("feature/models", "develop")
+            api_conflicts = await branches._check_merge_conflicts("demo", "feature/api", "develop")
+            ui_conflicts = await branches._check_merge_conflicts("demo", "feature/ui", "develop")
+        finally:
+            await manager.cleanup()
+
+        assert branches.branch_phases == {"feature/models": ["models"], "feature/api": ["api"], "feature/ui": ["ui"]}
+        assert branches.integration_files["develop"]["src/models.py"] == "M = 1\n"
+        assert [conflict["file"] for conflict in api_conflicts] == ["README.md"]
+        assert ui_conflicts == []
@@ -0,0 +1,155 @@
+"""
+Unit tests for conditional GitHub reads and the response cache.
+"""
+
+import pytest
+from aiohttp import web
+
+from ai_orchestrator.utils import github_cache
+from ai_orchestrator.utils.enhanced_github_client import EnhancedGitHubClient
+from ai_orchestrator.utils.github_cache import GitHubResponseCache, resource_ttl
+from tests.helpers import start_github_stub
+
+
+class ETagStub:
+    """Serves versioned resources and answers matching If-None-Match with 304."""
+
+    def __init__(self):
+        self.versions = {"/user": 1, "/repos/octo/demo": 1, "/repos/octo/demo/git/refs/heads/main": 1}
+        self.requests = []
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/{path:.*}", self.read)
+        app.router.add_post("/repos/octo/demo/issues/{number}/labels", self.write)
+        return app
+
+    async def read(self, request):
+        etag = f'"{request.path}-{self.versions[request.path]}"'
+        conditional = request.headers.get("If-None-Match")
+        self.requests.append((request.path, conditional))
+        if conditional == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        body = {"login": "octo"} if request.path == "/user" else {"path": request.path, "version": self.versions[request.path]}
+        return web.json_response(body, headers={"ETag": etag})
+
+    async def write(self, request):
+        self.requests.append((request.path, None))
+        return web.json_response([{"name": "phase"}])
+
+
+@pytest.fixture
+def cache(isolated_github, monkeypatch):
+    cache = GitHubResponseCache(max_entries=100)
+    monkeypatch.setattr(github_cache, "_github_cache", cache)
+    return cache
+
+
+def _expire(cache: GitHubResponseCache):
+    for entry in cache._entries.values():
+        if entry.expires_at is not None:
+            entry.expires_at = 0.0
+
+
+class TestGitHubReadCache:
+    """Test fresh hits, ETag revalidation, memoized owner lookups and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_owner_and_fresh_reads_are_served_from_cache(self, cache):
+        """Test that the login is fetched once across clients and fresh reads send nothing."""
+        stub = ETagStub()
+        server, first = await start_github_stub(stub, org=None)
+        second = EnhancedGitHubClient(token="test-token")
+        second.base_url = first.base_url
+        try:
+            info = await first.get_repository_info("demo")
+            again = await second.get_repository_info("demo")
+        finally:
+            await first.cleanup()
+            await second.cleanup()
+            await server.close()
+
+        assert info == again == {"path": "/repos/octo/demo", "version": 1}
+        assert [path for path, _ in stub.requests] == ["/user", "/repos/octo/demo"]
+        assert cache.get_stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_reads_revalidate(self, cache):
+        """Test that stale entries are revalidated with If-None-Match and 304s reuse the body."""
+        stub = ETagStub()
+        server, client = await start_github_stub(stub, org=None)
+        try:
+            await client.get_repository_info("demo")
+            _expire(cache)
+            unchanged = await client.get_repository_info("demo")
+            stub.versions["/repos/octo/demo"] = 2
+            _expire(cache)
+            changed = await client.get_repository_info("demo")
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert unchanged["version"] == 1
+        assert changed["version"] == 2
+        assert stub.requests[2] == ("/repos/octo/demo", '"/repos/octo/demo-1"')
+        assert cache.get_stats()["revalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_refs_always_revalidate(self, cache):
+        """Test that branch refs are never served without asking GitHub."""
+        stub = ETagStub()
+        server, client = await start_github_stub(stub, org=None)
+        url = f"{client.base_url}/repos/octo/demo/git/refs/heads/main"
+        try:
+            await client._make_request("GET", url)
+            await client._make_request("GET", url)
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert stub.requests == [
+            ("/repos/octo/demo/git/refs/heads/main", None),
+            ("/repos/octo/demo/git/refs/heads/main", '"/repos/octo/demo/git/refs/heads/main-1"')
+        ]
+
+    @pytest.mark.asyncio
+    async def test_own_writes_invalidate_repository_reads(self, cache):
+        """Test that a write makes the next read of the repository revalidate."""
+        stub = ETagStub()
+        server, client = await start_github_stub(stub, org=None)
+        try:
+            await client.get_repository_info("demo")
+            await client.add_pr_labels("demo", 1, ["phase"])
+            await client.get_repository_info("demo")
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert stub.requests[-1] == ("/repos/octo/demo", '"/repos/octo/demo-1"')
+        assert [path for path, _ in stub.requests].count("/user") == 1
+
+
+class TestResponseCache:
+    """Test resource classification and eviction."""
+
+    def test_resource_ttls(self):
+        """Test that paths map to their resource class and TTL."""
+        sha = "a" * 40
+        assert resource_ttl("/user") == ("user", None)
+        assert resource_ttl(f"/repos/o/r/git/commits/{sha}") == ("object", None)
+        assert resource_ttl("/repos/o/r/git/refs/heads/main") == ("ref", 0.0)
+        assert resource_ttl(f"/repos/o/r/commits/{sha}/status") == ("status", 10.0)
+        assert resource_ttl("/repos/o/r/pulls/3") == ("pulls", 30.0)
+        assert resource_ttl("/repos/o/r") == ("repo", 300.0)
+
+    def test_lru_eviction_and_unvalidated_responses(self):
+        """Test that the oldest entries are evicted and responses without validators are not kept."""
+        cache = GitHubResponseCache(max_entries=2)
+        for name in ("a", "b", "c"):
+            cache.store(cache.key("t", f"https://api/repos/o/{name}"), f"/repos/o/{name}", {"ETag": f'"{name}"'}, b"{}")
+        cache.store(cache.key("t", "https://api/repos/o/d"), "/repos/o/d", {}, b"{}")
+
+        assert cache.get(cache.key("t", "https://api/repos/o/a")) is None
+        assert cache.get(cache.key("t", "https://api/repos/o/c")).etag == '"c"'
+        assert cache.get(cache.key("t", "https://api/repos/o/d")) is None
+        assert cache.get(cache.key("other", "https://api/repos/o/c")) is None
@@ -0,0 +1,130 @@
+"""
+Unit tests for the enhanced GitHub client against a local API stub.
+"""
+
+import asyncio
+import pytest
+from aiohttp import web
+
+from tests.helpers import start_github_stub
+
+
+# The stub has no rate limits, so writes need no spacing
+pytestmark = pytest.mark.usefixtures("isolated_github")
+
+
+class GitHubStub:
+    """Records the git data API calls of a commit."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.requests = []
+        self.peers = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.trees = []
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/repos/acme/demo/git/refs/heads/{branch}", self.get_ref)
+        app.router.add_patch("/repos/acme/demo/git/refs/heads/{branch}", self.update_ref)
+        app.router.add_delete("/repos/acme/demo/git/refs/heads/{branch}", self.delete_ref)
+        app.router.add_post("/repos/acme/demo/git/blobs", self.create_blob)
+        app.router.add_post("/repos/acme/demo/git/trees", self.create_tree)
+        app.router.add_post("/repos/acme/demo/git/commits", self.create_commit)
+        return app
+
+    def _record(self, request):
+        self.requests.append((request.method, request.path))
+        self.peers.add(request.transport.get_extra_info("peername"))
+
+    async def get_ref(self, request):
+        self._record(request)
+        return web.json_response({"object": {"sha": "base"}})
+
+    async def update_ref(self, request):
+        self._record(request)
+        return web.json_response({"object": {"sha": (await request.json())["sha"]}})
+
+    async def delete_ref(self, request):
+        self._record(request)
+        return web.Response(status=204)
+
+    async def create_blob(self, request):
+        self._record(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        body = await request.json()
+        return web.json_response({"sha": f"blob-{len(body['content'])}"}, status=201)
+
+    async def create_tree(self, request):
+        self._record(request)
+        self.trees.append((await request.json())["tree"])
+        return web.json_response({"sha": "tree"}, status=201)
+
+    async def create_commit(self, request):
+        self._record(request)
+        return web.json_response({"sha": "commit"}, status=201)
+
+
+class TestEnhancedGitHubClient:
+    """Test pooled connections, inline tree entries and concurrent blob uploads."""
+
+    @pytest.mark.asyncio
+    async def test_small_files_are_inlined_on_one_connection(self):
+        """Test that a 30-file commit takes five requests over one pooled connection."""
+        stub = GitHubStub()
+        server, client = await start_github_stub(stub)
+        files = {f"src/module_{i}.py": f"VALUE = {i}\n" for i in range(30)}
+        files["data/large.json"] = "x" * (client.inline_blob_bytes + 1)
+        try:
+            result = await client.commit_micro_phase_files("demo", "phase-1", files, {"name": "Models"})
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert result["sha"] == "commit"
+        stats = result["upload_stats"]
+        assert stats["round_trips"] == 5
+        assert (stats["blobs_inlined"], stats["blobs_uploaded"]) == (30, 1)
+        assert stats["bytes_sent"] > client.inline_blob_bytes
+        assert [method for method, _ in stub.requests] == ["GET", "POST", "POST", "POST", "PATCH"]
+        assert len(stub.peers) == 1
+
+        tree = {item["path"]: item for item in stub.trees[0]}
+        assert tree["src/module_3.py"]["content"] == "VALUE = 3\n"
+        assert tree["data/large.json"]["sha"] == f"blob-{client.inline_blob_bytes + 1}"
+
+    @pytest.mark.asyncio
+    async def test_blob_uploads_are_concurrent_and_bounded(self):
+        """Test that large blobs upload in parallel, at most upload_concurrency at a time."""
+        stub = GitHubStub(delay=0.02)
+        server, client = await start_github_stub(stub, upload_concurrency=3, inline_blob_bytes=0)
+        files = {f"assets/file_{i}.txt": f"content {i}" for i in range(10)}
+        try:
+            result = await client.commit_micro_phase_files("demo", "phase-2", files, {"name": "Assets"})
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert result["upload_stats"]["blobs_uploaded"] == 10
+        assert stub.max_in_flight == 3
+        assert len(stub.peers) <= 3
+
+    @pytest.mark.asyncio
+    async def test_empty_response_and_cleanup(self):
+        """Test that 204 responses parse as empty and cleanup closes the session."""
+        stub = GitHubStub()
+        server, client = await start_github_stub(stub)
+        try:
+            url = f"{client.base_url}/repos/acme/demo/git/refs/heads/old"
+            assert await client._make_request("DELETE", url) == {}
+            session = client._session
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert session.closed
+        assert client._session is None
@@ -0,0 +1,158 @@
+"""
+Unit tests for the rate-limit-aware GitHub scheduler.
+"""
+
+import asyncio
+import time
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ai_orchestrator.utils import github_scheduler
+from ai_orchestrator.utils.enhanced_github_client import EnhancedGitHubClient
+from ai_orchestrator.utils.github_scheduler import (
+    BULK, GitHubRateLimitError, GitHubScheduler, github_priority
+)
+
+
+class RateLimitStub:
+    """Answers each request with the next scripted (status, headers, body)."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.times = []
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        return app
+
+    async def handle(self, request):
+        self.times.append(time.monotonic())
+        status, headers, body = self.responses.pop(0) if self.responses else (200, {}, "{}")
+        return web.Response(status=status, headers=headers, text=body, content_type="application/json")
+
+
+def _quota_headers(remaining, reset_in=60):
+    return {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(time.time() + reset_in))
+    }
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = GitHubScheduler(write_interval=0.05, quota_reserve=10, max_retries=2, max_wait=5.0, secondary_backoff=0.05)
+    monkeypatch.setattr(github_scheduler, "_github_scheduler", scheduler)
+    return scheduler
+
+
+async def _request(stub, method="GET", path="/repos/acme/demo"):
+    server = TestServer(stub.app())
+    await server.start_server()
+    client = EnhancedGitHubClient(token="test-token", org="acme")
+    client.base_url = str(server.make_url("")).rstrip("/")
+    try:
+        return await client._make_request(method, f"{client.base_url}{path}")
+    finally:
+        await client.cleanup()
+        await server.close()
+
+
+class TestRateLimitResponses:
+    """Test retries of primary and secondary rate limit responses."""
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_honoured(self, scheduler):
+        """Test that a 429 with Retry-After is retried once the pause is over."""
+        stub = RateLimitStub([(429, {"Retry-After": "0.2"}, '{"message": "slow down"}'), (200, _quota_headers(4321), '{"ok": true}')])
+
+        assert await _request(stub) == {"ok": True}
+        assert len(stub.times) == 2
+        assert stub.times[1] - stub.times[0] >= 0.2
+        assert scheduler.get_stats()[f"{scheduler.token_id('test-token')}/core"]["remaining"] == 4321
+
+    @pytest.mark.asyncio
+    async def test_secondary_limit_backs_off(self, scheduler):
+        """Test that a 403 mentioning a rate limit backs off and is retried."""
+        body = '{"message": "You have exceeded a secondary rate limit"}'
+        stub = RateLimitStub([(403, {}, body), (403, {}, body), (201, {}, '{"sha": "abc"}')])
+
+        assert await _request(stub, "POST", "/repos/acme/demo/git/blobs") == {"sha": "abc"}
+        assert stub.times[2] - stub.times[1] >= stub.times[1] - stub.times[0]
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, scheduler):
+        """Test that persistent rate limiting surfaces as GitHubRateLimitError."""
+        stub = RateLimitStub([(429, {"Retry-After": "0"}, "{}")] * 3)
+
+        with pytest.raises(GitHubRateLimitError):
+            await _request(stub)
+        assert len(stub.times) == 3
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_retried(self, scheduler):
+        """Test that a plain 403 fails at once."""
+        stub = RateLimitStub([(403, {}, '{"message": "Resource not accessible"}')])
+
+        with pytest.raises(Exception, match="GitHub API error 403"):
+            await _request(stub)
+        assert len(stub.times) == 1
+
+
+class TestScheduling:
+    """Test write pacing, the bulk reserve and the wait limit."""
+
+    @pytest.mark.asyncio
+    async def test_writes_are_spaced(self, scheduler):
+        """Test that mutating calls of one token are write_interval apart."""
+        start = time.monotonic()
+        await asyncio.gather(*(scheduler.acquire("t", "POST", "/repos/a/b/git/blobs") for _ in range(3)))
+        await scheduler.acquire("t", "GET", "/repos/a/b")
+
+        assert time.monotonic() - start >= 2 * scheduler.write_interval
+
+    def test_bulk_leaves_reserve_to_interactive(self, scheduler):
+        """Test that bulk requests wait once the quota reaches the reserve."""
+        scheduler.update_quota("t", remaining=10, limit=5000, reset_at=time.time() + 60)
+
+        scheduler.acquire_sync("t", "GET", "/repos/a/b")
+        with github_priority(BULK):
+            with pytest.raises(GitHubRateLimitError) as error:
+                scheduler.acquire_sync("t", "GET", "/repos/a/b")
+        assert error.value.retry_at > time.time() + 50
+
+    def test_exhausted_quota_exceeds_max_wait(self, scheduler):
+        """Test that a wait longer than max_wait fails fast instead of sleeping."""
+        scheduler.update_quota("t", remaining=0, limit=5000, reset_at=time.time() + 600)
+
+        with pytest.raises(GitHubRateLimitError):
+            scheduler.acquire_sync("t", "GET", "/repos/a/b")
+        scheduler.acquire_sync("other", "GET", "/repos/a/b")
+
+    def test_requests_adapter_retries(self, scheduler):
+        """Test that the requests-based client goes through the scheduler."""
+        from ai_orchestrator.utils.github_integration import GitHubIntegration
+
+        async def serve(stub, calls):
+            server = TestServer(stub.app())
+            await server.start_server()
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(None, calls, str(server.make_url("")).rstrip("/"))
+            finally:
+                await server.close()
+
+        def calls(base_url):
+            integration = GitHubIntegration(token="test-token")
+            integration.base_url = base_url
+            integration.session.mount(base_url, integration.session.get_adapter("https://api.github.com"))
+            return integration.session.get(f"{base_url}/user")
+
+        stub = RateLimitStub([(429, {"Retry-After": "0.1"}, "{}"), (200, _quota_headers(99), '{"login": "octo"}')])
+        response = asyncio.run(serve(stub, calls))
+
+        assert response.json() == {"login": "octo"}
+        assert len(stub.times) == 2
+        assert scheduler.get_stats()[f"{scheduler.token_id('test-token')}/core"]["remaining"] == 99
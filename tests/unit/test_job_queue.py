@@ -0,0 +1,176 @@
+"""
+Unit tests for the job queue, worker and cross-process event bus.
+"""
+
+import asyncio
+import time
+import pytest
+
+from ai_orchestrator.core.worker import OrchestrationWorker
+from ai_orchestrator.utils.event_bus import SQLiteEventBus
+from ai_orchestrator.utils.event_log import EventLogWriter, EventLogReader
+from ai_orchestrator.utils.job_queue import SQLiteJobQueue, RedisJobQueue
+from ai_orchestrator.utils.process_monitor import ProcessMonitor
+from ai_orchestrator.utils.status_hub import StatusHub
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestJobQueue:
+    """Test claiming, leases and retries."""
+
+    def test_sqlite_jobs_shared_between_connections(self, tmp_path):
+        """Test that a job enqueued by one process is claimed exactly once by another."""
+        api = SQLiteJobQueue(str(tmp_path / "jobs.db"))
+        worker = SQLiteJobQueue(str(tmp_path / "jobs.db"))
+
+        job_id = api.enqueue("workflow", {"user_request": "Build a blog"}, job_id="s1")
+        job = worker.claim("w1", lease_seconds=60)
+
+        assert job.job_id == "s1"
+        assert job.payload == {"user_request": "Build a blog"}
+        assert job.attempts == 1
+        assert worker.claim("w2", lease_seconds=60) is None
+        assert api.depth() == {"running": 1}
+
+        worker.complete(job_id, "w1")
+        assert api.get(job_id).status == "completed"
+
+    def test_sqlite_expired_lease_is_retried_then_failed(self, tmp_path):
+        """Test that a job whose worker stopped renewing its lease moves to another worker."""
+        queue = SQLiteJobQueue(str(tmp_path / "jobs.db"), max_attempts=2)
+        queue.enqueue("workflow", {}, job_id="s1")
+
+        assert queue.claim("w1", lease_seconds=-1).attempts == 1
+        retried = queue.claim("w2", lease_seconds=-1)
+        assert (retried.worker_id, retried.attempts) == ("w2", 2)
+        assert not queue.heartbeat("s1", "w1", 60)
+
+        assert queue.claim("w3", lease_seconds=60) is None
+        assert queue.get("s1").status == "failed"
+
+    def test_redis_backend(self):
+        """Test the Redis queue against an in-process fake server."""
+        fakeredis = pytest.importorskip("fakeredis")
+        queue = RedisJobQueue(client=fakeredis.FakeRedis(), prefix="t", max_attempts=2)
+        queue.enqueue("workflow", {"n": 1}, job_id="a")
+        queue.enqueue("workflow", {"n": 2}, job_id="b")
+
+        first = queue.claim("w1", lease_seconds=-1)
+        assert first.job_id == "a"
+        # The expired lease puts "a" back in front of "b"
+        assert queue.claim("w2", lease_seconds=60).job_id == "a"
+        assert queue.heartbeat("a", "w2", 60)
+        queue.complete("a", "w2", error="boom")
+
+        assert queue.get("a").status == "failed"
+        assert queue.claim("w2", lease_seconds=60).job_id == "b"
+        assert queue.depth() == {"queued": 0, "running": 1}
+
+    def test_redis_claim_survives_a_worker_dying_mid_claim(self):
+        """Test that a job moved to the claimed list without a lease is recovered."""
+        fakeredis = pytest.importorskip("fakeredis")
+        client = fakeredis.FakeRedis()
+        queue = RedisJobQueue(client=client, prefix="t")
+        queue.enqueue("workflow", {"n": 1}, job_id="a")
+        # A worker that died between taking the id and writing its lease
+        client.lmove("t:jobs:queued", "t:jobs:claimed", "RIGHT", "LEFT")
+
+        job = queue.claim("w2", lease_seconds=60)
+
+        assert job.job_id == "a"
+        assert client.lrange("t:jobs:claimed", 0, -1) == [b"a"]
+        assert client.zscore("t:jobs:leases", "a") is not None
+
+
+class TestWorker:
+    """Test the orchestration worker loop."""
+
+    @pytest.mark.asyncio
+    async def test_runs_jobs_with_bounded_concurrency(self, tmp_path):
+        """Test that queued jobs run at most ``concurrency`` at a time and are completed."""
+        queue = SQLiteJobQueue(str(tmp_path / "jobs.db"))
+        for n in range(5):
+            queue.enqueue("workflow", {"n": n}, job_id=f"s{n}")
+
+        class FakeOrchestrator:
+            running = 0
+            peak = 0
+            done = []
+
+            async def run_job(self, job):
+                FakeOrchestrator.running += 1
+                FakeOrchestrator.peak = max(FakeOrchestrator.peak, FakeOrchestrator.running)
+                await asyncio.sleep(0.05)
+                FakeOrchestrator.running -= 1
+                if job.payload["n"] == 3:
+                    raise ValueError("bad request")
+                FakeOrchestrator.done.append(job.job_id)
+
+        worker = OrchestrationWorker(queue, FakeOrchestrator(), concurrency=2, lease_seconds=60, poll_interval=0.01)
+        runner = asyncio.create_task(worker.run())
+        for _ in range(200):
+            if worker.jobs_completed + worker.jobs_failed == 5:
+                break
+            await asyncio.sleep(0.02)
+        worker.stop()
+        await runner
+
+        assert FakeOrchestrator.peak == 2
+        assert sorted(FakeOrchestrator.done) == ["s0", "s1", "s2", "s4"]
+        assert queue.get("s3").status == "failed"
+        assert queue.get("s3").error == "bad request"
+        assert queue.depth() == {"completed": 4, "failed": 1}
+
+
+class TestCrossProcessState:
+    """Test status and monitor events shared through the bus, and shared event logs."""
+
+    def test_status_and_monitor_events_reach_other_process(self, tmp_path):
+        """Test that hubs and monitors attached to different buses see each other's changes."""
+        worker_bus = SQLiteEventBus(str(tmp_path / "bus.db"), poll_interval=0.01)
+        api_bus = SQLiteEventBus(str(tmp_path / "bus.db"), poll_interval=0.01)
+        worker_hub, api_hub = StatusHub(), StatusHub()
+        worker_monitor, api_monitor = ProcessMonitor(), ProcessMonitor()
+        for hub, monitor, bus in ((worker_hub, worker_monitor, worker_bus), (api_hub, api_monitor, api_bus)):
+            hub.attach_bus(bus)
+            monitor.attach_bus(bus)
+
+        try:
+            worker_hub.publish("s1", current_phase="planning", progress=10)
+            worker_hub.publish("s1", progress=20)
+            worker_monitor.log_phase_start("s1", "planning")
+            worker_monitor.log_phase_end("s1", "planning", True)
+
+            assert _wait_for(lambda: api_hub.get_status("s1") == {"current_phase": "planning", "progress": 20})
+            assert _wait_for(lambda: api_monitor.get_last_seq("s1") == 2)
+            assert [m["message_type"] for m in api_monitor.get_messages("s1")] == ["phase_start", "phase_end"]
+            # Remote changes are not echoed back to the bus
+            time.sleep(0.1)
+            assert api_bus.get_stats()["published"] == 0
+        finally:
+            worker_bus.close()
+            api_bus.close()
+
+    def test_event_log_writers_in_one_directory(self, tmp_path):
+        """Test that concurrent writers get their own directory and readers merge them."""
+        first = EventLogWriter(str(tmp_path))
+        second = EventLogWriter(str(tmp_path))
+        first.append({"session_id": "a", "seq": 1, "timestamp": 1.0})
+        second.append({"session_id": "b", "seq": 1, "timestamp": 2.0})
+        first.close()
+        second.close()
+
+        assert second.log_dir == tmp_path / "writer-1"
+        assert set(EventLogReader(str(tmp_path)).list_sessions()) == {"a", "b"}
+        # A restarted writer reuses the free directory instead of sealing a live one
+        third = EventLogWriter(str(tmp_path))
+        assert third.log_dir == tmp_path
+        third.close()
@@ -0,0 +1,77 @@
+"""
+Unit tests for the event loop lag monitor.
+"""
+
+import asyncio
+import time
+import pytest
+
+from ai_orchestrator.utils.loop_monitor import LoopMonitor
+from ai_orchestrator.utils.process_monitor import get_process_monitor
+from ai_orchestrator.utils.tracing import Tracer, traced
+
+
+def _write_report_synchronously():
+    time.sleep(0.08)
+
+
+@traced("phase", name="implementation")
+async def _blocking_phase():
+    await asyncio.sleep(0)
+    _write_report_synchronously()
+
+
+class TestLoopMonitor:
+    """Test lag sampling and blocking-call attribution."""
+
+    @pytest.mark.asyncio
+    async def test_lag_is_sampled(self):
+        """Test that a blocking call shows up as loop lag."""
+        monitor = LoopMonitor(interval=0.01, block_threshold=0.03)
+        monitor.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.06)
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+        stats = monitor.get_stats()
+        assert stats["samples"] >= 2
+        assert stats["max_lag"] >= 0.03
+        assert stats["stalls"] >= 1
+        assert stats["running"] is False
+        assert monitor.get_blocking_calls() == []
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_attributed_to_session_and_phase(self):
+        """Test that debug mode reports the blocking callback with its stack, session and phase."""
+        monitor = LoopMonitor(interval=1.0, block_threshold=0.03, debug=True)
+        original_run = asyncio.events.Handle._run
+        monitor.start()
+        try:
+            with Tracer(enabled=False).trace("loop-session"):
+                await asyncio.create_task(_blocking_phase())
+        finally:
+            await monitor.stop()
+
+        assert asyncio.events.Handle._run is original_run
+        reports = monitor.get_blocking_calls(session_id="loop-session")
+        assert len(reports) == 1
+        report = reports[0]
+        assert report["phase"] == "implementation"
+        assert report["duration"] >= 0.08
+        assert "_blocking_phase" in report["callback"]
+        assert any("_write_report_synchronously" in line for line in report["stack"])
+
+        timings = get_process_monitor().get_session_timings("loop-session")
+        assert timings["loop_blocked"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_short_callbacks_are_not_reported(self):
+        """Test that callbacks under the threshold are ignored."""
+        monitor = LoopMonitor(interval=1.0, block_threshold=0.05, debug=True)
+        monitor.start()
+        for _ in range(20):
+            await asyncio.sleep(0)
+        await monitor.stop()
+
+        assert monitor.get_stats()["blocked_calls"] == 0
@@ -0,0 +1,233 @@
+"""
+Unit tests for the batched merge queue, against a git-backed GitHub stub.
+"""
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from ai_orchestrator.utils.merge_queue import MergeQueue, dependency_levels
+from tests.helpers import run_git, start_github_stub
+
+
+pytestmark = pytest.mark.usefixtures("isolated_github")
+
+
+class MergeStub:
+    """Branches, refs and the merges endpoint of acme/demo backed by a bare repository."""
+
+    def __init__(self, repo, latency: float = 0.002, protected=(), pulls=None):
+        self.repo = str(repo)
+        self.latency = latency
+        self.requests = []
+        self.protected = set(protected)
+        # number -> head branch
+        self.pulls = dict(pulls or {})
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self.delay])
+        base = "/repos/acme/demo"
+        app.router.add_get(base + "/branches/{branch:.+}", self.get_branch)
+        app.router.add_post(base + "/git/refs", self.create_ref)
+        app.router.add_patch(base + "/git/refs/heads/{branch:.+}", self.update_ref)
+        app.router.add_delete(base + "/git/refs/heads/{branch:.+}", self.delete_ref)
+        app.router.add_post(base + "/merges", self.merge)
+        app.router.add_put(base + "/pulls/{number}/merge", self.merge_pull)
+        return app
+
+    @web.middleware
+    async def delay(self, request, handler):
+        self.requests.append((request.method, request.path))
+        await asyncio.sleep(self.latency)
+        return await handler(request)
+
+    def sha(self, rev: str) -> str:
+        return run_git("--git-dir", self.repo, "rev-parse", rev).stdout.strip()
+
+    async def get_branch(self, request):
+        return web.json_response({"commit": {"sha": self.sha(f"refs/heads/{request.match_info['branch']}")}})
+
+    async def create_ref(self, request):
+        body = await request.json()
+        run_git("--git-dir", self.repo, "update-ref", body["ref"], body["sha"])
+        return web.json_response({"object": {"sha": body["sha"]}}, status=201)
+
+    async def update_ref(self, request):
+        body = await request.json()
+        ref = f"refs/heads/{request.match_info['branch']}"
+        if request.match_info["branch"] in self.protected:
+            return web.json_response({"message": f"Protected branch update failed for {ref}."}, status=422)
+        if not body.get("force") and run_git("--git-dir", self.repo, "merge-base", "--is-ancestor", ref, body["sha"], check=False).returncode:
+            return web.json_response({"message": "Update is not a fast forward"}, status=422)
+        run_git("--git-dir", self.repo, "update-ref", ref, body["sha"])
+        return web.json_response({"object": {"sha": body["sha"]}})
+
+    async def delete_ref(self, request):
+        run_git("--git-dir", self.repo, "update-ref", "-d", f"refs/heads/{request.match_info['branch']}")
+        return web.Response(status=204)
+
+    async def merge(self, request):
+        body = await request.json()
+        base = self.sha(f"refs/heads/{body['base']}")
+        if not run_git("--git-dir", self.repo, "merge-base", "--is-ancestor", body["head"], base, check=False).returncode:
+            return web.Response(status=204)
+        merged = run_git("--git-dir", self.repo, "merge-tree", "--write-tree", base, body["head"], check=False)
+        if merged.returncode:
+            return web.json_response({"message": "Merge conflict"}, status=409)
+        tree = merged.stdout.split()[0]
+        sha = run_git("--git-dir", self.repo, "commit-tree", tree, "-p", base, "-p", body["head"],
+                   "-m", body["commit_message"]).stdout.strip()
+        run_git("--git-dir", self.repo, "update-ref", f"refs/heads/{body['base']}", sha)
+        return web.json_response({"sha": sha}, status=201)
+
+    async def merge_pull(self, request):
+        body = await request.json()
+        head = self.sha(f"refs/heads/{self.pulls[int(request.match_info['number'])]}")
+        if head != body["sha"]:
+            return web.json_response({"message": "Head branch was modified"}, status=409)
+        base = self.sha("refs/heads/develop")
+        tree = run_git("--git-dir", self.repo, "merge-tree", "--write-tree", base, head).stdout.split()[0]
+        sha = run_git("--git-dir", self.repo, "commit-tree", tree, "-p", base, "-p", head,
+                   "-m", body["commit_title"]).stdout.strip()
+        run_git("--git-dir", self.repo, "update-ref", "refs/heads/develop", sha)
+        return web.json_response({"sha": sha, "merged": True})
+
+
+def _repository(tmp_path, branches):
+    """Bare repository with develop and one branch per (name, files) on top of it."""
+    work = tmp_path / "work"
+    run_git("init", "--quiet", "-b", "develop", str(work))
+    (work / "README.md").write_text("# Demo\n")
+    run_git("add", "-A", cwd=work)
+    run_git("commit", "--quiet", "-m", "Initial", cwd=work)
+    for name, files in branches:
+        run_git("checkout", "--quiet", "-b", name, "develop", cwd=work)
+        for path, content in files.items():
+            (work / path).parent.mkdir(parents=True, exist_ok=True)
+            (work / path).write_text(content)
+        run_git("add", "-A", cwd=work)
+        run_git("commit", "--quiet", "-m", name, cwd=work)
+    run_git("clone", "--quiet", "--bare", str(work), str(tmp_path / "remote.git"))
+    return tmp_path / "remote.git"
+
+
+def _files_at(stub: MergeStub, rev: str):
+    return set(run_git("--git-dir", stub.repo, "ls-tree", "-r", "--name-only", rev).stdout.split())
+
+
+class TestMergeQueue:
+    """Test batching, conflicts, bisection and the drain time against one-by-one merging."""
+
+    @pytest.mark.asyncio
+    async def test_batches_drain_faster_than_one_by_one(self, tmp_path):
+        """Test that 20 independent phases land in a few validated batches, much faster than one at a time."""
+        specs = [(f"feature/phase-{i}", {f"src/phase_{i}.py": f"VALUE = {i}\n"}) for i in range(20)]
+        branches = [{"name": name} for name, _ in specs]
+
+        async def ci(sha):
+            await asyncio.sleep(0.05)
+            return True
+
+        timings = {}
+        for label, max_batch in (("sequential", 1), ("batched", 8)):
+            stub = MergeStub(_repository(tmp_path / label, specs))
+            server, client = await start_github_stub(stub)
+            try:
+                queue = MergeQueue(client, "demo", "develop", max_batch=max_batch, validate=ci)
+                started_at = time.perf_counter()
+                results = await queue.drain(branches, {})
+                timings[label] = (time.perf_counter() - started_at, queue.stats)
+            finally:
+                await client.cleanup()
+                await server.close()
+
+            assert all(result["status"] == "merged" for result in results)
+            assert {f"src/phase_{i}.py" for i in range(20)} <= _files_at(stub, "develop")
+            assert [ref for ref in run_git("--git-dir", stub.repo, "branch").stdout.split() if "merge-queue" in ref] == []
+
+        (sequential, sequential_stats), (batched, batched_stats) = timings["sequential"], timings["batched"]
+        assert sequential_stats["validations"] == 20 and batched_stats["validations"] == 3
+        assert batched * 2 < sequential
+
+    @pytest.mark.asyncio
+    async def test_conflicts_and_blocked_dependents(self, tmp_path):
+        """Test that a branch conflicting with a batch mate is retried, reported and blocks its dependents."""
+        stub = MergeStub(_repository(tmp_path, [
+            ("feature/readme", {"README.md": "# Demo\nOurs\n"}),
+            ("feature/models", {"README.md": "# Demo\nTheirs\n", "src/models.py": "M = 1\n"}),
+            ("feature/api", {"src/api.py": "A = 1\n"}),
+        ]))
+        branches = [{"name": "feature/readme"}, {"name": "feature/models"}, {"name": "feature/api"}]
+        verdicts = {}
+        server, client = await start_github_stub(stub)
+        try:
+            results = await MergeQueue(client, "demo", "develop", verdicts=verdicts).drain(
+                branches, {"feature/api": ["models"]}
+            )
+            again = MergeQueue(client, "demo", "develop", verdicts=verdicts)
+            rerun = await again.drain([{"name": "feature/models"}], {})
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert [result["status"] for result in results] == [
+            "merged", "conflicts_require_manual_review", "blocked_by_dependency"
+        ]
+        assert rerun[0]["status"] == "conflicts_require_manual_review"
+        assert again.stats["merge_requests"] == 0 and again.stats["verdict_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failing_batch_is_bisected(self, tmp_path):
+        """Test that the branch breaking validation is found by bisection and the rest still lands."""
+        specs = [(f"feature/phase-{i}", {f"src/phase_{i}.py": "BROKEN\n" if i == 5 else f"VALUE = {i}\n"}) for i in range(8)]
+        stub = MergeStub(_repository(tmp_path, specs))
+
+        async def ci(sha):
+            return run_git("--git-dir", stub.repo, "grep", "-q", "BROKEN", sha, check=False).returncode != 0
+
+        server, client = await start_github_stub(stub)
+        try:
+            queue = MergeQueue(client, "demo", "develop", max_batch=8, validate=ci)
+            results = await queue.drain([{"name": name} for name, _ in specs], {})
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert [result["status"] for result in results] == ["merged"] * 5 + ["validation_failed"] + ["merged"] * 2
+        assert "src/phase_5.py" not in _files_at(stub, "develop")
+        # One full-batch check, three bisection steps, one check of the rebuilt remainder
+        assert queue.stats["validations"] == 5
+
+    @pytest.mark.asyncio
+    async def test_protected_target_lands_through_pull_requests(self, tmp_path):
+        """Test that a protected target is not retried as if it moved, and lands through pull requests."""
+        specs = [(f"feature/phase-{i}", {f"src/phase_{i}.py": f"VALUE = {i}\n"}) for i in range(3)]
+        stub = MergeStub(_repository(tmp_path, specs), protected={"develop"}, pulls={1: "feature/phase-0", 2: "feature/phase-1"})
+        branches = [{"name": "feature/phase-0", "pull_request_number": 1},
+                    {"name": "feature/phase-1", "pull_request_number": 2},
+                    {"name": "feature/phase-2"}]
+        server, client = await start_github_stub(stub)
+        try:
+            queue = MergeQueue(client, "demo", "develop")
+            results = await queue.drain(branches, {})
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert [result["status"] for result in results] == ["merged", "merged", "failed"]
+        assert "has no pull request" in results[2]["error"]
+        assert {"src/phase_0.py", "src/phase_1.py"} <= _files_at(stub, "develop")
+        assert queue.stats["batches"] == 1
+        assert len([r for r in stub.requests if r[0] == "PATCH"]) == 1
+
+    def test_dependency_levels(self):
+        """Test that levels follow dependencies and cycles do not stall the queue."""
+        branches = [{"name": n} for n in ("feature/api", "feature/models", "feature/ui", "feature/a", "feature/b")]
+        levels = dependency_levels(branches, {
+            "feature/api": ["models"], "feature/ui": ["api"], "feature/a": ["feature/b"], "feature/b": ["feature/a"]
+        })
+        assert [[b["name"] for b in level] for level in levels] == [
+            ["feature/models"], ["feature/api"], ["feature/ui"], ["feature/a", "feature/b"]
+        ]
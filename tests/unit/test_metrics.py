@@ -0,0 +1,167 @@
+"""
+Unit tests for metric primitives and the metrics collector.
+"""
+
+import random
+import pytest
+
+from ai_orchestrator.utils.metrics import Histogram, WindowedHistogram
+from ai_orchestrator.utils.logging_config import MetricsCollector
+
+
+class TestHistogram:
+    """Test the log-bucketed histogram."""
+
+    def test_percentiles_within_relative_error(self):
+        """Test that estimates stay within the bucket resolution."""
+        rng = random.Random(7)
+        values = [rng.expovariate(1.0) for _ in range(10000)]
+        histogram = Histogram()
+        for value in values:
+            histogram.observe(value)
+
+        values.sort()
+        for q in (50, 95, 99):
+            exact = values[int(q / 100 * len(values)) - 1]
+            assert histogram.percentile(q) == pytest.approx(exact, rel=0.06)
+        assert histogram.count == 10000
+        assert histogram.max == values[-1]
+
+    def test_memory_is_bounded(self):
+        """Test that the bucket count does not grow with observations."""
+        histogram = Histogram()
+        for i in range(100000):
+            histogram.observe(i * 0.37)
+
+        assert len(histogram.buckets) <= histogram._max_index + 1
+        assert len(histogram.buckets) < 400
+
+    def test_zero_and_negative_values(self):
+        """Test that non-positive values land in the lowest bucket."""
+        histogram = Histogram()
+        for value in (0, -5, 0):
+            histogram.observe(value)
+
+        assert histogram.percentile(50) == 0
+        assert histogram.min == -5
+
+    def test_window_drops_old_slots(self):
+        """Test that the windowed rollup forgets values older than the window."""
+        window = WindowedHistogram(Histogram(), window_seconds=60, slots=6)
+        window.observe(100.0, now=1000.0)
+        window.observe(1.0, now=1055.0)
+
+        assert window.snapshot(now=1055.0).count == 2
+        assert window.snapshot(now=1075.0).count == 1
+        assert window.snapshot(now=1075.0).max == 1.0
+
+
+class TestMetricsCollector:
+    """Test label-aware aggregation in the collector."""
+
+    def test_summary_keeps_existing_shape(self):
+        """Test that record_metric still aggregates count/total/average per name."""
+        collector = MetricsCollector()
+        collector.record_api_call("claude", "opus", 100, True)
+        collector.record_api_call("gpt", "gpt-4", 50, False)
+
+        summary = collector.get_summary()
+        tokens = summary["aggregated_metrics"]["tokens_used"]
+
+        assert tokens["count"] == 2
+        assert tokens["total"] == 150
+        assert tokens["average"] == 75
+        assert "p99" in tokens
+        assert summary["aggregated_metrics"]["api_calls"]["total"] == 2
+        assert summary["aggregated_metrics"]["api_errors"]["type"] == "counter"
+
+    def test_kind_collisions_are_rejected(self):
+        """Test that a name keeps one kind and histograms cannot take the counter suffix."""
+        collector = MetricsCollector()
+        collector.increment("cache_hits")
+
+        with pytest.raises(ValueError):
+            collector.observe("cache_hits", 1.0)
+        with pytest.raises(ValueError):
+            collector.observe("tokens_total", 1.0)
+
+    def test_percentiles_per_label_set(self):
+        """Test that each label set has its own histogram."""
+        collector = MetricsCollector()
+        for i in range(100):
+            collector.observe("latency", 1.0, {"agent": "fast"}, "seconds")
+            collector.observe("latency", 10.0, {"agent": "slow"}, "seconds")
+
+        assert collector.get_percentiles("latency", {"agent": "fast"})["p99"] == 1.0
+        assert collector.get_percentiles("latency", {"agent": "slow"})["p50"] == 10.0
+        assert collector.get_percentiles("latency")["p50"] == 1.0
+
+    def test_counters_and_gauges(self):
+        """Test counter and gauge series."""
+        collector = MetricsCollector()
+        collector.increment("cache_hits", labels={"tier": "memory"})
+        collector.increment("cache_hits", 2, labels={"tier": "memory"})
+        collector.set_gauge("active_sessions", 3)
+        collector.set_gauge("active_sessions", 2)
+
+        series = collector.get_series("cache_hits")
+        summary = collector.get_summary()["aggregated_metrics"]
+
+        assert series == [{"count": 2, "total": 3.0, "type": "counter", "unit": "count", "labels": {"tier": "memory"}}]
+        assert summary["active_sessions"]["value"] == 2
+
+    def test_label_cardinality_is_capped(self):
+        """Test that unbounded label values collapse into an overflow series."""
+        collector = MetricsCollector(max_series_per_metric=3)
+        for i in range(10):
+            collector.record_metric("workflow_started", 1, {"session_id": str(i)})
+
+        series = collector.get_series("workflow_started")
+
+        assert len(series) == 4
+        assert {"overflow": "true"} in [s["labels"] for s in series]
+        assert collector.get_summary()["aggregated_metrics"]["workflow_started"]["count"] == 10
+
+
+class TestPrometheusExposition:
+    """Test rendering in the Prometheus text format."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram bucket, sum and count lines."""
+        collector = MetricsCollector()
+        for duration in (0.003, 0.2, 0.2, 7.0):
+            collector.observe("agent_call_duration", duration, {"role": "gpt_manager"}, "seconds")
+
+        text = collector.render_prometheus()
+
+        assert "# TYPE orchestrator_agent_call_duration_seconds histogram" in text
+        assert 'orchestrator_agent_call_duration_seconds_bucket{role="gpt_manager",le="0.005"} 1' in text
+        assert 'orchestrator_agent_call_duration_seconds_bucket{role="gpt_manager",le="0.25"} 3' in text
+        assert 'orchestrator_agent_call_duration_seconds_bucket{role="gpt_manager",le="+Inf"} 4' in text
+        assert 'orchestrator_agent_call_duration_seconds_count{role="gpt_manager"} 4' in text
+
+    def test_counters_gauges_and_escaping(self):
+        """Test counter suffixes, gauges and label value escaping."""
+        collector = MetricsCollector()
+        collector.increment("cache_hits", 2, {"tier": "phases"})
+        collector.set_gauge("queue_depth", 5, {"queue": 'say "hi"'})
+
+        text = collector.render_prometheus()
+
+        assert "# TYPE orchestrator_cache_hits_total counter" in text
+        assert 'orchestrator_cache_hits_total{tier="phases"} 2' in text
+        assert 'orchestrator_queue_depth{queue="say \\"hi\\""} 5' in text
+
+    def test_unchanged_series_reuse_rendered_lines(self):
+        """Test that series are only re-rendered after an update."""
+        collector = MetricsCollector()
+        collector.increment("github_api_calls", labels={"method": "GET", "status": "200"})
+        collector.increment("cache_hits", labels={"tier": "phases"})
+        collector.render_prometheus()
+        cached = collector._series["cache_hits"][(("tier", "phases"),)].render("x", ())
+
+        collector.increment("github_api_calls", labels={"method": "GET", "status": "200"})
+        text = collector.render_prometheus()
+
+        assert collector._series["cache_hits"][(("tier", "phases"),)].render("x", ()) is cached
+        assert 'orchestrator_github_api_calls_total{method="GET",status="200"} 2' in text
@@ -0,0 +1,292 @@
+"""
+Unit tests for single-request-sequence micro-phase publishing.
+"""
+
+import pytest
+from aiohttp import web
+
+from ai_orchestrator.agents import MicroPhase
+from ai_orchestrator.core.micro_phase_coordinator import (
+    MicroPhaseCoordinator, PhaseStatus, WorkflowPhase, WorkflowState
+)
+from tests.helpers import start_github_stub
+
+
+pytestmark = pytest.mark.usefixtures("isolated_github")
+
+BASE_SHA = "b" * 40
+
+
+class GitDataStub:
+    """In-memory refs, trees, commits and pull requests of acme/demo."""
+
+    def __init__(self):
+        self.refs = {"develop": BASE_SHA}
+        self.commits = {BASE_SHA: {"sha": BASE_SHA, "tree": {"sha": "t" * 40}, "parents": []}}
+        self.trees = {}
+        self.pulls = []
+        self.comments = []
+        self.requests = []
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        repo = "/repos/acme/demo"
+        app.router.add_get(repo + "/branches/{branch:.+}", self.get_branch)
+        app.router.add_get(repo + "/git/refs/heads/{branch:.+}", self.get_ref)
+        app.router.add_post(repo + "/git/refs", self.create_ref)
+        app.router.add_patch(repo + "/git/refs/heads/{branch:.+}", self.update_ref)
+        app.router.add_get(repo + "/git/commits/{sha}", self.get_commit)
+        app.router.add_post(repo + "/git/commits", self.create_commit)
+        app.router.add_post(repo + "/git/trees", self.create_tree)
+        app.router.add_get(repo + "/compare/{spec}", self.compare)
+        app.router.add_get(repo + "/pulls", self.list_pulls)
+        app.router.add_post(repo + "/pulls", self.create_pull)
+        app.router.add_post(repo + "/issues/{number}/labels", self.add_labels)
+        app.router.add_post(repo + "/issues/{number}/comments", self.add_comment)
+        return app
+
+    def _record(self, request):
+        self.requests.append((request.method, request.path))
+
+    async def get_ref(self, request):
+        self._record(request)
+        sha = self.refs[request.match_info["branch"]]
+        return web.json_response({"object": {"sha": sha}}, headers={"ETag": f'"{sha}"'})
+
+    async def get_branch(self, request):
+        self._record(request)
+        sha = self.refs[request.match_info["branch"]]
+        commit = {"sha": sha, "commit": {"tree": self.commits[sha]["tree"]}}
+        return web.json_response({"name": request.match_info["branch"], "commit": commit}, headers={"ETag": f'"{sha}"'})
+
+    async def create_ref(self, request):
+        self._record(request)
+        body = await request.json()
+        branch = body["ref"][len("refs/heads/"):]
+        if branch in self.refs:
+            return web.json_response({"message": "Reference already exists"}, status=422)
+        self.refs[branch] = body["sha"]
+        return web.json_response({"object": {"sha": body["sha"]}}, status=201)
+
+    async def update_ref(self, request):
+        self._record(request)
+        body = await request.json()
+        branch = request.match_info["branch"]
+        if not body.get("force") and self.refs[branch] not in self._ancestors(body["sha"]):
+            return web.json_response({"message": "Update is not a fast forward"}, status=422)
+        self.refs[branch] = body["sha"]
+        return web.json_response({})
+
+    def _ancestors(self, sha):
+        seen, todo = set(), [sha]
+        while todo:
+            current = todo.pop()
+            if current not in seen:
+                seen.add(current)
+                todo.extend(self.commits[current]["parents"])
+        return seen
+
+    async def compare(self, request):
+        self._record(request)
+        base, head = request.match_info["spec"].split("...")
+        if base == head:
+            status = "identical"
+        elif base in self._ancestors(head):
+            status = "ahead"
+        elif head in self._ancestors(base):
+            status = "behind"
+        else:
+            status = "diverged"
+        return web.json_response({"status": status})
+
+    async def get_commit(self, request):
+        self._record(request)
+        return web.json_response(self.commits[request.match_info["sha"]])
+
+    async def create_commit(self, request):
+        self._record(request)
+        body = await request.json()
+        sha = f"{len(self.commits):040x}"
+        self.commits[sha] = {"sha": sha, "tree": {"sha": body["tree"]}, "parents": body["parents"], "message": body["message"]}
+        return web.json_response(self.commits[sha], status=201)
+
+    async def create_tree(self, request):
+        self._record(request)
+        body = await request.json()
+        sha = f"{len(self.trees) + 1:040x}"
+        self.trees[sha] = body
+        return web.json_response({"sha": sha}, status=201)
+
+    def _pull(self, number):
+        body = self.pulls[number - 1]
+        return {"number": number, "html_url": f"https://github.test/pull/{number}", "title": body["title"]}
+
+    async def list_pulls(self, request):
+        self._record(request)
+        head = request.query["head"].split(":", 1)[1]
+        return web.json_response([self._pull(n) for n, body in enumerate(self.pulls, 1) if body["head"] == head])
+
+    async def create_pull(self, request):
+        self._record(request)
+        body = await request.json()
+        if any(pull["head"] == body["head"] for pull in self.pulls):
+            return web.json_response({"message": f"A pull request already exists for acme:{body['head']}."}, status=422)
+        self.pulls.append(body)
+        return web.json_response(self._pull(len(self.pulls)), status=201)
+
+    async def add_labels(self, request):
+        self._record(request)
+        return web.json_response([])
+
+    async def add_comment(self, request):
+        self._record(request)
+        self.comments.append((await request.json())["body"])
+        return web.json_response({}, status=201)
+
+
+def _phase(index: int):
+    files = {f"src/phase_{index}.py": f"VALUE = {index}\n"}
+    return files, {"id": f"p{index}", "name": f"Phase {index}", "description": f"Phase {index}", "session_id": "s1"}
+
+
+class TestPublishMicroPhases:
+    """Test the publish sequence, stacking and request savings."""
+
+    @pytest.mark.asyncio
+    async def test_single_phase_sequence(self):
+        """Test that one phase is published with the branch created at its commit and one PR request."""
+        stub = GitDataStub()
+        server, client = await start_github_stub(stub)
+        try:
+            result = await client.publish_micro_phases(
+                "demo", "feature/models", "develop", [_phase(1)], _phase(1)[1], comment="## Validation report"
+            )
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert [method for method, _ in stub.requests] == ["GET", "POST", "POST", "POST", "POST", "POST"]
+        assert stub.refs["feature/models"] == result["commit_sha"]
+        assert stub.commits[result["commit_sha"]]["parents"] == [BASE_SHA]
+        assert stub.trees["0" * 39 + "1"]["base_tree"] == "t" * 40
+        assert stub.pulls[0]["body"].endswith("## Validation report")
+        assert stub.comments == []
+        assert result["publish_stats"]["round_trips"] == 6
+
+    @pytest.mark.asyncio
+    async def test_stacked_phases_share_one_branch_and_pr(self):
+        """Test that stacked phases become chained commits of one pull request."""
+        stub = GitDataStub()
+        server, client = await start_github_stub(stub)
+        phases = [_phase(i) for i in range(3)]
+        try:
+            result = await client.publish_micro_phases("demo", "stack/p0", "develop", phases, {"name": "Stack"})
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        first, second, third = (commit["sha"] for commit in result["commits"])
+        assert stub.commits[second]["parents"] == [first]
+        assert stub.commits[third]["parents"] == [second]
+        assert stub.refs["stack/p0"] == third
+        assert len(stub.pulls) == 1
+
+    @pytest.mark.asyncio
+    async def test_republish_fast_forwards_existing_branch(self):
+        """Test that publishing onto a branch left by an earlier attempt fast-forwards it and reuses its PR."""
+        stub = GitDataStub()
+        server, client = await start_github_stub(stub)
+        try:
+            first = await client.publish_micro_phases("demo", "feature/models", "develop", [_phase(1)], _phase(1)[1])
+            stub.refs["develop"] = first["commit_sha"]
+            result = await client.publish_micro_phases(
+                "demo", "feature/models", "develop", [_phase(2)], _phase(2)[1], comment="## Validation report"
+            )
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert stub.refs["feature/models"] == result["commit_sha"]
+        assert ("PATCH", "/repos/acme/demo/git/refs/heads/feature/models") in stub.requests
+        assert len(stub.pulls) == 1
+        assert result["pull_request"]["number"] == first["pull_request"]["number"]
+        assert stub.comments == ["## Validation report"]
+
+    @pytest.mark.asyncio
+    async def test_republish_does_not_overwrite_diverged_branch(self):
+        """Test that a branch holding other commits is left as it is."""
+        stub = GitDataStub()
+        other = "c" * 40
+        stub.commits[other] = {"sha": other, "tree": {"sha": "o" * 40}, "parents": [BASE_SHA]}
+        stub.refs["feature/models"] = other
+        server, client = await start_github_stub(stub)
+        try:
+            with pytest.raises(Exception, match="diverged"):
+                await client.publish_micro_phases("demo", "feature/models", "develop", [_phase(1)], _phase(1)[1])
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert stub.refs["feature/models"] == other
+        assert stub.pulls == []
+
+    @pytest.mark.asyncio
+    async def test_fewer_requests_than_step_by_step_workflow(self):
+        """Test the request savings against branch, commit, PR and comment calls made one by one."""
+        stub = GitDataStub()
+        server, client = await start_github_stub(stub)
+        phases = [_phase(i) for i in range(4)]
+        try:
+            for index, (files, info) in enumerate(phases):
+                await client.create_branch("demo", f"old/{index}", "develop")
+                await client.commit_micro_phase_files("demo", f"old/{index}", files, info)
+                pr = await client.create_micro_phase_pull_request("demo", info, f"old/{index}")
+                await client.add_pr_comment("demo", pr["number"], "report")
+            step_by_step = len(stub.requests)
+
+            stub.requests.clear()
+            await client.publish_micro_phases("demo", "stack/new", "develop", phases, {"name": "Stack"}, comment="report")
+            stacked = len(stub.requests)
+        finally:
+            await client.cleanup()
+            await server.close()
+
+        assert step_by_step == 36
+        assert stacked * 3 <= step_by_step
+
+
+def _micro_phase(phase_id: str, *dependencies: str) -> MicroPhase:
+    return MicroPhase(
+        id=phase_id, name=phase_id.title(), description=f"{phase_id} phase", phase_type="backend",
+        files_to_generate=[], dependencies=list(dependencies), priority=1, estimated_duration=5,
+        acceptance_criteria=["works"], branch_name=f"feature/{phase_id}"
+    )
+
+
+class TestStackPlanning:
+    """Test how the coordinator groups micro-phases into stacks."""
+
+    def _plan(self, stacking: bool, *micro_phases: MicroPhase):
+        state = WorkflowState(
+            session_id="s1", current_phase=WorkflowPhase.ITERATIVE_DEVELOPMENT,
+            phase_status={phase: PhaseStatus.PENDING for phase in WorkflowPhase}, project_requirements="demo",
+            approved_micro_phases=list(micro_phases), integration_results={"stack_micro_phases": stacking}
+        )
+        coordinator = object.__new__(MicroPhaseCoordinator)
+        return [[micro_phase.id for micro_phase in stack] for stack in coordinator._plan_micro_phase_stacks(state)]
+
+    def test_dependent_phases_are_stacked(self):
+        """Test that phases building on the open stack join it and independent phases start a new one."""
+        phases = (
+            _micro_phase("models"), _micro_phase("api", "models"), _micro_phase("auth", "api", "models"),
+            _micro_phase("ui"), _micro_phase("docs", "models"), _micro_phase("theme", "ui", "future"),
+            _micro_phase("future")
+        )
+
+        assert self._plan(True, *phases) == [["models", "api", "auth"], ["ui"], ["docs"], ["theme"], ["future"]]
+
+    def test_stacking_disabled(self):
+        """Test that without the policy every phase is published on its own."""
+        phases = (_micro_phase("models"), _micro_phase("api", "models"))
+
+        assert self._plan(False, *phases) == [["models"], ["api"]]
@@ -0,0 +1,249 @@
+"""
+Unit tests for the process monitor.
+"""
+
+import asyncio
+import json
+import threading
+import pytest
+from pathlib import Path
+
+from ai_orchestrator.utils.process_monitor import ProcessMonitor, MessageType, COLUMNAR_FIELDS
+from ai_orchestrator.utils.event_log import EventLogWriter, EventLogReader
+
+
+class TestProcessMonitorCursor:
+    """Test sequence numbers and since-cursor reads."""
+
+    @pytest.fixture
+    def monitor(self):
+        monitor = ProcessMonitor()
+        for i in range(5):
+            monitor.log_workflow_event("session-a", f"event_{i}", {"index": i})
+        monitor.log_workflow_event("session-b", "other", {})
+        return monitor
+
+    def test_sequence_numbers_are_per_session(self, monitor):
+        """Test that each session gets its own monotonic sequence."""
+        seqs = [m["seq"] for m in monitor.get_messages("session-a")]
+
+        assert seqs == [1, 2, 3, 4, 5]
+        assert monitor.get_messages("session-b")[0]["seq"] == 1
+        assert monitor.get_last_seq("session-a") == 5
+
+    def test_get_messages_since(self, monitor):
+        """Test that since returns only newer messages, oldest first."""
+        messages = monitor.get_messages("session-a", since=2, limit=2)
+
+        assert [m["seq"] for m in messages] == [3, 4]
+
+    def test_batch_paging_resumes_without_loss(self, monitor):
+        """Test that following next_since visits every message exactly once."""
+        seen = []
+        since = 0
+        while True:
+            batch = monitor.get_message_batch("session-a", since=since, limit=2)
+            seen.extend(m["seq"] for m in batch["messages"])
+            since = batch["next_since"]
+            if not batch["has_more"]:
+                break
+
+        assert seen == [1, 2, 3, 4, 5]
+        assert since == 5
+
+    def test_batch_reports_truncation(self, monitor):
+        """Test that a cursor older than the retained window is flagged."""
+        monitor._max_messages_per_session = 3
+        monitor.log_workflow_event("session-a", "event_5", {})
+
+        batch = monitor.get_message_batch("session-a", since=1)
+
+        assert batch["truncated"] is True
+        assert [m["seq"] for m in batch["messages"]] == [4, 5, 6]
+
+    def test_sequence_survives_clear_session(self, monitor):
+        """Test that clearing a session does not reset its cursor."""
+        monitor.clear_session("session-a")
+        monitor.log_workflow_event("session-a", "after_clear", {})
+
+        assert monitor.get_messages("session-a")[0]["seq"] == 6
+
+    def test_columnar_encoding(self, monitor):
+        """Test the columnar batch encoding."""
+        batch = monitor.get_message_batch(
+            "session-a", since=3, encoding="columnar",
+            message_type=MessageType.WORKFLOW_EVENT
+        )
+
+        assert batch["encoding"] == "columnar"
+        assert batch["fields"] == list(COLUMNAR_FIELDS)
+        assert batch["columns"]["seq"] == [4, 5]
+        assert batch["columns"]["content"][0]["event"] == "event_3"
+        assert "messages" not in batch
+
+    def test_invalid_encoding(self, monitor):
+        """Test that unknown encodings are rejected."""
+        with pytest.raises(ValueError):
+            monitor.get_message_batch("session-a", encoding="protobuf")
+
+
+class TestEventLog:
+    """Test the durable event log and its integration with the monitor."""
+
+    def test_events_survive_monitor_restart(self, temp_dir):
+        """Test that events written by one monitor can be replayed later."""
+        writer = EventLogWriter(temp_dir, compress=True)
+        monitor = ProcessMonitor(event_log=writer)
+        monitor.log_phase_start("session-a", "planning")
+        monitor.log_workflow_event("session-b", "noise", {})
+        monitor.log_phase_end("session-a", "planning", success=True)
+        monitor.clear_session("session-a")
+        writer.close()
+
+        reader = EventLogReader(temp_dir)
+        events = reader.read_session("session-a")
+
+        assert [e["message_type"] for e in events] == ["phase_start", "phase_end"]
+        assert reader.list_sessions()["session-b"]["count"] == 1
+        assert all(s["file"].endswith(".gz") for s in read_index(temp_dir))
+
+    def test_segment_rotation_and_time_filter(self, temp_dir):
+        """Test that small segments rotate and time ranges prune segments."""
+        writer = EventLogWriter(temp_dir, max_segment_bytes=200, compress=False)
+        for i in range(10):
+            writer.append({"session_id": "s", "seq": i + 1, "timestamp": 1000.0 + i, "content": "x" * 50})
+            writer.flush()
+        writer.close()
+
+        reader = EventLogReader(temp_dir)
+
+        assert len(read_index(temp_dir)) > 1
+        assert [e["seq"] for e in reader.read(start=1007.0)] == [8, 9, 10]
+        assert [e["seq"] for e in reader.read(session_id="s", end=1001.0)] == [1, 2]
+
+    def test_session_spanning_restarts_and_writers_replays_in_time_order(self, temp_dir):
+        """Test that replay does not interleave events by their per-process sequence numbers."""
+        first = EventLogWriter(temp_dir)
+        for seq, timestamp in ((1, 1000.0), (2, 1001.0), (3, 1002.0)):
+            first.append({"session_id": "s", "seq": seq, "timestamp": timestamp, "content": f"before-{seq}"})
+        second = EventLogWriter(temp_dir)
+        second.append({"session_id": "s", "seq": 1, "timestamp": 1001.5, "content": "other-worker"})
+        first.close()
+        # A restarted process counts from 1 again
+        restarted = EventLogWriter(temp_dir)
+        for seq, timestamp in ((1, 1003.0), (2, 1003.0)):
+            restarted.append({"session_id": "s", "seq": seq, "timestamp": timestamp, "content": f"after-{seq}"})
+        second.close()
+        restarted.close()
+
+        events = EventLogReader(temp_dir).read_session("s")
+
+        assert [e["content"] for e in events] == [
+            "before-1", "before-2", "other-worker", "before-3", "after-1", "after-2"
+        ]
+
+    def test_memory_bounded_by_session_count(self):
+        """Test that idle sessions are evicted from memory."""
+        monitor = ProcessMonitor(max_sessions=2)
+        for session_id in ("a", "b", "c"):
+            monitor.log_workflow_event(session_id, "event", {})
+
+        assert monitor.get_active_sessions() == ["b", "c"]
+
+
+class TestMonitorSubscription:
+    """Test batched, bounded fan-out to subscribers."""
+
+    @pytest.mark.asyncio
+    async def test_messages_are_batched_into_frames(self):
+        """Test that messages queued together arrive in one frame."""
+        monitor = ProcessMonitor()
+        frames = []
+
+        async def callback(frame):
+            frames.append(frame)
+
+        subscription = monitor.subscribe("s", callback)
+        for i in range(5):
+            monitor.log_workflow_event("s", f"event_{i}", {})
+        await asyncio.sleep(0.01)
+
+        assert len(frames) == 1
+        assert [m["seq"] for m in frames[0]["messages"]] == [1, 2, 3, 4, 5]
+        assert subscription.get_stats()["frames_sent"] == 1
+        monitor.unsubscribe("s", subscription)
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_drops_oldest_and_reports_gap(self):
+        """Test that a full queue drops the oldest messages as one gap."""
+        monitor = ProcessMonitor()
+        frames = []
+
+        async def callback(frame):
+            frames.append(frame)
+
+        subscription = monitor.subscribe("s", callback, max_queue=3)
+        for i in range(10):
+            monitor.log_workflow_event("s", f"event_{i}", {})
+        await asyncio.sleep(0.01)
+
+        assert frames[0]["dropped"] == {"from_seq": 1, "to_seq": 7, "count": 7}
+        assert [m["seq"] for m in frames[0]["messages"]] == [8, 9, 10]
+        assert subscription.get_stats()["messages_dropped"] == 7
+        monitor.unsubscribe("s", subscription)
+
+    @pytest.mark.asyncio
+    async def test_status_updates_are_coalesced(self):
+        """Test that queued status updates from one source keep only the newest."""
+        monitor = ProcessMonitor()
+        frames = []
+
+        async def callback(frame):
+            frames.append(frame)
+
+        subscription = monitor.subscribe("s", callback)
+        for progress in (10, 20, 30):
+            monitor.add_message("s", MessageType.STATUS_UPDATE, "orchestrator", {"progress": progress})
+        await asyncio.sleep(0.01)
+
+        assert [m["content"]["progress"] for m in frames[0]["messages"]] == [30]
+        assert subscription.get_stats()["messages_coalesced"] == 2
+        monitor.unsubscribe("s", subscription)
+
+    @pytest.mark.asyncio
+    async def test_messages_from_other_threads(self):
+        """Test that messages added from a thread without a loop are delivered."""
+        monitor = ProcessMonitor()
+        received = []
+
+        async def callback(frame):
+            received.extend(frame["messages"])
+
+        subscription = monitor.subscribe("s", callback)
+        worker = threading.Thread(target=monitor.log_workflow_event, args=("s", "from_thread", {}))
+        worker.start()
+        worker.join()
+        await asyncio.sleep(0.01)
+
+        assert [m["content"]["event"] for m in received] == ["from_thread"]
+        monitor.unsubscribe("s", subscription)
+
+    @pytest.mark.asyncio
+    async def test_failing_subscriber_is_removed(self):
+        """Test that a subscriber whose callback raises is dropped."""
+        monitor = ProcessMonitor()
+
+        async def callback(frame):
+            raise ConnectionError("socket closed")
+
+        monitor.subscribe("s", callback)
+        monitor.log_workflow_event("s", "first", {})
+        await asyncio.sleep(0.01)
+        monitor.log_workflow_event("s", "second", {})
+
+        assert monitor.get_subscriber_stats("s") == []
+
+
+def read_index(log_dir):
+    """Load the segment entries of an event log directory."""
+    return json.loads((Path(log_dir) / "index.json").read_text())["segments"]
@@ -0,0 +1,88 @@
+"""
+Unit tests for streamed project archives and the archive cache.
+"""
+
+import io
+import tarfile
+import zipfile
+
+from ai_orchestrator.utils.file_manager import GeneratedFile
+from ai_orchestrator.utils.project_archive import (
+    ArchiveCache, etag_matches, iter_project_archive, project_version
+)
+
+
+FILES = [
+    GeneratedFile(path="backend/main.py", content="print('hello')\n" * 100, file_type="code", language="python"),
+    GeneratedFile(path="README.md", content="# Demo ✓\n", file_type="documentation")
+]
+
+
+class TestProjectArchive:
+    """Test archive streaming and versioning."""
+
+    def test_zip_round_trip(self):
+        """Test that the streamed chunks form a valid ZIP."""
+        chunks = list(iter_project_archive(FILES, "demo", "zip"))
+        assert len(chunks) > 1
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+            assert archive.namelist() == ["demo/backend/main.py", "demo/README.md"]
+            assert archive.read("demo/README.md").decode() == "# Demo ✓\n"
+
+    def test_tar_gz_round_trip(self):
+        """Test that the streamed chunks form a valid tar.gz."""
+        data = b"".join(iter_project_archive(FILES, "demo", "tar.gz"))
+
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as archive:
+            assert archive.getnames() == ["demo/backend/main.py", "demo/README.md"]
+            assert archive.extractfile("demo/backend/main.py").read().decode() == FILES[0].content
+
+    def test_version_follows_workflow_state(self):
+        """Test that the version changes with the outputs and the format."""
+        state = {"session_id": "s1", "backend_implementation": "v1"}
+        version = project_version(state, "zip")
+
+        assert project_version(dict(state), "zip") == version
+        assert project_version({**state, "backend_implementation": "v2"}, "zip") != version
+        assert project_version(state, "tar.gz") != version
+        assert project_version({**state, "quality_report": {"score": 1}}, "zip") != project_version(
+            {**state, "quality_report": {"score": 2}}, "zip"
+        )
+        assert project_version({"a": "xy", "b": ""}, "zip") != project_version({"a": "x", "b": "y"}, "zip")
+
+    def test_etag_matches(self):
+        """Test If-None-Match parsing."""
+        assert etag_matches('"abc"', "abc")
+        assert etag_matches('W/"old", "abc"', "abc")
+        assert etag_matches("*", "abc")
+        assert not etag_matches('"old"', "abc")
+        assert not etag_matches(None, "abc")
+
+
+class TestArchiveCache:
+    """Test the versioned LRU cache."""
+
+    def test_hit_and_version_mismatch(self):
+        """Test that only the cached version is served."""
+        cache = ArchiveCache(max_bytes=100)
+        cache.put("s1", "zip", "v1", b"archive")
+
+        assert cache.get("s1", "zip", "v1") == b"archive"
+        assert cache.get("s1", "zip", "v2") is None
+        assert cache.get("s1", "tar.gz", "v1") is None
+        assert cache.get_stats()["hits"] == 1
+
+    def test_eviction_by_size(self):
+        """Test that the least recently used archives are evicted."""
+        cache = ArchiveCache(max_bytes=10)
+        cache.put("s1", "zip", "v1", b"aaaa")
+        cache.put("s2", "zip", "v1", b"bbbb")
+        cache.get("s1", "zip", "v1")
+        cache.put("s3", "zip", "v1", b"cccc")
+        cache.put("s4", "zip", "v1", b"x" * 11)
+
+        assert cache.get("s2", "zip", "v1") is None
+        assert cache.get("s1", "zip", "v1") == b"aaaa"
+        assert cache.get("s4", "zip", "v1") is None
+        assert cache.get_stats()["bytes"] == 8
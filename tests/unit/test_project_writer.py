@@ -0,0 +1,99 @@
+"""
+Unit tests for incremental project writes.
+"""
+
+import os
+from datetime import datetime
+import pytest
+
+from ai_orchestrator.utils.file_manager import FileOutputManager, GeneratedFile, ProjectStructure, MANIFEST_FILE
+
+
+def _project(files):
+    return ProjectStructure(
+        name="demo",
+        description="Demo project",
+        session_id="writer-session",
+        created_at=datetime.now(),
+        files=[GeneratedFile(path=path, content=content, file_type="code") for path, content in files.items()],
+        metadata={}
+    )
+
+
+FILES = {
+    "backend/main.py": "print('hello')\n",
+    "backend/app/models.py": "class User: pass\n",
+    "README.md": "# Demo\n"
+}
+
+
+class TestIncrementalWrite:
+    """Test manifest-based skipping, deletion and the directory swap."""
+
+    def test_first_write(self, tmp_path):
+        """Test that every file is written along with the manifest."""
+        result = FileOutputManager().materialize_project(_project(FILES), str(tmp_path / "demo"))
+
+        assert (result.written, result.skipped, result.deleted) == (3, 0, 0)
+        assert (tmp_path / "demo" / "backend" / "app" / "models.py").read_text() == FILES["backend/app/models.py"]
+        assert (tmp_path / "demo" / MANIFEST_FILE).exists()
+        assert (tmp_path / "demo" / "project_metadata.json").exists()
+        assert sorted(os.listdir(tmp_path)) == ["demo"]
+
+    def test_rewrite_skips_unchanged_and_deletes_removed(self, tmp_path):
+        """Test that only changed files are rewritten and dropped files disappear."""
+        manager = FileOutputManager()
+        output_dir = str(tmp_path / "demo")
+        manager.materialize_project(_project(FILES), output_dir)
+        inode = (tmp_path / "demo" / "README.md").stat().st_ino
+
+        changed = {"backend/main.py": "print('changed')\n", "README.md": FILES["README.md"], "docs/api.md": "# API\n"}
+        result = manager.materialize_project(_project(changed), output_dir)
+
+        assert (result.written, result.skipped, result.deleted) == (2, 1, 1)
+        assert (tmp_path / "demo" / "backend" / "main.py").read_text() == "print('changed')\n"
+        assert not (tmp_path / "demo" / "backend" / "app" / "models.py").exists()
+        assert (tmp_path / "demo" / "README.md").stat().st_ino == inode
+        assert sorted(os.listdir(tmp_path)) == ["demo"]
+
+    def test_edited_and_untracked_files(self, tmp_path):
+        """Test that hand-edited files are rewritten and unknown files are kept."""
+        manager = FileOutputManager()
+        output_dir = tmp_path / "demo"
+        manager.materialize_project(_project(FILES), str(output_dir))
+        (output_dir / "README.md").write_text("# Edited by hand, longer\n")
+        (output_dir / ".git").mkdir()
+        (output_dir / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+
+        result = manager.materialize_project(_project(FILES), str(output_dir))
+
+        assert (result.written, result.skipped) == (1, 2)
+        assert (output_dir / "README.md").read_text() == FILES["README.md"]
+        assert (output_dir / ".git" / "HEAD").read_text() == "ref: refs/heads/main\n"
+
+    @pytest.mark.asyncio
+    async def test_async_write_matches_sync(self, tmp_path):
+        """Test that the pooled write produces the same tree and counts."""
+        manager = FileOutputManager()
+        result = await manager.materialize_project_async(_project(FILES), str(tmp_path / "demo"))
+        again = await manager.materialize_project_async(_project(FILES), str(tmp_path / "demo"))
+
+        assert result.written == 3
+        assert (again.written, again.skipped, again.deleted) == (0, 3, 0)
+        assert (tmp_path / "demo" / "backend" / "main.py").read_text() == FILES["backend/main.py"]
+
+    def test_failed_write_keeps_previous_tree(self, tmp_path, monkeypatch):
+        """Test that a failure leaves the old tree in place and no staging directory behind."""
+        manager = FileOutputManager()
+        output_dir = tmp_path / "demo"
+        manager.materialize_project(_project(FILES), str(output_dir))
+
+        def failing_write(path, data):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("ai_orchestrator.utils.file_manager._write_bytes", failing_write)
+        with pytest.raises(OSError):
+            manager.materialize_project(_project({"backend/main.py": "new\n"}), str(output_dir))
+
+        assert (output_dir / "backend" / "main.py").read_text() == FILES["backend/main.py"]
+        assert sorted(os.listdir(tmp_path)) == ["demo"]
@@ -0,0 +1,90 @@
+"""
+Unit tests for per-session profiles.
+"""
+
+from ai_orchestrator.utils.process_monitor import ProcessMonitor
+from ai_orchestrator.utils.session_profile import build_session_profile, format_profile_report
+
+
+def _event(timestamp, message_type, source="workflow_engine", content=None, metadata=None):
+    return {
+        "timestamp": timestamp,
+        "message_type": message_type,
+        "source": source,
+        "content": content or {},
+        "metadata": metadata or {}
+    }
+
+
+def _phase(name, start, end, depends_on=None, success=True, parent=None):
+    metadata = {"parent": parent} if parent else {}
+    if depends_on is not None:
+        metadata["depends_on"] = depends_on
+    return [
+        _event(start, "phase_start", content={"phase": name}, metadata=metadata),
+        _event(end, "phase_end", content={"phase": name, "success": success})
+    ]
+
+
+class TestSessionProfile:
+    """Test waterfall, critical path and wait accounting."""
+
+    def test_critical_path_uses_declared_dependencies(self):
+        """Test that parallel branches collapse to the longest dependency chain."""
+        events = (
+            _phase("planning", 100.0, 110.0, depends_on=[])
+            + _phase("backend", 110.0, 140.0, depends_on=["planning"])
+            + _phase("frontend", 140.0, 150.0, depends_on=["planning"])
+            + _phase("review", 150.0, 160.0, depends_on=["backend", "frontend"])
+        )
+
+        profile = build_session_profile("s", events)
+
+        assert profile["wall_time"] == 60.0
+        assert profile["critical_path"]["phases"] == ["planning", "backend", "review"]
+        assert profile["critical_path"]["duration"] == 50.0
+        assert profile["critical_path"]["dependencies"] == "declared"
+        assert profile["parallelism"]["theoretical_speedup"] == 60.0 / 50.0
+
+    def test_inferred_dependencies_and_sub_phases(self):
+        """Test that undeclared phases run in sequence and sub-phases replace their parent."""
+        events = (
+            _phase("architecture", 0.0, 10.0)
+            + _phase("iterative_development", 10.0, 40.0)
+            + _phase("micro_phase:auth", 10.0, 25.0, depends_on=[], parent="iterative_development")
+            + _phase("micro_phase:posts", 25.0, 40.0, depends_on=[], parent="iterative_development")
+        )
+
+        profile = build_session_profile("s", events)
+
+        # Independent micro-phases could run side by side after architecture
+        assert profile["critical_path"]["duration"] == 25.0
+        assert profile["critical_path"]["dependencies"] == "mixed"
+        depths = {entry["name"]: entry["depth"] for entry in profile["waterfall"]}
+        assert depths["micro_phase:auth"] == 1
+
+    def test_agent_calls_waits_and_report(self):
+        """Test agent call pairing, recorded wait totals and the text report."""
+        monitor = ProcessMonitor()
+        monitor.log_phase_start("s", "implementation", metadata={"depends_on": []})
+        monitor.log_agent_request("s", "claude_implementer", "prompt", metadata={"task_type": "implementation"})
+        monitor.log_error("s", "claude_implementer", "timeout", metadata={"task_type": "implementation"})
+        monitor.log_agent_request("s", "claude_implementer", "prompt", metadata={"task_type": "implementation"})
+        monitor.log_agent_response("s", "claude_implementer", "code", metadata={"task_type": "implementation"})
+        monitor.log_phase_end("s", "implementation", True)
+        monitor.record_timing("s", "retry_backoff", 2.0)
+        monitor.record_timing("s", "cache_io", 0.25)
+        monitor.log_session_timings("s")
+
+        profile = build_session_profile("s", monitor.get_messages("s"))
+
+        calls = [entry for entry in profile["waterfall"] if entry["kind"] == "agent_call"]
+        assert [call["status"] for call in calls] == ["failed", "completed"]
+        assert all(call["parent"] == "implementation" for call in calls)
+        assert profile["agent_time"]["by_agent"]["claude_implementer"]["failed"] == 1
+        assert profile["waits"]["retry_backoff"] == {"total": 2.0, "count": 1}
+        assert profile["local_io"]["cache_io"]["total"] == 0.25
+
+        report = "\n".join(format_profile_report(profile))
+        assert "Critical path (declared dependencies)" in report
+        assert "claude_implementer:implementation [failed]" in report
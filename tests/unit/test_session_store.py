@@ -0,0 +1,200 @@
+"""
+Unit tests for the persistent session store.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from ai_orchestrator.core.orchestrator import WorkflowState, WorkflowPhase
+from ai_orchestrator.utils.session_store import (
+    MemorySessionStore, PersistentSessionMap, RedisSessionStore, SQLiteSessionStore
+)
+
+
+def _map(store, **kwargs):
+    return PersistentSessionMap("test", store, dict, dict, **kwargs)
+
+
+class TestSessionStore:
+    """Test snapshots, deltas, rehydration and eviction."""
+
+    def test_sqlite_snapshot_deltas_and_compaction(self, tmp_path):
+        """Test that changed fields are appended as deltas and folded into a snapshot."""
+        store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+        sessions = _map(store, snapshot_every=3)
+
+        sessions["s1"] = {"phase": "planning", "artifacts": {"plan": "x" * 100}, "progress": 0}
+        for progress in (10, 20):
+            sessions["s1"]["progress"] = progress
+            sessions.save("s1")
+
+        deltas = store._conn.execute("SELECT data FROM session_deltas").fetchall()
+        assert [row[0] for row in deltas] == ['{"progress": 10}', '{"progress": 20}']
+        assert store.load("test", "s1") == ({"phase": "planning", "artifacts": {"plan": "x" * 100}, "progress": 20}, False)
+
+        sessions["s1"]["progress"] = 30
+        sessions.save("s1")
+
+        assert store._conn.execute("SELECT COUNT(*) FROM session_deltas").fetchone()[0] == 0
+        assert store.load("test", "s1")[0]["progress"] == 30
+
+    def test_rehydrates_after_restart(self, tmp_path):
+        """Test that a new map on the same database lazily loads earlier sessions."""
+        path = str(tmp_path / "sessions.db")
+        sessions = _map(SQLiteSessionStore(path))
+        sessions["s1"] = {"progress": 0}
+        sessions["s1"]["progress"] = 100
+        sessions.mark_finished("s1")
+
+        restarted = _map(SQLiteSessionStore(path))
+
+        assert restarted.in_memory() == []
+        assert list(restarted) == ["s1"]
+        assert "s1" in restarted
+        assert restarted["s1"] == {"progress": 100}
+        assert restarted.in_memory() == ["s1"]
+        assert "missing" not in restarted
+
+    def test_nested_changes_after_rehydration_are_saved(self, tmp_path):
+        """Test that mutating a nested value of a rehydrated session is persisted."""
+        path = str(tmp_path / "sessions.db")
+        _map(SQLiteSessionStore(path))["s1"] = {"files": {}}
+        restarted = _map(SQLiteSessionStore(path))
+
+        restarted["s1"]["files"]["a.py"] = "x"
+        restarted.save("s1")
+
+        assert SQLiteSessionStore(path).load("test", "s1")[0] == {"files": {"a.py": "x"}}
+
+    def test_evicts_only_finished_sessions(self):
+        """Test that the TTL applies to finished sessions and the store keeps them."""
+        store = MemorySessionStore()
+        sessions = _map(store, ttl_seconds=60)
+        sessions["running"] = {"progress": 10}
+        sessions["done"] = {"progress": 100}
+        sessions.mark_finished("done")
+
+        assert sessions.evict_expired() == 0
+        assert sessions.evict_expired(now=sessions._finished["done"] + 61) == 1
+
+        assert sessions.in_memory() == ["running"]
+        assert store.load("test", "done") == ({"progress": 100}, True)
+        assert len(sessions) == 2
+
+    @pytest.mark.asyncio
+    async def test_saves_on_loop_are_coalesced_off_loop(self, tmp_path):
+        """Test that saves made on the event loop become one write on the I/O pool."""
+        store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+        sessions = _map(store, save_delay=0.05)
+        sessions["s1"] = {"progress": 0}
+        writers = []
+        append_delta = store.append_delta
+
+        def recording_append_delta(*args, **kwargs):
+            writers.append(threading.current_thread())
+            return append_delta(*args, **kwargs)
+
+        store.append_delta = recording_append_delta
+        for progress in (10, 20, 30):
+            sessions["s1"]["progress"] = progress
+            sessions.save("s1")
+
+        assert store.load("test", "s1")[0]["progress"] == 0
+        await asyncio.sleep(0.2)
+
+        assert store.load("test", "s1")[0]["progress"] == 30
+        assert len(writers) == 1
+        assert writers[0] is not threading.current_thread()
+
+        sessions.mark_finished("s1")
+        await sessions.close()
+        assert store.load("test", "s1") == ({"progress": 30}, True)
+
+    @pytest.mark.asyncio
+    async def test_async_accessors_do_store_io_off_loop(self, tmp_path):
+        """Test that lookup misses and new sessions hit the store on the I/O pool."""
+        store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+        store.save_snapshot("test", "stored", {"progress": 50}, False)
+        sessions = _map(store)
+        threads = []
+        load, save_snapshot = store.load, store.save_snapshot
+
+        def recording_load(*args):
+            threads.append(threading.current_thread())
+            return load(*args)
+
+        def recording_save_snapshot(*args):
+            threads.append(threading.current_thread())
+            return save_snapshot(*args)
+
+        store.load, store.save_snapshot = recording_load, recording_save_snapshot
+        await sessions.set_async("new", {"progress": 0})
+
+        assert await sessions.get_async("stored") == {"progress": 50}
+        assert await sessions.contains_async("new")
+        assert not await sessions.contains_async("missing")
+        assert await sessions.get_async("missing", {}) == {}
+        assert load("test", "new") == ({"progress": 0}, False)
+        assert len(threads) == 4
+        assert threading.current_thread() not in threads
+        await sessions.close()
+
+    @pytest.mark.asyncio
+    async def test_evicts_on_a_timer(self):
+        """Test that expired sessions leave memory without further saves."""
+        sessions = _map(MemorySessionStore(), ttl_seconds=0, save_delay=0, evict_interval=0.05)
+        sessions["done"] = {"progress": 100}
+        sessions.mark_finished("done")
+        await sessions.flush()
+
+        await asyncio.sleep(0.2)
+
+        assert sessions.in_memory() == []
+        await sessions.close()
+
+    def test_summaries_are_paginated_without_loading(self, tmp_path):
+        """Test that summaries are listed newest first from the store."""
+        store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+        sessions = _map(store, summarize=lambda data: {"phase": data["phase"]})
+        for session_id in ("s1", "s2", "s3"):
+            sessions[session_id] = {"phase": "planning", "artifacts": "x" * 100}
+        sessions["s1"]["phase"] = "testing"
+        sessions.save("s1")
+        sessions.clear_memory()
+
+        page, total = sessions.summaries(offset=0, limit=2)
+
+        assert total == 3
+        assert [(s["session_id"], s["phase"]) for s in page] == [("s1", "testing"), ("s3", "planning")]
+        assert sessions.summaries(offset=2, limit=2)[0][0]["session_id"] == "s2"
+        assert sessions.in_memory() == []
+
+    def test_redis_backend(self):
+        """Test the Redis store against an in-process fake server."""
+        fakeredis = pytest.importorskip("fakeredis")
+        store = RedisSessionStore(client=fakeredis.FakeRedis(), prefix="t")
+        sessions = _map(store)
+
+        sessions["s1"] = {"progress": 0, "files": ["a.py"]}
+        sessions["s1"]["files"].append("b.py")
+        sessions.mark_finished("s1")
+
+        assert store.load("test", "s1") == ({"progress": 0, "files": ["a.py", "b.py"]}, True)
+        assert store.list_sessions("test") == ["s1"]
+        assert store.list_summaries("test")[0][0]["finished"] is True
+
+        del sessions["s1"]
+        assert store.load("test", "s1") is None
+
+    def test_workflow_state_round_trip(self):
+        """Test that orchestrator workflow state keeps its phase and dynamic attributes."""
+        state = WorkflowState(session_id="s1", user_request="Build a blog", current_phase=WorkflowPhase.TESTING)
+        state.project_metadata = {"name": "blog"}
+
+        restored = WorkflowState.from_dict(state.to_dict())
+
+        assert restored.current_phase == WorkflowPhase.TESTING
+        assert restored.user_request == "Build a blog"
+        assert restored.project_metadata == {"name": "blog"}
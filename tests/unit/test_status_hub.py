@@ -0,0 +1,99 @@
+"""
+Unit tests for the workflow status hub.
+"""
+
+import asyncio
+import json
+import threading
+import pytest
+
+from ai_orchestrator.utils.status_hub import StatusHub
+
+
+class TestStatusHub:
+    """Test push-based status deltas."""
+
+    def test_unchanged_publish_does_not_bump_version(self):
+        """Test that republishing identical values is a no-op."""
+        hub = StatusHub()
+
+        first = hub.publish("s", current_phase="planning", progress=0.1)
+        second = hub.publish("s", current_phase="planning", progress=0.1)
+
+        assert first == second == 1
+        assert hub.get_status("s") == {"current_phase": "planning", "progress": 0.1}
+
+    def test_status_may_carry_session_id(self):
+        """Test that full workflow status dicts, which include session_id, can be published."""
+        hub = StatusHub()
+
+        hub.seed("s", {"session_id": "s", "current_phase": "planning"})
+
+        assert hub.get_status("s") == {"session_id": "s", "current_phase": "planning"}
+
+    @pytest.mark.asyncio
+    async def test_snapshot_then_deltas(self):
+        """Test that subscribers get a snapshot followed by changed fields only."""
+        hub = StatusHub()
+        hub.publish("s", current_phase="planning", progress=0.1, error_count=0)
+        frames = []
+
+        async def send(text):
+            frames.append(json.loads(text))
+
+        subscription = hub.subscribe("s", send)
+        await asyncio.sleep(0.01)
+        hub.publish("s", current_phase="implementation", progress=0.5, error_count=0)
+        await asyncio.sleep(0.01)
+
+        assert frames[0]["type"] == "status_snapshot"
+        assert frames[0]["status"]["current_phase"] == "planning"
+        assert frames[1] == {
+            "type": "status_delta",
+            "session_id": "s",
+            "version": 2,
+            "changes": {"current_phase": "implementation", "progress": 0.5}
+        }
+        hub.unsubscribe(subscription)
+
+    @pytest.mark.asyncio
+    async def test_subscribers_share_serialized_frames(self):
+        """Test that every subscriber of a session receives the same string object."""
+        hub = StatusHub()
+        hub.publish("s", progress=0.1)
+        received = [[], []]
+
+        subscriptions = []
+        for frames in received:
+            async def send(text, frames=frames):
+                frames.append(text)
+            subscriptions.append(hub.subscribe("s", send))
+        await asyncio.sleep(0.01)
+        hub.publish("s", progress=0.2)
+        await asyncio.sleep(0.01)
+
+        assert received[0][1] is received[1][1]
+        for subscription in subscriptions:
+            hub.unsubscribe(subscription)
+
+    @pytest.mark.asyncio
+    async def test_lagging_subscriber_gets_snapshot(self):
+        """Test that several changes before a send collapse into one snapshot."""
+        hub = StatusHub()
+        frames = []
+
+        async def send(text):
+            frames.append(json.loads(text))
+
+        subscription = hub.subscribe("s", send)
+        worker = threading.Thread(target=lambda: [hub.publish("s", progress=p) for p in (0.1, 0.2, 0.3)])
+        worker.start()
+        worker.join()
+        await asyncio.sleep(0.01)
+
+        assert len(frames) == 1
+        assert frames[0]["type"] == "status_snapshot"
+        assert frames[0]["status"] == {"progress": 0.3}
+        assert subscription.sent_version == 3
+        hub.unsubscribe(subscription)
+        assert hub.get_subscriber_count("s") == 0
@@ -0,0 +1,96 @@
+"""
+Unit tests for hierarchical tracing.
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from ai_orchestrator.utils import tracing
+from ai_orchestrator.utils.tracing import Tracer, traced
+
+
+@pytest.fixture
+def tracer(tmp_path, monkeypatch):
+    """Tracer writing into a temporary directory, installed as the global tracer."""
+    tracer = Tracer(trace_dir=str(tmp_path))
+    monkeypatch.setattr(tracing, "_tracer", tracer)
+    return tracer
+
+
+def _load(tmp_path, trace_id):
+    tracing._tracer.flush(timeout=5)
+    with open(tmp_path / f"{trace_id}.trace.json") as f:
+        return json.load(f)
+
+
+class TestTracer:
+    """Test span nesting and trace files."""
+
+    def test_span_outside_trace_is_noop(self, tracer, tmp_path):
+        """Test that spans without an active trace record nothing."""
+        with tracer.span("orphan") as span:
+            assert span is None
+        tracer.record_span("orphan", "http", 0.0, 1.0)
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_trace_files_written_off_caller_thread(self, tracer, tmp_path, monkeypatch):
+        """Test that finishing a trace only queues it and the writer thread writes the file."""
+        threads = []
+        write = tracer._write
+        monkeypatch.setattr(tracer, "_write", lambda trace: (threads.append(threading.current_thread().name), write(trace)))
+
+        with tracer.trace("s0", "workflow"):
+            pass
+        tracer.flush(timeout=5)
+
+        assert threads == ["trace-writer"]
+        assert (tmp_path / "s0.trace.json").exists()
+
+    def test_nested_spans_written_as_chrome_trace(self, tracer, tmp_path):
+        """Test that nested spans keep parent ids and are written on trace exit."""
+        with tracer.trace("s1", "workflow", workflow_type="adaptive") as root:
+            with tracer.span("planning", "phase") as phase:
+                with tracer.span("gpt_manager:planning", "agent", model="gpt-4"):
+                    pass
+
+        document = _load(tmp_path, "s1")
+        events = {event["name"]: event for event in document["traceEvents"]}
+
+        assert document["otherData"]["span_count"] == 3
+        assert events["workflow"]["args"]["workflow_type"] == "adaptive"
+        assert events["planning"]["args"]["parent_id"] == root.span_id
+        assert events["gpt_manager:planning"]["args"]["parent_id"] == phase.span_id
+        assert events["gpt_manager:planning"]["cat"] == "agent"
+        for event in document["traceEvents"]:
+            assert event["ph"] == "X"
+            assert event["dur"] >= 0
+
+    def test_span_records_error(self, tracer, tmp_path):
+        """Test that a failing span records the exception and re-raises it."""
+        with pytest.raises(ValueError):
+            with tracer.trace("s2"):
+                with tracer.span("boom"):
+                    raise ValueError("bad input")
+
+        events = {event["name"]: event for event in _load(tmp_path, "s2")["traceEvents"]}
+        assert events["boom"]["args"]["error"] == "ValueError: bad input"
+        assert events["session"]["args"]["error"] == "ValueError: bad input"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_get_separate_lanes(self, tracer, tmp_path):
+        """Test that decorated coroutines run as concurrent tasks nest under the caller on their own lanes."""
+        @traced("agent", name=lambda role: f"{role}:implementation")
+        async def call_agent(role):
+            await asyncio.sleep(0.01)
+
+        with tracer.trace("s3") as root:
+            await asyncio.gather(call_agent("claude"), call_agent("gpt"))
+
+        events = [event for event in _load(tmp_path, "s3")["traceEvents"] if event["cat"] == "agent"]
+        assert len(events) == 2
+        assert {event["args"]["parent_id"] for event in events} == {root.span_id}
+        assert len({event["tid"] for event in events}) == 2